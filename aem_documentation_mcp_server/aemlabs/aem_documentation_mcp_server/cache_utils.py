@@ -0,0 +1,589 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Caching utilities for Adobe AEM Documentation MCP Server."""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from aemlabs.aem_documentation_mcp_server.models import OutlineHeading
+from aemlabs.aem_documentation_mcp_server.outline_utils import build_outline
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from loguru import logger
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Converted-document cache limits (0 disables the cache)
+DOC_CACHE_MAX_BYTES = int(os.getenv('MCP_DOC_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+DOC_CACHE_TTL = float(os.getenv('MCP_DOC_CACHE_TTL', '3600'))
+
+
+@dataclass
+class CachedDocument:
+    """A fetched page after conversion to its final markdown form.
+
+    ``complete`` is False when only a prefix of the page was read or converted.
+    ``stale`` is True when an expired HTTP cache entry was served because the
+    upstream host is unavailable; such documents are not kept in memory.
+    ``anchors`` maps the element ids of the page to the offsets of the headings
+    they link to.
+    """
+
+    url: str
+    content: str
+    title: Optional[str] = None
+    complete: bool = True
+    stale: bool = False
+    anchors: Dict[str, int] = field(default_factory=dict, repr=False)
+    _outline: Optional[List[OutlineHeading]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def outline(self) -> List[OutlineHeading]:
+        """Headings of the content with their offsets, computed once per document."""
+        if self._outline is None:
+            self._outline = build_outline(self.content, self.anchors)
+        return self._outline
+
+    def section(self, heading: OutlineHeading) -> 'CachedDocument':
+        """The part of the document under one of its headings, as a document of its own."""
+        end = heading.start_index + heading.length
+        return CachedDocument(
+            url=self.url, content=self.content[heading.start_index : end], title=self.title
+        )
+
+    @property
+    def length(self) -> int:
+        """Length of the markdown content in characters."""
+        return len(self.content)
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes, used for cache accounting."""
+        return len(self.content.encode('utf-8')) + len((self.title or '').encode('utf-8'))
+
+
+class DocumentCache:
+    """In-memory LRU cache of converted documents bounded by total size and TTL.
+
+    Pagination calls for the same page are served from here, so reading a long
+    page in chunks costs one fetch and one markdown conversion.
+    """
+
+    def __init__(self, max_bytes: int = DOC_CACHE_MAX_BYTES, ttl: float = DOC_CACHE_TTL):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of cached documents in bytes (0 disables caching)
+            ttl: Seconds a cached document stays valid
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, Tuple[float, CachedDocument]]' = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CachedDocument]:
+        """Get a cached document, refreshing its LRU position.
+
+        Args:
+            key: Canonical URL of the document
+
+        Returns:
+            Cached document, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, document = entry
+        if time.monotonic() - stored_at > self.ttl:
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return document
+
+    def put(self, key: str, document: CachedDocument) -> None:
+        """Store a document, evicting least recently used entries to stay within budget.
+
+        Args:
+            key: Canonical URL of the document
+            document: Converted document to cache
+        """
+        size = document.size
+        if self.max_bytes <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic(), document)
+        self._total_bytes += size
+        while self._total_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+            logger.debug(f'Evicted {oldest_key} from document cache')
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and update the size accounting."""
+        _, document = self._entries.pop(key)
+        self._total_bytes -= document.size
+
+    def clear(self) -> None:
+        """Remove every cached document and reset the statistics."""
+        self._entries.clear()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Number of cached documents."""
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, total bytes, hits, misses and evictions
+        """
+        return {
+            'entries': len(self._entries),
+            'bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+# Process-wide cache of converted documents
+document_cache = DocumentCache()
+
+
+# Search result cache limits (0 entries disables the cache)
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('MCP_SEARCH_CACHE_MAX_ENTRIES', '256'))
+SEARCH_CACHE_TTL = float(os.getenv('MCP_SEARCH_CACHE_TTL', '600'))
+
+
+class SearchCache:
+    """In-memory LRU cache of search results bounded by entry count and TTL.
+
+    Results are small, so the cache is bounded by the number of queries rather
+    than by size; the TTL is short because search indexes change daily.
+    """
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_MAX_ENTRIES, ttl: float = SEARCH_CACHE_TTL):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached queries (0 disables caching)
+            ttl: Seconds cached results stay valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get cached results, refreshing their LRU position.
+
+        Args:
+            key: Normalized query and filters
+
+        Returns:
+            Cached results, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, results: Any) -> None:
+        """Store results, evicting the least recently used queries beyond the limit.
+
+        Args:
+            key: Normalized query and filters
+            results: Results to cache
+        """
+        if self.max_entries <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), results)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every cached query and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Number of cached queries."""
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, hits and misses
+        """
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# Process-wide cache of search results
+search_cache = SearchCache()
+
+
+# Persistent HTTP cache (RFC 9111 private cache) location and limits
+HTTP_CACHE_ENABLED = os.getenv('MCP_HTTP_CACHE', 'true').lower() in ('1', 'true', 'yes')
+HTTP_CACHE_DIR = os.getenv(
+    'MCP_HTTP_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'aem-documentation-mcp-server', 'http'),
+)
+HTTP_CACHE_MAX_BYTES = int(os.getenv('MCP_HTTP_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+# Upper bound for heuristic freshness of responses that only carry Last-Modified
+HEURISTIC_FRESHNESS_CAP = 24 * 3600
+
+# Response headers kept with a cache entry
+STORED_HEADERS = (
+    'age',
+    'cache-control',
+    'content-type',
+    'date',
+    'etag',
+    'expires',
+    'last-modified',
+    'vary',
+)
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a directive dictionary.
+
+    Args:
+        value: Raw Cache-Control header value
+
+    Returns:
+        Dictionary mapping lowercase directive names to their value (None for flags)
+    """
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+    for part in value.split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    """Parse an HTTP date into a POSIX timestamp, or None if invalid."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[int]:
+    """Parse a delta-seconds value, or None if invalid."""
+    try:
+        return max(0, int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class HttpCacheEntry:
+    """A stored response with its validators and optional converted markdown."""
+
+    url: str
+    headers: Dict[str, str]
+    body: bytes
+    encoding: str
+    stored_at: float
+    conversion_key: Optional[str] = None
+    markdown: Optional[str] = None
+    title: Optional[str] = None
+    anchors: Optional[Dict[str, int]] = None
+
+    @property
+    def text(self) -> str:
+        """Response body decoded with the original encoding."""
+        return self.body.decode(self.encoding or 'utf-8', errors='replace')
+
+    @property
+    def has_validators(self) -> bool:
+        """Whether the entry can be revalidated with a conditional request."""
+        return bool(self.headers.get('etag') or self.headers.get('last-modified'))
+
+    def freshness_lifetime(self) -> float:
+        """Compute the freshness lifetime in seconds (RFC 9111 section 4.2.1)."""
+        directives = parse_cache_control(self.headers.get('cache-control'))
+        if 'no-cache' in directives:
+            return 0.0
+        max_age = _parse_seconds(directives.get('max-age'))
+        if max_age is not None:
+            return float(max_age)
+        date = _parse_http_date(self.headers.get('date')) or self.stored_at
+        expires = self.headers.get('expires')
+        if expires is not None:
+            expires_at = _parse_http_date(expires)
+            return max(0.0, expires_at - date) if expires_at is not None else 0.0
+        last_modified = _parse_http_date(self.headers.get('last-modified'))
+        if last_modified is not None:
+            return min(max(0.0, (date - last_modified) / 10), HEURISTIC_FRESHNESS_CAP)
+        return 0.0
+
+    def current_age(self, now: Optional[float] = None) -> float:
+        """Compute the current age in seconds (RFC 9111 section 4.2.3)."""
+        now = time.time() if now is None else now
+        date = _parse_http_date(self.headers.get('date'))
+        apparent_age = max(0.0, self.stored_at - date) if date is not None else 0.0
+        age_value = _parse_seconds(self.headers.get('age')) or 0
+        return max(apparent_age, float(age_value)) + max(0.0, now - self.stored_at)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Whether the entry can be served without contacting the origin."""
+        return self.freshness_lifetime() > self.current_age(now)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidation."""
+        headers = {}
+        if self.headers.get('etag'):
+            headers['If-None-Match'] = self.headers['etag']
+        if self.headers.get('last-modified'):
+            headers['If-Modified-Since'] = self.headers['last-modified']
+        return headers
+
+
+def is_storable(status_code: int, headers: Any) -> bool:
+    """Check whether a response may be stored by a private cache.
+
+    Only complete 200 responses that carry either explicit freshness information
+    or validators are kept; anything else would be stale on arrival.
+
+    Args:
+        status_code: HTTP status code
+        headers: Response headers (case-insensitive mapping)
+
+    Returns:
+        True if the response should be stored
+    """
+    if status_code != 200:
+        return False
+    directives = parse_cache_control(headers.get('cache-control'))
+    if 'no-store' in directives or headers.get('vary', '').strip() == '*':
+        return False
+    return bool(
+        'max-age' in directives
+        or headers.get('expires')
+        or headers.get('etag')
+        or headers.get('last-modified')
+    )
+
+
+class HttpCache:
+    """Persistent on-disk HTTP cache honouring Cache-Control, Expires and validators.
+
+    Entries survive process restarts, so a new IDE session can serve fresh pages
+    without any network traffic and revalidate stale ones with a cheap 304. Each
+    entry can also carry the markdown produced from its body, letting a 304
+    skip the conversion pipeline as well.
+    """
+
+    def __init__(
+        self,
+        directory: str = HTTP_CACHE_DIR,
+        enabled: bool = HTTP_CACHE_ENABLED,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache files
+            enabled: Whether the cache is used at all
+            max_bytes: Total size budget of stored bodies before old entries are pruned
+        """
+        self.directory = directory
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self._stores_since_prune = 0
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        """Get the metadata and body file paths for a URL."""
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, digest[:2], digest)
+        return f'{base}.json', f'{base}.body'
+
+    def load(self, url: str) -> Optional[HttpCacheEntry]:
+        """Load the stored entry for a URL.
+
+        Args:
+            url: Canonical URL of the resource
+
+        Returns:
+            Stored entry, or None if missing, disabled or unreadable
+        """
+        if not self.enabled:
+            return None
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url:
+            return None
+        return HttpCacheEntry(
+            url=url,
+            headers=meta.get('headers', {}),
+            body=body,
+            encoding=meta.get('encoding') or 'utf-8',
+            stored_at=meta.get('stored_at', 0.0),
+            conversion_key=meta.get('conversion_key'),
+            markdown=meta.get('markdown'),
+            title=meta.get('title'),
+            anchors=meta.get('anchors'),
+        )
+
+    def store(self, entry: HttpCacheEntry) -> None:
+        """Write an entry to disk atomically.
+
+        Args:
+            entry: Entry to store
+        """
+        if not self.enabled:
+            return
+        meta_path, body_path = self._paths(entry.url)
+        meta = {
+            'url': entry.url,
+            'headers': entry.headers,
+            'encoding': entry.encoding,
+            'stored_at': entry.stored_at,
+            'conversion_key': entry.conversion_key,
+            'markdown': entry.markdown,
+            'title': entry.title,
+            'anchors': entry.anchors,
+        }
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            _atomic_write(body_path, entry.body)
+            _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f'Could not write HTTP cache entry for {entry.url}: {e}')
+            return
+        self._stores_since_prune += 1
+        if self._stores_since_prune >= 50:
+            self._stores_since_prune = 0
+            self.prune()
+
+    def refresh(self, entry: HttpCacheEntry, headers: Any) -> HttpCacheEntry:
+        """Update a stored entry with the headers of a 304 response (RFC 9111 section 4.3.4).
+
+        Args:
+            entry: Entry that was revalidated
+            headers: Headers of the 304 response
+
+        Returns:
+            The updated entry
+        """
+        for name in STORED_HEADERS:
+            if name != 'content-type' and headers.get(name) is not None:
+                entry.headers[name] = headers[name]
+        entry.stored_at = time.time()
+        self.store(entry)
+        return entry
+
+    def prune(self) -> None:
+        """Delete the least recently stored entries until the cache fits its budget."""
+        files = []
+        total = 0
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.body'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            for stale in (path, path[: -len('.body')] + '.json'):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            total -= size
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write a file through a uniquely named temporary file and rename it into place."""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f'{os.path.basename(path)}.', suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def build_cache_entry(url: str, headers: Any, body: bytes, encoding: str) -> HttpCacheEntry:
+    """Create a cache entry from a downloaded response.
+
+    Args:
+        url: Canonical URL the response belongs to
+        headers: Response headers (case-insensitive mapping)
+        body: Complete response body
+        encoding: Character encoding of the body
+
+    Returns:
+        Entry holding the stored headers and raw body
+    """
+    return HttpCacheEntry(
+        url=url,
+        headers={name: headers[name] for name in STORED_HEADERS if name in headers},
+        body=body,
+        encoding=encoding,
+        stored_at=time.time(),
+    )
+
+
+# Process-wide persistent HTTP cache
+http_cache = HttpCache()
@@ -0,0 +1,616 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Sitemap catalog of documentation URLs for Adobe AEM Documentation MCP Server.
+
+The sitemaps of the documentation sites are parsed incrementally as they
+download (gzipped sitemaps and sitemap indexes included) into a SQLite
+catalog of URL, title and lastmod. Lookups run in memory: URL prefixes are
+resolved with a binary search over the sorted URLs, and queries are matched
+against the words of each URL by exact, prefix and one-edit fuzzy matching,
+weighted by how rare the words are.
+"""
+
+import bisect
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from aemlabs.aem_documentation_mcp_server.index_utils import STOP_WORDS, WORD, stem, tokenize
+from aemlabs.aem_documentation_mcp_server.models import CatalogEntry
+from array import array
+from collections import defaultdict
+from functools import lru_cache
+from loguru import logger
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from xml.etree import ElementTree
+
+
+# Sitemap catalog location and refresh interval
+CATALOG_ENABLED = os.getenv('MCP_CATALOG', 'true').lower() in ('1', 'true', 'yes')
+CATALOG_PATH = os.getenv(
+    'MCP_CATALOG_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'aem-documentation-mcp-server', 'catalog.db'),
+)
+CATALOG_MAX_AGE = int(os.getenv('MCP_CATALOG_MAX_AGE', str(7 * 24 * 3600)))
+
+# Sitemaps ingested into the catalog (comma-separated)
+CATALOG_SITEMAPS = [
+    sitemap.strip()
+    for sitemap in os.getenv(
+        'MCP_CATALOG_SITEMAPS',
+        'https://experienceleague.adobe.com/sitemap.xml,'
+        'https://developer.adobe.com/sitemap.xml,'
+        'https://sling.apache.org/sitemap.xml,'
+        'https://adapt.to/sitemap.xml',
+    ).split(',')
+    if sitemap.strip()
+]
+
+# Seconds before a sitemap that could not be read is tried again
+CATALOG_RETRY_AFTER = 3600
+
+# Limits on one sitemap crawl: index nesting, sitemap files and decompressed bytes per file
+SITEMAP_MAX_DEPTH = 3
+SITEMAP_MAX_FILES = 500
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+# URL words too common to identify a page
+URL_NOISE_WORDS = frozenset(['www', 'http', 'https', 'html', 'htm', 'com', 'org', 'io', 'en'])
+
+# Match weights of a query term against a catalog word
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.7
+FUZZY_MATCH = 0.6
+
+# Weight of words of the page name (the last path segment) over other URL words
+NAME_WEIGHT = 1.5
+
+# Schema of the catalog database
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    lastmod TEXT,
+    source TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_source ON entries (source);
+CREATE TABLE IF NOT EXISTS sources (
+    url TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    entries INTEGER NOT NULL
+);
+"""
+
+
+class SitemapEntry(NamedTuple):
+    """A ``<loc>`` of a sitemap with its ``<lastmod>``."""
+
+    url: str
+    lastmod: Optional[str]
+
+
+class SitemapParser:
+    """Incremental parser of a sitemap or sitemap index.
+
+    Feed it the raw response body chunk by chunk; gzipped sitemaps are
+    recognized by their magic number and decompressed on the fly. Page
+    entries are collected in ``urls`` and nested sitemaps in ``sitemaps``;
+    parsed elements are discarded, so memory stays proportional to the
+    entries rather than to the document.
+    """
+
+    def __init__(self, max_bytes: int = SITEMAP_MAX_BYTES):
+        """Initialize the parser.
+
+        Args:
+            max_bytes: Largest decompressed sitemap accepted
+        """
+        self.max_bytes = max_bytes
+        self.urls: List[SitemapEntry] = []
+        self.sitemaps: List[str] = []
+        self._parser = ElementTree.XMLPullParser(events=('start', 'end'))
+        self._root: Optional[ElementTree.Element] = None
+        self._decompressor: Optional['zlib._Decompress'] = None
+        self._started = False
+        self._size = 0
+
+    def feed(self, data: bytes) -> None:
+        """Parse the next chunk of the body.
+
+        Raises:
+            ValueError: If the sitemap is not well-formed XML or exceeds ``max_bytes``
+        """
+        if not self._started:
+            self._started = True
+            if data[:2] == b'\x1f\x8b':
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._decompressor is not None:
+            try:
+                data = self._decompressor.decompress(data, self.max_bytes - self._size + 1)
+            except zlib.error as e:
+                raise ValueError(f'invalid gzip data: {e}') from e
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            raise ValueError(f'sitemap exceeds {self.max_bytes} bytes')
+        try:
+            self._parser.feed(data)
+            self._collect()
+        except ElementTree.ParseError as e:
+            raise ValueError(f'invalid sitemap XML: {e}') from e
+
+    def close(self) -> None:
+        """Finish parsing once the whole body was fed.
+
+        Raises:
+            ValueError: If the sitemap is truncated or not well-formed XML
+        """
+        try:
+            self._parser.close()
+            self._collect()
+        except ElementTree.ParseError as e:
+            raise ValueError(f'invalid sitemap XML: {e}') from e
+
+    def _collect(self) -> None:
+        """Turn completed ``<url>`` and ``<sitemap>`` elements into entries."""
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                if self._root is None:
+                    self._root = element
+                continue
+            tag = _local_name(element.tag)
+            if tag not in ('url', 'sitemap'):
+                continue
+            fields = {_local_name(child.tag): (child.text or '').strip() for child in element}
+            loc = fields.get('loc')
+            if loc:
+                if tag == 'url':
+                    self.urls.append(SitemapEntry(loc, fields.get('lastmod') or None))
+                else:
+                    self.sitemaps.append(loc)
+            if self._root is not None:
+                self._root.clear()
+
+
+def _local_name(tag: str) -> str:
+    """Tag name without its XML namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def title_from_url(url: str) -> str:
+    """Readable title derived from the last meaningful segment of a URL's path.
+
+    Args:
+        url: Page URL
+
+    Returns:
+        Title such as 'Content Delivery' for ``.../content-delivery.html``
+    """
+    parsed = urlparse(url)
+    segments = [segment for segment in unquote(parsed.path).split('/') if segment]
+    while segments and re.sub(r'\.\w+$', '', segments[-1]).lower() in ('index', 'home'):
+        segments.pop()
+    if not segments:
+        return parsed.netloc
+    words = re.split(r'[-_+\s]+', re.sub(r'\.(html?|md|pdf)$', '', segments[-1], flags=re.I))
+    return ' '.join(word[:1].upper() + word[1:] for word in words if word)
+
+
+def url_key(url: str) -> str:
+    """URL without scheme and ``www.``, the form URL prefixes are matched against."""
+    key = re.sub(r'^[a-z][a-z0-9+.-]*://', '', url.strip(), flags=re.I)
+    return key[4:] if key.lower().startswith('www.') else key
+
+
+def url_terms(url: str) -> List[str]:
+    """Distinct stemmed words of a URL's host and path."""
+    parsed = urlparse(url)
+    words = WORD.findall(f'{parsed.netloc} {unquote(parsed.path)}')
+    return list(dict.fromkeys(term for term in map(_url_word_term, words) if term))
+
+
+def name_terms(url: str) -> List[str]:
+    """Distinct stemmed words of the page name, the segment ``title_from_url`` uses."""
+    words = WORD.findall(title_from_url(url))
+    return list(dict.fromkeys(term for term in map(_url_word_term, words) if term))
+
+
+@lru_cache(maxsize=65536)
+def _url_word_term(word: str) -> Optional[str]:
+    """Index term of a URL word, or None for stop and noise words; URLs repeat their words."""
+    word = word.lower()
+    if word in STOP_WORDS or word in URL_NOISE_WORDS:
+        return None
+    return stem(word)
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Check whether two words differ by at most one insertion, deletion, substitution or swap."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    prefix = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        prefix += 1
+    a, b = a[prefix:], b[prefix:]
+    if len(a) == len(b):
+        return a[1:] == b[1:] or (a[:2] == b[1::-1] and a[2:] == b[2:])
+    return a[1:] == b or b[1:] == a
+
+
+def _contains(ids: array, entry_id: int) -> bool:
+    """Whether a posting list, in entry ID order, contains an entry."""
+    index = bisect.bisect_left(ids, entry_id)
+    return index < len(ids) and ids[index] == entry_id
+
+
+class Catalog:
+    """Persistent sitemap catalog with in-memory prefix and word lookups.
+
+    Entries are stored per source sitemap, so a refresh replaces exactly the
+    entries that sitemap produced. The in-memory structures are rebuilt from
+    the database on first use and after every refresh. All methods are
+    blocking and thread-safe; call them from a worker thread.
+    """
+
+    def __init__(self, path: str = CATALOG_PATH, enabled: bool = CATALOG_ENABLED):
+        """Initialize the catalog; the database is opened on first use.
+
+        Args:
+            path: SQLite database file
+            enabled: Whether sitemaps are ingested and looked up at all
+        """
+        self.path = path
+        self.enabled = enabled
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connected_path: Optional[str] = None
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._urls: List[str] = []
+        self._titles: List[str] = []
+        self._lastmods: List[Optional[str]] = []
+        self._ids: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._key_ids = array('I')
+        self._postings: Dict[str, array] = {}
+        self._name_postings: Dict[str, array] = {}
+        self._vocabulary: List[str] = []
+        self._by_length: Dict[int, List[str]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating it and its schema if needed."""
+        if self._connection is None or self._connected_path != self.path:
+            self.close_connection()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+            self._connection, self._connected_path = connection, self.path
+            self._loaded = False
+        return self._connection
+
+    def stale_sources(self, sources: Iterable[str], max_age: int = CATALOG_MAX_AGE) -> List[str]:
+        """Sources never read, read more than ``max_age`` seconds ago, or failed a while ago.
+
+        Args:
+            sources: Sitemap URLs the catalog should cover
+            max_age: Seconds a successfully read sitemap stays fresh
+
+        Returns:
+            Sources to (re-)read, in the given order
+        """
+        with self._lock:
+            connection = self._connect()
+            rows = {
+                url: (fetched_at, entries)
+                for url, fetched_at, entries in connection.execute(
+                    'SELECT url, fetched_at, entries FROM sources'
+                )
+            }
+        now = time.time()
+        stale = []
+        for source in sources:
+            fetched_at, entries = rows.get(source, (0.0, 0))
+            if now - fetched_at > (max_age if entries else CATALOG_RETRY_AFTER):
+                stale.append(source)
+        return stale
+
+    def replace_source(self, source: str, entries: Iterable[SitemapEntry]) -> int:
+        """Replace the entries of a source sitemap and rebuild the lookups.
+
+        Pages no longer listed are removed and listed pages keep their stored
+        title, so titles read from the pages survive the refresh. An empty
+        crawl only records the attempt, keeping the previous entries.
+
+        Args:
+            source: Sitemap URL the entries were read from
+            entries: Page entries of the sitemap and its nested sitemaps
+
+        Returns:
+            Number of entries stored for the source
+        """
+        rows = {
+            entry.url: (entry.url, title_from_url(entry.url), entry.lastmod, source)
+            for entry in entries
+        }
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                if rows:
+                    gone = [
+                        (url,)
+                        for (url,) in connection.execute(
+                            'SELECT url FROM entries WHERE source = ?', (source,)
+                        )
+                        if url not in rows
+                    ]
+                    connection.executemany('DELETE FROM entries WHERE url = ?', gone)
+                    connection.executemany(
+                        'INSERT INTO entries (url, title, lastmod, source) VALUES (?, ?, ?, ?) '
+                        'ON CONFLICT(url) DO UPDATE SET '
+                        'lastmod = excluded.lastmod, source = excluded.source',
+                        rows.values(),
+                    )
+                connection.execute(
+                    'INSERT OR REPLACE INTO sources (url, fetched_at, entries) VALUES (?, ?, ?)',
+                    (source, time.time(), len(rows)),
+                )
+            self._loaded = False
+        logger.info(f'Catalog has {len(rows)} entries from {source}')
+        return len(rows)
+
+    def set_title(self, url: str, title: Optional[str]) -> None:
+        """Replace the derived title of a cataloged page with the title read from the page.
+
+        Pages are read whether or not the catalog is used, so nothing is written
+        unless the catalog already exists and lists the page with another title.
+        """
+        if not self.enabled or not title or not os.path.exists(self.path):
+            return
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute('SELECT title FROM entries WHERE url = ?', (url,)).fetchone()
+            if row is None or row[0] == title:
+                return
+            with connection:
+                connection.execute('UPDATE entries SET title = ? WHERE url = ?', (title, url))
+            entry_id = self._ids.get(url)
+            if entry_id is not None:
+                self._titles[entry_id] = title
+
+    def _load(self) -> None:
+        """Build the in-memory lookups from the database."""
+        connection = self._connect()
+        if self._loaded:
+            return
+        # Entry IDs follow URL length, so lower IDs are the more general pages
+        rows = connection.execute(
+            'SELECT url, title, lastmod FROM entries ORDER BY length(url), url'
+        ).fetchall()
+        postings: Dict[str, List[int]] = defaultdict(list)
+        name_postings: Dict[str, List[int]] = defaultdict(list)
+        for entry_id, (url, _, _) in enumerate(rows):
+            for term in url_terms(url):
+                postings[term].append(entry_id)
+            for term in name_terms(url):
+                name_postings[term].append(entry_id)
+
+        self._urls = [url for url, _, _ in rows]
+        self._titles = [title for _, title, _ in rows]
+        self._lastmods = [lastmod for _, _, lastmod in rows]
+        self._ids = {url: entry_id for entry_id, url in enumerate(self._urls)}
+        keyed = sorted((url_key(url), entry_id) for entry_id, url in enumerate(self._urls))
+        self._keys = [key for key, _ in keyed]
+        self._key_ids = array('I', (entry_id for _, entry_id in keyed))
+        self._key_ranks = array('I', [0]) * len(keyed)
+        for rank, entry_id in enumerate(self._key_ids):
+            self._key_ranks[entry_id] = rank
+        self._postings = {term: array('I', ids) for term, ids in postings.items()}
+        self._name_postings = {term: array('I', ids) for term, ids in name_postings.items()}
+        self._vocabulary = sorted(self._postings)
+        by_length: Dict[int, List[str]] = defaultdict(list)
+        for word in self._vocabulary:
+            by_length[len(word)].append(word)
+        self._by_length = dict(by_length)
+        self._loaded = True
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Positions in the sorted URL keys of the URLs starting with a prefix."""
+        key = url_key(prefix)
+        start = bisect.bisect_left(self._keys, key)
+        return start, bisect.bisect_left(self._keys, key + '\U0010ffff', start)
+
+    def _matching_words(self, term: str) -> List[Tuple[str, float]]:
+        """Catalog words matching a query term exactly, by prefix, or within one edit."""
+        matches = []
+        if term in self._postings:
+            matches.append((term, EXACT_MATCH))
+        if len(term) >= 3:
+            start = bisect.bisect_right(self._vocabulary, term)
+            for word in self._vocabulary[start : start + 50]:
+                if not word.startswith(term):
+                    break
+                matches.append((word, PREFIX_MATCH))
+        if not matches and len(term) >= 4:
+            for length in (len(term) - 1, len(term), len(term) + 1):
+                matches.extend(
+                    (word, FUZZY_MATCH)
+                    for word in self._by_length.get(length, ())
+                    if within_one_edit(term, word)
+                )
+        return matches
+
+    def _term_matches(self, term: str) -> List[Tuple[float, array, Optional[array]]]:
+        """Score, postings and name postings of each catalog word matching a query term."""
+        total = len(self._urls)
+        return [
+            (
+                weight * math.log(1 + total / len(self._postings[word])),
+                self._postings[word],
+                self._name_postings.get(word),
+            )
+            for word, weight in self._matching_words(term)
+        ]
+
+    def _term_score(
+        self, matches: List[Tuple[float, array, Optional[array]]], entry_id: int
+    ) -> float:
+        """Score of an entry for one query term: that of its best matching word, or 0."""
+        best = 0.0
+        for score, ids, names in matches:
+            if score * NAME_WEIGHT > best and names is not None and _contains(names, entry_id):
+                best = score * NAME_WEIGHT
+            elif score > best and _contains(ids, entry_id):
+                best = score
+        return best
+
+    def _best_entries(
+        self,
+        matches: List[Tuple[float, array, Optional[array]]],
+        limit: int,
+        key_range: Optional[Tuple[int, int]],
+    ) -> List[Tuple[float, int]]:
+        """Best-scoring entries for one query term, walking its postings best score first.
+
+        Postings are in entry ID order and every entry of a posting list has the same
+        score, so the walk stops as soon as ``limit`` entries are found.
+        """
+        levels = [(score, ids) for score, ids, _ in matches]
+        levels.extend((score * NAME_WEIGHT, names) for score, _, names in matches if names)
+        levels.sort(key=lambda level: -level[0])
+        seen, best = set(), []
+        for score, ids in levels:
+            for entry_id in ids:
+                if entry_id in seen:
+                    continue
+                if key_range and not key_range[0] <= self._key_ranks[entry_id] < key_range[1]:
+                    continue
+                seen.add(entry_id)
+                best.append((score, entry_id))
+                if len(best) >= limit:
+                    return best
+        return best
+
+    def lookup(
+        self, query: Optional[str] = None, url_prefix: Optional[str] = None, max_results: int = 10
+    ) -> List[CatalogEntry]:
+        """Find cataloged pages by words of their URL and/or a URL prefix.
+
+        Args:
+            query: Words describing the page, e.g. 'sling models injector'
+            url_prefix: Only return pages whose URL starts with this prefix
+            max_results: Maximum number of entries returned
+
+        Returns:
+            Matching entries, best first; in URL order when only a prefix is given
+        """
+        if not self.enabled:
+            return []
+        terms = list(dict.fromkeys(term for _, _, term in tokenize(query or '')))
+        with self._lock:
+            self._load()
+            key_range = self._prefix_range(url_prefix) if url_prefix else None
+            if not terms:
+                start, end = key_range or (0, len(self._keys))
+                ids = self._key_ids[start : min(end, start + max_results)]
+                return [self._entry(entry_id, None) for entry_id in ids]
+
+            term_matches = [matches for matches in map(self._term_matches, terms) if matches]
+            if not term_matches:
+                return []
+            if len(term_matches) == 1:
+                scored = self._best_entries(term_matches[0], max_results, key_range)
+            else:
+                # Entries matching every term, found from the rarest term's postings
+                term_matches.sort(key=lambda matches: sum(len(ids) for _, ids, _ in matches))
+                candidates = set().union(*(ids for _, ids, _ in term_matches[0]))
+                if key_range and key_range[1] - key_range[0] < len(candidates):
+                    candidates = set(self._key_ids[key_range[0] : key_range[1]])
+                for matches in term_matches[1:]:
+                    if len(candidates) > 64:
+                        candidates.intersection_update(
+                            set().union(*(ids for _, ids, _ in matches))
+                        )
+                    else:
+                        candidates = {
+                            entry_id
+                            for entry_id in candidates
+                            if any(_contains(ids, entry_id) for _, ids, _ in matches)
+                        }
+                if key_range:
+                    candidates = {
+                        entry_id
+                        for entry_id in candidates
+                        if key_range[0] <= self._key_ranks[entry_id] < key_range[1]
+                    }
+                if not candidates:
+                    # No entry matches them all: rank the best entries of each term
+                    candidates = {
+                        entry_id
+                        for matches in term_matches
+                        for _, entry_id in self._best_entries(matches, max_results * 5, key_range)
+                    }
+                scored = [
+                    (
+                        sum(self._term_score(matches, entry_id) for matches in term_matches),
+                        entry_id,
+                    )
+                    for entry_id in candidates
+                ]
+
+            # Lower entry IDs are shorter URLs, which win ties as the more general pages
+            best = heapq.nsmallest(max_results, scored, key=lambda pair: (-pair[0], pair[1]))
+            return [self._entry(entry_id, score) for score, entry_id in best]
+
+    def _entry(self, entry_id: int, score: Optional[float]) -> CatalogEntry:
+        """Catalog entry of an entry ID."""
+        return CatalogEntry(
+            url=self._urls[entry_id],
+            title=self._titles[entry_id],
+            lastmod=self._lastmods[entry_id],
+            score=None if score is None else round(score, 3),
+        )
+
+    def __len__(self) -> int:
+        """Number of cataloged pages."""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            self._load()
+            return len(self._urls)
+
+    def clear(self) -> None:
+        """Remove every entry and source."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute('DELETE FROM entries')
+                connection.execute('DELETE FROM sources')
+            self._loaded = False
+
+    def close_connection(self) -> None:
+        """Close the database connection; it is reopened on next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection, self._connected_path = None, None
+
+
+# Process-wide sitemap catalog
+catalog = Catalog()
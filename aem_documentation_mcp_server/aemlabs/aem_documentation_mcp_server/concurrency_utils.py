@@ -0,0 +1,311 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Concurrency utilities for Adobe AEM Documentation MCP Server."""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from loguru import logger
+from multiprocessing.pool import Pool
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+# Executor running CPU-bound page conversion: 'auto', 'thread', 'process' or 'inline'
+CONVERSION_EXECUTOR = os.getenv('MCP_CONVERSION_EXECUTOR', 'auto').lower()
+CONVERSION_WORKERS = int(os.getenv('MCP_CONVERSION_WORKERS', str(min(8, os.cpu_count() or 1))))
+# Conversions allowed to run or wait for a worker before callers are held back
+CONVERSION_QUEUE_SIZE = int(os.getenv('MCP_CONVERSION_QUEUE_SIZE', str(CONVERSION_WORKERS * 4)))
+
+
+class _Flight:
+    """An in-flight call shared by every waiter for the same key."""
+
+    def __init__(self, task: 'asyncio.Task[Any]'):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls for the same key into one shared task.
+
+    The first caller for a key starts the work; callers arriving while it is
+    in flight await the same task and receive its result or exception. A waiter
+    being cancelled never cancels the shared task for the others; the task is
+    only cancelled once every waiter has gone away.
+    """
+
+    def __init__(self):
+        """Initialize an empty flight group."""
+        self._flights: Dict[str, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key`` unless an identical call is already in flight.
+
+        Args:
+            key: Identity of the call (e.g. canonical URL)
+            fn: Coroutine factory performing the work
+
+        Returns:
+            Result of the shared call
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            self.calls += 1
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+            logger.debug(f'Joining in-flight call for {key}')
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                logger.debug(f'All waiters left, cancelling in-flight call for {key}')
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        """Remove a finished or abandoned flight so new callers start a fresh call."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def in_flight(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._flights)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get coalescing statistics.
+
+        Returns:
+            Dictionary with started calls, coalesced waiters and calls in flight
+        """
+        return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._flights)}
+
+
+def is_free_threaded() -> bool:
+    """Check whether the interpreter runs without the global interpreter lock."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def resolve_executor_mode(mode: str) -> str:
+    """Resolve the configured executor mode.
+
+    'auto' selects threads on free-threaded builds, where they run conversions
+    in parallel, and processes otherwise.
+
+    Args:
+        mode: Configured mode ('auto', 'thread', 'process' or 'inline')
+
+    Returns:
+        Effective mode
+    """
+    if mode == 'auto':
+        return 'thread' if is_free_threaded() else 'process'
+    if mode not in ('thread', 'process', 'inline'):
+        logger.warning(f'Unknown conversion executor {mode!r}, using threads')
+        return 'thread'
+    return mode
+
+
+class ConversionExecutor:
+    """Run CPU-bound work off the event loop with a bounded queue.
+
+    At most ``queue_size`` calls are submitted at once; further callers wait
+    for a slot, so bursts of large pages cannot pile up unbounded work. The
+    pool is created on first use and the mode 'inline' runs calls directly on
+    the event loop.
+    """
+
+    def __init__(
+        self,
+        mode: str = CONVERSION_EXECUTOR,
+        workers: int = CONVERSION_WORKERS,
+        queue_size: int = CONVERSION_QUEUE_SIZE,
+    ):
+        """Initialize the executor without starting workers.
+
+        Args:
+            mode: 'auto', 'thread', 'process' or 'inline'
+            workers: Number of worker threads or processes
+            queue_size: Maximum calls submitted or waiting at once
+        """
+        self.mode = resolve_executor_mode(mode)
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.submitted = 0
+        self.waited = 0
+
+    def _check_loop(self) -> asyncio.Semaphore:
+        """Get the queue slots, recreating them if the event loop has changed."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.queue_size)
+            self._loop = loop
+        return self._slots
+
+    def _get_executor(self) -> Executor:
+        """Get the worker pool, creating it on first use."""
+        if self._executor is None:
+            if self.mode == 'process':
+                # Spawned workers do not inherit the server's threads or open sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='conversion'
+                )
+            logger.debug(f'Started {self.mode} conversion pool with {self.workers} workers')
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the worker pool.
+
+        In process mode ``fn`` and its arguments must be picklable (module-level
+        functions and plain data).
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments of the call
+
+        Returns:
+            Result of the call
+        """
+        if self.mode == 'inline':
+            return fn(*args)
+
+        slots = self._check_loop()
+        if slots.locked():
+            self.waited += 1
+        async with slots:
+            self.submitted += 1
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); start a fresh pool and retry once
+                logger.warning('Conversion worker pool broke, restarting it')
+                self.shutdown(wait=False)
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics.
+
+        Returns:
+            Dictionary with mode, worker count, queue size, submitted calls and
+            calls that had to wait for a queue slot
+        """
+        return {
+            'mode': self.mode,
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'submitted': self.submitted,
+            'waited': self.waited,
+        }
+
+
+class TimeLimitedWorker:
+    """Run calls in a worker process that is stopped when a call runs too long.
+
+    A thread cannot be interrupted, so a call that never returns (such as a
+    regular expression backtracking catastrophically) would keep a CPU busy
+    long after its caller gave up. Calls run one at a time in a spawned
+    process instead, which is terminated when a call exceeds the time limit
+    and started again on next use.
+    """
+
+    def __init__(self, timeout: float):
+        """Initialize the worker without starting its process.
+
+        Args:
+            timeout: Seconds a call may run before the process is terminated
+        """
+        self.timeout = timeout
+        self._pool: Optional[Pool] = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.timeouts = 0
+
+    def call(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the worker process, blocking until it returns.
+
+        ``fn`` and its arguments must be picklable (module-level functions and
+        plain data). Calls wait for the one before them to finish.
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments of the call
+
+        Returns:
+            Result of the call
+
+        Raises:
+            TimeoutError: If the call did not return within the time limit
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = multiprocessing.get_context('spawn').Pool(processes=1)
+            self.calls += 1
+            result = self._pool.apply_async(fn, args)
+            try:
+                return result.get(self.timeout)
+            except multiprocessing.TimeoutError:
+                self.timeouts += 1
+                logger.warning(f'Worker call exceeded {self.timeout} s, terminating the worker')
+                self._stop()
+                raise TimeoutError(f'did not finish within {self.timeout:g} seconds') from None
+
+    def _stop(self) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    def shutdown(self) -> None:
+        """Terminate the worker process; it is started again on next use."""
+        with self._lock:
+            self._stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker statistics.
+
+        Returns:
+            Dictionary with the time limit, calls and calls that timed out
+        """
+        return {'timeout': self.timeout, 'calls': self.calls, 'timeouts': self.timeouts}
+
+
+# Process-wide executor for HTML parsing and markdown conversion
+conversion_executor = ConversionExecutor()
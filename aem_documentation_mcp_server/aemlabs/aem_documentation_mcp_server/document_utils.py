@@ -0,0 +1,782 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Parsed HTML documents for Adobe AEM Documentation MCP Server."""
+
+import markdownify
+import os
+import re
+import soupsieve
+import threading
+from aemlabs.aem_documentation_mcp_server.table_utils import TableConverter, collapse_newlines
+from bs4 import BeautifulSoup, Comment, Doctype, NavigableString, PageElement, Tag
+from bs4.builder import builder_registry
+from dataclasses import dataclass, field
+from functools import lru_cache
+from loguru import logger
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import urlparse
+
+
+# HTML parser backends: configured name -> BeautifulSoup tree builder.
+# 'lxml' is the fast C parser; 'html.parser' is the pure-Python fallback. They
+# produce the same markdown for well-formed pages; on malformed markup lxml
+# applies the HTML implied end tag rules (e.g. an unclosed <li> or <p> ends at
+# the next sibling) where html.parser nests the elements instead.
+PARSER_BACKENDS = {
+    'lxml': 'lxml',
+    'html.parser': 'html.parser',
+}
+FALLBACK_PARSER = 'html.parser'
+HTML_PARSER = os.getenv('MCP_HTML_PARSER', 'lxml').lower()
+
+
+# Revision of the extraction rules; bump it whenever they change the markdown
+# or the heading anchors produced for a page so conversions persisted in the
+# HTTP cache are redone
+EXTRACTION_REVISION = 5
+
+# Removal rules are simple tag, id or class selectors so they can be hashed
+SIMPLE_SELECTOR = re.compile(r'^[#.]?[A-Za-z_][\w-]*$')
+
+# Generic content container selectors, tried in order for hosts without a
+# profile and when a profile's own selectors no longer match
+CONTENT_SELECTORS = [
+    # Developer.adobe.com specific (Gatsby-based)
+    '#___gatsby',
+    '#gatsby-focus-wrapper',
+    'main.css-7wiue4',
+    # Adobe Experience League specific
+    '.article-content',
+    '.doc-content',
+    '.documentation-content',
+    '.page-content',
+    '.sp-wrapper',
+    '.content-container',
+    '#article-content-body',
+    # Adobe Experience League search results
+    '.search-results',
+    '.search-results-list',
+    '.search-result-item',
+    'dexter-SearchResults',
+    '.coveo-search-section',
+    '.coveo-result-list',
+    # GitHub specific
+    'article.markdown-body',
+    '.repository-content',
+    '#readme',
+    '.Box-body',
+    # GitHub Pages (Jekyll, Hugo, etc.)
+    '.post-content',
+    '.content',
+    'article',
+    # Apache Sling specific
+    '#content',
+    # adaptTo() specific
+    '.main-content',
+    '.content-wrapper',
+    '.schedule-content',
+    '.conference-content',
+    # Common selectors
+    'main',
+    '#main-content',
+    "div[role='main']",
+]
+
+# Navigation and UI elements removed from the main content on every site
+COMMON_REMOVE_SELECTORS = [
+    'noscript',
+    'script',
+    'style',
+    'nav',
+    'header',
+    'footer',
+    'aside',
+    '.navigation',
+    '.breadcrumb',
+    '.breadcrumbs',
+    '.cookie-banner',
+    '.cookie-notice',
+    '.cookie-consent',
+    '.feedback-widget',
+    '.feedback-container',
+    '.language-selector',
+    '.lang-selector',
+    '.page-nav',
+    '.side-nav',
+    '.sidebar',
+    '.toc',
+    '.table-of-contents',
+    '.prev-next',
+    '.pagination',
+    # Social and sharing
+    '.social-share',
+    '.share-buttons',
+    # Advertising and tracking
+    '.advertisement',
+    '.ad-container',
+    '.tracking',
+]
+
+# Site-specific navigation and UI elements, removed by the generic profile
+ADOBE_REMOVE_SELECTORS = [
+    '.adobe-header',
+    '.adobe-footer',
+    '.feds-header',
+    '.feds-footer',
+    '.feds-navList',
+    '.spectrum-Accordion',
+    '.mini-toc-container',
+]
+GITHUB_REMOVE_SELECTORS = ['.Box-header', '.pagehead', '.reponav', '.file-navigation']
+SLING_REMOVE_SELECTORS = ['#navigation', '.nav']
+ADAPTTO_REMOVE_SELECTORS = ['.site-header', '.site-footer']
+
+NAV_SELECTORS = (
+    COMMON_REMOVE_SELECTORS
+    + ADOBE_REMOVE_SELECTORS
+    + GITHUB_REMOVE_SELECTORS
+    + SLING_REMOVE_SELECTORS
+    + ADAPTTO_REMOVE_SELECTORS
+)
+
+
+@dataclass(frozen=True)
+class PruneRules:
+    """Removal rules as hash sets of tag names, ids and class tokens.
+
+    Matching an element is a few set lookups, so a whole subtree is pruned in a
+    single traversal however many rules there are.
+    """
+
+    tags: FrozenSet[str] = frozenset()
+    ids: FrozenSet[str] = frozenset()
+    classes: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_selectors(cls, selectors: Sequence[str]) -> 'PruneRules':
+        """Build rules from simple selectors ('tag', '#id' or '.class').
+
+        Args:
+            selectors: Simple CSS selectors
+
+        Returns:
+            Rules matching any of the selectors
+
+        Raises:
+            ValueError: If a selector is not a simple tag, id or class selector
+        """
+        tags, ids, classes = set(), set(), set()
+        for selector in selectors:
+            if not SIMPLE_SELECTOR.match(selector):
+                raise ValueError(f'Unsupported removal selector: {selector!r}')
+            if selector.startswith('#'):
+                ids.add(selector[1:])
+            elif selector.startswith('.'):
+                classes.add(selector[1:])
+            else:
+                tags.add(selector.lower())
+        return cls(frozenset(tags), frozenset(ids), frozenset(classes))
+
+    def matches(self, element: Tag) -> bool:
+        """Check whether an element is removed by the rules."""
+        return self.matches_tag(element.name, element.attrs)
+
+    def matches_tag(self, name: str, attrs: Dict[str, Any]) -> bool:
+        """Check whether a tag name and attributes are removed by the rules."""
+        if name in self.tags:
+            return True
+        if attrs.get('id') in self.ids:
+            return True
+        element_classes = attrs.get('class')
+        if not element_classes:
+            return False
+        if isinstance(element_classes, str):
+            element_classes = element_classes.split()
+        return not self.classes.isdisjoint(element_classes)
+
+
+def prune_tree(root: Union[Tag, BeautifulSoup], rules: PruneRules) -> int:
+    """Remove every descendant matched by the rules in one depth-first traversal.
+
+    Matching subtrees are dropped without being visited. The root itself is
+    never removed.
+
+    Args:
+        root: Element whose descendants are pruned
+        rules: Removal rules
+
+    Returns:
+        Number of elements visited
+    """
+    visited = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for child in list(node.contents):
+            if not isinstance(child, Tag):
+                continue
+            visited += 1
+            if rules.matches(child):
+                child.decompose()
+            elif child.contents:
+                stack.append(child)
+    return visited
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """Compiled content extraction rules of one documentation site.
+
+    Attributes:
+        name: Profile name used in statistics
+        hosts: Hostnames served by the profile; an entry starting with '.' matches subdomains
+        content: Content container selectors, tried in order
+        remove: Rules of elements removed from the content in one traversal
+    """
+
+    name: str
+    hosts: Tuple[str, ...]
+    content: Tuple[Any, ...] = field(repr=False)
+    remove: PruneRules = field(repr=False)
+
+    @classmethod
+    def build(
+        cls, name: str, hosts: Sequence[str], content: Sequence[str], remove: Sequence[str]
+    ) -> 'ExtractionProfile':
+        """Build a profile, compiling its selectors once.
+
+        Args:
+            name: Profile name
+            hosts: Hostnames served by the profile
+            content: Content container selectors, tried in order
+            remove: Selectors of elements to remove from the content
+
+        Returns:
+            Compiled profile
+        """
+        return cls(
+            name=name,
+            hosts=tuple(hosts),
+            content=tuple(soupsieve.compile(selector) for selector in content),
+            remove=PruneRules.from_selectors(remove),
+        )
+
+    def find_content(self, soup: BeautifulSoup) -> Optional[Tag]:
+        """Find the first content container matched by the profile."""
+        for pattern in self.content:
+            content = pattern.select_one(soup)
+            if content:
+                return content
+        return None
+
+    def prune(self, content: Union[Tag, BeautifulSoup]) -> int:
+        """Remove navigation and UI elements from the content in one traversal.
+
+        Returns:
+            Number of elements visited
+        """
+        return prune_tree(content, self.remove)
+
+
+# Fallback profile: the full generic cascade
+GENERIC_PROFILE = ExtractionProfile.build('generic', (), CONTENT_SELECTORS, NAV_SELECTORS)
+
+# Profiles dispatched by hostname, so each page only evaluates its own rules
+EXTRACTION_PROFILES = [
+    ExtractionProfile.build(
+        'experience-league',
+        ('experienceleague.adobe.com', 'docs.adobe.com'),
+        [
+            '.article-content',
+            '.doc-content',
+            '.documentation-content',
+            '.page-content',
+            '.sp-wrapper',
+            '.content-container',
+            '#article-content-body',
+            '.search-results',
+            '.search-results-list',
+            '.search-result-item',
+            'dexter-SearchResults',
+            '.coveo-search-section',
+            '.coveo-result-list',
+        ],
+        COMMON_REMOVE_SELECTORS + ADOBE_REMOVE_SELECTORS,
+    ),
+    ExtractionProfile.build(
+        'developer-adobe-gatsby',
+        ('developer.adobe.com',),
+        ['#___gatsby', '#gatsby-focus-wrapper', 'main.css-7wiue4', 'main'],
+        COMMON_REMOVE_SELECTORS + ADOBE_REMOVE_SELECTORS,
+    ),
+    ExtractionProfile.build(
+        'github',
+        ('github.com',),
+        ['article.markdown-body', '.repository-content', '#readme', '.Box-body'],
+        COMMON_REMOVE_SELECTORS + GITHUB_REMOVE_SELECTORS,
+    ),
+    ExtractionProfile.build(
+        'github-pages',
+        ('.github.io',),
+        [
+            '.page-content',
+            'article.markdown-body',
+            '.post-content',
+            '.content',
+            'article',
+            '#content',
+            '.main-content',
+            'main',
+            '#main-content',
+            "div[role='main']",
+        ],
+        COMMON_REMOVE_SELECTORS + ADAPTTO_REMOVE_SELECTORS,
+    ),
+    ExtractionProfile.build(
+        'sling',
+        ('sling.apache.org',),
+        ['.content', 'article', '#content', 'main'],
+        COMMON_REMOVE_SELECTORS + SLING_REMOVE_SELECTORS,
+    ),
+    ExtractionProfile.build(
+        'adaptto',
+        ('adapt.to',),
+        [
+            '.content',
+            'article',
+            '#content',
+            '.main-content',
+            '.content-wrapper',
+            '.schedule-content',
+            '.conference-content',
+            'main',
+        ],
+        COMMON_REMOVE_SELECTORS + ADAPTTO_REMOVE_SELECTORS,
+    ),
+]
+
+
+def profile_for_url(url: Optional[str]) -> ExtractionProfile:
+    """Get the extraction profile of a page's host.
+
+    Args:
+        url: URL of the page, or None if unknown
+
+    Returns:
+        Matching profile, or the generic one
+    """
+    host = (urlparse(url).hostname or '') if url else ''
+    for profile in EXTRACTION_PROFILES:
+        for pattern in profile.hosts:
+            if host == pattern or (pattern.startswith('.') and host.endswith(pattern)):
+                return profile
+    return GENERIC_PROFILE
+
+
+class ProfileStats:
+    """Counts of pages extracted per profile and of profiles falling through.
+
+    A profile falls through when none of its content selectors match, which
+    usually means the site changed its markup and the profile needs updating.
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, profile: str, matched: bool) -> None:
+        """Record the outcome of one extraction.
+
+        Args:
+            profile: Name of the profile used
+            matched: Whether one of the profile's own selectors matched
+        """
+        stats = self._stats.setdefault(profile, {'pages': 0, 'hits': 0, 'fallthrough': 0})
+        stats['pages'] += 1
+        if matched:
+            stats['hits'] += 1
+            return
+        stats['fallthrough'] += 1
+        if profile != GENERIC_PROFILE.name and stats['fallthrough'] == 1:
+            logger.warning(
+                f'Extraction profile {profile!r} matched no content container; '
+                'the site layout may have changed'
+            )
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-profile counters and hit rates.
+
+        Returns:
+            Dictionary keyed by profile name with pages, hits, fall-throughs and hit rate
+        """
+        return {
+            name: {**stats, 'hit_rate': stats['hits'] / stats['pages']}
+            for name, stats in self._stats.items()
+        }
+
+
+# Process-wide extraction profile statistics
+profile_stats = ProfileStats()
+
+
+# Tags stripped completely by markdownify
+TAGS_TO_STRIP = [
+    'script',
+    'style',
+    'noscript',
+    'meta',
+    'link',
+    'svg',
+    'iframe',
+]
+
+# Markdown rendering options shared by every converter
+MARKDOWN_OPTIONS = {
+    'heading_style': markdownify.ATX,
+    'autolinks': True,
+    'default_title': True,
+    'escape_asterisks': False,
+    'escape_underscores': False,
+    'newline_style': 'SPACES',
+    'strip': TAGS_TO_STRIP,
+}
+
+# Elements converted as sections of their own by lazy conversion, besides the
+# runs of content starting at a heading
+SECTION_TAGS = frozenset(['section', 'article'])
+
+# Sole children of the content root descended into to find its sections; their
+# conversion only surrounds the content with blank lines
+WRAPPER_TAGS = frozenset(['div', 'section', 'article', 'main', 'body'])
+
+# Heading elements, the targets of the element ids recorded for deep links
+HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+
+# Meta tags carrying the last modification date, by attribute and value
+LAST_MODIFIED_META = [
+    ('property', 'article:modified_time'),
+    ('name', 'lastmod'),
+    ('name', 'last-modified'),
+    ('name', 'last-update'),
+    ('itemprop', 'dateModified'),
+]
+
+
+@lru_cache(maxsize=None)
+def resolve_parser(name: str = HTML_PARSER) -> str:
+    """Resolve a configured parser backend, falling back to html.parser.
+
+    Args:
+        name: Backend name ('lxml' or 'html.parser')
+
+    Returns:
+        Name of a usable backend
+    """
+    if name not in PARSER_BACKENDS:
+        logger.warning(f'Unknown HTML parser {name!r}, using {FALLBACK_PARSER}')
+        return FALLBACK_PARSER
+    if builder_registry.lookup(PARSER_BACKENDS[name]) is None:
+        logger.warning(f'HTML parser {name!r} is not installed, using {FALLBACK_PARSER}')
+        return FALLBACK_PARSER
+    return name
+
+
+@dataclass
+class PageMetadata:
+    """Metadata declared in the head of a page."""
+
+    og_title: Optional[str] = None
+    description: Optional[str] = None
+    canonical_url: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ParsedDocument:
+    """An HTML page parsed once, from which title, metadata and markdown are derived.
+
+    The title and metadata are read when the document is created. The main
+    content is located, pruned and converted on first access; pruning modifies
+    the parse tree, so everything else must be read before it.
+
+    The main content is converted section by section, a section starting at
+    each top-level heading or <section>/<article> element, and converted
+    sections are kept: ``markdown_prefix`` converts only as many sections as
+    the requested characters need, and later calls continue where the previous
+    one stopped.
+    """
+
+    def __init__(self, html: str, parser: Optional[str] = None, url: Optional[str] = None):
+        """Parse a page.
+
+        Args:
+            html: Raw HTML content
+            parser: Parser backend, defaults to the configured ``MCP_HTML_PARSER``
+            url: URL of the page, used to select its extraction profile
+        """
+        self.html = html
+        self.profile = profile_for_url(url)
+        self.profile_matched = False
+        self.parser = resolve_parser(parser or HTML_PARSER)
+        self.soup = BeautifulSoup(html, PARSER_BACKENDS[self.parser])
+        self.title = self._find_title()
+        self.metadata = self._find_metadata()
+        self._main_content: Optional[Union[Tag, BeautifulSoup]] = None
+        self._markdown: Optional[str] = None
+        self._converter: Optional[TableConverter] = None
+        self._sections: Optional[List[List[PageElement]]] = None
+        self._section_tags: Set[str] = set()
+        self._converted_sections = 0
+        self._strings: List[str] = ['']
+        self._heading_ids: Optional[List[Tuple[str, List[str]]]] = None
+        self._lock = threading.Lock()
+
+    def _find_title(self) -> Optional[str]:
+        """Find the title from the <title> tag, the first h1 or og:title."""
+        soup = self.soup
+        if soup.title and soup.title.string:
+            return soup.title.string.strip()
+
+        h1 = soup.find('h1')
+        if h1:
+            return h1.get_text().strip()
+
+        og_title = soup.find('meta', property='og:title')
+        if og_title and og_title.get('content'):
+            return og_title.get('content').strip()
+
+        return None
+
+    def _meta_content(self, attribute: str, value: str) -> Optional[str]:
+        """Get the content of the first meta tag with the given attribute value."""
+        tag = self.soup.find('meta', attrs={attribute: value})
+        content = tag.get('content') if tag else None
+        return content.strip() if isinstance(content, str) and content.strip() else None
+
+    def _find_metadata(self) -> PageMetadata:
+        """Read Open Graph, description, canonical link and modification date."""
+        canonical = self.soup.find('link', rel='canonical')
+        href = canonical.get('href') if canonical else None
+        last_modified = None
+        for attribute, value in LAST_MODIFIED_META:
+            last_modified = self._meta_content(attribute, value)
+            if last_modified:
+                break
+        return PageMetadata(
+            og_title=self._meta_content('property', 'og:title'),
+            description=self._meta_content('name', 'description')
+            or self._meta_content('property', 'og:description'),
+            canonical_url=href.strip() if isinstance(href, str) else None,
+            last_modified=last_modified,
+        )
+
+    @property
+    def converted(self) -> bool:
+        """Whether the main content has been extracted."""
+        return self._main_content is not None
+
+    @property
+    def main_content(self) -> Union[Tag, BeautifulSoup]:
+        """Main content element with navigation and UI elements removed."""
+        if self._main_content is None:
+            profile = self.profile
+            main_content = profile.find_content(self.soup)
+            self.profile_matched = main_content is not None
+            if main_content is None and profile is not GENERIC_PROFILE:
+                # The site no longer matches its profile; try the generic cascade
+                profile = GENERIC_PROFILE
+                main_content = profile.find_content(self.soup)
+
+            # If no main content found, use the body
+            if not main_content:
+                main_content = self.soup.body if self.soup.body else self.soup
+
+            profile.prune(main_content)
+            self._main_content = main_content
+        return self._main_content
+
+    @property
+    def sections(self) -> List[List[PageElement]]:
+        """Top-level nodes of the main content, grouped into sections."""
+        if self._sections is None:
+            root = self.main_content
+            tags: Set[str] = set()
+            children = _convertible_children(root)
+            if root.name == 'pre' or root.find_parent('pre'):
+                # Newlines are not collapsed inside <pre>; convert it as a whole
+                children, tags = [root], set()
+            else:
+                tags.add(root.name)
+                while (
+                    len(children) == 1
+                    and isinstance(children[0], Tag)
+                    and children[0].name in WRAPPER_TAGS
+                ):
+                    root = children[0]
+                    tags.add(root.name)
+                    children = _convertible_children(root)
+
+            sections: List[List[PageElement]] = []
+            previous = None
+            for child in children:
+                if not sections or _starts_section(child) or _starts_section(previous, True):
+                    sections.append([])
+                sections[-1].append(child)
+                previous = child
+            self._sections = sections
+            self._section_tags = tags
+        return self._sections
+
+    @property
+    def heading_ids(self) -> List[Tuple[str, List[str]]]:
+        """Headings of the main content with the element ids linking to them.
+
+        An element id links to the heading the element is, or is inside of; to
+        the first heading inside the element; for an element without text (an
+        ``<a name=...>`` target), to the next heading; and otherwise to the
+        heading of the section the element is in.
+
+        Returns:
+            Text and linking ids of each heading, in document order
+        """
+        if self._heading_ids is None:
+            headings: List[Tuple[str, List[str]]] = []
+            pending: List[str] = []
+            for element in self.main_content.find_all(True):
+                ids = element_ids(element.name, element.attrs)
+                if element.name in HEADING_TAGS:
+                    headings.append((element.get_text().strip(), pending + ids))
+                    pending = []
+                elif not ids:
+                    continue
+                elif headings and element.find_parent(HEADING_TAGS) is not None:
+                    headings[-1][1].extend(ids)
+                elif element.find(HEADING_TAGS) is not None or not element.get_text().strip():
+                    pending.extend(ids)
+                elif headings:
+                    headings[-1][1].extend(ids)
+            self._heading_ids = headings
+        return self._heading_ids
+
+    @property
+    def markdown(self) -> str:
+        """Markdown conversion of the main content (empty if nothing was extracted)."""
+        if self._markdown is None:
+            self._markdown, _ = self.markdown_prefix()
+        return self._markdown
+
+    def markdown_prefix(self, min_chars: Optional[int] = None) -> Tuple[str, bool]:
+        """Convert the main content up to at least ``min_chars`` characters of markdown.
+
+        The result is always a prefix of ``markdown``; sections converted by
+        earlier calls are reused.
+
+        Args:
+            min_chars: Number of characters needed (None converts everything)
+
+        Returns:
+            Tuple of (markdown, whether it is the complete markdown)
+        """
+        with self._lock:
+            if self._markdown is not None:
+                return self._markdown, True
+            sections = self.sections
+            if self._converter is None:
+                self._converter = TableConverter(**MARKDOWN_OPTIONS)
+
+            estimate = sum(len(text) for text in self._strings)
+            while self._converted_sections < len(sections):
+                if min_chars is not None and estimate > min_chars:
+                    # Collapsing newlines may shorten the estimate; check the real length
+                    markdown = ''.join(self._strings).strip()
+                    if len(markdown) > min_chars:
+                        return markdown, False
+                section = sections[self._converted_sections]
+                strings = [
+                    self._converter.process_element(node, parent_tags=self._section_tags)
+                    for node in section
+                ]
+                strings = [text for text in strings if text]
+                self._strings = collapse_newlines(strings, self._strings)
+                estimate += sum(len(text) for text in strings)
+                self._converted_sections += 1
+
+            self._markdown = ''.join(self._strings).strip()
+            self._strings = ['']
+            return self._markdown, True
+
+
+def element_ids(name: str, attrs: Dict[str, Any]) -> List[str]:
+    """Get the ids a URL fragment can address an element by.
+
+    Args:
+        name: Tag name
+        attrs: Attributes of the element
+
+    Returns:
+        The element's id and, for <a> elements, its name
+    """
+    ids: List[str] = []
+    for attribute in ('id', 'name') if name == 'a' else ('id',):
+        value = attrs.get(attribute)
+        if isinstance(value, str) and value.strip() and value.strip() not in ids:
+            ids.append(value.strip())
+    return ids
+
+
+def _convertible_children(node: Union[Tag, BeautifulSoup]) -> List[PageElement]:
+    """Children of an element that markdownify converts.
+
+    Comments, and whitespace next to block elements or the ends of the
+    element, are skipped like ``MarkdownConverter.process_tag`` does.
+    """
+    remove_inside = markdownify.should_remove_whitespace_inside(node)
+    children = []
+    for child in node.children:
+        if isinstance(child, (Comment, Doctype)):
+            continue
+        if isinstance(child, NavigableString) and not child.strip():
+            previous, following = child.previous_sibling, child.next_sibling
+            if remove_inside and (not previous or not following):
+                continue
+            if markdownify.should_remove_whitespace_outside(
+                previous
+            ) or markdownify.should_remove_whitespace_outside(following):
+                continue
+        children.append(child)
+    return children
+
+
+def _starts_section(node: Optional[PageElement], after: bool = False) -> bool:
+    """Check whether a top-level node starts a section (or ends one, if ``after``)."""
+    if not isinstance(node, Tag):
+        return False
+    if node.name in SECTION_TAGS:
+        return True
+    return not after and markdownify.re_html_heading.match(node.name) is not None
+
+
+def parse_document(
+    html: str, parser: Optional[str] = None, url: Optional[str] = None
+) -> ParsedDocument:
+    """Parse a page once for title, metadata and content extraction.
+
+    Args:
+        html: Raw HTML content
+        parser: Parser backend, defaults to the configured ``MCP_HTML_PARSER``
+        url: URL of the page, used to select its extraction profile
+
+    Returns:
+        Parsed document
+    """
+    return ParsedDocument(html, parser, url)
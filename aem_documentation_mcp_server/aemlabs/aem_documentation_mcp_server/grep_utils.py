@@ -0,0 +1,120 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In-page search of converted documentation for Adobe AEM Documentation MCP Server.
+
+Queries run against the converted markdown, so every offset is a
+``start_index`` for ``read_documentation``. Regular expressions come from the
+caller and may backtrack catastrophically, so they run in a worker process
+that is terminated when a search exceeds its time limit.
+"""
+
+import bisect
+import os
+import re
+from aemlabs.aem_documentation_mcp_server.concurrency_utils import TimeLimitedWorker
+from aemlabs.aem_documentation_mcp_server.models import GrepPassage, OutlineHeading
+from typing import List, Tuple
+
+
+# Longest accepted query, to keep pathological regular expressions in check
+MAX_QUERY_LENGTH = 500
+
+# Characters of a page searched per query; the rest of the page is not scanned
+MAX_SCAN_CHARS = int(os.getenv('MCP_GREP_MAX_CHARS', str(2 * 1024 * 1024)))
+
+# Seconds a regular expression search may run before its worker process is stopped
+REGEX_TIMEOUT = float(os.getenv('MCP_GREP_REGEX_TIMEOUT', '5'))
+
+
+def compile_query(query: str, regex: bool = False, ignore_case: bool = True) -> re.Pattern:
+    """Compile a grep query.
+
+    Plain-text queries match their words separated by any whitespace, so a
+    phrase still matches where the markdown wraps it.
+
+    Args:
+        query: Plain text or regular expression
+        regex: Whether the query is a regular expression
+        ignore_case: Match regardless of case
+
+    Returns:
+        Compiled pattern
+
+    Raises:
+        ValueError: If the query is empty, too long or an invalid regular expression
+    """
+    if not query.strip():
+        raise ValueError('Query must not be empty')
+    if len(query) > MAX_QUERY_LENGTH:
+        raise ValueError(f'Query must be at most {MAX_QUERY_LENGTH} characters')
+    expression = query if regex else r'\s+'.join(re.escape(word) for word in query.split())
+    try:
+        return re.compile(expression, re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        raise ValueError(f'Invalid regular expression: {e}') from e
+
+
+def grep_content(
+    content: str,
+    pattern: re.Pattern,
+    outline: List[OutlineHeading],
+    context_chars: int = 200,
+    max_passages: int = 20,
+) -> Tuple[List[GrepPassage], int]:
+    """Find the passages of converted content matching a pattern.
+
+    Matches whose context overlaps are reported in one passage.
+
+    Args:
+        content: Markdown content as returned by ``read_documentation``
+        pattern: Compiled query
+        outline: Headings of the content, used to name each passage's section
+        context_chars: Characters of context kept on each side of a match
+        max_passages: Maximum number of passages returned
+
+    Returns:
+        Tuple of (passages in document order, total number of matches)
+    """
+    passages: List[Tuple[int, int, List[int]]] = []
+    total = 0
+    for match in pattern.finditer(content):
+        if match.start() == match.end():
+            continue
+        total += 1
+        start = max(0, match.start() - context_chars)
+        end = min(len(content), match.end() + context_chars)
+        if passages and start <= passages[-1][1]:
+            previous_start, _, indexes = passages[-1]
+            indexes.append(match.start())
+            passages[-1] = (previous_start, end, indexes)
+        elif len(passages) < max_passages:
+            passages.append((start, end, [match.start()]))
+
+    heading_starts = [heading.start_index for heading in outline]
+    results = []
+    for start, end, indexes in passages:
+        position = bisect.bisect_right(heading_starts, indexes[0]) - 1
+        results.append(
+            GrepPassage(
+                start_index=start,
+                match_indexes=indexes,
+                section=outline[position].text if position >= 0 else None,
+                text=content[start:end],
+            )
+        )
+    return results, total
+
+
+# Process-wide worker running regular expression searches
+regex_worker = TimeLimitedWorker(REGEX_TIMEOUT)
@@ -0,0 +1,278 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""HTTP client pooling for Adobe AEM Documentation MCP Server."""
+
+import asyncio
+import codecs
+import httpx
+import os
+from loguru import logger
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+# Connection pool sizing, applied to each per-host client
+MAX_CONNECTIONS_PER_HOST = int(os.getenv('MCP_HTTP_MAX_CONNECTIONS_PER_HOST', '20'))
+MAX_KEEPALIVE_PER_HOST = int(os.getenv('MCP_HTTP_MAX_KEEPALIVE_PER_HOST', '10'))
+KEEPALIVE_EXPIRY = float(os.getenv('MCP_HTTP_KEEPALIVE_EXPIRY', '120'))
+
+# Largest response body that is downloaded before the fetch is aborted
+MAX_RESPONSE_BYTES = int(os.getenv('MCP_MAX_RESPONSE_BYTES', str(10 * 1024 * 1024)))
+
+# HTTP/2 multiplexing is opt-in and requires the optional 'h2' package (httpx[http2])
+HTTP2_ENABLED = os.getenv('MCP_HTTP2', 'false').lower() in ('1', 'true', 'yes')
+
+
+def is_http2_available() -> bool:
+    """Check whether the optional HTTP/2 support for httpx is installed.
+
+    Returns:
+        True if the 'h2' package can be imported, False otherwise
+    """
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HttpClientPool:
+    """Process-wide registry of long-lived ``httpx.AsyncClient`` instances, one per host.
+
+    Each documentation host gets its own client and therefore its own keep-alive
+    pool, so a slow or saturated upstream cannot starve connections to the others.
+    Clients are created lazily on first use and closed by ``aclose`` when the MCP
+    server shuts down.
+    """
+
+    def __init__(
+        self,
+        http2: bool = HTTP2_ENABLED,
+        max_connections: int = MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections: int = MAX_KEEPALIVE_PER_HOST,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+    ):
+        """Initialize the pool.
+
+        Args:
+            http2: Enable HTTP/2 when the optional 'h2' package is installed
+            max_connections: Maximum concurrent connections per host
+            max_keepalive_connections: Maximum idle keep-alive connections per host
+            keepalive_expiry: Seconds an idle connection is kept open
+        """
+        if http2 and not is_http2_available():
+            logger.warning(
+                'MCP_HTTP2 is enabled but h2 is not installed, falling back to HTTP/1.1'
+            )
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._requests: Dict[str, int] = {}
+        self._clients_created: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _check_loop(self) -> None:
+        """Close and drop clients bound to an event loop that is no longer the running one.
+
+        httpx connections cannot be shared across event loops, which happens when
+        the tools are driven outside the server lifecycle (e.g. one loop per test).
+        A client can only be closed normally on its own loop: when that loop still
+        runs in another thread the client is closed there, otherwise its sockets
+        are closed directly.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._clients:
+                logger.debug('Event loop changed, closing pooled HTTP clients')
+            for client in self._clients.values():
+                if self._loop is not None and self._loop.is_running():
+                    asyncio.run_coroutine_threadsafe(client.aclose(), self._loop)
+                else:
+                    _close_sockets(client)
+            self._clients.clear()
+            self._loop = loop
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """Get the pooled client for the host of ``url``, creating it if needed.
+
+        Args:
+            url: URL that is about to be requested
+
+        Returns:
+            Long-lived AsyncClient dedicated to the URL's host
+        """
+        self._check_loop()
+        host = urlparse(url).netloc.lower()
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT,
+                limits=self.limits,
+                http2=self.http2,
+                follow_redirects=True,
+            )
+            self._clients[host] = client
+            self._clients_created[host] = self._clients_created.get(host, 0) + 1
+            logger.debug(f'Created pooled HTTP client for {host} (http2={self.http2})')
+        self._requests[host] = self._requests.get(host, 0) + 1
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled client and release its connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f'Error closing pooled HTTP client: {e}')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics per host.
+
+        Only the pool's own counters are reported, so the statistics do not
+        depend on httpx or httpcore internals.
+
+        Returns:
+            Dictionary with the HTTP/2 flag and, per host, the number of requests,
+            clients created and whether a client is currently open
+        """
+        hosts: Dict[str, Dict[str, Any]] = {}
+        for host in sorted(set(self._requests) | set(self._clients)):
+            client = self._clients.get(host)
+            hosts[host] = {
+                'requests': self._requests.get(host, 0),
+                'clients_created': self._clients_created.get(host, 0),
+                'client_open': client is not None and not client.is_closed,
+            }
+        return {'http2': self.http2, 'hosts': hosts}
+
+
+def _private_attr(obj: Any, *names: str) -> Any:
+    """Follow a chain of private attributes, stopping at the first one that is missing.
+
+    Args:
+        obj: Object to start from
+        *names: Attribute names to follow in order
+
+    Returns:
+        The final attribute, or None if any link of the chain does not exist
+    """
+    for name in names:
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def _close_sockets(client: httpx.AsyncClient) -> None:
+    """Close the sockets of a client whose event loop is gone.
+
+    ``aclose`` cannot be used here because closing a transport schedules work
+    on its (closed) loop. httpx has no public handle on the sockets, so the
+    httpcore pool is walked with ``_private_attr``; if a later httpx or
+    httpcore release changes that layout nothing is closed and the sockets are
+    left to garbage collection, as they would be without this cleanup.
+
+    Args:
+        client: Pooled client that can no longer be closed with ``aclose``
+    """
+    connections = _private_attr(client, '_transport', '_pool', 'connections')
+    try:
+        connections = list(connections or ())
+    except TypeError:
+        return
+    for connection in connections:
+        stream = _private_attr(connection, '_connection', '_network_stream')
+        get_extra_info = getattr(stream, 'get_extra_info', None)
+        if get_extra_info is None:
+            continue
+        try:
+            sock = get_extra_info('socket')
+            # asyncio hands out a TransportSocket wrapper, which has no close()
+            sock = getattr(sock, '_sock', sock)
+            close = getattr(sock, 'close', None)
+            if close is not None:
+                close()
+        except Exception as e:
+            logger.debug(f'Error closing pooled HTTP connection: {e}')
+
+
+class ResponseTooLargeError(Exception):
+    """Raised when a response body exceeds the configured size limit."""
+
+
+async def read_body(
+    response: httpx.Response,
+    max_bytes: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    on_chunk: Optional[Callable[[bytes], Awaitable[bool]]] = None,
+) -> tuple[bytes, bool]:
+    """Read a streamed response body with a size cap and optional early stop.
+
+    The declared Content-Length is checked before any byte is downloaded, and
+    the running total is checked after every chunk, so peak memory per request
+    stays bounded by ``max_bytes``.
+
+    Args:
+        response: Response opened with ``stream=True``
+        max_bytes: Maximum number of body bytes to accept (defaults to MCP_MAX_RESPONSE_BYTES)
+        max_chars: Stop once more than this many characters have been decoded
+        on_chunk: Awaited with every chunk as it arrives; reading stops early once it returns True
+
+    Returns:
+        Tuple of (body bytes, whether the whole body was read)
+
+    Raises:
+        ResponseTooLargeError: If the body is larger than ``max_bytes``
+    """
+    if max_bytes is None:
+        max_bytes = MAX_RESPONSE_BYTES
+    declared = response.headers.get('content-length')
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise ResponseTooLargeError(
+            f'response of {int(declared)} bytes exceeds the {max_bytes} byte limit'
+        )
+
+    decoder = None
+    if max_chars is not None:
+        decoder = codecs.getincrementaldecoder(response.charset_encoding or 'utf-8')(
+            errors='replace'
+        )
+    chunks = []
+    total_bytes = 0
+    total_chars = 0
+    async for chunk in response.aiter_bytes():
+        total_bytes += len(chunk)
+        if total_bytes > max_bytes:
+            raise ResponseTooLargeError(f'response exceeds the {max_bytes} byte limit')
+        chunks.append(chunk)
+        if on_chunk is not None and await on_chunk(chunk):
+            return b''.join(chunks), False
+        if decoder is not None and max_chars is not None:
+            total_chars += len(decoder.decode(chunk))
+            if total_chars > max_chars:
+                return b''.join(chunks), False
+    return b''.join(chunks), True
+
+
+# Process-wide pool shared by every tool call
+http_pool = HttpClientPool()
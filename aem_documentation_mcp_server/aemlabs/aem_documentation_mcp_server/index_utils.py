@@ -0,0 +1,444 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local full-text index of converted pages for Adobe AEM Documentation MCP Server.
+
+Every page the server converts is added to a persistent inverted index in a
+SQLite database: the markdown is split into lowercased, lightly stemmed
+terms, and each term keeps its token positions and character offsets per
+page. Queries are ranked with BM25 and answered without any network access;
+offsets refer to the converted markdown, so they can be passed as
+``start_index`` to ``read_documentation``.
+"""
+
+import bisect
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from aemlabs.aem_documentation_mcp_server.models import LocalSearchHit
+from aemlabs.aem_documentation_mcp_server.outline_utils import build_outline
+from array import array
+from collections import defaultdict
+from loguru import logger
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+# Persistent local full-text index location and limits
+LOCAL_INDEX_ENABLED = os.getenv('MCP_LOCAL_INDEX', 'true').lower() in ('1', 'true', 'yes')
+LOCAL_INDEX_PATH = os.getenv(
+    'MCP_LOCAL_INDEX_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'aem-documentation-mcp-server', 'index.db'),
+)
+LOCAL_INDEX_MAX_DOCUMENTS = int(os.getenv('MCP_LOCAL_INDEX_MAX_DOCUMENTS', '5000'))
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Words of the markdown: letters and digits, so markup and punctuation separate terms
+WORD = re.compile(r'[^\W_]+')
+
+# Quoted phrases of a query
+PHRASE = re.compile(r'"([^"]*)"')
+
+# Frequent English words left out of the index
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the this to was '
+    'were will with'.split()
+)
+
+# Schema of the index database
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    content TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    document_id INTEGER NOT NULL,
+    frequency INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term, document_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_document ON postings (document_id);
+CREATE INDEX IF NOT EXISTS documents_indexed_at ON documents (indexed_at);
+"""
+
+
+def stem(word: str) -> str:
+    """Reduce an English word to a stem shared by its common inflections.
+
+    A light stemmer: plural and -ed/-ing endings and a final e are removed,
+    so that 'cache', 'caches', 'cached' and 'caching' share a term. Words
+    with digits and short words are kept as they are.
+
+    Args:
+        word: Lowercase word
+
+    Returns:
+        Stem of the word
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith('sses'):
+        word = word[:-2]
+    elif word.endswith('ies'):
+        word = word[:-3] + 'y'
+    elif word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+    for suffix in ('ing', 'ed'):
+        base = word[: -len(suffix)]
+        if word.endswith(suffix) and len(base) >= 3 and any(c in 'aeiouy' for c in base):
+            word = base
+            if word[-1] == word[-2] and word[-1] not in 'lsz':
+                word = word[:-1]
+            break
+    if word.endswith('e') and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> Iterator[Tuple[int, int, str]]:
+    """Split text into index terms.
+
+    Stop words are skipped but still count as positions, so phrases keep
+    their word distances.
+
+    Args:
+        text: Markdown or query text
+
+    Yields:
+        Tuples of (token position, character offset, term)
+    """
+    for position, match in enumerate(WORD.finditer(text)):
+        word = match.group().lower()
+        if word not in STOP_WORDS:
+            yield position, match.start(), stem(word)
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[Tuple[int, str]]]]:
+    """Split a query into its terms and its quoted phrases.
+
+    Args:
+        query: Words, optionally with "quoted phrases"
+
+    Returns:
+        Tuple of (distinct terms, phrases as (relative position, term) lists)
+    """
+    phrases = []
+    for text in PHRASE.findall(query):
+        tokens = list(tokenize(text))
+        if len(tokens) > 1:
+            first = tokens[0][0]
+            phrases.append([(position - first, term) for position, _, term in tokens])
+    terms = [term for _, _, term in tokenize(query.replace('"', ' '))]
+    return list(dict.fromkeys(terms)), phrases
+
+
+class LocalIndex:
+    """Persistent inverted index of converted pages, ranked with BM25.
+
+    Positions are stored per term and page as an array of (token position,
+    character offset) pairs. A page is re-indexed only when its markdown
+    changes, and the least recently indexed pages are dropped beyond
+    ``MCP_LOCAL_INDEX_MAX_DOCUMENTS``. All methods are blocking and
+    thread-safe; call them from a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str = LOCAL_INDEX_PATH,
+        enabled: bool = LOCAL_INDEX_ENABLED,
+        max_documents: int = LOCAL_INDEX_MAX_DOCUMENTS,
+    ):
+        """Initialize the index; the database is opened on first use.
+
+        Args:
+            path: SQLite database file
+            enabled: Whether pages are indexed and searched at all
+            max_documents: Number of pages kept before the oldest are dropped
+        """
+        self.path = path
+        self.enabled = enabled
+        self.max_documents = max_documents
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connected_path: Optional[str] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating it and its schema if needed."""
+        if self._connection is None or self._connected_path != self.path:
+            self.close_connection()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+            self._connection, self._connected_path = connection, self.path
+        return self._connection
+
+    def add(self, url: str, title: Optional[str], content: str) -> bool:
+        """Index a converted page, replacing its previous version.
+
+        Args:
+            url: URL of the page, as passed to ``read_documentation``
+            title: Title of the page
+            content: Markdown of the whole page
+
+        Returns:
+            True if the page was (re-)indexed, False if it was already up to date
+        """
+        if not self.enabled:
+            return False
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        with self._lock:
+            row = (
+                self._connect()
+                .execute('SELECT digest FROM documents WHERE url = ?', (url,))
+                .fetchone()
+            )
+        if row is not None and row[0] == digest:
+            return False
+
+        postings: Dict[str, array] = defaultdict(lambda: array('I'))
+        length = 0
+        for position, offset, term in tokenize(content):
+            postings[term].extend((position, offset))
+            length += 1
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                self._delete(connection, url)
+                cursor = connection.execute(
+                    'INSERT INTO documents (url, title, content, digest, length, indexed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (url, title, content, digest, length, time.time()),
+                )
+                document_id = cursor.lastrowid
+                connection.executemany(
+                    'INSERT INTO postings (term, document_id, frequency, positions) '
+                    'VALUES (?, ?, ?, ?)',
+                    (
+                        (term, document_id, len(pairs) // 2, pairs.tobytes())
+                        for term, pairs in postings.items()
+                    ),
+                )
+                self._evict(connection)
+        logger.debug(f'Indexed {url}: {length} terms, {len(postings)} distinct')
+        return True
+
+    def _delete(self, connection: sqlite3.Connection, url: str) -> None:
+        """Remove a page and its postings."""
+        row = connection.execute('SELECT id FROM documents WHERE url = ?', (url,)).fetchone()
+        if row is not None:
+            connection.execute('DELETE FROM postings WHERE document_id = ?', row)
+            connection.execute('DELETE FROM documents WHERE id = ?', row)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Drop the least recently indexed pages beyond the document limit."""
+        (count,) = connection.execute('SELECT COUNT(*) FROM documents').fetchone()
+        excess = count - max(self.max_documents, 1)
+        if excess <= 0:
+            return
+        oldest = connection.execute(
+            'SELECT id FROM documents ORDER BY indexed_at, id LIMIT ?', (excess,)
+        ).fetchall()
+        connection.executemany('DELETE FROM postings WHERE document_id = ?', oldest)
+        connection.executemany('DELETE FROM documents WHERE id = ?', oldest)
+
+    def search(
+        self, query: str, max_results: int = 10, context_chars: int = 150
+    ) -> List[LocalSearchHit]:
+        """Rank the indexed pages for a query with BM25.
+
+        Every query term contributes to the score (a page needs at least one
+        of them); quoted phrases must appear in a page with their words in
+        order. Each hit carries the offset of its best passage: the match
+        surrounded by the most distinct query terms.
+
+        Args:
+            query: Words, optionally with "quoted phrases"
+            max_results: Maximum number of pages returned
+            context_chars: Characters of context kept on each side of the passage
+
+        Returns:
+            Hits, best first
+        """
+        terms, phrases = parse_query(query)
+        if not self.enabled or not terms:
+            return []
+        with self._lock:
+            connection = self._connect()
+            count, average_length = connection.execute(
+                'SELECT COUNT(*), AVG(length) FROM documents'
+            ).fetchone()
+            if not count:
+                return []
+            postings: Dict[str, Dict[int, Tuple[int, bytes]]] = {}
+            for term in terms:
+                postings[term] = {
+                    document_id: (frequency, positions)
+                    for document_id, frequency, positions in connection.execute(
+                        'SELECT document_id, frequency, positions FROM postings WHERE term = ?',
+                        (term,),
+                    )
+                }
+            candidates = set().union(*(set(found) for found in postings.values()))
+            if not candidates:
+                return []
+            lengths = dict(
+                connection.execute(
+                    f'SELECT id, length FROM documents WHERE id IN ({_placeholders(candidates)})',
+                    list(candidates),
+                ).fetchall()
+            )
+
+            scores = {}
+            for document_id in candidates:
+                matches = {
+                    term: _pairs(found[document_id][1])
+                    for term, found in postings.items()
+                    if document_id in found
+                }
+                if phrases and not all(_phrase_starts(phrase, matches) for phrase in phrases):
+                    continue
+                score = 0.0
+                for term, found in postings.items():
+                    if document_id not in found:
+                        continue
+                    frequency = found[document_id][0]
+                    idf = math.log(1 + (count - len(found) + 0.5) / (len(found) + 0.5))
+                    norm = 1 - BM25_B + BM25_B * lengths[document_id] / (average_length or 1)
+                    score += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+                scores[document_id] = (score, matches)
+
+            best = sorted(scores, key=lambda document_id: -scores[document_id][0])[:max_results]
+            rows = {}
+            if best:
+                rows = {
+                    row[0]: row[1:]
+                    for row in connection.execute(
+                        'SELECT id, url, title, content FROM documents '
+                        f'WHERE id IN ({_placeholders(best)})',
+                        best,
+                    )
+                }
+
+        hits = []
+        for document_id in best:
+            score, matches = scores[document_id]
+            url, title, content = rows[document_id]
+            offset = _best_offset(matches, phrases, context_chars)
+            start = max(0, offset - context_chars)
+            outline = build_outline(content)
+            heading = bisect.bisect_right([h.start_index for h in outline], offset) - 1
+            hits.append(
+                LocalSearchHit(
+                    url=url,
+                    title=title,
+                    score=round(score, 4),
+                    start_index=offset,
+                    section=outline[heading].text if heading >= 0 else None,
+                    snippet=content[start : offset + context_chars],
+                )
+            )
+        return hits
+
+    def __len__(self) -> int:
+        """Number of indexed pages."""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            return self._connect().execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove every indexed page."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute('DELETE FROM postings')
+                connection.execute('DELETE FROM documents')
+
+    def close_connection(self) -> None:
+        """Close the database connection; the next call opens it again."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def _placeholders(values) -> str:
+    """SQL parameter placeholders for an IN clause."""
+    return ','.join('?' * len(values))
+
+
+def _pairs(blob: bytes) -> List[Tuple[int, int]]:
+    """Decode stored (token position, character offset) pairs."""
+    values = array('I')
+    values.frombytes(blob)
+    return list(zip(values[::2], values[1::2]))
+
+
+def _phrase_starts(
+    phrase: List[Tuple[int, str]], matches: Dict[str, List[Tuple[int, int]]]
+) -> List[int]:
+    """Character offsets where a phrase occurs in a page."""
+    if any(term not in matches for _, term in phrase):
+        return []
+    positions: Dict[str, Set[int]] = {
+        term: {position for position, _ in matches[term]} for _, term in phrase
+    }
+    first_relative, first_term = phrase[0]
+    return [
+        offset
+        for position, offset in matches[first_term]
+        if all(
+            position - first_relative + relative in positions[term] for relative, term in phrase
+        )
+    ]
+
+
+def _best_offset(
+    matches: Dict[str, List[Tuple[int, int]]],
+    phrases: List[List[Tuple[int, str]]],
+    context_chars: int,
+) -> int:
+    """Offset of the match with the most distinct query terms within the context window."""
+    if phrases:
+        candidates = sorted(
+            offset for phrase in phrases for offset in _phrase_starts(phrase, matches)
+        )
+    else:
+        candidates = sorted(offset for found in matches.values() for _, offset in found)
+    occurrences = sorted((offset, term) for term, found in matches.items() for _, offset in found)
+    offsets = [offset for offset, _ in occurrences]
+    best, best_count = candidates[0], 0
+    for candidate in candidates:
+        low = bisect.bisect_left(offsets, candidate - context_chars)
+        high = bisect.bisect_right(offsets, candidate + context_chars)
+        count = len({term for _, term in occurrences[low:high]})
+        if count > best_count:
+            best, best_count = candidate, count
+    return best
+
+
+# Process-wide local full-text index
+local_index = LocalIndex()
@@ -14,7 +14,7 @@
 """Data models for Adobe AEM Documentation MCP Server."""
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class DocumentationResult(BaseModel):
@@ -34,3 +34,121 @@ class ServiceInfo(BaseModel):
     url: str
     description: Optional[str] = None
     category: str  # e.g., "cloud-service", "on-premise", "apis"
+
+
+class BatchReadResult(BaseModel):
+    """Result of reading one URL as part of a batch."""
+
+    url: str
+    content: Optional[str] = None
+    error: Optional[str] = None
+
+
+class OutlineHeading(BaseModel):
+    """A heading of a converted documentation page."""
+
+    level: int
+    text: str
+    anchor: str
+    start_index: int  # Offset of the heading in the read_documentation content
+    length: int  # Characters up to the next heading of the same or a higher level
+    ids: List[str] = []  # Element ids of the page that link to the heading
+
+
+class DocumentationOutline(BaseModel):
+    """Heading tree of a documentation page, in document order."""
+
+    url: str
+    title: Optional[str] = None
+    content_length: int = 0
+    headings: List[OutlineHeading] = []
+    error: Optional[str] = None
+
+
+class GrepPassage(BaseModel):
+    """A passage of a documentation page around one or more matches."""
+
+    start_index: int  # Offset of the passage in the read_documentation content
+    match_indexes: List[int]  # Offsets of the matches in the read_documentation content
+    section: Optional[str] = None  # Text of the heading the passage is under
+    text: str
+
+
+class GrepResult(BaseModel):
+    """Passages of a documentation page matching a query."""
+
+    url: str
+    query: str
+    total_matches: int = 0
+    passages: List[GrepPassage] = []
+    truncated: bool = False
+    error: Optional[str] = None
+
+
+class SearchResult(BaseModel):
+    """A result of an Experience League search."""
+
+    title: str
+    url: str
+    snippet: Optional[str] = None
+    content_type: Optional[str] = None
+    product: Optional[str] = None
+
+
+class LocalSearchHit(BaseModel):
+    """A page of the local full-text index matching a query."""
+
+    url: str
+    title: Optional[str] = None
+    score: float
+    start_index: int
+    section: Optional[str] = None
+    snippet: str
+
+
+class LocalSearchResult(BaseModel):
+    """Result of a local full-text index search."""
+
+    query: str
+    indexed_documents: int = 0
+    hits: List[LocalSearchHit] = []
+    error: Optional[str] = None
+
+
+class RelatedPage(BaseModel):
+    """An indexed page similar to a query or another page."""
+
+    url: str
+    title: Optional[str] = None
+    section: Optional[str] = None
+    start_index: int
+    score: float
+
+
+class RelatedDocumentationResult(BaseModel):
+    """Result of a related-page lookup in the vector index."""
+
+    query: Optional[str] = None
+    url: Optional[str] = None
+    indexed_documents: int = 0
+    related: List[RelatedPage] = []
+    error: Optional[str] = None
+
+
+class CatalogEntry(BaseModel):
+    """A documentation page listed in a sitemap."""
+
+    url: str
+    title: str
+    lastmod: Optional[str] = None
+    score: Optional[float] = None
+
+
+class CatalogLookupResult(BaseModel):
+    """Result of a sitemap catalog lookup."""
+
+    query: Optional[str] = None
+    url_prefix: Optional[str] = None
+    catalog_size: int = 0
+    entries: List[CatalogEntry] = []
+    error: Optional[str] = None
@@ -0,0 +1,200 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Outlines of converted documentation pages for Adobe AEM Documentation MCP Server.
+
+The outline is read from the final markdown, so each heading's offset is the
+``start_index`` at which ``read_documentation`` returns it. The element ids
+that link to a heading (``<h2 id=...>``, ``<a name=...>``, ids of wrapping
+sections) are recorded by the converters and matched to the outline by
+``anchor_offsets``.
+"""
+
+import re
+from aemlabs.aem_documentation_mcp_server.models import OutlineHeading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+
+# ATX heading line, as produced by the markdown converters
+HEADING_LINE = re.compile(r'^(#{1,6})[ \t]+(.+?)(?:[ \t]+#+)?[ \t]*$')
+
+# Opening or closing line of a fenced code block
+FENCE_LINE = re.compile(r'^[ ]{0,3}(`{3,}|~{3,})')
+
+# Markdown link or image, reduced to its text for anchors
+MARKDOWN_LINK = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+
+# Prefixes sites add to the ids of generated heading anchors
+ANCHOR_PREFIXES = ('user-content-',)
+
+
+def heading_anchor(text: str, seen: Dict[str, int]) -> str:
+    """Build the anchor of a heading the way GitHub and Experience League slug them.
+
+    Args:
+        text: Heading text as markdown
+        seen: Anchors already used in the page and how often, updated in place
+
+    Returns:
+        Anchor, with a numeric suffix when the same heading occurs again
+    """
+    plain = MARKDOWN_LINK.sub(r'\1', text).replace('`', '').replace('*', '')
+    slug = re.sub(r'[^\w\- ]', '', plain.strip().lower()).replace(' ', '-')
+    count = seen.get(slug, 0)
+    seen[slug] = count + 1
+    return f'{slug}-{count}' if count else slug
+
+
+def build_outline(content: str, anchors: Optional[Dict[str, int]] = None) -> List[OutlineHeading]:
+    """List the headings of converted markdown with their offsets.
+
+    Lines inside fenced code blocks are skipped, so shell comments in
+    examples are not mistaken for headings.
+
+    Args:
+        content: Markdown content as returned by ``read_documentation``
+        anchors: Element ids of the page and the offsets of the headings they link to
+
+    Returns:
+        Headings in document order
+    """
+    headings: List[OutlineHeading] = []
+    seen: Dict[str, int] = {}
+    fence = None
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        start = offset
+        offset += len(line)
+        fence_match = FENCE_LINE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif line.strip() == marker[0] * len(line.strip()) and len(marker) >= len(fence):
+                # A closing fence uses the same character, at least as many times
+                fence = None
+            continue
+        if fence is not None:
+            continue
+        match = HEADING_LINE.match(line.rstrip('\r\n'))
+        if match:
+            text = match.group(2).strip()
+            headings.append(
+                OutlineHeading(
+                    level=len(match.group(1)),
+                    text=text,
+                    anchor=heading_anchor(text, seen),
+                    start_index=start,
+                    length=0,
+                )
+            )
+
+    # A section runs until the next heading of the same or a higher level
+    open_headings: List[OutlineHeading] = []
+    for heading in headings:
+        while open_headings and open_headings[-1].level >= heading.level:
+            closed = open_headings.pop()
+            closed.length = heading.start_index - closed.start_index
+        open_headings.append(heading)
+    for heading in open_headings:
+        heading.length = len(content) - heading.start_index
+
+    if anchors:
+        by_offset = {heading.start_index: heading for heading in headings}
+        for element_id, offset in anchors.items():
+            heading = by_offset.get(offset)
+            if heading is not None:
+                heading.ids.append(element_id)
+    return headings
+
+
+def anchor_offsets(content: str, heading_ids: List[Tuple[str, List[str]]]) -> Dict[str, int]:
+    """Map the element ids recorded by a converter to the offsets of their headings.
+
+    Converters list every heading of the page's content with the ids linking
+    to it. The listed headings are matched in order with the headings of the
+    markdown by their text; headings that did not become markdown headings
+    (e.g. in table cells) are skipped.
+
+    Args:
+        content: Converted markdown
+        heading_ids: Text and linking element ids of each HTML heading, in document order
+
+    Returns:
+        Offset of the linked heading in ``content`` per element id
+    """
+    outline = [
+        (_text_key(heading.text), heading.start_index) for heading in build_outline(content)
+    ]
+    anchors: Dict[str, int] = {}
+    position = 0
+    for text, ids in heading_ids:
+        key = _text_key(text)
+        if not key:
+            continue
+        for index in range(position, len(outline)):
+            if outline[index][0] == key:
+                position = index + 1
+                for element_id in ids:
+                    anchors.setdefault(element_id, outline[index][1])
+                break
+    return anchors
+
+
+def find_heading(outline: List[OutlineHeading], fragment: str) -> Optional[OutlineHeading]:
+    """Find the heading a URL fragment points to.
+
+    The fragment is first looked up among the element ids linking to each
+    heading. Most documentation sites derive heading ids from the heading
+    text, so it is then compared with the heading anchors, first exactly and
+    then ignoring case, punctuation and separators.
+
+    Args:
+        outline: Headings of the page
+        fragment: URL fragment without the leading ``#``
+
+    Returns:
+        Addressed heading, or None if no heading matches
+    """
+    element_id = unquote(fragment).strip()
+    for candidate in [element_id] + [prefix + element_id for prefix in ANCHOR_PREFIXES]:
+        for heading in outline:
+            if candidate in heading.ids:
+                return heading
+
+    anchor = element_id.lower()
+    for prefix in ANCHOR_PREFIXES:
+        if anchor.startswith(prefix):
+            anchor = anchor[len(prefix) :]
+    if not anchor:
+        return None
+    for heading in outline:
+        if heading.anchor == anchor:
+            return heading
+
+    key = _anchor_key(anchor)
+    for heading in outline:
+        if key and _anchor_key(heading.anchor) == key:
+            return heading
+    return None
+
+
+def _anchor_key(anchor: str) -> str:
+    """Reduce an anchor to its letters and digits."""
+    return re.sub(r'[\W_]+', '', anchor)
+
+
+def _text_key(text: str) -> str:
+    """Reduce heading text to the letters and digits of its anchor."""
+    return _anchor_key(heading_anchor(text, {}))
@@ -0,0 +1,569 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Rate limiting, retry and circuit breaker utilities for Adobe AEM Documentation MCP Server."""
+
+import asyncio
+import httpx
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from loguru import logger
+from typing import Any, Deque, Dict, List, Optional
+
+
+# Status codes worth retrying: throttling and transient upstream failures
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Only requests without side effects are retried
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+# Circuit breaker defaults: failure rate that opens a host's circuit, calls needed
+# before the rate is trusted, and seconds the circuit stays open before a probe
+CIRCUIT_FAILURE_RATE = float(os.getenv('MCP_CIRCUIT_FAILURE_RATE', '0.5'))
+CIRCUIT_MIN_CALLS = int(os.getenv('MCP_CIRCUIT_MIN_CALLS', '4'))
+CIRCUIT_OPEN_SECONDS = float(os.getenv('MCP_CIRCUIT_OPEN_SECONDS', '30'))
+
+# Hedged requests (opt-in): a second GET is sent when the first has not returned
+# headers within the host's recent HEDGE_PERCENTILE latency, for at most
+# HEDGE_BUDGET extra requests relative to the requests sent to that host
+HEDGE_ENABLED = os.getenv('MCP_HEDGE_REQUESTS', 'false').lower() in ('1', 'true', 'yes')
+HEDGE_PERCENTILE = float(os.getenv('MCP_HEDGE_PERCENTILE', '0.95'))
+HEDGE_BUDGET = float(os.getenv('MCP_HEDGE_BUDGET', '0.05'))
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """Request policy applied to one documentation host."""
+
+    requests_per_second: float = 5.0
+    burst: int = 10
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    deadline: float = 60.0
+    # Circuit breaker: open when the failure rate over the last `breaker_window`
+    # calls reaches `breaker_failure_rate` (after at least `breaker_min_calls`)
+    breaker_failure_rate: float = CIRCUIT_FAILURE_RATE
+    breaker_window: int = 10
+    breaker_min_calls: int = CIRCUIT_MIN_CALLS
+    breaker_open_seconds: float = CIRCUIT_OPEN_SECONDS
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the host's circuit is open."""
+
+
+class CircuitBreaker:
+    """Circuit breaker tracking the recent failure rate of one host.
+
+    States:
+        closed: requests flow normally and outcomes are recorded
+        open: requests fail immediately until ``breaker_open_seconds`` elapse
+        half_open: a single probe request is let through; its outcome closes
+            or re-opens the circuit
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, host: str, policy: HostPolicy):
+        """Initialize a closed breaker.
+
+        Args:
+            host: Hostname the breaker protects, used in logs
+            policy: Policy holding the breaker thresholds
+        """
+        self.host = host
+        self.policy = policy
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.transitions = 0
+        self.rejected = 0
+        self._outcomes: Deque[bool] = deque(maxlen=policy.breaker_window)
+        self._probe_in_flight = False
+
+    def _transition(self, state: str) -> None:
+        """Move to a new state and log the transition."""
+        if state == self.state:
+            return
+        logger.warning(f'Circuit for {self.host} changed from {self.state} to {state}')
+        self.state = state
+        self.transitions += 1
+        if state == self.OPEN:
+            self.opened_at = time.monotonic()
+        if state == self.CLOSED:
+            self._outcomes.clear()
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent now.
+
+        Returns:
+            True if the request may proceed (possibly as the half-open probe)
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.policy.breaker_open_seconds:
+                self.rejected += 1
+                return False
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+            self._transition(self.CLOSED)
+            return
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Record a failed request and open the circuit if the failure rate is too high."""
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+            self._transition(self.OPEN)
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if (
+            len(self._outcomes) >= self.policy.breaker_min_calls
+            and failures / len(self._outcomes) >= self.policy.breaker_failure_rate
+        ):
+            self._transition(self.OPEN)
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe that ended without an outcome (e.g. cancelled)."""
+        if self.state == self.HALF_OPEN and self._probe_in_flight:
+            self._probe_in_flight = False
+            self.state = self.OPEN
+            self.opened_at = time.monotonic() - self.policy.breaker_open_seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the breaker state and counters.
+
+        Returns:
+            Dictionary with state, transitions, rejected calls and recent failure rate
+        """
+        failures = self._outcomes.count(False)
+        return {
+            'state': self.state,
+            'transitions': self.transitions,
+            'rejected': self.rejected,
+            'recent_failure_rate': failures / len(self._outcomes) if self._outcomes else 0.0,
+        }
+
+
+class LatencyTracker:
+    """Sliding window of recent time-to-headers latencies of one host."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        """Initialize an empty window.
+
+        Args:
+            window: Number of recent samples kept
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample."""
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        """Number of samples in the window."""
+        return len(self._samples)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Get a latency percentile of the window.
+
+        Args:
+            fraction: Percentile as a fraction between 0 and 1
+
+        Returns:
+            Latency in seconds, or None without samples
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class TokenBucket:
+    """Asynchronous token bucket limiting the request rate to one host."""
+
+    def __init__(self, rate: float, capacity: int):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, waiting for it if the bucket is empty.
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= 1
+        return waited
+
+    def drain(self) -> None:
+        """Empty the bucket after the upstream signalled throttling."""
+        self._refill()
+        self._tokens = 0.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as delta-seconds or an HTTP date.
+
+    Args:
+        value: Raw Retry-After header value
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def backoff_delay(attempt: int, policy: HostPolicy) -> float:
+    """Compute a full-jitter exponential backoff delay.
+
+    Args:
+        attempt: Zero-based retry attempt
+        policy: Policy of the host being retried
+
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(policy.backoff_max, policy.backoff_base * (2**attempt)))
+
+
+class HostResilience:
+    """Per-host rate limiters, retry policies, circuit breakers and their counters."""
+
+    def __init__(
+        self,
+        policies: Dict[str, HostPolicy],
+        default_policy: HostPolicy,
+        hedging: bool = HEDGE_ENABLED,
+        hedge_percentile: float = HEDGE_PERCENTILE,
+        hedge_budget: float = HEDGE_BUDGET,
+    ):
+        """Initialize the registry.
+
+        Args:
+            policies: Policies keyed by hostname; a key starting with '.' matches subdomains
+            default_policy: Policy for hosts without an explicit entry
+            hedging: Whether slow requests are hedged with a second request
+            hedge_percentile: Latency percentile after which a request is hedged
+            hedge_budget: Maximum hedged requests as a fraction of requests sent
+        """
+        self.policies = policies
+        self.default_policy = default_policy
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def policy_for(self, host: str) -> HostPolicy:
+        """Get the policy for a host.
+
+        Args:
+            host: Hostname of the request
+
+        Returns:
+            Matching policy, or the default one
+        """
+        host = host.lower()
+        if host in self.policies:
+            return self.policies[host]
+        for pattern, policy in self.policies.items():
+            if pattern.startswith('.') and host.endswith(pattern):
+                return policy
+        return self.default_policy
+
+    def bucket_for(self, host: str) -> TokenBucket:
+        """Get the rate limiter of a host, creating it on first use."""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            policy = self.policy_for(host)
+            bucket = TokenBucket(policy.requests_per_second, policy.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def breaker_for(self, host: str) -> CircuitBreaker:
+        """Get the circuit breaker of a host, creating it on first use."""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, self.policy_for(host))
+            self._breakers[host] = breaker
+        return breaker
+
+    def latency_for(self, host: str) -> LatencyTracker:
+        """Get the latency tracker of a host, creating it on first use."""
+        tracker = self._latencies.get(host)
+        if tracker is None:
+            tracker = LatencyTracker()
+            self._latencies[host] = tracker
+        return tracker
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """Get how long to wait for headers before hedging a request to a host.
+
+        Returns:
+            Delay in seconds, or None if the request must not be hedged because
+            hedging is disabled, too few latencies are known or the budget is spent
+        """
+        if not self.hedging:
+            return None
+        tracker = self.latency_for(host)
+        if len(tracker) < HEDGE_MIN_SAMPLES:
+            return None
+        stats = self._stats.get(host, {})
+        if stats.get('hedged', 0) + 1 > self.hedge_budget * stats.get('requests', 0):
+            return None
+        return tracker.percentile(self.hedge_percentile)
+
+    def count(self, host: str, counter: str) -> None:
+        """Increment a per-host counter."""
+        stats = self._stats.setdefault(
+            host, {'requests': 0, 'rate_limited': 0, 'throttled': 0, 'retries': 0}
+        )
+        stats[counter] = stats.get(counter, 0) + 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-host counters, latency percentiles and circuit breaker state.
+
+        Returns:
+            Dictionary keyed by hostname with request, rate limiting, throttling,
+            retry and hedging counters, the hedge win rate, p50/p95 time to
+            headers and the breaker state under 'circuit'
+        """
+        stats: Dict[str, Dict[str, Any]] = {host: dict(c) for host, c in self._stats.items()}
+        for host, host_stats in stats.items():
+            if host_stats.get('hedged'):
+                host_stats['hedge_win_rate'] = (
+                    host_stats.get('hedge_wins', 0) / host_stats['hedged']
+                )
+        for host, tracker in self._latencies.items():
+            host_stats = stats.setdefault(host, {})
+            host_stats['latency_p50'] = tracker.percentile(0.5)
+            host_stats['latency_p95'] = tracker.percentile(0.95)
+        for host, breaker in self._breakers.items():
+            stats.setdefault(host, {})['circuit'] = breaker.get_stats()
+        return stats
+
+    async def send(self, client: httpx.AsyncClient, request: httpx.Request) -> httpx.Response:
+        """Send a request under the host's circuit breaker, rate limit and retry policy.
+
+        Requests to a host whose circuit is open fail immediately. Throttling (429)
+        and transient failures (5xx, timeouts, connection errors) are retried with
+        jittered exponential backoff, honouring Retry-After, until the retry budget
+        or the overall deadline is exhausted. Non-idempotent requests are never
+        retried. The final outcome is recorded by the host's circuit breaker.
+
+        Args:
+            client: Client used to send the request
+            request: Request to send (its body is streamed by the caller)
+
+        Returns:
+            Final response, which may still carry a retryable error status
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+        """
+        host = request.url.host
+        breaker = self.breaker_for(host)
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f'{host} is failing repeatedly; requests are suspended for up to '
+                f'{breaker.policy.breaker_open_seconds:.0f} seconds'
+            )
+
+        outcome_recorded = False
+        try:
+            try:
+                response = await self._send_with_retries(client, request)
+            except httpx.TransportError:
+                breaker.record_failure()
+                outcome_recorded = True
+                raise
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            outcome_recorded = True
+            return response
+        finally:
+            if not outcome_recorded:
+                breaker.release_probe()
+
+    async def _send_with_retries(
+        self, client: httpx.AsyncClient, request: httpx.Request
+    ) -> httpx.Response:
+        """Send a request under the host's rate limit, retrying transient failures."""
+        host = request.url.host
+        policy = self.policy_for(host)
+        bucket = self.bucket_for(host)
+        retryable = request.method in IDEMPOTENT_METHODS
+        deadline = time.monotonic() + policy.deadline
+        attempt = 0
+
+        while True:
+            if await bucket.acquire() > 0:
+                self.count(host, 'rate_limited')
+            self.count(host, 'requests')
+
+            try:
+                if retryable:
+                    response = await self._send_hedged(client, request)
+                else:
+                    response = await client.send(request, stream=True)
+            except httpx.TransportError as e:
+                if not retryable or attempt >= policy.max_retries:
+                    raise
+                delay = backoff_delay(attempt, policy)
+                if time.monotonic() + delay > deadline:
+                    raise
+                logger.debug(f'Retrying {request.url} after {type(e).__name__}: {e}')
+            else:
+                if (
+                    response.status_code not in RETRYABLE_STATUS_CODES
+                    or not retryable
+                    or attempt >= policy.max_retries
+                ):
+                    return response
+                retry_after = parse_retry_after(response.headers.get('retry-after'))
+                if response.status_code == 429:
+                    self.count(host, 'throttled')
+                    bucket.drain()
+                delay = retry_after if retry_after is not None else backoff_delay(attempt, policy)
+                if time.monotonic() + delay > deadline:
+                    return response
+                await response.aclose()
+                logger.debug(
+                    f'Retrying {request.url} after status {response.status_code} in {delay:.2f}s'
+                )
+
+            attempt += 1
+            self.count(host, 'retries')
+            await asyncio.sleep(delay)
+
+    async def _timed_send(
+        self, client: httpx.AsyncClient, request: httpx.Request
+    ) -> httpx.Response:
+        """Send a request and record its time to headers."""
+        started = time.monotonic()
+        response = await client.send(request, stream=True)
+        self.latency_for(request.url.host).record(time.monotonic() - started)
+        return response
+
+    async def _send_hedged(
+        self, client: httpx.AsyncClient, request: httpx.Request
+    ) -> httpx.Response:
+        """Send a request, hedging it with a second one if headers are slow to arrive.
+
+        The hedge runs on another pooled connection since the first one is still
+        busy. The first successful response wins and the other request is cancelled.
+        """
+        host = request.url.host
+        delay = self.hedge_delay(host)
+        if delay is None:
+            return await self._timed_send(client, request)
+
+        primary = asyncio.ensure_future(self._timed_send(client, request))
+        tasks = [primary]
+        winner: Optional['asyncio.Future[httpx.Response]'] = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                winner = primary
+                return primary.result()
+
+            self.count(host, 'hedged')
+            logger.debug(f'Hedging {request.url} after {delay:.3f}s without headers')
+            hedge_request = client.build_request(
+                request.method, request.url, headers=request.headers
+            )
+            hedge = asyncio.ensure_future(self._timed_send(client, hedge_request))
+            tasks.append(hedge)
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        if task is hedge:
+                            self.count(host, 'hedge_wins')
+                        return task.result()
+            # Both requests failed; surface the primary's error
+            return primary.result()
+        finally:
+            await _cancel_losers(tasks, winner)
+
+
+async def _cancel_losers(
+    tasks: 'List[asyncio.Future[httpx.Response]]',
+    winner: Optional['asyncio.Future[httpx.Response]'],
+) -> None:
+    """Cancel the requests that lost a hedge race and close responses nobody will read."""
+    losers = [task for task in tasks if task is not winner]
+    for task in losers:
+        task.cancel()
+    for task in losers:
+        try:
+            response = await task
+        except (asyncio.CancelledError, Exception):
+            continue
+        await response.aclose()
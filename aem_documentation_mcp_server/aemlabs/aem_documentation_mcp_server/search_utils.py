@@ -13,8 +13,56 @@
 # limitations under the License.
 """Search utilities for Adobe Experience League."""
 
-from typing import List, Optional
-from urllib.parse import quote_plus
+import json
+import os
+from aemlabs.aem_documentation_mcp_server.models import (
+    CatalogLookupResult,
+    LocalSearchResult,
+    SearchResult,
+)
+from aemlabs.aem_documentation_mcp_server.util import canonicalize_url
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote_plus, urlencode, urlparse, urlunparse
+
+
+# JSON search API behind the Experience League search page (Coveo REST search).
+# The page keeps its filters in the URL fragment, so fetching the search URL
+# only returns the empty search shell. No public token is shipped: without one,
+# searches are answered from the sitemap catalog and the local index instead.
+SEARCH_ENDPOINT = os.getenv(
+    'MCP_SEARCH_ENDPOINT', 'https://platform.cloud.coveo.com/rest/search/v2'
+)
+SEARCH_ORGANIZATION_ID = os.getenv('MCP_SEARCH_ORGANIZATION_ID', '')
+SEARCH_TOKEN = os.getenv('MCP_SEARCH_TOKEN', '')
+
+# Results requested per search
+SEARCH_RESULTS = int(os.getenv('MCP_SEARCH_RESULTS', '10'))
+
+# Index fields of the search filters, as used in the search page's fragment (f-<field>)
+CONTENT_TYPE_FIELD = 'el_contenttype'
+PRODUCT_FIELD = 'el_product'
+ROLE_FIELD = 'el_role'
+
+# Longest snippet kept per result
+SNIPPET_MAX_CHARS = 300
+
+# Without a token, searches are answered from the sitemap catalog and the local
+# index, with this many characters of context around each local index passage
+SEARCH_NOT_CONFIGURED = (
+    'The Experience League search API is not configured '
+    '(set MCP_SEARCH_TOKEN and MCP_SEARCH_ORGANIZATION_ID).'
+)
+FALLBACK_CONTEXT_CHARS = 150
+
+# Searches of a multi-query search run at the same time, and at most in total
+SEARCH_CONCURRENCY = int(os.getenv('MCP_SEARCH_CONCURRENCY', '5'))
+MAX_FANOUT_SEARCHES = 20
+
+# Reciprocal-rank fusion constant: larger values flatten the advantage of top ranks
+RRF_K = 60
+
+# Query parameters that do not change the page a result points to
+IGNORED_RESULT_PARAMS = frozenset(['lang'])
 
 
 def build_experience_league_search_url(
@@ -120,3 +168,292 @@ ROLES = [
     'Architect',
     'Business Practitioner',
 ]
+
+
+def search_cache_key(
+    query: str,
+    content_types: Optional[List[str]] = None,
+    products: Optional[List[str]] = None,
+    roles: Optional[List[str]] = None,
+) -> str:
+    """Normalize a query and its filters into a cache key.
+
+    Case, repeated whitespace and the order and repetition of filter values
+    do not change the results, so they do not change the key.
+
+    Args:
+        query: Search query string
+        content_types: Content types to filter
+        products: Products to filter
+        roles: Roles to filter
+
+    Returns:
+        Cache key
+    """
+    filters = [
+        sorted({value.strip().lower() for value in values or []})
+        for values in (content_types, products, roles)
+    ]
+    return json.dumps([' '.join(query.lower().split()), *filters])
+
+
+def build_search_request(
+    query: str,
+    content_types: Optional[List[str]] = None,
+    products: Optional[List[str]] = None,
+    roles: Optional[List[str]] = None,
+    count: int = SEARCH_RESULTS,
+) -> Dict[str, Any]:
+    """Build the JSON body of a search API request.
+
+    Args:
+        query: Search query string
+        content_types: Content types to filter
+        products: Products to filter
+        roles: Roles to filter
+        count: Number of results to request
+
+    Returns:
+        Request body
+    """
+    expressions = []
+    for field, values in (
+        (CONTENT_TYPE_FIELD, content_types),
+        (PRODUCT_FIELD, products),
+        (ROLE_FIELD, roles),
+    ):
+        if isinstance(values, str):
+            values = [values]
+        if values:
+            quoted = ','.join('"' + value.replace('"', '\\"') + '"' for value in values)
+            expressions.append(f'@{field}==({quoted})')
+    body: Dict[str, Any] = {
+        'q': query,
+        'numberOfResults': count,
+        'firstResult': 0,
+        'fieldsToInclude': [CONTENT_TYPE_FIELD, PRODUCT_FIELD],
+    }
+    if expressions:
+        body['aq'] = ' '.join(expressions)
+    return body
+
+
+def parse_search_response(data: Any) -> Tuple[List[SearchResult], int]:
+    """Parse a search API response into result records.
+
+    Args:
+        data: Decoded JSON response
+
+    Returns:
+        Tuple of (results, total number of matches)
+
+    Raises:
+        ValueError: If the response is not a search response
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('results'), list):
+        raise ValueError('Unexpected search response')
+
+    results = []
+    for item in data['results']:
+        if not isinstance(item, dict):
+            continue
+        url = item.get('clickUri') or item.get('uri')
+        if not url:
+            continue
+        raw = item.get('raw') if isinstance(item.get('raw'), dict) else {}
+        snippet = ' '.join(str(item.get('excerpt') or '').split())
+        if len(snippet) > SNIPPET_MAX_CHARS:
+            snippet = snippet[: SNIPPET_MAX_CHARS - 3].rstrip() + '...'
+        results.append(
+            SearchResult(
+                title=' '.join(str(item.get('title') or url).split()),
+                url=url,
+                snippet=snippet or None,
+                content_type=_field_value(raw.get(CONTENT_TYPE_FIELD)),
+                product=_field_value(raw.get(PRODUCT_FIELD)),
+            )
+        )
+    total = data.get('totalCount')
+    return results, total if isinstance(total, int) else len(results)
+
+
+def _field_value(value: Any) -> Optional[str]:
+    """Join a single or multi-valued index field into one string."""
+    if isinstance(value, list):
+        value = ', '.join(str(item) for item in value if item)
+    return str(value) if value else None
+
+
+def render_search_results(
+    query: str, results: List[SearchResult], total: int, search_url: str
+) -> str:
+    """Render search results as compact markdown.
+
+    Args:
+        query: Search query string
+        results: Parsed results
+        total: Total number of matches
+        search_url: Experience League search page with the same query and filters
+
+    Returns:
+        Markdown list of the results
+    """
+    lines = [f'# Experience League search: {query}', '']
+    if not results:
+        lines.append(f'No results. Search page: {search_url}')
+        return '\n'.join(lines)
+
+    lines.append(f'{total} results, showing {len(results)}. Search page: {search_url}')
+    lines.append('')
+    lines.extend(_result_lines(results))
+    return '\n'.join(lines)
+
+
+def render_fallback_results(
+    query: str,
+    reason: str,
+    search_url: str,
+    catalog_result: CatalogLookupResult,
+    local_result: LocalSearchResult,
+) -> str:
+    """Render the catalog and local index matches returned when the search API cannot be used.
+
+    Args:
+        query: Search query string
+        reason: Why the search API was not queried, shown first
+        search_url: Experience League search page with the same query and filters
+        catalog_result: Sitemap catalog lookup of the query
+        local_result: Local index search of the query
+
+    Returns:
+        Markdown with the reason and both lists of pages
+    """
+    lines = [f'# Experience League search: {query}', '']
+    lines.append(f'{reason} Search page (open in a browser): {search_url}')
+    lines.extend(['', '## Sitemap catalog', ''])
+    if catalog_result.error:
+        lines.append(catalog_result.error)
+    elif not catalog_result.entries:
+        lines.append('No matching pages.')
+    for number, entry in enumerate(catalog_result.entries, start=1):
+        lines.append(f'{number}. [{entry.title}]({entry.url})')
+
+    lines.extend(['', '## Local index', ''])
+    if local_result.error:
+        lines.append(local_result.error)
+    elif not local_result.hits:
+        lines.append('No matching pages.')
+    for number, hit in enumerate(local_result.hits, start=1):
+        section = f' - {hit.section}' if hit.section else ''
+        lines.append(f'{number}. [{hit.title or hit.url}]({hit.url}){section}')
+        lines.append(f"   {' '.join(hit.snippet.split())}")
+    return '\n'.join(lines)
+
+
+def _result_lines(results: List[SearchResult], notes: Optional[List[str]] = None) -> List[str]:
+    """Render one numbered entry per result, with an optional note after its details."""
+    lines = []
+    for number, result in enumerate(results, start=1):
+        details = [value for value in (result.content_type, result.product) if value]
+        if notes is not None:
+            details.append(notes[number - 1])
+        joined = ' · '.join(details)
+        lines.append(
+            f'{number}. [{result.title}]({result.url})' + (f' - {joined}' if joined else '')
+        )
+        if result.snippet:
+            lines.append(f'   {result.snippet}')
+    return lines
+
+
+def result_key(url: str) -> str:
+    """Identify the page a search result points to, for de-duplication.
+
+    The fragment, a trailing slash and parameters such as ``lang`` are dropped
+    on top of ``canonicalize_url``, so links to the same page found by
+    different searches are recognised as one hit.
+
+    Args:
+        url: URL of a search result
+
+    Returns:
+        De-duplication key
+    """
+    parsed = urlparse(canonicalize_url(url))
+    query = urlencode(
+        [
+            (name, value)
+            for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if name not in IGNORED_RESULT_PARAMS
+        ]
+    )
+    path = parsed.path.rstrip('/') or '/'
+    return urlunparse((parsed.scheme, parsed.netloc, path, parsed.params, query, ''))
+
+
+def fuse_rankings(
+    rankings: List[List[SearchResult]], k: int = RRF_K
+) -> List[Tuple[SearchResult, int]]:
+    """Merge ranked result lists with reciprocal-rank fusion.
+
+    Each result scores ``1 / (k + rank)`` in every list it appears in, and the
+    scores of the same page (see ``result_key``) are summed. Pages found by
+    several searches therefore rise above pages only one search ranked high.
+    A page is represented by its best-ranked occurrence; ties keep the order
+    in which the pages were first seen.
+
+    Args:
+        rankings: Result lists, best match first
+        k: Fusion constant
+
+    Returns:
+        De-duplicated results, best first, each with the number of lists it appeared in
+    """
+    scores: Dict[str, float] = {}
+    best: Dict[str, Tuple[int, SearchResult]] = {}
+    found_in: Dict[str, int] = {}
+    for results in rankings:
+        seen = set()
+        for rank, result in enumerate(results, start=1):
+            key = result_key(result.url)
+            if key in seen:
+                continue
+            seen.add(key)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            found_in[key] = found_in.get(key, 0) + 1
+            if key not in best or rank < best[key][0]:
+                best[key] = (rank, result)
+    ordered = sorted(scores, key=scores.__getitem__, reverse=True)
+    return [(best[key][1], found_in[key]) for key in ordered]
+
+
+def render_fused_results(
+    queries: List[str],
+    fused: List[Tuple[SearchResult, int]],
+    searches: int,
+    failures: List[str],
+) -> str:
+    """Render the merged results of a multi-query search as compact markdown.
+
+    Args:
+        queries: Search queries
+        fused: Results of ``fuse_rankings``, already cut to the number to show
+        searches: Number of searches that returned results
+        failures: Descriptions of the searches that failed
+
+    Returns:
+        Markdown list of the results
+    """
+    lines = ['# Experience League search: ' + ' | '.join(queries), '']
+    if not fused:
+        lines.append(f'No results from {searches} searches.')
+    else:
+        lines.append(f'{len(fused)} results merged from {searches} searches.')
+        lines.append('')
+        notes = [f'found by {count} of {searches} searches' for _, count in fused]
+        lines.extend(_result_lines([result for result, _ in fused], notes))
+    if failures:
+        lines.append('')
+        lines.append('Failed searches:')
+        lines.extend(f'- {failure}' for failure in failures)
+    return '\n'.join(lines)
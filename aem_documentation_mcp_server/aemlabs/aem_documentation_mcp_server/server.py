@@ -13,27 +13,47 @@
 # limitations under the License.
 """Adobe AEM Documentation MCP Server implementation."""
 
+import asyncio
 import os
 import sys
 import uuid
-from aemlabs.aem_documentation_mcp_server.models import ServiceInfo
+from aemlabs.aem_documentation_mcp_server import server_utils
+from aemlabs.aem_documentation_mcp_server.document_utils import profile_stats
+from aemlabs.aem_documentation_mcp_server.http_utils import http_pool
+from aemlabs.aem_documentation_mcp_server.models import (
+    BatchReadResult,
+    CatalogLookupResult,
+    DocumentationOutline,
+    GrepResult,
+    LocalSearchResult,
+    RelatedDocumentationResult,
+    ServiceInfo,
+)
 from aemlabs.aem_documentation_mcp_server.server_utils import (
     DEFAULT_USER_AGENT,
+    find_related_documentation_impl,
+    get_documentation_outline_impl,
+    grep_documentation_impl,
+    lookup_documentation_impl,
+    read_documentation_batch_impl,
     read_documentation_impl,
+    search_experience_league_impl,
+    search_experience_league_multi_impl,
+    search_local_docs_impl,
     validate_adobe_url,
 )
 from aemlabs.aem_documentation_mcp_server.search_utils import (
-    build_experience_league_search_url,
     EXPERIENCE_MANAGER_PRODUCTS,
     ALL_PRODUCTS,
     CONTENT_TYPES,
     ROLES,
 )
+from contextlib import asynccontextmanager
 from loguru import logger
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
 from pydantic.fields import FieldInfo
-from typing import List, Optional, Union
+from typing import AsyncIterator, List, Optional, Union
 
 
 # Set up logging
@@ -42,6 +62,39 @@ logger.add(sys.stderr, level=os.getenv('FASTMCP_LOG_LEVEL', 'WARNING'))
 
 SESSION_UUID = str(uuid.uuid4())
 
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Own process-wide resources for the lifetime of the MCP server.
+
+    The pooled HTTP clients are shared by every tool call so that consecutive reads
+    reuse warm keep-alive connections, and are closed when the server shuts down
+    together with the conversion worker pool.
+
+    Args:
+        server: FastMCP server instance being started
+    """
+    logger.debug('Starting HTTP client pool')
+    try:
+        yield
+    finally:
+        for task in server_utils.catalog_tasks:
+            task.cancel()
+        await asyncio.gather(*server_utils.catalog_tasks, return_exceptions=True)
+        logger.info(f'HTTP client pool statistics: {http_pool.get_stats()}')
+        logger.info(f'Per-host request statistics: {server_utils.host_resilience.get_stats()}')
+        await http_pool.aclose()
+        logger.info(
+            f'Conversion executor statistics: {server_utils.conversion_executor.get_stats()}'
+        )
+        server_utils.conversion_executor.shutdown(wait=False)
+        server_utils.regex_worker.shutdown()
+        logger.info(f'Extraction profile statistics: {profile_stats.get_stats()}')
+        await asyncio.gather(*server_utils.index_tasks, return_exceptions=True)
+        server_utils.local_index.close_connection()
+        server_utils.catalog.close_connection()
+
+
 mcp = FastMCP(
     'aemlabs.aem-documentation-mcp-server',
     instructions="""
@@ -54,16 +107,26 @@ mcp = FastMCP(
 
     - Use `search_experience_league` to find relevant documentation before reading specific pages
     - Always use `get_available_services` first to see available AEM documentation areas
-    - For long documentation pages, make multiple calls to `read_documentation` with different `start_index` values for pagination
+    - For long documentation pages, call `get_documentation_outline` first and read the section you need at its `start_index`
+    - Otherwise, make multiple calls to `read_documentation` with different `start_index` values for pagination
+    - When you need several known pages, read them together with `read_documentation_batch`
     - For very long documents (>30,000 characters), stop reading if you've found the needed information
     - Always cite the documentation URL when providing information to users
     - Hash fragments in URLs are preserved for search pages and adapt.to conference schedules
+    - Deep links with a section anchor return just that section; read the URL without the anchor for the whole page
 
     ## Tool Selection Guide
 
     - Use `search_experience_league` when: You need to find documentation about a specific topic
+    - Use `search_experience_league_multi` when: You want to search several phrasings or products at once
     - Use `get_available_services` when: You need to know what AEM services and documentation areas are available
     - Use `read_documentation` when: You have a specific documentation URL and need its content converted to markdown
+    - Use `read_documentation_batch` when: You have several documentation URLs and need all of them
+    - Use `get_documentation_outline` when: You need one section of a long page and want to jump straight to it
+    - Use `grep_documentation` when: You look for specific terms (an issue ID, a property, an API name) in a long page
+    - Use `search_local_docs` when: The topic is likely covered by pages already read; it answers instantly without network access
+    - Use `lookup_documentation` when: You need the URL of a page you can name (e.g. "sling models injectors") or the pages under a URL prefix, without a web search
+    - Use `find_related_documentation` when: You need pages similar to a page or a description, such as the AEM 6.5 equivalent of a Cloud Service page
 
     ## Supported Domains
 
@@ -93,6 +156,7 @@ mcp = FastMCP(
         'beautifulsoup4',
         'markdownify',
     ],
+    lifespan=server_lifespan,
 )
 
 
@@ -127,7 +191,10 @@ async def read_documentation(
       - developer.adobe.com
       - helpx.adobe.com
       - docs.adobe.com
-    - Hash fragments (#) are automatically removed before fetching
+    - Hash fragments (#) are removed before fetching; a fragment naming a heading of the
+      page (e.g. `#configure-the-dispatcher`) or an element id linking to one returns
+      only that section, with `start_index`
+      counted from the start of the section, and an unknown fragment returns the whole page
 
     ## Example URLs
 
@@ -179,6 +246,178 @@ async def read_documentation(
     return await read_documentation_impl(ctx, url_str, max_length, start_index, SESSION_UUID)
 
 
+@mcp.tool()
+async def read_documentation_batch(
+    ctx: Context,
+    urls: List[str] = Field(
+        description='URLs of the Adobe AEM documentation pages to read',
+        min_length=1,
+        max_length=20,
+    ),
+    max_length: int = Field(
+        default=10000,
+        description='Maximum number of characters to return for each page.',
+        gt=0,
+        lt=1000000,
+    ),
+    max_concurrency: int = Field(
+        default=5,
+        description='Maximum number of pages fetched at the same time.',
+        ge=1,
+        le=10,
+    ),
+    timeout: float = Field(
+        default=30.0,
+        description='Maximum number of seconds spent on each page.',
+        gt=0,
+        le=120,
+    ),
+) -> List[BatchReadResult]:
+    """Fetch and convert several Adobe AEM documentation pages in one call.
+
+    ## Usage
+
+    Use this tool instead of a chain of `read_documentation` calls when you already
+    know several related URLs (e.g. multiple Sling bundle pages listed by
+    `get_available_services`). Pages are fetched concurrently, so the whole batch
+    takes about as long as the slowest page.
+
+    ## Results
+
+    One entry is returned per URL, in the same order:
+    - `content`: First `max_length` characters of the page, formatted like `read_documentation`
+    - `error`: Why the page could not be read (invalid domain, fetch failure or timeout)
+
+    Use `read_documentation` with `start_index` to continue reading a truncated page.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        urls: URLs of the documentation pages to read
+        max_length: Maximum number of characters to return for each page
+        max_concurrency: Maximum number of pages fetched at the same time
+        timeout: Maximum number of seconds spent on each page
+
+    Returns:
+        Per-URL results and errors
+    """
+    return await read_documentation_batch_impl(
+        ctx, urls, max_length, max_concurrency, timeout, SESSION_UUID
+    )
+
+
+@mcp.tool()
+async def get_documentation_outline(
+    ctx: Context,
+    url: str = Field(description='URL of the Adobe AEM documentation page to outline'),
+) -> DocumentationOutline:
+    """Get the heading tree of an Adobe AEM documentation page with character offsets.
+
+    ## Usage
+
+    Use this tool before reading a long page to find the section you need, then call
+    `read_documentation` once with `start_index` set to the heading's `start_index` and
+    `max_length` set to its `length`, instead of paging through the whole document.
+
+    ## Results
+
+    - `headings`: Headings in document order, each with its `level` (1-6), `text`,
+      `anchor` (slug of the text), `start_index` and `length` (characters up to the next
+      heading of the same or a higher level, so it includes subsections) and `ids` (element
+      ids of the page that link to the heading)
+    - `content_length`: Total length of the converted page
+    - `error`: Why the page could not be read
+
+    The offsets refer to the same markdown `read_documentation` returns, and the converted
+    page is cached, so the follow-up read does not fetch the page again.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        url: URL of the Adobe AEM documentation page to outline
+
+    Returns:
+        Outline of the page
+    """
+    url_str = str(url)
+
+    is_valid, error_msg = validate_adobe_url(url_str)
+    if not is_valid:
+        await ctx.error(error_msg)
+        return DocumentationOutline(url=url_str, error=error_msg)
+
+    return await get_documentation_outline_impl(ctx, url_str, SESSION_UUID)
+
+
+@mcp.tool()
+async def grep_documentation(
+    ctx: Context,
+    url: str = Field(description='URL of the Adobe AEM documentation page to search'),
+    query: str = Field(description='Text or regular expression to look for'),
+    regex: bool = Field(default=False, description='Treat the query as a regular expression'),
+    ignore_case: bool = Field(default=True, description='Match regardless of case'),
+    context_chars: int = Field(
+        default=200,
+        description='Characters of context returned on each side of a match.',
+        ge=0,
+        le=2000,
+    ),
+    max_passages: int = Field(
+        default=20,
+        description='Maximum number of passages to return.',
+        ge=1,
+        le=100,
+    ),
+) -> GrepResult:
+    """Search one Adobe AEM documentation page and return the matching passages.
+
+    ## Usage
+
+    Use this tool instead of paging through a long page (release notes, API references)
+    with `read_documentation` when you look for specific terms: an issue ID such as
+    `NPR-41234`, a property, an OSGi configuration or an error message.
+
+    ## Query
+
+    - Plain text (default): words match case-insensitively, separated by any whitespace
+    - Regular expression (`regex=True`): Python syntax, e.g. `NPR-4[0-9]{4}` or `sling:(resourceType|resourceSuperType)`;
+      a search running longer than `MCP_GREP_REGEX_TIMEOUT` seconds is stopped
+
+    ## Results
+
+    - `passages`: Matching passages in document order, with `context_chars` of context around
+      the matches; matches close to each other share one passage
+    - `start_index` / `match_indexes`: Offsets of the passage and its matches, usable as
+      `start_index` for `read_documentation` on the same URL
+    - `section`: Heading the passage is under
+    - `total_matches`: Number of matches in the whole page, including passages not returned
+    - `truncated`: True when the page is too long to be searched entirely; only its start
+      (`MCP_GREP_MAX_CHARS`) was searched
+
+    The converted page is cached, so further searches of the same page are fast.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        url: URL of the Adobe AEM documentation page to search
+        query: Text or regular expression to look for
+        regex: Treat the query as a regular expression
+        ignore_case: Match regardless of case
+        context_chars: Characters of context returned on each side of a match
+        max_passages: Maximum number of passages to return
+
+    Returns:
+        Matching passages
+    """
+    url_str = str(url)
+
+    is_valid, error_msg = validate_adobe_url(url_str)
+    if not is_valid:
+        await ctx.error(error_msg)
+        return GrepResult(url=url_str, query=query, error=error_msg)
+
+    return await grep_documentation_impl(
+        ctx, url_str, query, regex, ignore_case, context_chars, max_passages, SESSION_UUID
+    )
+
+
 @mcp.tool()
 async def search_experience_league(
     ctx: Context,
@@ -204,8 +443,15 @@ async def search_experience_league(
 
     ## Usage
 
-    This tool generates a search URL for Adobe Experience League and fetches the results.
+    This tool searches Adobe Experience League and returns the results as a compact
+    markdown list: title, URL, content type, product and a snippet per result.
     You can filter by content types, products, and roles to narrow down results.
+    Identical searches (regardless of case, spacing and filter order) are served from
+    a short-lived cache.
+
+    When the search API is not configured (no MCP_SEARCH_TOKEN, the default) or fails, the
+    result says so and lists the matching pages of the sitemap catalog and the local index
+    instead; the filters are not applied to them.
 
     ## Parameters
 
@@ -269,18 +515,320 @@ async def search_experience_league(
             products = EXPERIENCE_MANAGER_PRODUCTS
             await ctx.info(f'Including all AEM products in search: {len(products)} products')
     
-    # Build search URL
-    search_url = build_experience_league_search_url(
-        query=query,
+    return await search_experience_league_impl(
+        ctx,
+        query,
         content_types=content_types if content_types else None,
         products=products,
         roles=roles,
+        session_uuid=SESSION_UUID,
+    )
+
+
+@mcp.tool()
+async def search_experience_league_multi(
+    ctx: Context,
+    queries: List[str] = Field(
+        description='Search query strings, e.g. variants of the same question',
+        min_length=1,
+        max_length=10,
+    ),
+    content_types: List[str] = Field(
+        default=['Documentation'],
+        description='Content types to search (Documentation, Tutorial, Troubleshooting, etc.)',
+    ),
+    products: Optional[List[str]] = Field(
+        default=None,
+        description='Products to filter (e.g., Experience Manager, Experience Manager|as a Cloud Service)',
+    ),
+    roles: Optional[List[str]] = Field(
+        default=None,
+        description='Roles to filter (Developer, Admin, User, etc.)',
+    ),
+    search_each_product: bool = Field(
+        default=False,
+        description='If true, run a separate search per product instead of one search for all products',
+    ),
+    include_all_aem_products: bool = Field(
+        default=False,
+        description='If true, automatically includes all AEM product variants in the search',
+    ),
+    max_results: int = Field(
+        default=20,
+        description='Maximum number of merged results to return.',
+        ge=1,
+        le=100,
+    ),
+) -> str:
+    """Run several Experience League searches at once and merge their results.
+
+    ## Usage
+
+    Use this tool instead of a chain of `search_experience_league` calls when you want
+    to try several phrasings of a question, or search each AEM product separately.
+    The searches run concurrently; their results are de-duplicated by page and merged
+    with reciprocal-rank fusion, so pages found by several searches rank first.
+
+    ## Parameters
+
+    - **queries**: Up to 10 search terms (e.g. ['sling models', 'sling model injection'])
+    - **content_types**, **products**, **roles**, **include_all_aem_products**: As for
+      `search_experience_league`, applied to every search
+    - **search_each_product**: One search per query and product (at most 20 searches in total)
+    - **max_results**: Number of merged results returned
+
+    ## Example
+
+    ```
+    search_experience_league_multi(
+        queries=['dispatcher cache invalidation', 'flush dispatcher cache'],
+        include_all_aem_products=True,
+        search_each_product=True
+    )
+    ```
+
+    Args:
+        ctx: MCP context for logging and error handling
+        queries: Search query strings
+        content_types: List of content types to filter
+        products: List of products to filter
+        roles: List of roles to filter
+        search_each_product: Search each product separately
+        include_all_aem_products: Include all AEM product variants automatically
+        max_results: Maximum number of merged results
+
+    Returns:
+        Merged search results in markdown format
+    """
+    # Handle FieldInfo objects (when called directly without MCP processing)
+    if isinstance(products, FieldInfo):
+        products = products.default
+    if isinstance(roles, FieldInfo):
+        roles = roles.default
+    if isinstance(content_types, FieldInfo):
+        content_types = content_types.default
+    if isinstance(max_results, FieldInfo):
+        max_results = max_results.default
+    if isinstance(search_each_product, FieldInfo):
+        search_each_product = search_each_product.default
+    if isinstance(include_all_aem_products, FieldInfo):
+        include_all_aem_products = include_all_aem_products.default
+
+    if include_all_aem_products and not products:
+        products = EXPERIENCE_MANAGER_PRODUCTS
+    if search_each_product and products:
+        product_sets = [[product] for product in products]
+    else:
+        product_sets = [products or None]
+
+    return await search_experience_league_multi_impl(
+        ctx,
+        queries,
+        content_types=content_types if content_types else None,
+        product_sets=product_sets,
+        roles=roles,
+        max_results=max_results,
+        session_uuid=SESSION_UUID,
+    )
+
+
+@mcp.tool()
+async def search_local_docs(
+    ctx: Context,
+    query: str = Field(
+        description='Words to search for; wrap words in double quotes to require an exact phrase'
+    ),
+    max_results: int = Field(
+        default=10,
+        description='Maximum number of pages to return.',
+        ge=1,
+        le=50,
+    ),
+    context_chars: int = Field(
+        default=150,
+        description='Characters of context returned on each side of the best passage of a page.',
+        ge=0,
+        le=1000,
+    ),
+) -> LocalSearchResult:
+    """Search the documentation pages this server has already read, without network access.
+
+    ## Usage
+
+    Every page read through this server is added to a persistent local full-text
+    index that survives restarts. This tool ranks the indexed pages with BM25 and
+    answers in milliseconds, so try it first for AEM areas you have read before;
+    use `search_experience_league` when it finds nothing relevant.
+
+    Words are matched regardless of case and of common inflections ('cache',
+    'cached', 'caching'). Pages matching more of the words rank first; a quoted
+    phrase such as `"flush the dispatcher cache"` must appear as written.
+
+    ## Results
+
+    One hit per page, best first, with:
+    - `url`, `title` and `score`
+    - `start_index`: Offset of the best passage; pass it to `read_documentation`
+      with the same URL to continue reading there
+    - `section`: Heading of the section containing the passage
+    - `snippet`: The passage with `context_chars` of context on each side
+
+    Args:
+        ctx: MCP context for logging and error handling
+        query: Words and quoted phrases to search for
+        max_results: Maximum number of pages to return
+        context_chars: Characters of context on each side of the passage
+
+    Returns:
+        Ranked pages with their best passage, or an error
+    """
+    return await search_local_docs_impl(ctx, query, max_results, context_chars)
+
+
+@mcp.tool()
+async def lookup_documentation(
+    ctx: Context,
+    query: Optional[str] = Field(
+        default=None,
+        description='Words naming the page, e.g. "sling models injectors"',
+    ),
+    url_prefix: Optional[str] = Field(
+        default=None,
+        description=(
+            'Only return pages whose URL starts with this prefix, e.g. '
+            '"experienceleague.adobe.com/en/docs/experience-manager-65"'
+        ),
+    ),
+    max_results: int = Field(
+        default=10,
+        description='Maximum number of pages to return.',
+        ge=1,
+        le=100,
+    ),
+) -> CatalogLookupResult:
+    """Resolve a page name to documentation URLs from the sites' sitemaps.
+
+    ## Usage
+
+    The server keeps a catalog of every page listed in the sitemaps of Experience
+    League, developer.adobe.com, the Apache Sling site and adaptTo(). Use this tool to
+    turn a description such as "sling models injectors" into candidate URLs before
+    calling `read_documentation`, instead of guessing URLs or searching the web.
+
+    Query words are matched against the words of each URL (host, path and page name),
+    also by prefix ('inject' finds 'injectors') and with one typo; rare words weigh more.
+    `url_prefix` restricts the results to one area of a site; given alone, it lists the
+    pages under that prefix. The first lookup reads the sitemaps, which takes a while;
+    later lookups answer from the local catalog.
+
+    ## Results
+
+    One entry per page with `url`, `title` (derived from the URL until the page is
+    read), `lastmod` from the sitemap and `score` (absent for prefix listings).
+
+    Args:
+        ctx: MCP context for logging and error handling
+        query: Words naming the page
+        url_prefix: Only return pages whose URL starts with this prefix
+        max_results: Maximum number of pages to return
+
+    Returns:
+        Matching catalog entries, or an error
+    """
+    # Handle FieldInfo objects (when called directly without MCP processing)
+    if isinstance(query, FieldInfo):
+        query = query.default
+    if isinstance(url_prefix, FieldInfo):
+        url_prefix = url_prefix.default
+    if isinstance(max_results, FieldInfo):
+        max_results = max_results.default
+
+    return await lookup_documentation_impl(
+        ctx, query, url_prefix, max_results, session_uuid=SESSION_UUID
+    )
+
+
+@mcp.tool()
+async def find_related_documentation(
+    ctx: Context,
+    query: Optional[str] = Field(
+        default=None,
+        description='Description of the content to find, e.g. "configure dispatcher cache flush"',
+    ),
+    url: Optional[str] = Field(
+        default=None,
+        description='URL of a documentation page to find related pages for',
+    ),
+    max_results: int = Field(
+        default=10,
+        description='Maximum number of pages to return.',
+        ge=1,
+        le=50,
+    ),
+    url_contains: Optional[str] = Field(
+        default=None,
+        description=(
+            'Only return pages whose URL contains this text, e.g. "experience-manager-65" '
+            'for AEM 6.5 or "experience-manager-cloud-service" for AEM as a Cloud Service'
+        ),
+    ),
+) -> RelatedDocumentationResult:
+    """Find documentation pages similar to a page or a description, without network searches.
+
+    ## Usage
+
+    Every page read through this server is split into sections and added to a
+    persistent similarity index. This tool compares a description (`query`), a
+    page (`url`), or both, with the indexed sections and returns the most similar
+    pages. Use it to find the counterpart of a page in another AEM version, e.g.
+    the AEM 6.5 page matching a Cloud Service page:
+
+    ```
+    find_related_documentation(
+        url='https://experienceleague.adobe.com/en/docs/experience-manager-cloud-service/content/implementing/content-delivery/caching',
+        url_contains='experience-manager-65'
+    )
+    ```
+
+    Only pages read before (by any tool) can be found; a `url` is read and indexed
+    first. Results improve as more pages are read, so read or search the area first
+    when nothing relevant is returned. Requires the optional NumPy dependency.
+
+    ## Results
+
+    One entry per page, most similar first, with:
+    - `url`, `title` and `score` (cosine similarity, 0 to 1)
+    - `section` and `start_index`: The most similar section; pass `start_index` to
+      `read_documentation` with the same URL to read it
+
+    Args:
+        ctx: MCP context for logging and error handling
+        query: Description of the content to find
+        url: URL of a page to find related pages for
+        max_results: Maximum number of pages to return
+        url_contains: Only return pages whose URL contains this text
+
+    Returns:
+        Related pages with their most similar section, or an error
+    """
+    # Handle FieldInfo objects (when called directly without MCP processing)
+    if isinstance(query, FieldInfo):
+        query = query.default
+    if isinstance(url, FieldInfo):
+        url = url.default
+    if isinstance(max_results, FieldInfo):
+        max_results = max_results.default
+    if isinstance(url_contains, FieldInfo):
+        url_contains = url_contains.default
+
+    if url:
+        is_valid, error_msg = validate_adobe_url(url)
+        if not is_valid:
+            await ctx.error(error_msg)
+            return RelatedDocumentationResult(query=query, url=url, error=error_msg)
+    return await find_related_documentation_impl(
+        ctx, query, url, max_results, url_contains, session_uuid=SESSION_UUID
     )
-    
-    await ctx.info(f'Search URL: {search_url}')
-    
-    # Fetch and return search results
-    return await read_documentation_impl(ctx, search_url, 10000, 0, SESSION_UUID)
 
 
 @mcp.tool()
@@ -13,15 +13,99 @@
 # limitations under the License.
 """Shared utilities for Adobe AEM Documentation MCP Server."""
 
+import asyncio
 import httpx
 import os
+import re
+import sqlite3
+from aemlabs.aem_documentation_mcp_server.cache_utils import (
+    CachedDocument,
+    HttpCacheEntry,
+    build_cache_entry,
+    document_cache,
+    http_cache,
+    is_storable,
+    search_cache,
+)
+from aemlabs.aem_documentation_mcp_server.catalog_utils import (
+    CATALOG_SITEMAPS,
+    SITEMAP_MAX_DEPTH,
+    SITEMAP_MAX_FILES,
+    SitemapEntry,
+    SitemapParser,
+    catalog,
+)
+from aemlabs.aem_documentation_mcp_server.concurrency_utils import (
+    SingleFlight,
+    conversion_executor,
+)
+from aemlabs.aem_documentation_mcp_server.document_utils import (
+    EXTRACTION_REVISION,
+    profile_stats,
+    resolve_parser,
+)
+from aemlabs.aem_documentation_mcp_server.http_utils import (
+    ResponseTooLargeError,
+    http_pool,
+    read_body,
+)
+from aemlabs.aem_documentation_mcp_server.grep_utils import (
+    MAX_SCAN_CHARS,
+    compile_query,
+    grep_content,
+    regex_worker,
+)
+from aemlabs.aem_documentation_mcp_server.index_utils import local_index, parse_query, tokenize
+from aemlabs.aem_documentation_mcp_server.models import (
+    BatchReadResult,
+    CatalogLookupResult,
+    DocumentationOutline,
+    GrepResult,
+    LocalSearchResult,
+    RelatedDocumentationResult,
+    SearchResult,
+)
+from aemlabs.aem_documentation_mcp_server.outline_utils import find_heading
+from aemlabs.aem_documentation_mcp_server.resilience_utils import (
+    CircuitOpenError,
+    HostPolicy,
+    HostResilience,
+)
+from aemlabs.aem_documentation_mcp_server.search_utils import (
+    FALLBACK_CONTEXT_CHARS,
+    MAX_FANOUT_SEARCHES,
+    SEARCH_CONCURRENCY,
+    SEARCH_ENDPOINT,
+    SEARCH_NOT_CONFIGURED,
+    SEARCH_ORGANIZATION_ID,
+    SEARCH_RESULTS,
+    SEARCH_TOKEN,
+    build_experience_league_search_url,
+    build_search_request,
+    fuse_rankings,
+    parse_search_response,
+    render_fallback_results,
+    render_fused_results,
+    render_search_results,
+    search_cache_key,
+)
+from aemlabs.aem_documentation_mcp_server.streaming_utils import (
+    StreamingConverter,
+    resolve_converter,
+)
+from aemlabs.aem_documentation_mcp_server.table_utils import TABLE_MAX_ROWS
+from collections import deque
 from functools import lru_cache
 from aemlabs.aem_documentation_mcp_server.util import (
-    extract_content_from_html,
-    extract_page_title,
+    LAZY_CONVERSION,
+    canonicalize_url,
+    ConvertedPage,
+    convert_page,
+    converted_from_stream,
     format_documentation_result,
-    is_html_content,
+    is_binary_content_type,
 )
+from aemlabs.aem_documentation_mcp_server.vector_utils import is_numpy_available, vector_index
 from aemlabs.aem_documentation_mcp_server.youtube_utils import (
     extract_video_id,
     is_youtube_url,
@@ -29,7 +113,7 @@ from aemlabs.aem_documentation_mcp_server.youtube_utils import (
 from importlib.metadata import version
 from loguru import logger
 from mcp.server.fastmcp import Context
-from typing import Optional
+from typing import List, Optional, Set, Tuple, Union
 from urllib.parse import urlparse
 
 
@@ -48,6 +132,21 @@ DEFAULT_USER_AGENT = (
     f'{BASE_USER_AGENT} ModelContextProtocol/{__version__} (Adobe AEM Documentation Server)'
 )
 
+# Concurrent reads of the same page share one fetch and conversion
+fetch_flights: SingleFlight[Union[CachedDocument, str]] = SingleFlight()
+
+# Concurrent identical searches share one search API request
+search_flights: SingleFlight[Tuple[List[SearchResult], int]] = SingleFlight()
+
+# Pages being added to the local full-text index in the background
+index_tasks: Set[asyncio.Task] = set()
+
+# Concurrent catalog refreshes share one crawl of the stale sitemaps
+catalog_flights: SingleFlight[List[str]] = SingleFlight()
+
+# Catalog refreshes running in the background
+catalog_tasks: Set[asyncio.Task] = set()
+
 
 async def read_documentation_impl(
     ctx: Context,
@@ -59,7 +158,9 @@ async def read_documentation_impl(
     """Implementation of the read_documentation tool.
 
     This function fetches Adobe AEM documentation pages and converts them
-    to Markdown format with support for pagination.
+    to Markdown format with support for pagination. When the URL's fragment
+    addresses a heading of the page, only that section is returned and
+    ``start_index`` counts from its start.
 
     Args:
         ctx: MCP context for logging and error handling
@@ -71,6 +172,29 @@ async def read_documentation_impl(
     Returns:
         Formatted markdown documentation or error message
     """
+    result, _ = await _read_documentation(ctx, url_str, max_length, start_index, session_uuid)
+    return result
+
+
+async def _read_documentation(
+    ctx: Context,
+    url_str: str,
+    max_length: int,
+    start_index: int,
+    session_uuid: str,
+) -> tuple[str, bool]:
+    """Read one documentation page, reporting whether it succeeded.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        url_str: URL of the documentation page
+        max_length: Maximum number of characters to return
+        start_index: Starting character index for pagination
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        Tuple of (formatted markdown documentation or error message, success flag)
+    """
     logger.debug(f'Fetching Adobe AEM documentation from {url_str}')
 
     # Special handling for YouTube URLs
@@ -90,7 +214,7 @@ async def read_documentation_impl(
             content += 'and API access not included in this version.\n'
 
             result, _ = format_documentation_result(url_str, content, start_index, max_length)
-            return result
+            return result, True
 
     # Parse URL and check if it's a PDF file
     parsed_url = urlparse(url_str)
@@ -122,79 +246,1077 @@ async def read_documentation_impl(
             content += '- Performance optimization techniques\n\n'
         
         result, _ = format_documentation_result(url_str, content, start_index, max_length)
-        return result
+        return result, True
+
+    document = await load_page_content(ctx, url_str, session_uuid, start_index + max_length)
+    if isinstance(document, str):
+        return document, False
+    content = document.content
+
+    # Format with pagination
+    result, is_truncated = format_documentation_result(
+        url_str, content, start_index, max_length, complete=document.complete
+    )
+
+    # Log if content was truncated
+    if is_truncated:
+        logger.debug(
+            f'Content truncated at {start_index + max_length} of {len(content)} characters'
+        )
+
+    return result, True
+
+
+def documentation_fetch_url(url_str: str) -> tuple[str, bool]:
+    """Get the URL to fetch for a documentation page.
+
+    Args:
+        url_str: URL as requested by the caller
 
+    Returns:
+        Tuple of (URL to fetch, whether its hash fragment was preserved)
+    """
     # Parse URL and check if it's a search page
-    is_search_page = '/search' in parsed_url.path or (parsed_url.fragment and parsed_url.fragment.startswith('q='))
+    parsed_url = urlparse(url_str)
+    is_search_page = '/search' in parsed_url.path or (
+        parsed_url.fragment and parsed_url.fragment.startswith('q=')
+    )
     is_adaptto = 'adapt.to' in parsed_url.netloc
-    
+
     # For search pages, preserve the hash fragment as it contains search parameters
     # For adapt.to, preserve hash fragments for day navigation (e.g., #day-1, #day-2)
     if is_search_page or is_adaptto:
-        clean_url = url_str
-        await ctx.info(f'Detected special page type (search or adapt.to), preserving hash fragment')
+        return url_str, True
+    # Remove hash fragment for regular documentation pages
+    return parsed_url._replace(fragment='').geturl(), False
+
+
+async def load_page_content(
+    ctx: Context, url_str: str, session_uuid: str, min_chars: Optional[int] = None
+) -> Union[CachedDocument, str]:
+    """Load the converted content a documentation URL addresses.
+
+    When the URL's fragment addresses a heading of the page (deep links),
+    only that section is returned; otherwise the whole page is.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        url_str: URL as requested by the caller
+        session_uuid: Unique session identifier for tracking
+        min_chars: Number of characters the caller needs (None reads all)
+
+    Returns:
+        Converted document or section, or an error message if the page could not be fetched
+    """
+    clean_url, fragment_preserved = documentation_fetch_url(url_str)
+    if fragment_preserved:
+        await ctx.info('Detected special page type (search or adapt.to), preserving hash fragment')
+        fragment = ''
     else:
-        # Remove hash fragment for regular documentation pages
-        clean_url = parsed_url._replace(fragment='').geturl()
+        fragment = urlparse(url_str).fragment
+
+    # A section can end anywhere in the page, so deep links need the whole document
+    document = await load_document(
+        ctx, url_str, clean_url, session_uuid, min_chars=None if fragment else min_chars
+    )
+    if isinstance(document, str) or not fragment:
+        return document
+
+    heading = find_heading(document.outline, fragment)
+    if heading is None:
+        await ctx.info(f'Section #{fragment} not found in {clean_url}, returning the full page')
+        return document
+    return document.section(heading)
+
+
+async def get_documentation_outline_impl(
+    ctx: Context, url_str: str, session_uuid: str
+) -> DocumentationOutline:
+    """Implementation of the get_documentation_outline tool.
+
+    The outline is computed from the same converted document that
+    ``read_documentation`` paginates for the URL, and is cached with it, so its
+    offsets can be passed as ``start_index`` directly.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        url_str: URL of the documentation page
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        Outline of the page, or the reason it could not be read
+    """
+    if is_youtube_url(url_str) or url_str.lower().endswith('.pdf'):
+        return DocumentationOutline(
+            url=url_str, error=f'No outline available for {url_str}: not an HTML page'
+        )
+
+    document = await load_page_content(ctx, url_str, session_uuid)
+    if isinstance(document, str):
+        return DocumentationOutline(url=url_str, error=document)
+
+    return DocumentationOutline(
+        url=url_str,
+        title=document.title,
+        content_length=document.length,
+        headings=document.outline,
+    )
+
+
+async def grep_documentation_impl(
+    ctx: Context,
+    url_str: str,
+    query: str,
+    regex: bool,
+    ignore_case: bool,
+    context_chars: int,
+    max_passages: int,
+    session_uuid: str,
+) -> GrepResult:
+    """Implementation of the grep_documentation tool.
+
+    The query runs against the converted document ``read_documentation``
+    paginates for the URL; the document is cached, so repeated queries
+    against the same page only scan it in memory. At most ``MAX_SCAN_CHARS``
+    characters are scanned, and regular expressions run in ``regex_worker``
+    so a runaway pattern is stopped after ``MCP_GREP_REGEX_TIMEOUT``.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        url_str: URL of the documentation page
+        query: Plain text or regular expression
+        regex: Whether the query is a regular expression
+        ignore_case: Match regardless of case
+        context_chars: Characters of context kept on each side of a match
+        max_passages: Maximum number of passages returned
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        Matching passages, or the reason the page could not be searched
+    """
+    try:
+        pattern = compile_query(query, regex, ignore_case)
+    except ValueError as e:
+        return GrepResult(url=url_str, query=query, error=str(e))
+
+    if is_youtube_url(url_str) or url_str.lower().endswith('.pdf'):
+        return GrepResult(
+            url=url_str, query=query, error=f'Cannot search {url_str}: not an HTML page'
+        )
+
+    document = await load_page_content(ctx, url_str, session_uuid)
+    if isinstance(document, str):
+        return GrepResult(url=url_str, query=query, error=document)
+
+    content = document.content[:MAX_SCAN_CHARS]
+    args = (content, pattern, document.outline, context_chars, max_passages)
+    try:
+        if regex:
+            passages, total = await asyncio.to_thread(regex_worker.call, grep_content, *args)
+        else:
+            passages, total = await asyncio.to_thread(grep_content, *args)
+    except TimeoutError as e:
+        error_msg = f'Regular expression search of {url_str} {e}; use a simpler pattern'
+        logger.warning(error_msg)
+        await ctx.error(error_msg)
+        return GrepResult(url=url_str, query=query, error=error_msg)
+    return GrepResult(
+        url=url_str,
+        query=query,
+        total_matches=total,
+        passages=passages,
+        truncated=len(document.content) > len(content),
+    )
+
+
+async def search_local_docs_impl(
+    ctx: Context, query: str, max_results: int, context_chars: int
+) -> LocalSearchResult:
+    """Implementation of the search_local_docs tool.
+
+    Pages still being indexed in the background are waited for first, so a
+    page read just before is already searchable.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        query: Words, optionally with "quoted phrases"
+        max_results: Maximum number of pages returned
+        context_chars: Characters of context kept on each side of a hit's passage
+
+    Returns:
+        Ranked pages with their best passage, or the reason the index could not be searched
+    """
+    if not local_index.enabled:
+        error_msg = 'The local index is disabled (MCP_LOCAL_INDEX)'
+        return LocalSearchResult(query=query, error=error_msg)
+    if not parse_query(query)[0]:
+        return LocalSearchResult(query=query, error='Query must contain at least one search term')
+    if index_tasks:
+        await asyncio.gather(*index_tasks, return_exceptions=True)
+
+    try:
+        hits = await asyncio.to_thread(local_index.search, query, max_results, context_chars)
+        indexed = await asyncio.to_thread(len, local_index)
+    except sqlite3.Error as e:
+        error_msg = f'Could not search the local index: {e}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return LocalSearchResult(query=query, error=error_msg)
+    return LocalSearchResult(query=query, indexed_documents=indexed, hits=hits)
+
+
+async def find_related_documentation_impl(
+    ctx: Context,
+    query: Optional[str],
+    url_str: Optional[str],
+    max_results: int,
+    url_contains: Optional[str],
+    session_uuid: str,
+) -> RelatedDocumentationResult:
+    """Implementation of the find_related_documentation tool.
+
+    A URL is read (or served from the document cache) and indexed first, so
+    any page can be compared with the pages read so far. Pages still being
+    indexed in the background are waited for before querying.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        query: Free-text description of the content looked for
+        url_str: URL of a page whose related pages are looked for
+        max_results: Maximum number of pages returned
+        url_contains: Only return pages whose URL contains this text
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        Similar pages with their most similar section, or the reason none could be looked up
+    """
+    result = RelatedDocumentationResult(query=query, url=url_str)
+    if not is_numpy_available():
+        result.error = 'The vector index requires NumPy (pip install numpy)'
+        return result
+    if not vector_index.enabled:
+        result.error = 'The vector index is disabled (MCP_VECTOR_INDEX)'
+        return result
+    if not (query and query.strip()) and not url_str:
+        result.error = 'Provide a query or a url'
+        return result
+    if index_tasks:
+        await asyncio.gather(*index_tasks, return_exceptions=True)
+
+    try:
+        if url_str:
+            clean_url = documentation_fetch_url(url_str)[0]
+            document = await load_document(ctx, url_str, clean_url, session_uuid)
+            if isinstance(document, str):
+                result.error = document
+                return result
+            await asyncio.to_thread(
+                vector_index.add, document.url, document.title, document.content
+            )
+            vector = await asyncio.to_thread(vector_index.page_vector, document.url)
+            if vector is None:
+                result.error = f'{clean_url} has no content to compare'
+                return result
+            if query:
+                vector = vector + vector_index.query_vector(query)
+        else:
+            vector = vector_index.query_vector(query)
+        result.related = await asyncio.to_thread(
+            vector_index.related,
+            vector,
+            max_results,
+            clean_url if url_str else None,
+            url_contains,
+        )
+        result.indexed_documents = await asyncio.to_thread(len, vector_index)
+    except (OSError, ValueError) as e:
+        error_msg = f'Could not query the vector index: {e}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        result.error = error_msg
+    return result
+
+
+async def lookup_documentation_impl(
+    ctx: Context,
+    query: Optional[str],
+    url_prefix: Optional[str],
+    max_results: int,
+    session_uuid: str,
+) -> CatalogLookupResult:
+    """Implementation of the lookup_documentation tool.
+
+    The first lookup reads the sitemaps into an empty catalog; afterwards
+    stale sitemaps are re-read in the background while lookups are answered
+    from the catalog as it is.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        query: Words describing the page
+        url_prefix: Only return pages whose URL starts with this prefix
+        max_results: Maximum number of entries returned
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        Matching catalog entries, or the reason the catalog could not be searched
+    """
+    result = CatalogLookupResult(query=query, url_prefix=url_prefix)
+    if not catalog.enabled:
+        result.error = 'The sitemap catalog is disabled (MCP_CATALOG)'
+        return result
+    if not url_prefix and not any(tokenize(query or '')):
+        result.error = 'Provide a query with at least one search term or a url_prefix'
+        return result
+
+    try:
+        stale = await asyncio.to_thread(catalog.stale_sources, CATALOG_SITEMAPS)
+        size = await asyncio.to_thread(len, catalog)
+        if stale and not size:
+            await ctx.info('Reading the documentation sitemaps into the catalog')
+            failures = await refresh_catalog(session_uuid)
+            size = await asyncio.to_thread(len, catalog)
+            if not size:
+                result.error = 'No documentation sitemap could be read: ' + '; '.join(failures)
+                await ctx.error(result.error)
+                return result
+        elif stale:
+            refresh_catalog_in_background(session_uuid)
+        result.entries = await asyncio.to_thread(catalog.lookup, query, url_prefix, max_results)
+        result.catalog_size = size
+    except sqlite3.Error as e:
+        error_msg = f'Could not search the sitemap catalog: {e}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        result.error = error_msg
+    return result
+
+
+async def refresh_catalog(session_uuid: str) -> List[str]:
+    """Re-read the stale catalog sitemaps; concurrent callers share one refresh.
+
+    Args:
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        Errors of the sitemaps that could not be read
+    """
+
+    async def refresh() -> List[str]:
+        stale = await asyncio.to_thread(catalog.stale_sources, CATALOG_SITEMAPS)
+        crawls = await asyncio.gather(*(crawl_sitemap(source, session_uuid) for source in stale))
+        failures = []
+        for source, (entries, errors) in zip(stale, crawls):
+            failures.extend(errors)
+            await asyncio.to_thread(catalog.replace_source, source, entries)
+        return failures
+
+    return await catalog_flights.do('refresh', refresh)
+
+
+def refresh_catalog_in_background(session_uuid: str) -> None:
+    """Refresh the catalog without delaying the lookup that noticed it is stale."""
+    if catalog_tasks:
+        return
+
+    async def refresh() -> None:
+        try:
+            await refresh_catalog(session_uuid)
+        except sqlite3.Error as e:
+            logger.warning(f'Could not refresh the sitemap catalog: {e}')
+
+    task = asyncio.create_task(refresh())
+    catalog_tasks.add(task)
+    task.add_done_callback(catalog_tasks.discard)
+
+
+async def crawl_sitemap(source: str, session_uuid: str) -> Tuple[List[SitemapEntry], List[str]]:
+    """Read a sitemap and, for sitemap indexes, the sitemaps it lists.
+
+    Only entries and nested sitemaps on supported documentation domains are
+    kept; nesting and the number of sitemap files read are bounded.
+
+    Args:
+        source: Sitemap or sitemap index URL
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        Tuple of (page entries, errors of the sitemap files that could not be read)
+    """
+    entries: List[SitemapEntry] = []
+    errors: List[str] = []
+    pending = deque([(source, 0)])
+    seen = {source}
+    while pending:
+        url, depth = pending.popleft()
+        try:
+            parser = await _read_sitemap(url, session_uuid)
+        except (CircuitOpenError, httpx.HTTPError, ValueError) as e:
+            logger.warning(f'Could not read sitemap {url}: {e}')
+            errors.append(f'{url}: {e}')
+            continue
+        entries.extend(entry for entry in parser.urls if validate_adobe_url(entry.url)[0])
+        if depth >= SITEMAP_MAX_DEPTH:
+            continue
+        for child in parser.sitemaps:
+            if (
+                child not in seen
+                and len(seen) < SITEMAP_MAX_FILES
+                and validate_adobe_url(child)[0]
+            ):
+                seen.add(child)
+                pending.append((child, depth + 1))
+    return entries, errors
+
+
+async def _read_sitemap(url: str, session_uuid: str) -> SitemapParser:
+    """Download a sitemap file, parsing it chunk by chunk as it arrives.
+
+    Raises:
+        CircuitOpenError: If the host's circuit breaker is open
+        httpx.HTTPError: If the request fails or returns an error status
+        ValueError: If the file is not a readable sitemap
+    """
+    headers = {
+        'User-Agent': DEFAULT_USER_AGENT,
+        'X-MCP-Session-Id': session_uuid,
+        'Accept': 'application/xml,text/xml;q=0.9,*/*;q=0.8',
+    }
+    client = http_pool.client_for(url)
+    request = client.build_request('GET', url, headers=headers)
+    response = await host_resilience.send(client, request)
+    parser = SitemapParser()
+    try:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            await asyncio.to_thread(parser.feed, chunk)
+        parser.close()
+    finally:
+        await response.aclose()
+    return parser
+
+
+async def search_experience_league_impl(
+    ctx: Context,
+    query: str,
+    content_types: Optional[List[str]],
+    products: Optional[List[str]],
+    roles: Optional[List[str]],
+    session_uuid: str,
+) -> str:
+    """Implementation of the search_experience_league tool.
+
+    With ``MCP_SEARCH_TOKEN`` set, the query goes to the JSON search API
+    behind the Experience League search page and the results are cached by
+    normalized query and filters for ``MCP_SEARCH_CACHE_TTL`` seconds. Without
+    a token, or when the search API fails, the query is looked up in the
+    sitemap catalog and the local index instead; the search page itself only
+    holds an empty search shell, so it is not read.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        query: Search query string
+        content_types: Content types to filter
+        products: Products to filter
+        roles: Roles to filter
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        Search results in markdown format
+    """
+    search_url = build_experience_league_search_url(
+        query=query, content_types=content_types, products=products, roles=roles
+    )
+    await ctx.info(f'Search URL: {search_url}')
+
+    if not SEARCH_TOKEN:
+        return await _search_fallback(ctx, query, search_url, SEARCH_NOT_CONFIGURED, session_uuid)
+
+    try:
+        results, total = await _cached_search(query, content_types, products, roles, session_uuid)
+    except (CircuitOpenError, httpx.HTTPError, ValueError) as e:
+        logger.warning(f'Search API failed for {query!r}, using the catalog and local index: {e}')
+        reason = f'The Experience League search API is unavailable ({e}).'
+        return await _search_fallback(ctx, query, search_url, reason, session_uuid)
+
+    return render_search_results(query, results, total, search_url)
+
+
+async def _search_fallback(
+    ctx: Context, query: str, search_url: str, reason: str, session_uuid: str
+) -> str:
+    """Answer a search from the sitemap catalog and the local index.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        query: Search query string
+        search_url: Experience League search page with the same query and filters
+        reason: Why the search API was not queried
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        The reason followed by the matching catalog and local index pages
+    """
+    await ctx.info(f'{reason} Searching the sitemap catalog and the local index instead')
+    catalog_result, local_result = await asyncio.gather(
+        lookup_documentation_impl(ctx, query, None, SEARCH_RESULTS, session_uuid),
+        search_local_docs_impl(ctx, query, SEARCH_RESULTS, FALLBACK_CONTEXT_CHARS),
+    )
+    return render_fallback_results(query, reason, search_url, catalog_result, local_result)
+
+
+async def search_experience_league_multi_impl(
+    ctx: Context,
+    queries: List[str],
+    content_types: Optional[List[str]],
+    product_sets: List[Optional[List[str]]],
+    roles: Optional[List[str]],
+    max_results: int,
+    session_uuid: str,
+) -> str:
+    """Implementation of the search_experience_league_multi tool.
+
+    Every query is searched with every product filter set, at most
+    ``MCP_SEARCH_CONCURRENCY`` searches at a time, each through the same cache
+    as ``search_experience_league``. The result lists are merged with
+    reciprocal-rank fusion and de-duplicated by page. Searches that fail are
+    listed below the results; if all of them fail, or no search token is
+    configured, the first query is looked up in the sitemap catalog and the
+    local index instead.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        queries: Search query strings
+        content_types: Content types to filter
+        product_sets: Product filters, one search per set and query (None for no filter)
+        roles: Roles to filter
+        max_results: Maximum number of merged results returned
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        Merged search results in markdown format
+    """
+    queries = list(dict.fromkeys(' '.join(query.split()) for query in queries if query.strip()))
+    if not queries:
+        return 'No search queries given'
+    searches = [(query, products) for query in queries for products in product_sets]
+    if len(searches) > MAX_FANOUT_SEARCHES:
+        return (
+            f'Too many searches: {len(queries)} queries x {len(product_sets)} product filters '
+            f'make {len(searches)} searches, at most {MAX_FANOUT_SEARCHES} are allowed'
+        )
+
+    first_query, first_products = searches[0]
+    if not SEARCH_TOKEN:
+        search_url = build_experience_league_search_url(
+            query=first_query, content_types=content_types, products=first_products, roles=roles
+        )
+        return await _search_fallback(
+            ctx, first_query, search_url, SEARCH_NOT_CONFIGURED, session_uuid
+        )
+
+    semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+    async def search_one(query: str, products: Optional[List[str]]) -> List[SearchResult]:
+        async with semaphore:
+            results, _ = await _cached_search(query, content_types, products, roles, session_uuid)
+        return results
+
+    await ctx.info(f'Running {len(searches)} Experience League searches')
+    outcomes = await asyncio.gather(
+        *(search_one(query, products) for query, products in searches), return_exceptions=True
+    )
+    rankings = []
+    failures = []
+    for (query, products), outcome in zip(searches, outcomes):
+        if isinstance(outcome, (CircuitOpenError, httpx.HTTPError, ValueError)):
+            label = f'{query!r}' + (f' in {", ".join(products)}' if products else '')
+            failures.append(f'{label}: {outcome}')
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            rankings.append(outcome)
+
+    if not rankings:
+        logger.warning(f'All {len(searches)} searches failed, using the catalog and local index')
+        search_url = build_experience_league_search_url(
+            query=first_query, content_types=content_types, products=first_products, roles=roles
+        )
+        reason = f'The Experience League search API is unavailable ({failures[0]}).'
+        return await _search_fallback(ctx, first_query, search_url, reason, session_uuid)
+
+    fused = fuse_rankings(rankings)[:max_results]
+    return render_fused_results(queries, fused, len(rankings), failures)
+
+
+async def _cached_search(
+    query: str,
+    content_types: Optional[List[str]],
+    products: Optional[List[str]],
+    roles: Optional[List[str]],
+    session_uuid: str,
+) -> Tuple[List[SearchResult], int]:
+    """Search through the search result cache; concurrent identical searches share a request.
+
+    Raises:
+        CircuitOpenError: If the search API's circuit breaker is open
+        httpx.HTTPError: If the request fails or returns an error status
+        ValueError: If the response is not a search response
+    """
+    key = search_cache_key(query, content_types, products, roles)
+    found = search_cache.get(key)
+    if found is not None:
+        return found
+
+    async def search() -> Tuple[List[SearchResult], int]:
+        found = await _query_search_api(query, content_types, products, roles, session_uuid)
+        search_cache.put(key, found)
+        return found
+
+    return await search_flights.do(key, search)
+
+
+async def _query_search_api(
+    query: str,
+    content_types: Optional[List[str]],
+    products: Optional[List[str]],
+    roles: Optional[List[str]],
+    session_uuid: str,
+) -> Tuple[List[SearchResult], int]:
+    """Send one query to the search API.
+
+    Raises:
+        CircuitOpenError: If the search API's circuit breaker is open
+        httpx.HTTPError: If the request fails or returns an error status
+        ValueError: If the response is not a search response
+    """
+    params = {'organizationId': SEARCH_ORGANIZATION_ID} if SEARCH_ORGANIZATION_ID else None
+    headers = {
+        'User-Agent': DEFAULT_USER_AGENT,
+        'X-MCP-Session-Id': session_uuid,
+        'Accept': 'application/json',
+        'Authorization': f'Bearer {SEARCH_TOKEN}',
+    }
+    client = http_pool.client_for(SEARCH_ENDPOINT)
+    request = client.build_request(
+        'POST',
+        SEARCH_ENDPOINT,
+        params=params,
+        headers=headers,
+        json=build_search_request(query, content_types, products, roles),
+    )
+    response = await host_resilience.send(client, request)
+    try:
+        response.raise_for_status()
+        await response.aread()
+    finally:
+        await response.aclose()
+    return parse_search_response(response.json())
+
+
+async def load_document(
+    ctx: Context,
+    url_str: str,
+    clean_url: str,
+    session_uuid: str,
+    min_chars: Optional[int] = None,
+) -> Union[CachedDocument, str]:
+    """Get the converted document for a URL from the cache or the network.
+
+    Concurrent requests for the same page share a single fetch and conversion,
+    and the result is stored in the document cache for later pagination calls.
+    The shared fetch only logs through ``logger``; each caller reports errors and
+    stale copies to its own MCP context once the fetch is done.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        url_str: URL as requested by the caller, used in error messages
+        clean_url: URL to fetch, with unwanted hash fragments removed
+        session_uuid: Unique session identifier for tracking
+        min_chars: Number of characters the caller needs; plain-text responses
+            may stop downloading once this many have been read (None reads all)
+
+    Returns:
+        Converted document, or an error message if the page could not be fetched
+    """
+    cache_key = canonicalize_url(clean_url)
+    document = document_cache.get(cache_key)
+    if document is not None and _covers(document, min_chars):
+        logger.debug(f'Serving {clean_url} from document cache')
+        return document
+
+    async def fetch_and_cache() -> Union[CachedDocument, str]:
+        fetched = await fetch_and_convert(url_str, clean_url, session_uuid, min_chars)
+        if isinstance(fetched, CachedDocument) and not fetched.stale:
+            document_cache.put(cache_key, fetched)
+            if fetched.complete:
+                index_in_background(fetched)
+        return fetched
+
+    fetched = await fetch_flights.do(cache_key, fetch_and_cache)
+    if isinstance(fetched, CachedDocument) and not _covers(fetched, min_chars):
+        # Joined a shorter partial read; fetch the prefix this caller needs
+        fetched = await fetch_and_cache()
+    if isinstance(fetched, str):
+        await ctx.error(fetched)
+    elif fetched.stale:
+        await ctx.info(f'Serving a stale cached copy of {url_str}: its host is unavailable')
+    return fetched
+
+
+def index_in_background(document: CachedDocument) -> None:
+    """Add a complete converted page to the local indexes and catalog without delaying the read."""
+    if not (local_index.enabled or vector_index.enabled or catalog.enabled):
+        return
+    task = asyncio.create_task(asyncio.to_thread(_index_document, document))
+    index_tasks.add(task)
+    task.add_done_callback(index_tasks.discard)
+
+
+def _index_document(document: CachedDocument) -> None:
+    """Index a page, logging instead of raising so reads never fail because of the index."""
+    try:
+        local_index.add(document.url, document.title, document.content)
+    except sqlite3.Error as e:
+        logger.warning(f'Could not add {document.url} to the local index: {e}')
+    try:
+        vector_index.add(document.url, document.title, document.content)
+    except (OSError, ValueError) as e:
+        logger.warning(f'Could not add {document.url} to the vector index: {e}')
+    try:
+        catalog.set_title(document.url, document.title)
+    except sqlite3.Error as e:
+        logger.warning(f'Could not update the catalog title of {document.url}: {e}')
+
+
+def _covers(document: CachedDocument, min_chars: Optional[int]) -> bool:
+    """Check whether a (possibly partial) document holds the requested characters."""
+    if document.complete:
+        return True
+    return min_chars is not None and document.length > min_chars
+
+
+async def fetch_and_convert(
+    url_str: str,
+    clean_url: str,
+    session_uuid: str,
+    min_chars: Optional[int] = None,
+) -> Union[CachedDocument, str]:
+    """Fetch a documentation page and convert it to its final markdown form.
+
+    The body is streamed: binary content types are rejected from the headers
+    alone, bodies larger than ``MCP_MAX_RESPONSE_BYTES`` are aborted, and
+    plain-text responses stop downloading once ``min_chars`` are available.
+    With the streaming markdown converter, HTML is converted while it downloads
+    and the download stops once ``min_chars`` of markdown are available. With
+    ``MCP_LAZY_CONVERSION``, HTML is only converted up to ``min_chars``.
+    While the host's circuit breaker is open the call fails immediately, or
+    serves the expired HTTP cache entry when one exists.
+
+    The result may be shared by several coalesced callers, so problems are
+    only logged here and returned; callers report them to their own context.
+
+    Args:
+        url_str: URL as requested by the caller, used in error messages
+        clean_url: URL to fetch, with unwanted hash fragments removed
+        session_uuid: Unique session identifier for tracking
+        min_chars: Number of characters needed from plain-text responses, from
+            the streaming converter and from lazy conversion (None reads all)
+
+    Returns:
+        Converted document, or an error message if the page could not be fetched
+    """
+    cache_url = canonicalize_url(clean_url)
+    stored = await asyncio.to_thread(http_cache.load, cache_url)
+    if stored is not None and stored.is_fresh():
+        logger.debug(f'Serving {clean_url} from HTTP cache without revalidation')
+        return await _document_from_cache_entry(clean_url, stored, min_chars)
 
     # Add session tracking parameter
     separator = '&' if '?' in clean_url else '?'
     url_with_session = f'{clean_url}{separator}session={session_uuid}'
 
-    # Configure httpx client with optimized settings
-    async with httpx.AsyncClient(
-        timeout=httpx.Timeout(30.0, connect=10.0),
-        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
-        follow_redirects=True,
-    ) as client:
-        try:
-            response = await client.get(
-                url_with_session,
-                headers={
-                    'User-Agent': DEFAULT_USER_AGENT,
-                    'X-MCP-Session-Id': session_uuid,
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                },
-            )
-        except httpx.HTTPError as e:
-            error_msg = f'Failed to fetch {url_str}: {str(e)}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return error_msg
+    headers = {
+        'User-Agent': DEFAULT_USER_AGENT,
+        'X-MCP-Session-Id': session_uuid,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+    }
+    if stored is not None:
+        headers.update(stored.conditional_headers())
+
+    # Reuse the process-wide keep-alive pool for this host, under its rate limit and retry policy
+    client = http_pool.client_for(clean_url)
+    try:
+        request = client.build_request('GET', url_with_session, headers=headers)
+        response = await host_resilience.send(client, request)
+    except CircuitOpenError as e:
+        if stored is not None:
+            logger.warning(f'Serving stale copy of {clean_url}: {e}')
+            document = await _document_from_cache_entry(clean_url, stored, min_chars)
+            document.stale = True
+            return document
+        error_msg = f'Failed to fetch {url_str}: {e}'
+        logger.error(error_msg)
+        return error_msg
+    except httpx.HTTPError as e:
+        error_msg = f'Failed to fetch {url_str}: {str(e)}'
+        logger.error(error_msg)
+        return error_msg
+
+    try:
+        if response.status_code == 304 and stored is not None:
+            logger.debug(f'{clean_url} not modified, reusing HTTP cache entry')
+            stored = await asyncio.to_thread(http_cache.refresh, stored, response.headers)
+            return await _document_from_cache_entry(clean_url, stored, min_chars)
 
         if response.status_code >= 400:
             error_msg = f'Failed to fetch {url_str} - status code {response.status_code}'
             logger.error(error_msg)
-            await ctx.error(error_msg)
             return error_msg
 
-        page_raw = response.text
         content_type = response.headers.get('content-type', '')
+        if is_binary_content_type(content_type):
+            error_msg = (
+                f'Failed to fetch {url_str} - unsupported binary content type '
+                f'{content_type.split(";")[0]}'
+            )
+            logger.error(error_msg)
+            return error_msg
+
+        # Plain-text bodies can be cut short; HTML only when converted as it streams
+        is_plain_text = bool(content_type) and 'html' not in content_type.lower()
+        encoding = response.charset_encoding or 'utf-8'
+        stream = None
+        on_chunk = None
+        if not is_plain_text and resolve_converter() == 'streaming':
+            stream = StreamingConverter(clean_url, max_chars=min_chars, encoding=encoding)
 
-    # Extract title
-    title = extract_page_title(page_raw)
+            async def on_chunk(chunk: bytes) -> bool:
+                await asyncio.to_thread(stream.feed, chunk)
+                return stream.done
 
-    # Convert to markdown
-    if is_html_content(page_raw, content_type):
-        content = extract_content_from_html(page_raw)
+        try:
+            body, complete = await read_body(
+                response, max_chars=min_chars if is_plain_text else None, on_chunk=on_chunk
+            )
+        except (ResponseTooLargeError, httpx.HTTPError) as e:
+            error_msg = f'Failed to fetch {url_str}: {str(e)}'
+            logger.error(error_msg)
+            return error_msg
+    finally:
+        await response.aclose()
+
+    if stream is not None:
+        # The markdown was produced while downloading; the body was never decoded as a whole
+        await asyncio.to_thread(stream.close)
+        converted = converted_from_stream(stream)
+        record_profile(converted)
+        content_complete = converted.complete
     else:
-        content = page_raw
+        page_raw = body.decode(encoding, errors='replace')
+        converted = await convert(
+            page_raw, content_type, clean_url, min_chars if LAZY_CONVERSION else None
+        )
+        content_complete = complete and converted.complete
+    content, title = converted.content, converted.title
 
-    # Add title to content if available
-    if title and not content.startswith('# '):
-        content = f'# {title}\n\n{content}'
+    if complete and is_storable(response.status_code, response.headers):
+        entry = build_cache_entry(cache_url, response.headers, body, encoding)
+        if converted.complete:
+            entry.conversion_key = get_conversion_key()
+            entry.markdown = content
+            entry.title = title
+            entry.anchors = converted.anchors
+        await asyncio.to_thread(http_cache.store, entry)
 
-    # Format with pagination
-    result, is_truncated = format_documentation_result(url_str, content, start_index, max_length)
+    return CachedDocument(
+        url=clean_url,
+        content=content,
+        title=title,
+        complete=content_complete,
+        anchors=converted.anchors,
+    )
 
-    # Log if content was truncated
-    if is_truncated:
-        logger.debug(
-            f'Content truncated at {start_index + max_length} of {len(content)} characters'
+
+async def _document_from_cache_entry(
+    clean_url: str, entry: HttpCacheEntry, min_chars: Optional[int] = None
+) -> CachedDocument:
+    """Build a document from an HTTP cache entry, reusing its stored conversion.
+
+    The stored markdown is only reused when it was produced by the current
+    conversion pipeline; otherwise the cached body is converted again and the
+    entry is updated. A lazy conversion that stopped before the end of the
+    page is returned without being stored.
+
+    Args:
+        clean_url: URL of the document
+        entry: Fresh or revalidated cache entry
+        min_chars: Number of characters needed from lazy conversion (None converts all)
+
+    Returns:
+        Converted document
+    """
+    conversion_key = get_conversion_key()
+    if entry.markdown is None or entry.conversion_key != conversion_key:
+        converted = await convert(
+            entry.text,
+            entry.headers.get('content-type', ''),
+            clean_url,
+            min_chars if LAZY_CONVERSION else None,
         )
+        if not converted.complete:
+            return CachedDocument(
+                url=clean_url, content=converted.content, title=converted.title, complete=False
+            )
+        entry.markdown, entry.title = converted.content, converted.title
+        entry.anchors = converted.anchors
+        entry.conversion_key = conversion_key
+        await asyncio.to_thread(http_cache.store, entry)
+    return CachedDocument(
+        url=clean_url, content=entry.markdown, title=entry.title, anchors=entry.anchors or {}
+    )
 
-    return result
+
+async def convert(
+    page_raw: str, content_type: str, url: str, max_chars: Optional[int] = None
+) -> ConvertedPage:
+    """Convert a page in the conversion worker pool and record its extraction profile.
+
+    Lazy conversions with the markdownify converter run in a thread of this
+    process instead: they continue a parsed document kept in ``lazy_documents``,
+    which worker processes could not share, so every window would parse the
+    page again.
+
+    Args:
+        page_raw: Decoded response body
+        content_type: Content-Type header of the response
+        url: URL of the page
+        max_chars: Stop converting HTML once this many characters are available
+            (None converts the whole page)
+
+    Returns:
+        Converted page
+    """
+    if max_chars is not None and resolve_converter() != 'streaming':
+        converted = await asyncio.to_thread(
+            convert_page, page_raw, content_type, url, None, max_chars
+        )
+    else:
+        converted = await conversion_executor.run(
+            convert_page, page_raw, content_type, url, None, max_chars
+        )
+    record_profile(converted)
+    return converted
+
+
+def record_profile(converted: ConvertedPage) -> None:
+    """Record the extraction profile outcome of a converted HTML page."""
+    if converted.profile is not None:
+        # Conversions may run in worker processes, so statistics are kept here
+        profile_stats.record(converted.profile, converted.profile_matched)
+
+
+def get_conversion_key() -> str:
+    """Identify the conversion pipeline that produced stored markdown.
+
+    Markdown persisted in the HTTP cache is discarded when this changes, so
+    upgrades never serve output from an older converter.
+
+    Returns:
+        Conversion pipeline identifier
+    """
+    converter = resolve_converter()
+    backend = 'stream' if converter == 'streaming' else resolve_parser()
+    key = f'aem-docs-{__version__}-{backend}-x{EXTRACTION_REVISION}'
+    return f'{key}-rows{TABLE_MAX_ROWS}' if TABLE_MAX_ROWS else key
+
+
+async def read_documentation_batch_impl(
+    ctx: Context,
+    urls: List[str],
+    max_length: int,
+    max_concurrency: int,
+    timeout: float,
+    session_uuid: str,
+) -> List[BatchReadResult]:
+    """Implementation of the read_documentation_batch tool.
+
+    URLs are validated individually, then fetched and converted concurrently
+    with at most ``max_concurrency`` reads in flight. A failing or slow URL only
+    affects its own entry in the result list.
+
+    Args:
+        ctx: MCP context for logging and error handling
+        urls: URLs of the documentation pages to read
+        max_length: Maximum number of characters to return per page
+        max_concurrency: Maximum number of pages fetched at the same time
+        timeout: Maximum number of seconds spent on each page
+        session_uuid: Unique session identifier for tracking
+
+    Returns:
+        One result per URL, in the order the URLs were given
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def read_one(url_str: str) -> BatchReadResult:
+        is_valid, error_msg = validate_adobe_url(url_str)
+        if not is_valid:
+            return BatchReadResult(url=url_str, error=error_msg)
+        async with semaphore:
+            try:
+                result, ok = await asyncio.wait_for(
+                    _read_documentation(ctx, url_str, max_length, 0, session_uuid), timeout
+                )
+            except asyncio.TimeoutError:
+                error_msg = f'Timed out after {timeout} seconds reading {url_str}'
+                logger.error(error_msg)
+                return BatchReadResult(url=url_str, error=error_msg)
+        if not ok:
+            return BatchReadResult(url=url_str, error=result)
+        return BatchReadResult(url=url_str, content=result)
+
+    await ctx.info(f'Reading {len(urls)} documentation pages (concurrency {max_concurrency})')
+    return list(await asyncio.gather(*(read_one(str(url)) for url in urls)))
+
+
+# Supported Adobe and AEM-related domains
+SUPPORTED_DOMAINS = [
+    # Adobe official domains (including search pages)
+    r'^https?://experienceleague\.adobe\.com/',
+    r'^https?://developer\.adobe\.com/',
+    r'^https?://helpx\.adobe\.com/',
+    r'^https?://docs\.adobe\.com/',
+    r'^https?://business\.adobe\.com/',
+    # GitHub repositories (any organization, with or without repo path) and GitHub Pages
+    r'^https?://github\.com/[^/]+',
+    r'^https?://[^/]+\.github\.io/',
+    # Apache Sling documentation
+    r'^https?://sling\.apache\.org/',
+    # adaptTo() conference (all years 2011-2025+, including PDFs)
+    r'^https?://adapt\.to/',
+    # YouTube channels (Adobe-related)
+    r'^https?://(?:www\.)?youtube\.com/',
+    r'^https?://(?:www\.)?youtu\.be/',
+]
+
+# Request policies (rate limit, retries, deadline) of the supported domains.
+# Keys are hostnames; a key starting with '.' matches every subdomain.
+DOMAIN_POLICIES = {
+    'experienceleague.adobe.com': HostPolicy(requests_per_second=5.0, burst=10),
+    'developer.adobe.com': HostPolicy(requests_per_second=5.0, burst=10),
+    'helpx.adobe.com': HostPolicy(requests_per_second=3.0, burst=5),
+    'docs.adobe.com': HostPolicy(requests_per_second=3.0, burst=5),
+    'business.adobe.com': HostPolicy(requests_per_second=3.0, burst=5),
+    # GitHub throttles unauthenticated clients aggressively
+    'github.com': HostPolicy(requests_per_second=1.0, burst=5, backoff_base=1.0),
+    '.github.io': HostPolicy(requests_per_second=3.0, burst=5),
+    'sling.apache.org': HostPolicy(requests_per_second=2.0, burst=5),
+    'adapt.to': HostPolicy(requests_per_second=2.0, burst=5),
+}
+DEFAULT_HOST_POLICY = HostPolicy(requests_per_second=2.0, burst=5)
+
+# Process-wide rate limiters, retry counters and circuit breakers of the supported domains
+host_resilience = HostResilience(DOMAIN_POLICIES, DEFAULT_HOST_POLICY)
 
 
 @lru_cache(maxsize=1000)
@@ -209,30 +1331,8 @@ def validate_adobe_url(url: str) -> tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message). error_message is None if valid.
     """
-    import re
-
-    # Supported Adobe and AEM-related domains
-    supported_domains = [
-        # Adobe official domains (including search pages)
-        r'^https?://experienceleague\.adobe\.com/',
-        r'^https?://developer\.adobe\.com/',
-        r'^https?://helpx\.adobe\.com/',
-        r'^https?://docs\.adobe\.com/',
-        r'^https?://business\.adobe\.com/',
-        # GitHub repositories (any organization, with or without repo path) and GitHub Pages
-        r'^https?://github\.com/[^/]+',
-        r'^https?://[^/]+\.github\.io/',
-        # Apache Sling documentation
-        r'^https?://sling\.apache\.org/',
-        # adaptTo() conference (all years 2011-2025+, including PDFs)
-        r'^https?://adapt\.to/',
-        # YouTube channels (Adobe-related)
-        r'^https?://(?:www\.)?youtube\.com/',
-        r'^https?://(?:www\.)?youtu\.be/',
-    ]
-
     # Check if URL matches any supported domain
-    if not any(re.match(domain_regex, url) for domain_regex in supported_domains):
+    if not any(re.match(domain_regex, url) for domain_regex in SUPPORTED_DOMAINS):
         return False, (
             f'Invalid URL: {url}. URL must be from supported domains: '
             'Adobe domains (experienceleague, developer, helpx, docs, business), '
@@ -0,0 +1,1027 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Streaming HTML to markdown conversion for Adobe AEM Documentation MCP Server.
+
+The streaming converter renders markdown from parser events instead of a parse
+tree. Only the chain of open elements is kept: content containers (div,
+section, main, ...) write their children to the output as soon as each child
+is complete, and other elements hold the markdown of their own children until
+they close. Pruned regions are skipped without being materialized and parsing
+stops once enough markdown has been produced.
+
+The output matches the markdownify converter, including the table rendering
+of ``TableConverter``. Markup is nested as the ``html.parser`` backend nests
+it, except that end tags left out of lists, definition lists, paragraphs,
+tables and selects are implied as the default lxml backend implies them
+(``IMPLIED_END_TAGS``). Known differences are
+limited to pathological markup: blank-line counts around empty list items that
+sit directly in a content container, tables nested in table cells, a <thead>
+after the table's first <tbody>, rowspans and the row cap in tables with text
+between their rows, the row cap in tables mixing bare rows with row groups, and
+the title when an early stop happens before the page's first <h1> on pages
+without a <title>.
+"""
+
+import codecs
+import markdownify
+import os
+import re
+from aemlabs.aem_documentation_mcp_server.document_utils import (
+    GENERIC_PROFILE,
+    HEADING_TAGS,
+    MARKDOWN_OPTIONS,
+    ExtractionProfile,
+    PruneRules,
+    element_ids,
+    profile_for_url,
+)
+from aemlabs.aem_documentation_mcp_server.table_utils import (
+    RowSpans,
+    TableConverter,
+    cell_span,
+    table_row,
+    with_more_rows,
+)
+from bs4.builder import HTMLTreeBuilder
+from dataclasses import dataclass
+from functools import lru_cache
+from html.parser import HTMLParser
+from loguru import logger
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+
+# Markdown converters: 'markdownify' renders the parse tree of the page,
+# 'streaming' renders parser events and can stop early
+MARKDOWN_CONVERTERS = ('markdownify', 'streaming')
+MARKDOWN_CONVERTER = os.getenv('MCP_MARKDOWN_CONVERTER', 'markdownify').lower()
+
+# Characters of an in-memory page fed to the parser at a time
+STREAM_CHUNK_CHARS = 64 * 1024
+
+# Elements without content or end tag, as in BeautifulSoup's tree builders
+VOID_ELEMENTS = frozenset(HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS)
+
+# Open elements closed by a start tag while they are the current element,
+# which is how libxml2 (the lxml backend) implies left-out end tags
+_ROW_CONTENT = frozenset(('tr', 'td', 'th', 'p', 'caption', 'colgroup'))
+_CELL_CONTENT = frozenset(('td', 'th', 'p', 'b', 'i', 'u', 'span', 'a', 'font'))
+IMPLIED_END_TAGS = {
+    'li': HEADING_TAGS | {'li', 'p', 'pre', 'dl', 'address'},
+    'dt': frozenset(('dd', 'p', 'pre', 'address', 'menu', 'dir')),
+    'dd': frozenset(('dt', 'p', 'pre', 'address', 'menu', 'dir')),
+    'p': HEADING_TAGS | {'p', 'b', 'i', 'u', 's', 'tt', 'big', 'small', 'strike'},
+    'td': _CELL_CONTENT,
+    'th': _CELL_CONTENT,
+    'tr': _ROW_CONTENT,
+    'thead': frozenset(('caption', 'colgroup')),
+    'tbody': _ROW_CONTENT | {'thead', 'tbody', 'tfoot'},
+    'tfoot': _ROW_CONTENT | {'thead', 'tbody'},
+    'option': frozenset(('option',)),
+    'optgroup': frozenset(('option',)),
+}
+
+# Containers whose children are written out as soon as they are complete
+BLOCK_CONTAINERS = frozenset(('div', 'article', 'section'))
+
+# Compound selectors supported by the streaming matcher: a tag name followed by
+# any number of #id, .class and [attribute] or [attribute=value] parts
+COMPOUND_SELECTOR = re.compile(
+    r'^(?P<tag>[A-Za-z][\w-]*)?'
+    r'(?P<parts>(?:[#.][\w-]+|\[[\w-]+(?:=(?:\'[^\']*\'|"[^"]*"|[\w-]+))?\])*)$'
+)
+SELECTOR_PART = re.compile(r'([#.])([\w-]+)|\[([\w-]+)(?:=(?:\'([^\']*)\'|"([^"]*)"|([\w-]+)))?\]')
+
+
+@lru_cache(maxsize=None)
+def resolve_converter(name: str = MARKDOWN_CONVERTER) -> str:
+    """Resolve a configured markdown converter, falling back to markdownify.
+
+    Args:
+        name: Converter name ('markdownify' or 'streaming')
+
+    Returns:
+        Name of a supported converter
+    """
+    if name not in MARKDOWN_CONVERTERS:
+        logger.warning(f'Unknown markdown converter {name!r}, using markdownify')
+        return 'markdownify'
+    return name
+
+
+@dataclass(frozen=True)
+class ElementMatcher:
+    """A compound CSS selector matched against start tags.
+
+    Attributes:
+        tag: Lowercased tag name, if the selector has one
+        id: Required id
+        classes: Required class tokens
+        attributes: Required attributes, with their value or None for presence
+    """
+
+    tag: Optional[str]
+    id: Optional[str]
+    classes: FrozenSet[str]
+    attributes: Tuple[Tuple[str, Optional[str]], ...]
+
+    @classmethod
+    def parse(cls, selector: str) -> 'ElementMatcher':
+        """Parse a compound selector such as 'main.css-7wiue4' or "div[role='main']".
+
+        Raises:
+            ValueError: If the selector uses combinators or pseudo-classes
+        """
+        match = COMPOUND_SELECTOR.match(selector.strip())
+        if not match or not (match.group('tag') or match.group('parts')):
+            raise ValueError(f'Unsupported streaming selector: {selector!r}')
+        element_id = None
+        classes = set()
+        attributes = []
+        for part in SELECTOR_PART.finditer(match.group('parts')):
+            prefix, token, attribute = part.group(1), part.group(2), part.group(3)
+            if prefix == '#':
+                element_id = token
+            elif prefix == '.':
+                classes.add(token)
+            else:
+                value = next((v for v in part.group(4, 5, 6) if v is not None), None)
+                attributes.append((attribute.lower(), value))
+        tag = match.group('tag')
+        return cls(tag.lower() if tag else None, element_id, frozenset(classes), tuple(attributes))
+
+    def matches(self, name: str, attrs: Dict[str, str], classes: FrozenSet[str]) -> bool:
+        """Check whether a start tag matches the selector."""
+        if self.tag is not None and self.tag != name:
+            return False
+        if self.id is not None and attrs.get('id') != self.id:
+            return False
+        if not self.classes <= classes:
+            return False
+        for attribute, value in self.attributes:
+            if attribute not in attrs or (value is not None and attrs[attribute] != value):
+                return False
+        return True
+
+
+@dataclass(frozen=True)
+class _Candidate:
+    """A content container selector with its priority and removal rules."""
+
+    priority: int
+    matcher: ElementMatcher
+    rules: PruneRules
+
+
+class _CandidateIndex:
+    """Content container selectors of a profile, indexed by their most selective part.
+
+    Priorities follow the tree converter: the profile's own selectors, then the
+    generic cascade, then <body>, then the whole document.
+    """
+
+    def __init__(self, profile: ExtractionProfile):
+        """Compile the profile's selectors followed by the generic fallbacks."""
+        selectors = [(pattern.pattern, profile.remove) for pattern in profile.content]
+        self.profile_priorities = len(selectors)
+        if profile is not GENERIC_PROFILE:
+            selectors += [
+                (pattern.pattern, GENERIC_PROFILE.remove) for pattern in GENERIC_PROFILE.content
+            ]
+        selectors.append(('body', GENERIC_PROFILE.remove))
+        self.document_priority = len(selectors)
+
+        self.by_id: Dict[str, List[_Candidate]] = {}
+        self.by_class: Dict[str, List[_Candidate]] = {}
+        self.by_tag: Dict[str, List[_Candidate]] = {}
+        self.any: List[_Candidate] = []
+        for priority, (selector, rules) in enumerate(selectors):
+            matcher = ElementMatcher.parse(selector)
+            candidate = _Candidate(priority, matcher, rules)
+            if matcher.id is not None:
+                self.by_id.setdefault(matcher.id, []).append(candidate)
+            elif matcher.classes:
+                self.by_class.setdefault(min(matcher.classes), []).append(candidate)
+            elif matcher.tag is not None:
+                self.by_tag.setdefault(matcher.tag, []).append(candidate)
+            else:
+                self.any.append(candidate)
+
+    def best_match(
+        self, name: str, attrs: Dict[str, str], classes: FrozenSet[str], below: int
+    ) -> Optional[_Candidate]:
+        """Find the best candidate matching a start tag with a priority below a bound."""
+        best = None
+        groups = [self.by_tag.get(name, ()), self.any]
+        element_id = attrs.get('id')
+        if element_id is not None:
+            groups.append(self.by_id.get(element_id, ()))
+        for token in classes:
+            groups.append(self.by_class.get(token, ()))
+        for group in groups:
+            for candidate in group:
+                if candidate.priority < below and candidate.matcher.matches(name, attrs, classes):
+                    below = candidate.priority
+                    best = candidate
+        return best
+
+
+@lru_cache(maxsize=None)
+def candidate_index(profile: ExtractionProfile) -> _CandidateIndex:
+    """Get the compiled content container candidates of a profile."""
+    return _CandidateIndex(profile)
+
+
+class _Element:
+    """Minimal element passed to markdownify's per-tag conversion functions."""
+
+    __slots__ = ('name', 'attrs', 'parent', 'sources')
+
+    def __init__(self, name: str, attrs: Dict[str, str], parent: Optional['_Element']):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.sources: List['_Element'] = []
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key: str) -> str:
+        return self.attrs[key]
+
+    def find_all(self, name: str, attrs: Optional[Dict[str, Any]] = None) -> List['_Element']:
+        # Only <video> looks up descendants, for its <source> children
+        return self.sources if name == 'source' else []
+
+
+class _Item:
+    """A child of an open element: text, a comment, or a converted element."""
+
+    __slots__ = ('kind', 'name', 'text', 'element', 'cells', 'row_cells', 'skipped_rows')
+
+    def __init__(self, kind: str, name: Optional[str] = None, text: str = '', element=None):
+        self.kind = kind
+        self.name = name
+        self.text = text
+        self.element = element
+        # Rows: name and colspan of every cell, and the converted direct cells
+        self.cells: List[Tuple[str, Optional[str]]] = []
+        self.row_cells: List[Tuple[str, int, int]] = []
+        # Tables: rows left out past the row cap
+        self.skipped_rows = 0
+
+
+class _Level:
+    """An open element inside the captured content."""
+
+    __slots__ = (
+        'name',
+        'element',
+        'parent',
+        'flow',
+        'block',
+        'parent_tags',
+        'child_tags',
+        'items',
+        'item',
+        'previous',
+        'tag_seen',
+        'li_count',
+        'tr_count',
+        'ul_depth',
+        'child_tag_count',
+        'has_previous_tag',
+        'thead_seen',
+        'spans',
+        'data_rows',
+        'written',
+        'anchor',
+    )
+
+    def __init__(
+        self,
+        name: str,
+        attrs: Dict[str, str],
+        parent: Optional['_Level'],
+        flow: bool,
+        parent_tags: FrozenSet[str],
+    ):
+        self.name = name
+        self.element = _Element(name, attrs, parent.element if parent else None)
+        self.parent = parent
+        self.flow = flow
+        self.block = flow and name in BLOCK_CONTAINERS
+        self.parent_tags = parent_tags
+        child_tags = set(parent_tags)
+        child_tags.add(name)
+        if markdownify.re_html_heading.match(name) or name in ('td', 'th'):
+            child_tags.add('_inline')
+        if name in ('pre', 'code', 'kbd', 'samp'):
+            child_tags.add('_noformat')
+        self.child_tags = frozenset(child_tags)
+        self.items: List[_Item] = []
+        # The item standing for this element among its parent's children
+        self.item = _Item('flow' if flow else 'element', name, element=self.element)
+        self.previous: Optional[_Item] = None
+        self.tag_seen = False
+        self.li_count = 0
+        self.tr_count = 0
+        self.ul_depth = (parent.ul_depth if parent else 0) + (name == 'ul')
+        self.child_tag_count = 0
+        self.has_previous_tag = bool(parent and parent.child_tag_count)
+        self.thead_seen = False
+        # Row groups: cells spanning rows; tables: data rows seen
+        self.spans: Optional[RowSpans] = None
+        self.data_rows = 0
+        # Strings written by the writer when this content container opened
+        self.written = 0
+        # Linking ids not yet resolved to a heading, with the capture's text
+        # and heading counts when the element opened
+        self.anchor: Optional[Tuple[List[str], int, int]] = None
+
+
+class _MarkdownWriter:
+    """Output of a content capture, written one child string at a time.
+
+    Child strings are joined with markdownify's newline collapsing, and block
+    containers strip their content and surround it with blank lines. Trailing
+    whitespace is held back until more content follows, since a closing block
+    container may still strip it.
+    """
+
+    def __init__(self, max_chars: Optional[int]):
+        self.parts: List[str] = []
+        self.length = 0
+        self.max_chars = max_chars
+        self.tail = ''
+        self.trailing_newlines = 0
+        self.blocks: List[bool] = []
+        self.written = 0
+
+    @property
+    def full(self) -> bool:
+        """Whether more than ``max_chars`` characters have been written."""
+        return self.max_chars is not None and self.length > self.max_chars
+
+    def open_block(self) -> None:
+        """Start a block container."""
+        self.blocks.append(False)
+
+    def close_block(self) -> None:
+        """End a block container, stripping its content and ending it with a blank line."""
+        if self.blocks.pop():
+            self.tail = '\n\n'
+            self.trailing_newlines = 2
+
+    def close_container(self, written: int) -> None:
+        """End a transparent container opened when ``written`` strings had been written.
+
+        Its children were collapsed individually; the newlines ending all of them
+        collapse with whatever follows, as they would for a single child string.
+        """
+        if self.written != written:
+            self.trailing_newlines = len(self.tail) - len(self.tail.rstrip('\n'))
+
+    def write(self, text: str) -> None:
+        """Append the converted string of one child."""
+        if not text or self.full:
+            return
+        self.written += 1
+        if self.blocks and not self.blocks[-1]:
+            # First content of a block container: strip it and start a new block
+            text = text.lstrip()
+            if not text:
+                return
+            for index in range(len(self.blocks) - 1, -1, -1):
+                if self.blocks[index]:
+                    break
+                self.blocks[index] = True
+            self._collapse('\n\n')
+        else:
+            content = text.lstrip('\n')
+            self._collapse(text[: len(text) - len(content)])
+            text = content
+        content = text.rstrip('\n')
+        trailing = text[len(content) :]
+        if content:
+            stripped = content.rstrip()
+            if stripped:
+                self._commit(self.tail + stripped)
+                self.tail = content[len(stripped) :]
+            else:
+                self.tail += content
+        self.tail += trailing
+        self.trailing_newlines = len(trailing)
+
+    def _collapse(self, leading: str) -> None:
+        """Merge leading newlines with the trailing newlines of the previous string."""
+        if self.trailing_newlines and leading:
+            count = min(2, max(self.trailing_newlines, len(leading)))
+            self.tail = self.tail[: -self.trailing_newlines] + '\n' * count
+        else:
+            self.tail += leading
+
+    def _commit(self, text: str) -> None:
+        if not self.parts:
+            text = text.lstrip()
+        self.parts.append(text)
+        self.length += len(text)
+
+    def getvalue(self) -> str:
+        """Get the markdown written so far, without surrounding whitespace."""
+        return ''.join(self.parts)
+
+
+class _Capture:
+    """A content container being converted."""
+
+    def __init__(self, candidate_priority: int, rules: PruneRules, max_chars: Optional[int]):
+        self.priority = candidate_priority
+        self.rules = rules
+        self.writer = _MarkdownWriter(max_chars)
+        self.document = _Level('[document]', {}, None, True, frozenset())
+        self.root_depth = 0
+        # Headings as (text parts, linking ids), the open heading, ids waiting
+        # for the next heading and the number of non-blank text nodes seen
+        self.headings: List[Tuple[List[str], List[str]]] = []
+        self.heading: Optional[_Level] = None
+        self.pending_ids: List[str] = []
+        self.text_seen = 0
+
+
+# Marker of open elements skipped by the removal rules
+_SKIPPED = object()
+
+
+class StreamingConverter(HTMLParser):
+    """Incremental HTML to markdown converter for a page's main content.
+
+    Feed the page in chunks of bytes or text, then call ``close()``. Once
+    ``done`` is True the rest of the page cannot change the result and no more
+    input needs to be read.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        max_chars: Optional[int] = None,
+        encoding: str = 'utf-8',
+    ):
+        """Create a converter.
+
+        Args:
+            url: URL of the page, used to select its extraction profile
+            max_chars: Stop once more than this many markdown characters are produced
+            encoding: Encoding of byte chunks
+        """
+        super().__init__(convert_charrefs=True)
+        self.profile = profile_for_url(url)
+        self.max_chars = max_chars
+        self.done = False
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._candidates = candidate_index(self.profile)
+        self._markdown = TableConverter(**MARKDOWN_OPTIONS)
+        # Open elements as [name, level] pairs; level is None outside the capture
+        self._open: List[list] = []
+        self._capture: Optional[_Capture] = _Capture(
+            self._candidates.document_priority, GENERIC_PROFILE.remove, max_chars
+        )
+        self._best_priority = self._candidates.document_priority
+        self._result: Optional[Tuple[int, str, bool]] = None
+        self._headings: List[Tuple[List[str], List[str]]] = []
+        self._title: Optional[str] = None
+        self._title_depth: Optional[int] = None
+        self._title_parts: Optional[List[str]] = []
+        self._h1: Optional[str] = None
+        self._h1_depth: Optional[int] = None
+        self._h1_parts: List[str] = []
+        self._og_title: Optional[str] = None
+        self._og_seen = False
+
+    # Input
+
+    def feed(self, data: Union[str, bytes]) -> None:
+        """Feed the next chunk of the page."""
+        if self.done:
+            return
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        super().feed(data)
+
+    def close(self) -> None:
+        """Finish the page, closing every element still open."""
+        if not self.done:
+            tail = self._decoder.decode(b'', final=True)
+            if tail:
+                super().feed(tail)
+            super().close()
+        while self._open:
+            self._pop()
+        self._end_capture()
+        self.done = True
+
+    # Results
+
+    @property
+    def markdown(self) -> str:
+        """Markdown of the main content (a prefix of it when ``complete`` is False)."""
+        return self._result[1] if self._result else ''
+
+    @property
+    def complete(self) -> bool:
+        """Whether the markdown was not cut short by ``max_chars``."""
+        return not self._result[2] if self._result else True
+
+    @property
+    def heading_ids(self) -> List[Tuple[str, List[str]]]:
+        """Headings of the main content with the element ids linking to them.
+
+        Ids are resolved to headings as ``ParsedDocument.heading_ids`` does.
+        """
+        return [(''.join(parts).strip(), ids) for parts, ids in self._headings]
+
+    @property
+    def profile_matched(self) -> bool:
+        """Whether one of the profile's own content selectors matched."""
+        return self._best_priority < self._candidates.profile_priorities
+
+    @property
+    def title(self) -> Optional[str]:
+        """Title from the <title> tag, the first h1 or og:title."""
+        if self._title is not None:
+            return self._title
+        if self._h1 is not None:
+            return self._h1
+        if self._h1_depth is not None:
+            return ''.join(self._h1_parts).strip()
+        return self._og_title
+
+    # Parser events
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        """Open an element, starting a capture when it is a better content container.
+
+        Open elements whose end tag this start tag implies are closed first.
+        """
+        if self.done:
+            return
+        implied = IMPLIED_END_TAGS.get(tag)
+        if implied:
+            while self._open and self._open[-1][0] in implied and not self.done:
+                self._pop()
+            if self.done:
+                return
+        attributes = {name: value if value is not None else '' for name, value in attrs}
+        depth = len(self._open)
+        self._track_title_start(tag, attributes, depth)
+
+        classes = frozenset(attributes.get('class', '').split())
+        candidate = self._candidates.best_match(tag, attributes, classes, self._best_priority)
+        if candidate is not None:
+            self._start_capture(candidate, depth)
+
+        level = self._open_level(tag, attributes, classes, depth, candidate is not None)
+        self._open.append([tag, level])
+        if tag in VOID_ELEMENTS:
+            self._pop()
+        else:
+            self._check_done()
+
+    def handle_endtag(self, tag: str) -> None:
+        """Close the innermost open element with this name and everything inside it."""
+        if self.done:
+            return
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index][0] == tag:
+                while len(self._open) > index and not self.done:
+                    self._pop()
+                return
+
+    def handle_data(self, data: str) -> None:
+        """Add text to the open element of the capture."""
+        if self.done:
+            return
+        if self._title_parts is not None and self._title_depth is not None:
+            self._title_parts.append(data)
+        if self._h1_depth is not None and self._h1 is None:
+            self._h1_parts.append(data)
+        level = self._current_level()
+        if level is None:
+            return
+        capture = self._capture
+        if capture.heading is not None:
+            capture.headings[-1][0].append(data)
+        if data.strip():
+            capture.text_seen += 1
+        items = level.items
+        if items and items[-1].kind == 'text':
+            items[-1].text += data
+        else:
+            items.append(_Item('text', text=data))
+            if level.flow:
+                self._flush(level)
+                self._check_done()
+
+    def handle_comment(self, data: str) -> None:
+        """Add a comment, which markdownify drops but which separates text nodes."""
+        if self.done:
+            return
+        if self._title_depth is not None:
+            self._title_parts = None
+        level = self._current_level()
+        if level is not None:
+            level.items.append(_Item('comment'))
+            if level.flow:
+                self._flush(level)
+                self._check_done()
+
+    handle_decl = handle_pi = unknown_decl = handle_comment
+
+    # Title
+
+    def _track_title_start(self, tag: str, attrs: Dict[str, str], depth: int) -> None:
+        if self._title_depth is not None:
+            # The title has child elements, so it has no single string
+            self._title_parts = None
+        elif tag == 'title' and self._title is None and self._title_parts is not None:
+            self._title_depth = depth
+        if tag == 'h1' and self._h1_depth is None:
+            self._h1_depth = depth
+        if tag == 'meta' and not self._og_seen and attrs.get('property') == 'og:title':
+            self._og_seen = True
+            content = attrs.get('content')
+            self._og_title = content.strip() if content else None
+
+    def _track_title_end(self, depth: int) -> None:
+        if depth == self._title_depth:
+            text = ''.join(self._title_parts or ())
+            self._title = text.strip() if text else None
+            self._title_depth = None
+            # Only the first <title> counts, like soup.title
+            self._title_parts = None
+        if depth == self._h1_depth and self._h1 is None:
+            self._h1 = ''.join(self._h1_parts).strip()
+
+    # Capture
+
+    def _start_capture(self, candidate: _Candidate, depth: int) -> None:
+        """Switch to a better content container starting at the given depth."""
+        for entry in self._open:
+            entry[1] = None
+        self._capture = _Capture(candidate.priority, candidate.rules, self.max_chars)
+        self._capture.root_depth = depth + 1
+        self._best_priority = candidate.priority
+
+    def _end_capture(self) -> None:
+        """Finish the active capture and keep its markdown."""
+        capture = self._capture
+        if capture is None:
+            return
+        if not capture.writer.full:
+            self._close_level(capture.document)
+        self._capture = None
+        self._result = (capture.priority, capture.writer.getvalue(), capture.writer.full)
+        self._headings = capture.headings
+
+    def _current_level(self) -> Optional[_Level]:
+        capture = self._capture
+        if capture is None or capture.writer.full:
+            return None
+        if not self._open:
+            return capture.document if capture.root_depth == 0 else None
+        level = self._open[-1][1]
+        return level if isinstance(level, _Level) else None
+
+    def _open_level(
+        self, tag: str, attrs: Dict[str, str], classes: FrozenSet[str], depth: int, root: bool
+    ) -> Any:
+        """Create the level of an element opened inside the capture."""
+        capture = self._capture
+        if capture is None or capture.writer.full:
+            return None
+        if root:
+            parent = capture.document
+        else:
+            parent = self._current_level()
+            if parent is None:
+                # Outside the capture, or inside a skipped element
+                if self._open and self._open[-1][1] is _SKIPPED:
+                    return _SKIPPED
+                return None if depth < capture.root_depth else _SKIPPED
+            if capture.rules.matches_tag(tag, {'id': attrs.get('id'), 'class': classes}):
+                return _SKIPPED
+
+        if tag == 'source' and parent.name == 'video':
+            parent.element.sources.append(_Element(tag, attrs, parent.element))
+        if tag == 'thead':
+            parent.thead_seen = True
+        flow = parent.flow and (
+            tag in BLOCK_CONTAINERS or self._markdown.get_conv_fn_cached(tag) is None
+        )
+        level = _Level(tag, attrs, parent, flow, parent.child_tags)
+        parent.child_tag_count += 1
+        if not root:
+            self._open_anchor(level)
+        if flow:
+            parent.items.append(level.item)
+            self._flush(parent)
+            level.written = capture.writer.written
+            if level.block:
+                capture.writer.open_block()
+        return level
+
+    def _pop(self) -> None:
+        """Close the innermost open element."""
+        depth = len(self._open) - 1
+        _, level = self._open.pop()
+        self._track_title_end(depth)
+        capture = self._capture
+        if capture is None or not isinstance(level, _Level):
+            return
+        if not capture.writer.full:
+            self._close_level(level)
+        if depth == capture.root_depth - 1:
+            self._end_capture()
+        self._check_done()
+
+    def _check_done(self) -> None:
+        """Stop once the best possible content container has been converted."""
+        capture = self._capture
+        if capture is not None and capture.writer.full and capture.priority == 0:
+            self._end_capture()
+        if self._capture is None and self._result is not None and self._result[0] == 0:
+            self.done = True
+
+    def _open_anchor(self, level: _Level) -> None:
+        """Record a heading, or the ids of an element that may link to one."""
+        capture = self._capture
+        ids = element_ids(level.name, level.element.attrs)
+        if level.name in HEADING_TAGS:
+            capture.headings.append(([], capture.pending_ids + ids))
+            capture.pending_ids = []
+            capture.heading = level
+        elif ids and capture.heading is not None:
+            capture.headings[-1][1].extend(ids)
+        elif ids:
+            # Taken by the next heading, unless the element closes with text in it
+            capture.pending_ids.extend(ids)
+            level.anchor = (ids, capture.text_seen, len(capture.headings))
+
+    def _close_anchor(self, level: _Level) -> None:
+        """Resolve the ids of a closing element that no heading has taken."""
+        capture = self._capture
+        if level is capture.heading:
+            capture.heading = None
+            return
+        ids, text_seen, heading_count = level.anchor
+        if len(capture.headings) != heading_count or capture.text_seen == text_seen:
+            return
+        capture.pending_ids = [
+            element_id for element_id in capture.pending_ids if element_id not in ids
+        ]
+        if capture.headings:
+            # The section the element is in
+            capture.headings[-1][1].extend(ids)
+
+    def _close_level(self, level: _Level) -> None:
+        """Convert the children of a closing element and hand it to its parent."""
+        capture = self._capture
+        if level is capture.heading or level.anchor is not None:
+            self._close_anchor(level)
+        strings = self._resolve(level, final=True)
+        if level.flow:
+            for text in strings:
+                capture.writer.write(text)
+            if level.block:
+                capture.writer.close_block()
+            else:
+                capture.writer.close_container(level.written)
+            return
+
+        if 'pre' not in level.child_tags:
+            strings = _collapse_newlines(strings)
+        level.item.text = ''.join(strings)
+        if level.name in ('td', 'th'):
+            row = level.parent
+            while row is not None and row.name not in ('tr', 'table'):
+                row = row.parent
+            if row is not None and row.name == 'tr':
+                row.item.cells.append((level.name, level.element.attrs.get('colspan')))
+        parent = level.parent
+        if level.name == 'tr':
+            parent.tr_count += 1
+        parent.items.append(level.item)
+        if parent.flow:
+            self._flush(parent)
+
+    def _flush(self, level: _Level) -> None:
+        """Write out the children of a content container whose next sibling is known."""
+        capture = self._capture
+        for text in self._resolve(level, final=False):
+            capture.writer.write(text)
+            if capture.writer.full:
+                break
+
+    # Conversion
+
+    def _resolve(self, level: _Level, final: bool) -> List[str]:
+        """Convert the children of a level whose following siblings are known.
+
+        Returns:
+            Converted child strings, without empty ones
+        """
+        items = level.items
+        strings = []
+        count = len(items)
+        index = 0
+        while index < count:
+            item = items[index]
+            following = items[index + 1] if index + 1 < count else None
+            if following is None and not final:
+                break
+            if item.kind == 'element' and item.name in ('ul', 'ol'):
+                following_content = next(
+                    (other for other in items[index + 1 :] if _is_content(other)), None
+                )
+                if following_content is None and not final:
+                    break
+                text = self._convert_list(item, level, following_content)
+            elif item.kind == 'text':
+                text = self._convert_text(item, level, following)
+            elif item.kind == 'element':
+                text = self._convert_element(item, level)
+            else:
+                text = ''
+            if item.kind != 'text' and item.kind != 'comment':
+                level.tag_seen = True
+                if item.name == 'li':
+                    level.li_count += 1
+            level.previous = item
+            if text:
+                strings.append(text)
+            index += 1
+        del items[:index]
+        return strings
+
+    def _convert_text(self, item: _Item, level: _Level, following: Optional[_Item]) -> str:
+        text = item.text
+        previous = level.previous
+        remove_inside = markdownify.should_remove_whitespace_inside(level)
+        if not text.strip():
+            if remove_inside and (previous is None or following is None):
+                return ''
+            if markdownify.should_remove_whitespace_outside(
+                previous
+            ) or markdownify.should_remove_whitespace_outside(following):
+                return ''
+        tags = level.child_tags
+        if 'pre' not in tags:
+            text = markdownify.re_newline_whitespace.sub('\n', text)
+            text = markdownify.re_whitespace.sub(' ', text)
+        if '_noformat' not in tags:
+            text = self._markdown.escape(text, tags)
+        if markdownify.should_remove_whitespace_outside(previous) or (
+            remove_inside and previous is None
+        ):
+            text = text.lstrip(' \t\r\n')
+        if markdownify.should_remove_whitespace_outside(following) or (
+            remove_inside and following is None
+        ):
+            text = text.rstrip()
+        return text
+
+    def _convert_element(self, item: _Item, level: _Level) -> str:
+        name = item.name
+        if name == 'li':
+            return self._convert_li(item, level)
+        if name == 'tr':
+            return self._convert_tr(item, level)
+        convert = self._markdown.get_conv_fn_cached(name)
+        if convert is None:
+            return item.text
+        text = convert(item.element, item.text, level.child_tags)
+        if name in ('td', 'th') and level.name == 'tr':
+            attrs = item.element.attrs
+            level.item.row_cells.append(
+                (text, cell_span(attrs.get('colspan')), cell_span(attrs.get('rowspan')))
+            )
+        elif name == 'table':
+            text = with_more_rows(text, item.skipped_rows)
+        return text
+
+    def _convert_list(self, item: _Item, level: _Level, following: Optional[_Item]) -> str:
+        # Mirrors MarkdownConverter.convert_list with a precomputed next sibling
+        before_paragraph = following is not None and following.name not in ('ul', 'ol')
+        if 'li' in level.child_tags:
+            return '\n' + item.text.rstrip()
+        return '\n\n' + item.text + ('\n' if before_paragraph else '')
+
+    def _convert_li(self, item: _Item, level: _Level) -> str:
+        # Mirrors MarkdownConverter.convert_li with counters kept on the parent level
+        text = (item.text or '').strip()
+        if not text:
+            return '\n'
+        if level.name == 'ol':
+            start = level.element.get('start')
+            start = int(start) if start and str(start).isnumeric() else 1
+            bullet = '%s.' % (start + level.li_count)
+        else:
+            bullets = self._markdown.options['bullets']
+            bullet = bullets[(level.ul_depth - 1) % len(bullets)]
+        bullet = bullet + ' '
+        indent = ' ' * len(bullet)
+        text = markdownify.re_line_with_content.sub(
+            lambda match: indent + match.group(1) if match.group(1) else '', text
+        )
+        return '%s\n' % (bullet + text[len(bullet) :])
+
+    def _convert_tr(self, item: _Item, level: _Level) -> str:
+        # Mirrors TableConverter.render_table with the row's cells collected while parsing
+        cells = item.cells
+        parent = level.name
+        is_first_row = not level.tag_seen
+        table_has_thead = level.parent is not None and level.parent.thead_seen
+        is_headrow = all(name == 'th' for name, _ in cells) or (
+            parent == 'thead' and level.tr_count == 1
+        )
+        is_head_row_missing = (is_first_row and parent != 'tbody') or (
+            is_first_row and parent == 'tbody' and not table_has_thead
+        )
+        infer_header = self._markdown.options['table_infer_header']
+        underline = (is_headrow or (is_head_row_missing and infer_header)) and is_first_row
+        overline = not underline and (
+            (is_head_row_missing and not infer_header)
+            or (
+                is_first_row
+                and (parent == 'table' or (parent == 'tbody' and not level.has_previous_tag))
+            )
+        )
+
+        table = level if parent == 'table' else level.parent
+        if not underline and table is not None and table.name == 'table':
+            table.data_rows += 1
+            max_rows = self._markdown.options['table_max_rows']
+            if max_rows and table.data_rows > max_rows:
+                table.item.skipped_rows += 1
+                return ''
+
+        if len(item.row_cells) == len(cells):
+            if level.spans is None:
+                level.spans = RowSpans()
+            text, width = level.spans.place(item.row_cells)
+        else:
+            # Cells nested deeper than the row: markdownify's layout
+            text = item.text
+            width = sum(cell_span(colspan) for _, colspan in cells)
+        return table_row(text, width, overline, underline)
+
+
+def _is_content(item: _Item) -> bool:
+    """Check whether a sibling counts as block content (a tag or non-blank text)."""
+    if item.kind == 'text':
+        return item.text.strip() != ''
+    return item.kind != 'comment'
+
+
+def _collapse_newlines(strings: List[str]) -> List[str]:
+    """Collapse newlines at child boundaries to at most a blank line, like markdownify."""
+    collapsed = ['']
+    for text in strings:
+        leading, content, trailing = markdownify.re_extract_newlines.match(text).groups()
+        if collapsed[-1] and leading:
+            previous = collapsed.pop()
+            leading = '\n' * min(2, max(len(previous), len(leading)))
+        collapsed.extend([leading, content, trailing])
+    return collapsed
+
+
+def convert_html_streaming(
+    html: str, url: Optional[str] = None, max_chars: Optional[int] = None
+) -> StreamingConverter:
+    """Convert an in-memory page with the streaming converter.
+
+    Args:
+        html: Raw HTML content
+        url: URL of the page, used to select its extraction profile
+        max_chars: Stop once more than this many markdown characters are produced
+
+    Returns:
+        Closed converter holding the markdown, title and profile outcome
+    """
+    converter = StreamingConverter(url, max_chars)
+    for start in range(0, len(html), STREAM_CHUNK_CHARS):
+        converter.feed(html[start : start + STREAM_CHUNK_CHARS])
+        if converter.done:
+            break
+    converter.close()
+    return converter
@@ -0,0 +1,345 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Markdown rendering of HTML tables for Adobe AEM Documentation MCP Server.
+
+Reference pages (Coral UI component APIs, AEM release notes) consist mostly of
+large tables, and markdownify's generic conversion searches the tree for every
+row and every node inside a cell. ``TableConverter`` renders regular tables in
+one pass over their rows instead: header rows, colspan and the markdown of the
+cells are the same as markdownify's, cells covered by a rowspan from a row
+above are kept as empty cells so the columns stay aligned, and rows past
+``MCP_TABLE_MAX_ROWS`` are replaced by a "N more rows" line.
+
+Irregular tables (text or other elements between rows, tables nested in
+cells) are left to markdownify.
+"""
+
+import markdownify
+import os
+from bs4 import Comment, Doctype, NavigableString, Tag
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Data rows rendered per table before the rest are summarized (0 renders all)
+TABLE_MAX_ROWS = int(os.getenv('MCP_TABLE_MAX_ROWS', '0'))
+
+# Row groups of a table
+ROW_GROUPS = frozenset(['thead', 'tbody', 'tfoot'])
+
+# Table children converted generically, in place
+TABLE_DECORATIONS = frozenset(['caption', 'colgroup', 'col'])
+
+# Elements that make a table irregular when found inside one of its cells
+NESTED_TABLE_TAGS = frozenset(['table', 'tr', 'td', 'th'])
+
+
+class IrregularTable(Exception):
+    """A table whose structure the single-pass renderer does not handle."""
+
+
+def cell_span(value: Optional[str]) -> int:
+    """Parse a colspan or rowspan attribute like markdownify does for colspan.
+
+    Args:
+        value: Attribute value, if any
+
+    Returns:
+        Span between 1 and 1000
+    """
+    if isinstance(value, str) and value.isdigit():
+        return max(1, min(1000, int(value)))
+    return 1
+
+
+def more_rows_marker(skipped: int) -> str:
+    """Markdown line replacing the rows of a table past the row cap."""
+    return f'*{skipped} more rows*'
+
+
+def with_more_rows(table: str, skipped: int) -> str:
+    """Append the "N more rows" line to the markdown of a table, if rows were skipped.
+
+    Args:
+        table: Markdown of the table, surrounded by blank lines
+        skipped: Number of rows left out
+
+    Returns:
+        Markdown of the table
+    """
+    if not skipped:
+        return table
+    return table.rstrip('\n') + '\n\n' + more_rows_marker(skipped) + '\n\n'
+
+
+class RowSpans:
+    """Columns of a row group still covered by cells spanning rows from above."""
+
+    def __init__(self):
+        """Initialize with no spanning cells."""
+        self.remaining: Dict[int, int] = {}
+
+    def place(self, cells: List[Tuple[str, int, int]]) -> Tuple[str, int]:
+        """Lay out one row, inserting empty cells under cells spanning from above.
+
+        Args:
+            cells: Converted cells as (markdown, colspan, rowspan), where the
+                markdown is markdownify's ``' text |'`` repeated per column
+
+        Returns:
+            Cells of the row joined after the leading ``|``, and the row's width
+        """
+        remaining = self.remaining
+        below = {}
+        parts = []
+        column = 0
+        for text, colspan, rowspan in cells:
+            while column in remaining:
+                parts.append(' |')
+                column += 1
+            parts.append(text)
+            if rowspan > 1:
+                for spanned in range(column, column + colspan):
+                    below[spanned] = rowspan - 1
+            column += colspan
+        if remaining:
+            last = max(remaining)
+            while column <= last:
+                parts.append(' |')
+                column += 1
+        for spanned, rows in remaining.items():
+            if rows > 1:
+                below[spanned] = rows - 1
+        self.remaining = below
+        return ''.join(parts), column
+
+
+def table_row(
+    cells: str,
+    width: int,
+    overline: bool,
+    underline: bool,
+) -> str:
+    """Render a table row with markdownify's header lines.
+
+    Args:
+        cells: Cells of the row after the leading ``|``
+        width: Number of columns of the row
+        overline: Add an empty header row above the row
+        underline: Add a header separator below the row
+
+    Returns:
+        Markdown of the row
+    """
+    above = ''
+    if overline:
+        above = '| ' + ' | '.join([''] * width) + ' |' + '\n'
+        above += '| ' + ' | '.join(['---'] * width) + ' |' + '\n'
+    below = '| ' + ' | '.join(['---'] * width) + ' |' + '\n' if underline else ''
+    return above + '|' + cells + '\n' + below
+
+
+class TableConverter(markdownify.MarkdownConverter):
+    """Markdown converter rendering regular tables in a single pass over their rows."""
+
+    class Options(markdownify.MarkdownConverter.DefaultOptions):
+        """Converter defaults."""
+
+        table_max_rows = TABLE_MAX_ROWS
+
+    def process_tag(self, node, parent_tags=None):
+        """Convert an element, rendering tables with the single-pass renderer."""
+        if node.name == 'table':
+            try:
+                return self.render_table(node, parent_tags or set())
+            except IrregularTable:
+                pass
+        return super().process_tag(node, parent_tags)
+
+    def render_table(self, table: Tag, parent_tags: Set[str]) -> str:
+        """Render a table whose rows sit directly in it or in its row groups.
+
+        The header lines follow ``MarkdownConverter.convert_tr``: a header
+        separator below the first row of a group when it is a header row, and
+        an empty header row above a table that starts with a data row.
+
+        Args:
+            table: Table element
+            parent_tags: Names of the ancestors of the table
+
+        Returns:
+            Markdown of the table
+
+        Raises:
+            IrregularTable: If the table has content the renderer does not handle
+        """
+        table_tags = set(parent_tags)
+        table_tags.add('table')
+        infer_header = self.options['table_infer_header']
+        max_rows = self.options['table_max_rows']
+        children = [child for child in table.children if _is_structure(child)]
+        has_thead = any(child.name == 'thead' for child in children)
+        table_spans = RowSpans()
+        parts = []
+        data_rows = 0
+        skipped = 0
+        for index, child in enumerate(children):
+            name = child.name
+            if name in TABLE_DECORATIONS:
+                parts.append(super().process_tag(child, table_tags))
+                continue
+            if name == 'tr':
+                group, rows, spans = table, [child], table_spans
+                first_row = index == 0
+            elif name in ROW_GROUPS:
+                group, spans = child, RowSpans()
+                rows = [row for row in child.children if _is_structure(row)]
+                first_row = True
+            else:
+                raise IrregularTable(name)
+
+            group_tags = table_tags if group is table else table_tags | {name}
+            row_tags = group_tags | {'tr'}
+            for position, row in enumerate(rows):
+                if row.name != 'tr':
+                    raise IrregularTable(row.name)
+                is_first_row = first_row and position == 0
+                cells = [cell for cell in row.children if _is_structure(cell)]
+                if any(cell.name not in ('td', 'th') for cell in cells):
+                    raise IrregularTable(row.name)
+
+                is_headrow = all(cell.name == 'th' for cell in cells) or (
+                    group.name == 'thead' and len(rows) == 1
+                )
+                is_head_row_missing = is_first_row and (group.name != 'tbody' or not has_thead)
+                underline = (is_headrow or (is_head_row_missing and infer_header)) and is_first_row
+                overline = not underline and (
+                    (is_head_row_missing and not infer_header)
+                    or (
+                        is_first_row and (group is table or (group.name == 'tbody' and index == 0))
+                    )
+                )
+                if not underline:
+                    data_rows += 1
+                    if max_rows and data_rows > max_rows:
+                        skipped += 1
+                        continue
+
+                converted = [
+                    (
+                        self.render_cell(cell, row_tags),
+                        cell_span(cell.get('colspan')),
+                        cell_span(cell.get('rowspan')),
+                    )
+                    for cell in cells
+                ]
+                text, width = spans.place(converted)
+                parts.append(table_row(text, width, overline, underline))
+
+        return with_more_rows(self.convert_table(table, ''.join(parts), parent_tags), skipped)
+
+    def render_cell(self, node: Tag, parent_tags: Set[str]) -> str:
+        """Convert an element inside a table cell.
+
+        Equivalent to ``MarkdownConverter.process_tag``, except that whether
+        the element is inside a <pre> is read from its parent tags rather than
+        searched in the tree.
+
+        Raises:
+            IrregularTable: If the cell contains another table or stray table cells
+        """
+        name = node.name
+        child_tags = set(parent_tags)
+        child_tags.add(name)
+        if name in ('td', 'th') or markdownify.re_html_heading.match(name) is not None:
+            child_tags.add('_inline')
+        if name in ('pre', 'code', 'kbd', 'samp'):
+            child_tags.add('_noformat')
+
+        remove_inside = markdownify.should_remove_whitespace_inside(node)
+        strings = []
+        for child in node.children:
+            if isinstance(child, Tag):
+                if child.name in NESTED_TABLE_TAGS:
+                    raise IrregularTable(child.name)
+                text = self.render_cell(child, child_tags)
+            elif isinstance(child, (Comment, Doctype)):
+                continue
+            elif isinstance(child, NavigableString):
+                if not child.strip():
+                    previous, following = child.previous_sibling, child.next_sibling
+                    if remove_inside and (not previous or not following):
+                        continue
+                    if markdownify.should_remove_whitespace_outside(
+                        previous
+                    ) or markdownify.should_remove_whitespace_outside(following):
+                        continue
+                text = self.process_text(child, parent_tags=child_tags)
+            else:
+                continue
+            if text:
+                strings.append(text)
+
+        if 'pre' not in child_tags:
+            strings = collapse_newlines(strings)
+        text = ''.join(strings)
+
+        convert = self.get_conv_fn_cached(name)
+        if convert is not None:
+            text = convert(node, text, parent_tags=parent_tags)
+        return text
+
+
+def _is_structure(node) -> bool:
+    """Check whether a child of a table, row group or row is an element.
+
+    Comments, and whitespace next to rows, cells or the ends of the parent,
+    are dropped by markdownify.
+
+    Raises:
+        IrregularTable: If the child is text that markdownify would keep
+    """
+    if isinstance(node, Tag):
+        return True
+    if isinstance(node, (Comment, Doctype)):
+        return False
+    if not node.strip():
+        previous, following = node.previous_sibling, node.next_sibling
+        if (
+            not previous
+            or not following
+            or markdownify.should_remove_whitespace_outside(previous)
+            or markdownify.should_remove_whitespace_outside(following)
+        ):
+            return False
+    raise IrregularTable('text')
+
+
+def collapse_newlines(strings: List[str], collapsed: Optional[List[str]] = None) -> List[str]:
+    """Collapse newlines at child boundaries to at most a blank line, like markdownify.
+
+    Args:
+        strings: Converted children
+        collapsed: Result of an earlier call to continue from, extended in place
+
+    Returns:
+        Collapsed strings, to be joined
+    """
+    collapsed = [''] if collapsed is None else collapsed
+    for text in strings:
+        leading, content, trailing = markdownify.re_extract_newlines.match(text).groups()
+        if collapsed[-1] and leading:
+            previous = collapsed.pop()
+            leading = '\n' * min(2, max(len(previous), len(leading)))
+        collapsed.extend([leading, content, trailing])
+    return collapsed
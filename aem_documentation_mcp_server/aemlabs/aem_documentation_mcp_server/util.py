@@ -13,10 +13,29 @@
 # limitations under the License.
 """Utility functions for Adobe AEM Documentation MCP Server."""
 
-import markdownify
-from functools import lru_cache
-from typing import Optional
-from bs4 import BeautifulSoup
+import hashlib
+import os
+import threading
+from aemlabs.aem_documentation_mcp_server.document_utils import ParsedDocument, parse_document
+from aemlabs.aem_documentation_mcp_server.outline_utils import anchor_offsets
+from aemlabs.aem_documentation_mcp_server.streaming_utils import (
+    MARKDOWN_CONVERTER,
+    StreamingConverter,
+    convert_html_streaming,
+    resolve_converter,
+)
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+
+
+# Convert HTML pages only as far as the requested window needs
+LAZY_CONVERSION = os.getenv('MCP_LAZY_CONVERSION', 'false').lower() in ('1', 'true', 'yes')
+
+# Partially converted documents kept in the server process, so reading further
+# into a page continues the conversion where the previous read stopped
+LAZY_DOCUMENT_CACHE_SIZE = 4
 
 
 def extract_content_from_html(html: str) -> str:
@@ -36,163 +55,276 @@ def extract_content_from_html(html: str) -> str:
         return '<e>Empty HTML content</e>'
 
     try:
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Try to find the main content area
-        main_content = None
-
-        # Adobe-specific and common content container selectors
-        content_selectors = [
-            # Developer.adobe.com specific (Gatsby-based)
-            '#___gatsby',
-            '#gatsby-focus-wrapper',
-            'main.css-7wiue4',
-            # Adobe Experience League specific
-            '.article-content',
-            '.doc-content',
-            '.documentation-content',
-            '.page-content',
-            '.sp-wrapper',
-            '.content-container',
-            '#article-content-body',
-            # Adobe Experience League search results
-            '.search-results',
-            '.search-results-list',
-            '.search-result-item',
-            'dexter-SearchResults',
-            '.coveo-search-section',
-            '.coveo-result-list',
-            # GitHub specific
-            'article.markdown-body',
-            '.repository-content',
-            '#readme',
-            '.Box-body',
-            # GitHub Pages (Jekyll, Hugo, etc.)
-            '.post-content',
-            '.page-content',
-            '.content',
-            'article',
-            # Apache Sling specific
-            '.content',
-            '#content',
-            # adaptTo() specific
-            '.main-content',
-            '.content-wrapper',
-            '.schedule-content',
-            '.conference-content',
-            # Common selectors
-            'main',
-            'article',
-            '#main-content',
-            '.main-content',
-            '#content',
-            '.content',
-            "div[role='main']",
-        ]
-
-        # Try to find the main content using common selectors
-        for selector in content_selectors:
-            content = soup.select_one(selector)
-            if content:
-                main_content = content
-                break
-
-        # If no main content found, use the body
-        if not main_content:
-            main_content = soup.body if soup.body else soup
-
-        # Remove navigation elements that might be in the main content
-        nav_selectors = [
-            'noscript',
-            'script',
-            'style',
-            'nav',
-            'header',
-            'footer',
-            'aside',
-            # Adobe-specific navigation and UI elements
-            '.adobe-header',
-            '.adobe-footer',
-            '.navigation',
-            '.breadcrumb',
-            '.breadcrumbs',
-            '.cookie-banner',
-            '.cookie-notice',
-            '.cookie-consent',
-            '.feedback-widget',
-            '.feedback-container',
-            '.language-selector',
-            '.lang-selector',
-            '.page-nav',
-            '.side-nav',
-            '.sidebar',
-            '.toc',
-            '.table-of-contents',
-            '.prev-next',
-            '.pagination',
-            # Social and sharing
-            '.social-share',
-            '.share-buttons',
-            # Adobe Experience League specific
-            '.feds-header',
-            '.feds-footer',
-            '.feds-navList',
-            '.spectrum-Accordion',
-            '.mini-toc-container',
-            # GitHub specific
-            '.Box-header',
-            '.pagehead',
-            '.reponav',
-            '.file-navigation',
-            # Apache Sling specific
-            '#navigation',
-            '.nav',
-            # adaptTo() specific
-            '.site-header',
-            '.site-footer',
-            # Advertising and tracking
-            '.advertisement',
-            '.ad-container',
-            '.tracking',
-        ]
-
-        for selector in nav_selectors:
-            for element in main_content.select(selector):
-                element.decompose()
-
-        # Define tags to strip completely
-        tags_to_strip = [
-            'script',
-            'style',
-            'noscript',
-            'meta',
-            'link',
-            'svg',
-            'iframe',
-        ]
-
-        # Use markdownify on the cleaned HTML content
-        content = markdownify.markdownify(
-            str(main_content),
-            heading_style=markdownify.ATX,
-            autolinks=True,
-            default_title=True,
-            escape_asterisks=False,
-            escape_underscores=False,
-            newline_style='SPACES',
-            strip=tags_to_strip,
-        )
-
-        if not content or len(content.strip()) < 10:
-            return '<e>Page failed to be simplified from HTML or content too short</e>'
-
-        return content.strip()
-
+        return markdown_from_document(parse_document(html))
     except Exception as e:
         return f'<e>Error converting HTML to Markdown: {str(e)}</e>'
 
 
+def markdown_from_document(document: ParsedDocument) -> str:
+    """Get the markdown of a parsed page, or an error tag if too little was extracted.
+
+    Args:
+        document: Parsed page
+
+    Returns:
+        Simplified markdown version of the content
+    """
+    return checked_markdown(document.markdown)
+
+
+def checked_markdown(content: str) -> str:
+    """Get converted markdown, or an error tag if too little was extracted."""
+    if len(content) < 10:
+        return '<e>Page failed to be simplified from HTML or content too short</e>'
+    return content
+
+
+@dataclass
+class ConvertedPage:
+    """Result of converting a fetched page.
+
+    Attributes:
+        content: Markdown content with the title heading
+        title: Page title, if found
+        profile: Extraction profile used for HTML pages
+        profile_matched: Whether the profile's own content selectors matched
+        complete: False if the conversion stopped before the end of the content
+        anchors: Offsets of the headings in ``content`` that element ids of the
+            page link to, for complete HTML conversions
+    """
+
+    content: str
+    title: Optional[str] = None
+    profile: Optional[str] = None
+    profile_matched: bool = False
+    complete: bool = True
+    anchors: Dict[str, int] = field(default_factory=dict)
+
+
+def convert_page(
+    page_raw: str,
+    content_type: str,
+    url: Optional[str] = None,
+    converter: Optional[str] = None,
+    max_chars: Optional[int] = None,
+) -> ConvertedPage:
+    """Convert a fetched page to its final markdown form.
+
+    Args:
+        page_raw: Decoded response body
+        content_type: Content-Type header of the response
+        url: URL of the page, used to select its extraction profile
+        converter: Markdown converter, defaults to the configured ``MCP_MARKDOWN_CONVERTER``
+        max_chars: Stop converting HTML once more than this many characters of
+            markdown are available (None converts the whole page)
+
+    Returns:
+        Converted page
+    """
+    is_html = is_html_content(page_raw, content_type)
+    if resolve_converter(converter or MARKDOWN_CONVERTER) == 'streaming' and page_raw and is_html:
+        try:
+            return converted_from_stream(
+                convert_html_streaming(page_raw, url, max_chars=max_chars)
+            )
+        except Exception as e:
+            return ConvertedPage(content=f'<e>Error converting HTML to Markdown: {str(e)}</e>')
+
+    # Parse once; the title and the markdown come from the same tree
+    lazy = max_chars is not None and is_html and bool(page_raw)
+    document = None
+    title = None
+    parse_error = None
+    try:
+        document = lazy_document(page_raw, url) if lazy else parse_document(page_raw, url=url)
+        title = document.title
+    except Exception as e:
+        parse_error = e
+
+    # Convert to markdown
+    complete = True
+    if not is_html:
+        content = page_raw
+    elif not page_raw:
+        content = '<e>Empty HTML content</e>'
+    elif document is None:
+        content = f'<e>Error converting HTML to Markdown: {str(parse_error)}</e>'
+    else:
+        try:
+            if lazy:
+                markdown, complete = document.markdown_prefix(max_chars)
+                content = checked_markdown(markdown)
+            else:
+                content = markdown_from_document(document)
+        except Exception as e:
+            content = f'<e>Error converting HTML to Markdown: {str(e)}</e>'
+
+    converted = ConvertedPage(content=with_title(content, title), title=title, complete=complete)
+    if document is not None and document.converted:
+        converted.profile = document.profile.name
+        converted.profile_matched = document.profile_matched
+        if complete and content == document.markdown:
+            converted.anchors = title_anchors(converted.content, content, document.heading_ids)
+    return converted
+
+
+class LazyDocumentCache:
+    """LRU memo of the parsed documents that lazy conversion continues.
+
+    Documents are keyed by canonical URL and a digest of the body, so a read
+    further into the same page reuses the document and its converted sections
+    while a changed body is parsed again. The memo lives in the process that
+    calls ``lazy_document``; lazy conversions therefore run in threads of the
+    server process rather than in conversion worker processes, where each
+    worker would keep (and re-parse) its own copy.
+    """
+
+    def __init__(self, max_entries: int = LAZY_DOCUMENT_CACHE_SIZE):
+        """Initialize the memo.
+
+        Args:
+            max_entries: Maximum number of documents kept
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[str, str], ParsedDocument]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, page_raw: str, url: Optional[str]) -> ParsedDocument:
+        """Get the parsed document of a page, parsing it on first use.
+
+        Args:
+            page_raw: Decoded response body
+            url: URL of the page, used to select its extraction profile
+
+        Returns:
+            Parsed document, possibly with sections already converted
+        """
+        digest = hashlib.sha256(page_raw.encode('utf-8', 'surrogatepass')).hexdigest()
+        key = (canonicalize_url(url) if url else '', digest)
+        with self._lock:
+            document = self._entries.get(key)
+            if document is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return document
+            self.misses += 1
+
+        # Parse outside the lock so other pages are not held up
+        document = parse_document(page_raw, url=url)
+        with self._lock:
+            document = self._entries.setdefault(key, document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return document
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide memo of documents being converted lazily
+lazy_documents = LazyDocumentCache()
+
+
+def lazy_document(page_raw: str, url: Optional[str]) -> ParsedDocument:
+    """Parse a page for lazy conversion, reusing the document of an identical body.
+
+    Args:
+        page_raw: Decoded response body
+        url: URL of the page, used to select its extraction profile
+
+    Returns:
+        Parsed document, possibly with sections already converted
+    """
+    return lazy_documents.get(page_raw, url)
+
+
+def converted_from_stream(stream: StreamingConverter) -> ConvertedPage:
+    """Build the converted page of a closed streaming converter.
+
+    Args:
+        stream: Streaming converter that has been closed
+
+    Returns:
+        Converted page
+    """
+    content = checked_markdown(stream.markdown)
+    converted = ConvertedPage(
+        content=with_title(content, stream.title),
+        title=stream.title,
+        profile=stream.profile.name,
+        profile_matched=stream.profile_matched,
+        complete=stream.complete,
+    )
+    if stream.complete and content == stream.markdown:
+        converted.anchors = title_anchors(converted.content, content, stream.heading_ids)
+    return converted
+
+
+def title_anchors(
+    content: str, markdown: str, heading_ids: List[Tuple[str, List[str]]]
+) -> Dict[str, int]:
+    """Map element ids to heading offsets in content that may start with an added title.
+
+    The headings are matched within the converted markdown, so a title heading
+    added by ``with_title`` is never mistaken for one of the page's headings.
+
+    Args:
+        content: Final content, ending with ``markdown``
+        markdown: Converted markdown of the main content
+        heading_ids: Headings of the main content with the element ids linking to them
+
+    Returns:
+        Offset of the linked heading in ``content`` per element id
+    """
+    shift = len(content) - len(markdown)
+    return {
+        element_id: offset + shift
+        for element_id, offset in anchor_offsets(markdown, heading_ids).items()
+    }
+
+
+def with_title(content: str, title: Optional[str]) -> str:
+    """Add the title heading to converted content if it does not start with one."""
+    if title and not content.startswith('# '):
+        return f'# {title}\n\n{content}'
+    return content
+
+
+# Media types that are never converted to markdown
+BINARY_CONTENT_TYPE_PREFIXES = ('image/', 'audio/', 'video/', 'font/', 'application/vnd.')
+BINARY_CONTENT_TYPES = {
+    'application/octet-stream',
+    'application/pdf',
+    'application/zip',
+    'application/gzip',
+    'application/x-gzip',
+    'application/x-tar',
+    'application/java-archive',
+    'application/x-7z-compressed',
+    'application/wasm',
+}
+
+
+def is_binary_content_type(content_type: str) -> bool:
+    """Determine if a Content-Type header denotes binary content.
+
+    Args:
+        content_type: Content-Type header
+
+    Returns:
+        True if the content is binary and should not be downloaded for conversion
+    """
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return media_type in BINARY_CONTENT_TYPES or media_type.startswith(
+        BINARY_CONTENT_TYPE_PREFIXES
+    )
+
+
 def is_html_content(page_raw: str, content_type: str) -> bool:
     """Determine if content is HTML.
 
@@ -210,8 +342,32 @@ def is_html_content(page_raw: str, content_type: str) -> bool:
     )
 
 
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings map to the same cache key.
+
+    The scheme and host are lowercased, default ports are dropped and an empty
+    path becomes '/'. The query and fragment are kept as-is because search pages
+    and adapt.to schedules carry meaningful state in them.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Canonical form of the URL
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme == 'https' and netloc.endswith(':443')) or (
+        scheme == 'http' and netloc.endswith(':80')
+    ):
+        netloc = netloc.rsplit(':', 1)[0]
+    path = parsed.path or '/'
+    return urlunparse((scheme, netloc, path, parsed.params, parsed.query, parsed.fragment))
+
+
 def format_documentation_result(
-    url: str, content: str, start_index: int, max_length: int
+    url: str, content: str, start_index: int, max_length: int, complete: bool = True
 ) -> tuple[str, bool]:
     """Format documentation result with pagination information.
 
@@ -220,6 +376,7 @@ def format_documentation_result(
         content: Content to format
         start_index: Start index for pagination
         max_length: Maximum content length
+        complete: False if content is only a prefix of the document
 
     Returns:
         Tuple of (formatted documentation result, is_truncated)
@@ -246,7 +403,8 @@ def format_documentation_result(
     # Only add the prompt to continue fetching if there is still remaining content
     if is_truncated:
         next_start = start_index + actual_content_length
-        result += f'\n\n<e>Content truncated. Call the read_documentation tool with start_index={next_start} to get more content. Total length: {original_length}, Retrieved: {end_index}</e>'
+        total = original_length if complete else f'more than {original_length}'
+        result += f'\n\n<e>Content truncated. Call the read_documentation tool with start_index={next_start} to get more content. Total length: {total}, Retrieved: {end_index}</e>'
 
     return result, is_truncated
 
@@ -261,24 +419,6 @@ def extract_page_title(html: str) -> Optional[str]:
         Page title if found, None otherwise
     """
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Try various title sources
-        # 1. <title> tag
-        if soup.title and soup.title.string:
-            return soup.title.string.strip()
-
-        # 2. h1 heading
-        h1 = soup.find('h1')
-        if h1:
-            return h1.get_text().strip()
-
-        # 3. meta og:title
-        og_title = soup.find('meta', property='og:title')
-        if og_title and og_title.get('content'):
-            return og_title.get('content').strip()
-
-        return None
-
+        return parse_document(html).title
     except Exception:
         return None
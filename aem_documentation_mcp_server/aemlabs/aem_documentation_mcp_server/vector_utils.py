@@ -0,0 +1,442 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Related-page retrieval over converted pages for Adobe AEM Documentation MCP Server.
+
+Converted pages are split into chunks along their headings, and every chunk
+becomes a hashed TF-IDF vector: its terms (the stemmed terms of the local
+full-text index) are hashed into ``MCP_VECTOR_DIMENSIONS`` buckets holding
+sublinear term frequencies. The rows are appended to a float32 file that is
+memory-mapped with NumPy, and inverse document frequencies are applied at
+query time, so adding pages never rewrites earlier vectors. A query is one
+matrix-vector product over the mapped rows followed by a top-k selection.
+
+NumPy is an optional dependency (``pip install numpy``); without it the
+index stays disabled.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import zlib
+from aemlabs.aem_documentation_mcp_server.index_utils import tokenize
+from aemlabs.aem_documentation_mcp_server.models import RelatedPage
+from aemlabs.aem_documentation_mcp_server.outline_utils import build_outline
+from collections import Counter
+from loguru import logger
+from typing import Any, Dict, List, Optional, Tuple
+
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Persistent vector index location and limits (requires the optional 'numpy' package)
+VECTOR_INDEX_ENABLED = os.getenv('MCP_VECTOR_INDEX', 'true').lower() in ('1', 'true', 'yes')
+VECTOR_INDEX_DIR = os.getenv(
+    'MCP_VECTOR_INDEX_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'aem-documentation-mcp-server', 'vectors'),
+)
+VECTOR_INDEX_MAX_CHUNKS = int(os.getenv('MCP_VECTOR_INDEX_MAX_CHUNKS', '50000'))
+
+# Hash buckets per vector; changing it rebuilds the index from pages read afterwards
+VECTOR_DIMENSIONS = int(os.getenv('MCP_VECTOR_DIMENSIONS', '1024'))
+
+# Longest chunk; longer sections are split at paragraph boundaries
+CHUNK_MAX_CHARS = 2000
+
+# Removed chunks tolerated in the vector file before it is compacted
+COMPACT_MIN_DEAD_CHUNKS = 1000
+
+
+def is_numpy_available() -> bool:
+    """Check whether the optional NumPy dependency is installed.
+
+    Returns:
+        True if NumPy can be imported, False otherwise
+    """
+    return np is not None
+
+
+def chunk_document(content: str) -> List[Tuple[int, int, Optional[str]]]:
+    """Split converted markdown into chunks along its headings.
+
+    Args:
+        content: Markdown of a whole page
+
+    Returns:
+        Chunks as (start offset, end offset, section heading)
+    """
+    outline = build_outline(content)
+    bounds = [(0, None)] + [(heading.start_index, heading.text) for heading in outline]
+    chunks = []
+    for (start, section), (end, _) in zip(bounds, bounds[1:] + [(len(content), None)]):
+        while end - start > CHUNK_MAX_CHARS:
+            split = content.rfind('\n\n', start + CHUNK_MAX_CHARS // 2, start + CHUNK_MAX_CHARS)
+            split = split if split > start else start + CHUNK_MAX_CHARS
+            chunks.append((start, split, section))
+            start = split
+        if content[start:end].strip():
+            chunks.append((start, end, section))
+    return chunks
+
+
+def term_buckets(text: str, dimensions: int = VECTOR_DIMENSIONS) -> Dict[int, float]:
+    """Hash the terms of a text into sublinear term frequency buckets.
+
+    Args:
+        text: Markdown or query text
+        dimensions: Number of hash buckets
+
+    Returns:
+        Weight per bucket
+    """
+    counts = Counter(
+        zlib.crc32(term.encode('utf-8')) % dimensions for _, _, term in tokenize(text)
+    )
+    return {bucket: 1.0 + math.log(count) for bucket, count in counts.items()}
+
+
+class VectorIndex:
+    """Persistent chunk-level hashed TF-IDF index queried by cosine similarity.
+
+    ``vectors.f32`` holds one row of ``dimensions`` float32 term weights per
+    chunk, and ``chunks.jsonl`` a log of the pages added and removed with the
+    metadata of their chunks, in row order. Both files are only appended to;
+    removed pages leave dead rows behind until the files are compacted. All
+    methods are blocking and thread-safe; call them from a worker thread.
+    """
+
+    def __init__(
+        self,
+        directory: str = VECTOR_INDEX_DIR,
+        enabled: bool = VECTOR_INDEX_ENABLED,
+        dimensions: int = VECTOR_DIMENSIONS,
+        max_chunks: int = VECTOR_INDEX_MAX_CHUNKS,
+    ):
+        """Initialize the index; its files are read on first use.
+
+        Args:
+            directory: Directory holding the index files
+            enabled: Whether pages are indexed and queried (also requires NumPy)
+            dimensions: Hash buckets per vector
+            max_chunks: Live chunks kept before the oldest pages are dropped
+        """
+        self.directory = directory
+        self.enabled = enabled and is_numpy_available()
+        self.dimensions = dimensions
+        self.max_chunks = max_chunks
+        self._lock = threading.RLock()
+        self._loaded_directory: Optional[str] = None
+        self._truncate = True
+        self._chunks: List[Dict[str, Any]] = []
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._live = 0
+        self._vectors: Any = None
+        self._weights: Any = None
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, 'vectors.f32')
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self.directory, 'chunks.jsonl')
+
+    def _load(self) -> None:
+        """Replay the log of the index directory, starting over if it does not match the vectors."""
+        if self._loaded_directory == self.directory:
+            return
+        self._reset()
+        self._loaded_directory = self.directory
+        try:
+            with open(self._log_path, encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                records = [json.loads(line) for line in f]
+            rows = os.path.getsize(self._vectors_path) // (4 * self.dimensions)
+        except (OSError, ValueError):
+            return
+        if header.get('dimensions') == self.dimensions:
+            for record in records:
+                self._apply(record)
+            if rows == len(self._chunks):
+                self._truncate = False
+                return
+        logger.info(f'Vector index in {self.directory} does not match, starting a new one')
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget the loaded pages; the files are rewritten on the next add."""
+        self._chunks, self._pages, self._live = [], {}, 0
+        self._vectors, self._weights = None, None
+        self._truncate = True
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply a log record: a page added with its chunks, or a page removed."""
+        if 'remove' in record:
+            self._remove_page(record['remove'])
+            return
+        url = record['url']
+        self._remove_page(url)
+        self._pages[url] = {
+            'digest': record['digest'],
+            'row': len(self._chunks),
+            'count': len(record['chunks']),
+        }
+        self._chunks.extend(
+            {'url': url, 'title': record['title'], 'section': section, 'start_index': start}
+            for start, section in record['chunks']
+        )
+        self._live += len(record['chunks'])
+
+    def _remove_page(self, url: str) -> None:
+        """Mark the chunks of a page as dead."""
+        page = self._pages.pop(url, None)
+        if page is None:
+            return
+        for chunk in self._chunks[page['row'] : page['row'] + page['count']]:
+            chunk['url'] = None
+        self._live -= page['count']
+
+    def _append(self, rows: Any, records: List[Dict[str, Any]]) -> None:
+        """Append vectors, then their log records, creating the files if needed."""
+        os.makedirs(self.directory, exist_ok=True)
+        if self._truncate:
+            with open(self._log_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'dimensions': self.dimensions}) + '\n')
+            open(self._vectors_path, 'wb').close()
+            self._truncate = False
+        with open(self._vectors_path, 'ab') as f:
+            f.write(rows.tobytes())
+        with open(self._log_path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(record) + '\n' for record in records)
+
+    def _matrix(self) -> Any:
+        """Memory-mapped vectors, one row per chunk."""
+        if self._vectors is None and self._chunks:
+            self._vectors = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode='r',
+                shape=(len(self._chunks), self.dimensions),
+            )
+        return self._vectors
+
+    def add(self, url: str, title: Optional[str], content: str) -> bool:
+        """Index the chunks of a converted page, replacing its previous version.
+
+        Args:
+            url: URL of the page, as passed to ``read_documentation``
+            title: Title of the page, whose terms are added to every chunk
+            content: Markdown of the whole page
+
+        Returns:
+            True if the page was (re-)indexed, False if it was already up to date
+        """
+        if not self.enabled:
+            return False
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        with self._lock:
+            self._load()
+            if self._pages.get(url, {}).get('digest') == digest:
+                return False
+
+        chunks = chunk_document(content)
+        rows = np.zeros((len(chunks), self.dimensions), dtype=np.float32)
+        title_buckets = term_buckets(title or '', self.dimensions)
+        for row, (start, end, _) in zip(rows, chunks):
+            for bucket, weight in term_buckets(content[start:end], self.dimensions).items():
+                row[bucket] = weight
+            for bucket, weight in title_buckets.items():
+                row[bucket] += weight
+        record = {
+            'url': url,
+            'title': title,
+            'digest': digest,
+            'chunks': [[start, section] for start, _, section in chunks],
+        }
+
+        with self._lock:
+            self._load()
+            self._append(rows, [record])
+            self._apply(record)
+            self._evict()
+            self._vectors, self._weights = None, None
+        logger.debug(f'Added {len(chunks)} chunks of {url} to the vector index')
+        return True
+
+    def _evict(self) -> None:
+        """Drop the oldest pages beyond the chunk limit and compact the files if needed."""
+        evicted = []
+        while self._live > self.max_chunks and len(self._pages) > 1:
+            url = next(iter(self._pages))
+            self._remove_page(url)
+            evicted.append({'remove': url})
+        if len(self._chunks) - self._live >= max(COMPACT_MIN_DEAD_CHUNKS, self._live):
+            self._compact()
+        elif evicted:
+            self._append(np.zeros((0, self.dimensions), dtype=np.float32), evicted)
+
+    def _compact(self) -> None:
+        """Rewrite both files with the live pages only."""
+        vectors = np.memmap(
+            self._vectors_path,
+            dtype=np.float32,
+            mode='r',
+            shape=(len(self._chunks), self.dimensions),
+        )
+        records = []
+        vectors_tmp = f'{self._vectors_path}.{os.getpid()}.tmp'
+        with open(vectors_tmp, 'wb') as f:
+            for url, page in self._pages.items():
+                rows = slice(page['row'], page['row'] + page['count'])
+                f.write(vectors[rows].tobytes())
+                chunks = self._chunks[rows]
+                records.append(
+                    {
+                        'url': url,
+                        'title': chunks[0]['title'] if chunks else None,
+                        'digest': page['digest'],
+                        'chunks': [[chunk['start_index'], chunk['section']] for chunk in chunks],
+                    }
+                )
+        del vectors
+        log_tmp = f'{self._log_path}.{os.getpid()}.tmp'
+        with open(log_tmp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'dimensions': self.dimensions}) + '\n')
+            f.writelines(json.dumps(record) + '\n' for record in records)
+        os.replace(vectors_tmp, self._vectors_path)
+        os.replace(log_tmp, self._log_path)
+
+        self._reset()
+        self._truncate = False
+        for record in records:
+            self._apply(record)
+
+    def _idf_weights(self) -> Tuple[Any, Any, Any]:
+        """Squared IDF per bucket, TF-IDF norm per chunk and live chunk mask, cached until the next add.
+
+        The mapped rows are read in blocks, so no copy of the whole matrix is made.
+        """
+        if self._weights is None:
+            matrix = self._matrix()
+            live = np.zeros(len(self._chunks), dtype=bool)
+            for page in self._pages.values():
+                live[page['row'] : page['row'] + page['count']] = True
+            blocks = [slice(start, start + 4096) for start in range(0, len(matrix), 4096)]
+            frequencies = np.zeros(self.dimensions, dtype=np.int64)
+            for block in blocks:
+                frequencies += np.count_nonzero(matrix[block][live[block]], axis=0)
+            idf = np.log((1 + self._live) / (1 + frequencies)) + 1
+            idf_squared = (idf * idf).astype(np.float32)
+            norms = np.concatenate(
+                [np.sqrt((matrix[block] * matrix[block]) @ idf_squared) for block in blocks]
+            )
+            norms[norms == 0] = 1
+            self._weights = (idf_squared, norms, live)
+        return self._weights
+
+    def page_vector(self, url: str) -> Optional[Any]:
+        """Sum of the chunk vectors of an indexed page, or None if the page is not indexed."""
+        with self._lock:
+            self._load()
+            page = self._pages.get(url)
+            if not page or not page['count']:
+                return None
+            rows = self._matrix()[page['row'] : page['row'] + page['count']]
+            return np.asarray(rows).sum(axis=0)
+
+    def query_vector(self, text: str) -> Any:
+        """Vector of a free-text query."""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for bucket, weight in term_buckets(text, self.dimensions).items():
+            vector[bucket] = weight
+        return vector
+
+    def related(
+        self,
+        vector: Any,
+        max_results: int = 10,
+        exclude_url: Optional[str] = None,
+        url_contains: Optional[str] = None,
+    ) -> List[RelatedPage]:
+        """Find the pages whose chunks are most similar to a vector.
+
+        Args:
+            vector: Query or page vector (raw term weights)
+            max_results: Maximum number of pages returned
+            exclude_url: Page left out of the results, typically the query page
+            url_contains: Only return pages whose URL contains this text
+
+        Returns:
+            Pages with their most similar chunk, best first
+        """
+        if not self.enabled:
+            return []
+        with self._lock:
+            self._load()
+            if not self._live or not vector.any():
+                return []
+            idf_squared, norms, live = self._idf_weights()
+            query_norm = float(np.sqrt(vector * vector @ idf_squared)) or 1.0
+            scores = (self._matrix() @ (vector * idf_squared)) / (norms * query_norm)
+            allowed = live.copy()
+            for url, page in self._pages.items():
+                if url == exclude_url or (url_contains and url_contains not in url):
+                    allowed[page['row'] : page['row'] + page['count']] = False
+            scores = np.where(allowed & (scores > 0), scores, -1.0)
+            return self._best_pages(scores, max_results)
+
+    def _best_pages(self, scores: Any, max_results: int) -> List[RelatedPage]:
+        """Pages of the best scoring chunks, one per page with its best chunk."""
+        # The best chunks of max_results pages are among the top chunks; widen until they are
+        wanted = max_results * 4
+        while True:
+            top = min(wanted, len(scores))
+            candidates = np.argpartition(-scores, top - 1)[:top]
+            candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+            pages: Dict[str, RelatedPage] = {}
+            exhausted = top == len(scores)
+            for index in candidates:
+                score = float(scores[index])
+                if score <= 0:
+                    exhausted = True
+                    break
+                chunk = self._chunks[index]
+                if chunk['url'] not in pages:
+                    pages[chunk['url']] = RelatedPage(
+                        url=chunk['url'],
+                        title=chunk['title'],
+                        section=chunk['section'],
+                        start_index=chunk['start_index'],
+                        score=round(score, 4),
+                    )
+            if len(pages) >= max_results or exhausted:
+                return list(pages.values())[:max_results]
+            wanted *= 4
+
+    def __len__(self) -> int:
+        """Number of indexed pages."""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            self._load()
+            return len(self._pages)
+
+
+# Process-wide vector index
+vector_index = VectorIndex()
@@ -0,0 +1,126 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the sitemap catalog: sitemap parsing, loading and lookup latency.
+
+The corpus is ``--pages`` Experience League-like URLs built from a fixed
+vocabulary of path words, written as one gzipped sitemap. Every word is in
+about one URL in thirteen, a worst case for queries made only of common
+words. Lookups run against a freshly opened catalog, after its in-memory
+structures are built.
+
+Run from the package directory:
+
+    python -m tests.benchmarks.bench_catalog [--pages 100000] [--repeat 20]
+"""
+
+import argparse
+import gzip
+import random
+import tempfile
+import time
+from aemlabs.aem_documentation_mcp_server.catalog_utils import Catalog, SitemapParser
+from os import path
+
+
+PRODUCTS = [
+    'experience-manager-65',
+    'experience-manager-cloud-service',
+    'experience-manager-learn',
+]
+AREAS = ['implementing', 'administering', 'developing', 'authoring', 'assets', 'forms', 'sites']
+WORDS = (
+    'sling models injectors dispatcher caching flush agents replication workflow launcher '
+    'content fragments graphql headless components templates policies clientlibs osgi '
+    'configuration servlets resource resolver oak indexing lucene query builder translation '
+    'msm live copy blueprint assets renditions metadata schemas forms adaptive submission'
+).split()
+
+QUERIES = [
+    'injectors 4242',
+    'sling models injectors',
+    'dispatcher flush',
+    'dispacher',
+    'graphql',
+]
+
+
+def build_sitemap(pages: int) -> bytes:
+    """Gzipped urlset with ``pages`` distinct URLs."""
+    rng = random.Random(7)
+    entries = []
+    for number in range(pages):
+        product, area = rng.choice(PRODUCTS), rng.choice(AREAS)
+        name = '-'.join(rng.sample(WORDS, 3))
+        url = (
+            f'https://experienceleague.adobe.com/en/docs/{product}/content/{area}/{name}-{number}'
+        )
+        entries.append(f'<url><loc>{url}</loc><lastmod>2024-05-01</lastmod></url>')
+    body = (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        + ''.join(entries)
+        + '</urlset>'
+    )
+    return gzip.compress(body.encode())
+
+
+def main():
+    """Parse, store and load the catalog, then print per-lookup latency."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    sitemap = build_sitemap(args.pages)
+    started = time.perf_counter()
+    sitemap_parser = SitemapParser()
+    for start in range(0, len(sitemap), 65536):
+        sitemap_parser.feed(sitemap[start : start + 65536])
+    sitemap_parser.close()
+    print(
+        f'parsed {len(sitemap_parser.urls)} entries from {len(sitemap) / 1024 / 1024:.1f} MiB '
+        f'of gzipped sitemap in {time.perf_counter() - started:.2f} s'
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = path.join(directory, 'catalog.db')
+        catalog = Catalog(path=database, enabled=True)
+        started = time.perf_counter()
+        catalog.replace_source(
+            'https://experienceleague.adobe.com/sitemap.xml', sitemap_parser.urls
+        )
+        print(f'stored in {time.perf_counter() - started:.2f} s')
+        catalog.close_connection()
+
+        catalog = Catalog(path=database, enabled=True)
+        started = time.perf_counter()
+        size = len(catalog)
+        print(f'loaded {size} entries in {time.perf_counter() - started:.2f} s')
+
+        lookups = [(query, None) for query in QUERIES] + [
+            ('caching', 'experienceleague.adobe.com/en/docs/experience-manager-65/'),
+            (None, 'experienceleague.adobe.com/en/docs/experience-manager-learn/content/forms/'),
+        ]
+        for query, prefix in lookups:
+            best = float('inf')
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                entries = catalog.lookup(query, prefix)
+                best = min(best, time.perf_counter() - started)
+            label = f'{query or ""} {"(prefix)" if prefix else ""}'.strip()
+            print(f'  {label:<28} {best * 1e6:10.0f} us  {len(entries)} entries')
+        catalog.close_connection()
+
+
+if __name__ == '__main__':
+    main()
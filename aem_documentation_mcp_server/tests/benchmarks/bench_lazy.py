@@ -0,0 +1,88 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark lazy conversion: markdown of the first page versus the whole page.
+
+Content extraction (locating and pruning the main content) is the same for
+both and is excluded; only the markdown conversion is timed. The last line per
+page reads the whole page window by window through ``markdown_prefix``.
+
+Run from the package directory:
+
+    python -m tests.benchmarks.bench_lazy [--repeat 3] [--max-chars 10000]
+"""
+
+import argparse
+import time
+from aemlabs.aem_documentation_mcp_server.document_utils import ParsedDocument, parse_document
+from tests.benchmarks.bench_parse import build_page
+from tests.benchmarks.pages import build_coral_reference, build_release_notes
+from typing import Callable
+
+
+def best_time(html: str, url: str, fn: Callable[[ParsedDocument], object], repeat: int) -> float:
+    """Return the best wall time of ``fn`` on a freshly extracted document."""
+    best = float('inf')
+    for _ in range(repeat):
+        document = parse_document(html, url=url)
+        document.main_content
+        started = time.perf_counter()
+        fn(document)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def read_all(document: ParsedDocument, max_chars: int) -> None:
+    """Request every window of the page in turn, like paginated reads."""
+    end = max_chars
+    while not document.markdown_prefix(end)[1]:
+        end += max_chars
+
+
+def main():
+    """Run the benchmark and print one line per page and conversion."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-chars', type=int, default=10000)
+    args = parser.parse_args()
+
+    pages = {
+        'coral reference': (
+            build_coral_reference(),
+            'https://developer.adobe.com/experience-manager/reference-materials/coral/',
+        ),
+        'release notes': (
+            build_release_notes(),
+            'https://experienceleague.adobe.com/docs/experience-manager-65/release-notes/sp.html',
+        ),
+        'sectioned page': (build_page(400), 'https://experienceleague.adobe.com/docs/page.html'),
+    }
+    for name, (html, url) in pages.items():
+        document = parse_document(html, url=url)
+        print(f'{name}: {len(document.markdown) / 1024:.0f} KiB of markdown')
+        conversions = {
+            'whole page': lambda document: document.markdown,
+            f'first {args.max_chars} chars': lambda document: document.markdown_prefix(
+                args.max_chars
+            ),
+            f'all, {args.max_chars} at a time': lambda document: read_all(
+                document, args.max_chars
+            ),
+        }
+        for label, fn in conversions.items():
+            elapsed = best_time(html, url, fn, args.repeat)
+            print(f'  {label:<26} {elapsed * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark page parsing: separate title/content parses versus one shared parse.
+
+Run from the package directory:
+
+    python -m tests.benchmarks.bench_parse [--sections 400] [--repeat 5]
+"""
+
+import argparse
+import bs4
+import time
+from aemlabs.aem_documentation_mcp_server import document_utils
+from aemlabs.aem_documentation_mcp_server.util import (
+    convert_page,
+    extract_content_from_html,
+    extract_page_title,
+)
+from unittest.mock import patch
+
+
+def build_page(sections: int) -> str:
+    """Build a documentation-like page with navigation chrome and many sections."""
+    nav = ''.join(f'<li><a href="/docs/{i}">Topic {i}</a></li>' for i in range(200))
+    body = ''.join(
+        f'<h2 id="s{i}">Section {i}</h2>'
+        f'<p>Configure the <code>OsgiConfig{i}</code> for <a href="/x/{i}">component {i}</a>.</p>'
+        f'<pre><code>mvn clean install -PautoInstallPackage -Dsection={i}</code></pre>'
+        f'<ul><li>First point {i}</li><li>Second point {i}</li></ul>'
+        for i in range(sections)
+    )
+    return (
+        '<html><head><title>Benchmark page</title>'
+        '<meta name="description" content="Synthetic page"></head><body>'
+        f'<header class="feds-header"><nav><ul>{nav}</ul></nav></header>'
+        f'<div class="article-content"><h1>Benchmark page</h1>{body}</div>'
+        '<footer class="feds-footer">Footer</footer></body></html>'
+    )
+
+
+def measure(fn, repeat: int) -> tuple[float, int]:
+    """Return the best wall time of ``fn`` and how many parse trees one call builds."""
+    with patch.object(document_utils, 'BeautifulSoup', wraps=bs4.BeautifulSoup) as soup:
+        fn()
+        parses = soup.call_count
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best, parses
+
+
+def main():
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    html = build_page(args.sections)
+    parser_name = document_utils.resolve_parser()
+    builder = document_utils.PARSER_BACKENDS[parser_name]
+    parse_only, _ = measure(lambda: bs4.BeautifulSoup(html, builder), args.repeat)
+    separate, separate_parses = measure(
+        lambda: (extract_page_title(html), extract_content_from_html(html)), args.repeat
+    )
+    shared, shared_parses = measure(lambda: convert_page(html, 'text/html'), args.repeat)
+
+    print(
+        f'Page size: {len(html) / 1024:.0f} KiB, parser: {parser_name}, '
+        f'one parse: {parse_only * 1000:.1f} ms'
+    )
+    print(
+        f'Separate title + content: {separate * 1000:.1f} ms, '
+        f'{separate_parses} parses, parse cost {separate_parses * parse_only * 1000:.1f} ms'
+    )
+    print(
+        f'Shared parsed document:   {shared * 1000:.1f} ms, '
+        f'{shared_parses} parse, parse cost {shared_parses * parse_only * 1000:.1f} ms'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the HTML parser backends on the recorded pages of every supported domain.
+
+Run from the package directory:
+
+    python -m tests.benchmarks.bench_parsers [--repeat 20] [--sections 400]
+"""
+
+import argparse
+import time
+from aemlabs.aem_documentation_mcp_server.document_utils import PARSER_BACKENDS, parse_document
+from pathlib import Path
+from tests.benchmarks.bench_parse import build_page
+
+
+PAGES_DIR = Path(__file__).parent.parent / 'fixtures' / 'pages'
+
+
+def best_time(fn, repeat: int) -> float:
+    """Return the best wall time of ``fn`` over ``repeat`` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    """Run the comparison and print one row per page."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--sections', type=int, default=400)
+    args = parser.parse_args()
+
+    pages = [
+        (path.name, path.read_text(encoding='utf-8')) for path in sorted(PAGES_DIR.glob('*.html'))
+    ]
+    pages.append((f'synthetic ({args.sections} sections)', build_page(args.sections)))
+
+    backends = list(PARSER_BACKENDS)
+    header = f'{"page":<34}' + ''.join(
+        f'{name + " parse":>20}{name + " total":>20}' for name in backends
+    )
+    print(header + f'{"same output":>14}')
+    for name, html in pages:
+        row = f'{name:<34}'
+        outputs = set()
+        for backend in backends:
+            parse = best_time(lambda: parse_document(html, backend), args.repeat)
+            total = best_time(lambda: parse_document(html, backend).markdown, args.repeat)
+            outputs.add(parse_document(html, backend).markdown)
+            row += f'{parse * 1000:>17.2f} ms{total * 1000:>17.2f} ms'
+        print(row + f'{"yes" if len(outputs) == 1 else "no":>14}')
+
+
+if __name__ == '__main__':
+    main()
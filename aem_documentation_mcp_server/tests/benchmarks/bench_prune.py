@@ -0,0 +1,92 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark navigation pruning: one select pass per selector versus the single-pass walker.
+
+Run from the package directory:
+
+    python -m tests.benchmarks.bench_prune [--repeat 5]
+"""
+
+import argparse
+import time
+from aemlabs.aem_documentation_mcp_server.document_utils import (
+    GENERIC_PROFILE,
+    NAV_SELECTORS,
+    parse_document,
+)
+from tests.benchmarks.pages import build_coral_reference, build_release_notes
+
+
+def prune_per_selector(content, count: bool = False) -> int:
+    """Prune the way the converter used to: one full traversal per selector.
+
+    Counting the elements each traversal visits is only done on request so that
+    it does not inflate the timed runs.
+    """
+    visited = 0
+    for selector in NAV_SELECTORS:
+        if count:
+            visited += sum(1 for _ in content.find_all(True))
+        for element in content.select(selector):
+            element.decompose()
+    return visited
+
+
+def prune_walker(content) -> int:
+    """Prune with the hash-set walker in a single traversal."""
+    return GENERIC_PROFILE.prune(content)
+
+
+def run(html: str, prune, repeat: int) -> tuple[float, str]:
+    """Return the best pruning time and the resulting markup."""
+    best = float('inf')
+    markup = ''
+    for _ in range(repeat):
+        content = parse_document(html).soup.body
+        started = time.perf_counter()
+        prune(content)
+        best = min(best, time.perf_counter() - started)
+        markup = str(content)
+    return best, markup
+
+
+def main():
+    """Run the benchmark and print a comparison per page."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = [
+        ('Coral UI 3 reference', build_coral_reference()),
+        ('AEM 6.5 release notes', build_release_notes()),
+    ]
+    for name, html in pages:
+        old_time, old_markup = run(html, prune_per_selector, args.repeat)
+        new_time, new_markup = run(html, prune_walker, args.repeat)
+        old_visited = prune_per_selector(parse_document(html).soup.body, count=True)
+        new_visited = prune_walker(parse_document(html).soup.body)
+        print(f'{name} ({len(html) / 1024:.0f} KiB)')
+        print(
+            f'  per-selector select: {len(NAV_SELECTORS)} traversals, '
+            f'{old_visited} elements visited, {old_time * 1000:.1f} ms'
+        )
+        print(
+            f'  single-pass walker:  1 traversal, {new_visited} elements visited, '
+            f'{new_time * 1000:.1f} ms ({old_time / new_time:.0f}x faster)'
+        )
+        print(f'  identical result: {old_markup == new_markup}')
+
+
+if __name__ == '__main__':
+    main()
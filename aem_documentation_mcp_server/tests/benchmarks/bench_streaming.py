@@ -0,0 +1,79 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark markdown conversion: parse tree plus markdownify versus the streaming converter.
+
+Reports wall time and peak traced memory for full conversions and for the
+streaming converter stopping after the first ``read_documentation`` page.
+
+Run from the package directory:
+
+    python -m tests.benchmarks.bench_streaming [--repeat 3] [--max-chars 10000]
+"""
+
+import argparse
+import time
+import tracemalloc
+from aemlabs.aem_documentation_mcp_server.document_utils import parse_document, resolve_parser
+from aemlabs.aem_documentation_mcp_server.streaming_utils import convert_html_streaming
+from tests.benchmarks.bench_parse import build_page
+from tests.benchmarks.pages import build_coral_reference, build_release_notes
+
+
+def measure(fn, repeat: int) -> tuple[float, int]:
+    """Return the best wall time of ``fn`` and its peak traced memory in bytes."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    """Run the benchmark and print one line per page and converter."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-chars', type=int, default=10000)
+    args = parser.parse_args()
+
+    parser_name = resolve_parser()
+    pages = {
+        'coral reference': build_coral_reference(),
+        'release notes': build_release_notes(),
+        'sectioned page': build_page(400),
+    }
+    for name, html in pages.items():
+        tree = parse_document(html, parser_name).markdown
+        streamed = convert_html_streaming(html).markdown
+        converters = {
+            f'{parser_name} + markdownify': lambda: parse_document(html, parser_name).markdown,
+            'streaming': lambda: convert_html_streaming(html).markdown,
+            f'streaming ({args.max_chars} chars)': lambda: (
+                convert_html_streaming(html, max_chars=args.max_chars).markdown
+            ),
+        }
+        print(f'{name}: {len(html) / 1024:.0f} KiB, identical output: {tree == streamed}')
+        for label, fn in converters.items():
+            elapsed, peak = measure(fn, args.repeat)
+            print(f'  {label:<28} {elapsed * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark table conversion: markdownify's generic tables versus the single-pass renderer.
+
+Uses the recorded release notes table (its rows repeated ``--copies`` times)
+and the Coral UI reference page. Both converters render the same parse tree of
+the extracted main content. The release notes use rowspans, which markdownify
+ignores, so only the Coral UI page has identical output.
+
+Run from the package directory:
+
+    python -m tests.benchmarks.bench_tables [--copies 20] [--repeat 3] [--max-rows 200]
+"""
+
+import argparse
+import markdownify
+import re
+import time
+from aemlabs.aem_documentation_mcp_server.document_utils import MARKDOWN_OPTIONS, parse_document
+from aemlabs.aem_documentation_mcp_server.table_utils import TableConverter
+from bs4 import BeautifulSoup
+from pathlib import Path
+from tests.benchmarks.pages import build_coral_reference
+
+
+RELEASE_NOTES = (
+    Path(__file__).parent.parent / 'fixtures' / 'tables' / 'experienceleague-release-notes.html'
+)
+
+
+def build_release_notes_table(copies: int) -> str:
+    """Repeat the body rows of the recorded release notes table."""
+    html = RELEASE_NOTES.read_text(encoding='utf-8')
+    match = re.search(r'(<tbody>)(.*?)(</tbody>)', html, re.S)
+    return html[: match.start(2)] + match.group(2) * copies + html[match.end(2) :]
+
+
+def best_time(fn, repeat: int) -> float:
+    """Return the best wall time of ``fn`` over ``repeat`` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    """Run the benchmark and print one line per page and converter."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--copies', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-rows', type=int, default=200)
+    args = parser.parse_args()
+
+    pages = {
+        'release notes table': build_release_notes_table(args.copies),
+        'coral reference': build_coral_reference(),
+    }
+    for name, html in pages.items():
+        content = str(parse_document(html).main_content)
+        soup = BeautifulSoup(content, 'html.parser')
+        converters = {
+            'markdownify': markdownify.MarkdownConverter(**MARKDOWN_OPTIONS),
+            'single-pass tables': TableConverter(**MARKDOWN_OPTIONS),
+            f'single-pass, {args.max_rows} rows': TableConverter(
+                **MARKDOWN_OPTIONS, table_max_rows=args.max_rows
+            ),
+        }
+        outputs = [converter.convert_soup(soup) for converter in converters.values()]
+        print(
+            f'{name}: {len(content) / 1024:.0f} KiB of content, '
+            f'identical output: {outputs[0] == outputs[1]}'
+        )
+        for label, converter in converters.items():
+            elapsed = best_time(lambda: converter.convert_soup(soup), args.repeat)
+            print(f'  {label:<26} {elapsed * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark the related-page vector index: indexing time and query latency.
+
+The corpus is the converted release notes page plus ``--pages`` converted
+sectioned pages, each made distinct by its own page number. Queries run
+against a freshly opened index, as after a server restart; the first query
+includes computing the IDF weights. Requires NumPy.
+
+Run from the package directory:
+
+    python -m tests.benchmarks.bench_vectors [--pages 200] [--repeat 5]
+"""
+
+import argparse
+import tempfile
+import time
+from aemlabs.aem_documentation_mcp_server.util import extract_content_from_html
+from aemlabs.aem_documentation_mcp_server.vector_utils import VectorIndex
+from os import path
+from tests.benchmarks.bench_parse import build_page
+from tests.benchmarks.pages import build_release_notes
+
+
+QUERIES = [
+    'osgiconfig7',
+    'configure component',
+    'fixed publishing issue',
+]
+
+
+def main():
+    """Index the corpus and print indexing throughput and per-query latency."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    release_notes = extract_content_from_html(build_release_notes())
+    page = extract_content_from_html(build_page(20))
+    corpus = {'https://experienceleague.adobe.com/docs/release-notes.html': release_notes}
+    for number in range(args.pages):
+        corpus[f'https://experienceleague.adobe.com/docs/page-{number}.html'] = (
+            f'# Page {number}\n\n{page}'
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = VectorIndex(directory=directory, enabled=True)
+        started = time.perf_counter()
+        for url, content in corpus.items():
+            index.add(url, None, content)
+        elapsed = time.perf_counter() - started
+        vectors = path.getsize(path.join(directory, 'vectors.f32'))
+        print(
+            f'indexed {len(corpus)} pages in {elapsed:.2f} s, '
+            f'vectors {vectors / 1024 / 1024:.1f} MiB'
+        )
+
+        index = VectorIndex(directory=directory, enabled=True)
+        for query in QUERIES:
+            best = float('inf')
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                related = index.related(index.query_vector(query))
+                best = min(best, time.perf_counter() - started)
+            print(f'  {query:<28} {best * 1000:8.1f} ms  {len(related)} pages')
+
+        url = 'https://experienceleague.adobe.com/docs/page-0.html'
+        started = time.perf_counter()
+        related = index.related(index.page_vector(url), exclude_url=url)
+        elapsed = time.perf_counter() - started
+        print(f'  {"related to page-0":<28} {elapsed * 1000:8.1f} ms  {len(related)} pages')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Generators of large documentation pages for benchmarks.
+
+The pages mirror the structure of the heaviest pages served by the supported
+sites: a Coral UI 3 style component reference (many nested API tables) and AEM
+6.5 style release notes (long fix lists and tables of issue identifiers).
+"""
+
+
+def build_coral_reference(components: int = 60, rows: int = 40) -> str:
+    """Build a component reference page with one large API table per component."""
+    sections = []
+    for c in range(components):
+        table_rows = ''.join(
+            f'<tr><td><code>prop{r}</code></td><td><code>String</code></td>'
+            f'<td>Sets the <em>prop{r}</em> of <code>coral-component{c}</code>.<br>'
+            f'Reflected to the <code>prop-{r}</code> attribute.</td><td>{"yes" if r % 2 else "no"}</td></tr>'
+            for r in range(rows)
+        )
+        sections.append(
+            f'<section class="component"><h2 id="c{c}">Coral.Component{c}</h2>'
+            f'<div class="toc"><a href="#c{c}-props">Properties</a><a href="#c{c}-events">Events</a></div>'
+            f'<p>The <code>Coral.Component{c}</code> component renders an accessible widget.</p>'
+            f'<h3 id="c{c}-props">Properties</h3>'
+            f'<table class="coral-Table"><thead><tr><th>Name</th><th>Type</th><th>Description</th>'
+            f'<th>Reflected</th></tr></thead><tbody>{table_rows}</tbody></table>'
+            f'<h3 id="c{c}-events">Events</h3>'
+            f'<pre><code>component.on("coral-component{c}:change", handler);</code></pre>'
+            f'<div class="feedback-widget"><button>Helpful?</button></div></section>'
+        )
+    nav = ''.join(f'<li><a href="#c{c}">Coral.Component{c}</a></li>' for c in range(components))
+    return (
+        '<html><head><title>Coral UI 3 Reference</title><script>var config = {};</script></head>'
+        f'<body><header class="site-header"><nav><ul>{nav}</ul></nav></header>'
+        f'<div class="sidebar"><ul>{nav}</ul></div>'
+        f'<main><h1>Coral UI 3 Reference</h1>{"".join(sections)}</main>'
+        '<footer class="site-footer">Footer</footer></body></html>'
+    )
+
+
+def build_release_notes(fixes: int = 1500) -> str:
+    """Build a service pack release notes page with long fix lists and issue tables."""
+    groups = []
+    for g in range(fixes // 100):
+        items = ''.join(
+            f'<li>Fixed an issue where <code>/content/page{g}-{i}</code> could not be published '
+            f'after a <strong>Move</strong> operation. NPR-{40000 + g * 100 + i}</li>'
+            for i in range(100)
+        )
+        rows = ''.join(
+            f'<tr><td>NPR-{40000 + g * 100 + i}</td><td>Sites</td><td>Resolved</td></tr>'
+            for i in range(0, 100, 4)
+        )
+        groups.append(
+            f'<h2 id="g{g}">Fixes in area {g}</h2><ul>{items}</ul>'
+            f'<table><tr><th>Issue</th><th>Area</th><th>Status</th></tr>{rows}</table>'
+            f'<div class="mini-toc-container"><a href="#g{g}">Area {g}</a></div>'
+        )
+    return (
+        '<html><head><title>AEM 6.5 Service Pack Release Notes</title></head><body>'
+        '<header class="feds-header"><nav class="feds-navList"><a href="/">Home</a></nav></header>'
+        '<div class="article-content"><h1>AEM 6.5 Service Pack Release Notes</h1>'
+        f'<div class="breadcrumbs"><a href="/">Docs</a></div>{"".join(groups)}</div>'
+        '<footer class="feds-footer">Footer</footer></body></html>'
+    )
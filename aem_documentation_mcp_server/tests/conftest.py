@@ -14,6 +14,22 @@
 """Configuration for pytest."""
 
 import pytest
+from aemlabs.aem_documentation_mcp_server import server_utils
+from aemlabs.aem_documentation_mcp_server.cache_utils import (
+    document_cache,
+    http_cache,
+    search_cache,
+)
+from aemlabs.aem_documentation_mcp_server.catalog_utils import catalog
+from aemlabs.aem_documentation_mcp_server.concurrency_utils import (
+    ConversionExecutor,
+    TimeLimitedWorker,
+)
+from aemlabs.aem_documentation_mcp_server.document_utils import ProfileStats
+from aemlabs.aem_documentation_mcp_server.index_utils import local_index
+from aemlabs.aem_documentation_mcp_server.resilience_utils import HostPolicy, HostResilience
+from aemlabs.aem_documentation_mcp_server.util import lazy_documents
+from aemlabs.aem_documentation_mcp_server.vector_utils import vector_index
 
 
 def pytest_addoption(parser):
@@ -38,3 +54,37 @@ def pytest_collection_modifyitems(config, items):
         for item in items:
             if 'live' in item.keywords:
                 item.add_marker(skip_live)
+
+
+@pytest.fixture(autouse=True)
+def reset_process_state(tmp_path, monkeypatch):
+    """Reset process-wide caches so tests do not observe each other's documents."""
+    document_cache.clear()
+    search_cache.clear()
+    lazy_documents.clear()
+    monkeypatch.setattr(http_cache, 'directory', str(tmp_path / 'http-cache'))
+    # Index only in tests that enable it, so background indexing cannot outlive a test
+    monkeypatch.setattr(local_index, 'path', str(tmp_path / 'index.db'))
+    monkeypatch.setattr(local_index, 'enabled', False)
+    monkeypatch.setattr(vector_index, 'directory', str(tmp_path / 'vectors'))
+    monkeypatch.setattr(vector_index, 'enabled', False)
+    monkeypatch.setattr(catalog, 'path', str(tmp_path / 'catalog.db'))
+    monkeypatch.setattr(catalog, 'enabled', False)
+    # Keep retries but without rate limiting or backoff delays
+    fast_policy = HostPolicy(requests_per_second=1000.0, burst=1000, backoff_base=0.0)
+    monkeypatch.setattr(server_utils, 'host_resilience', HostResilience({}, fast_policy))
+    # Convert in threads so patched helpers stay visible to the conversion
+    executor = ConversionExecutor(mode='thread', workers=2)
+    monkeypatch.setattr(server_utils, 'conversion_executor', executor)
+    # Regular expression searches get a worker process that ends with the test
+    regex_worker = TimeLimitedWorker(timeout=30)
+    monkeypatch.setattr(server_utils, 'regex_worker', regex_worker)
+    monkeypatch.setattr(server_utils, 'profile_stats', ProfileStats())
+    yield
+    executor.shutdown()
+    regex_worker.shutdown()
+    local_index.close_connection()
+    catalog.close_connection()
+    document_cache.clear()
+    search_cache.clear()
+    lazy_documents.clear()
@@ -0,0 +1,260 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for caching utilities."""
+
+import os
+from aemlabs.aem_documentation_mcp_server.cache_utils import (
+    CachedDocument,
+    DocumentCache,
+    HttpCache,
+    HttpCacheEntry,
+    SearchCache,
+    is_storable,
+)
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+
+class TestDocumentCache:
+    """Tests for DocumentCache class."""
+
+    def test_put_and_get(self):
+        """Test storing and retrieving a document."""
+        cache = DocumentCache(max_bytes=1000, ttl=60)
+        cache.put('https://a/', CachedDocument(url='https://a/', content='hello', title='A'))
+
+        document = cache.get('https://a/')
+        assert document is not None
+        assert document.content == 'hello'
+        assert document.length == 5
+        assert cache.hits == 1
+
+    def test_miss(self):
+        """Test that unknown keys are a miss."""
+        cache = DocumentCache(max_bytes=1000, ttl=60)
+        assert cache.get('https://missing/') is None
+        assert cache.misses == 1
+
+    def test_lru_eviction_by_size(self):
+        """Test that least recently used documents are evicted to fit the byte budget."""
+        cache = DocumentCache(max_bytes=25, ttl=60)
+        cache.put('a', CachedDocument(url='a', content='x' * 10))
+        cache.put('b', CachedDocument(url='b', content='y' * 10))
+        cache.get('a')
+        cache.put('c', CachedDocument(url='c', content='z' * 10))
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
+        assert cache.evictions == 1
+        assert cache.get_stats()['bytes'] == 20
+
+    def test_oversized_document_not_cached(self):
+        """Test that a document larger than the budget is not cached."""
+        cache = DocumentCache(max_bytes=5, ttl=60)
+        cache.put('a', CachedDocument(url='a', content='x' * 10))
+        assert len(cache) == 0
+
+    def test_ttl_expiry(self):
+        """Test that expired documents are dropped."""
+        cache = DocumentCache(max_bytes=1000, ttl=10)
+        with patch('aemlabs.aem_documentation_mcp_server.cache_utils.time.monotonic') as now:
+            now.return_value = 100.0
+            cache.put('a', CachedDocument(url='a', content='hello'))
+            now.return_value = 105.0
+            assert cache.get('a') is not None
+            now.return_value = 111.0
+            assert cache.get('a') is None
+        assert len(cache) == 0
+
+    def test_replace_updates_size(self):
+        """Test that replacing an entry keeps size accounting correct."""
+        cache = DocumentCache(max_bytes=1000, ttl=60)
+        cache.put('a', CachedDocument(url='a', content='x' * 10))
+        cache.put('a', CachedDocument(url='a', content='x' * 4))
+        assert cache.get_stats()['bytes'] == 4
+        assert len(cache) == 1
+
+
+class TestSearchCache:
+    """Tests for SearchCache class."""
+
+    def test_lru_and_ttl(self):
+        """Test eviction of the least recently used query and expiry of old results."""
+        cache = SearchCache(max_entries=2, ttl=10)
+        with patch('aemlabs.aem_documentation_mcp_server.cache_utils.time.monotonic') as now:
+            now.return_value = 100.0
+            cache.put('a', 1)
+            cache.put('b', 2)
+            assert cache.get('a') == 1
+            cache.put('c', 3)
+            assert cache.get('b') is None
+            now.return_value = 111.0
+            assert cache.get('a') is None
+        assert len(cache) == 1
+        assert cache.get_stats() == {'entries': 1, 'hits': 1, 'misses': 2}
+
+    def test_disabled(self):
+        """Test that a zero entry limit disables caching."""
+        cache = SearchCache(max_entries=0, ttl=10)
+        cache.put('a', 1)
+        assert cache.get('a') is None
+
+
+class TestHttpCacheEntry:
+    """Tests for HttpCacheEntry freshness rules."""
+
+    def _entry(self, headers, stored_at=1000.0):
+        return HttpCacheEntry(
+            url='https://a/', headers=headers, body=b'body', encoding='utf-8', stored_at=stored_at
+        )
+
+    def test_max_age_freshness(self):
+        """Test that max-age defines the freshness lifetime."""
+        entry = self._entry({'cache-control': 'public, max-age=60'})
+        assert entry.is_fresh(now=1030.0)
+        assert not entry.is_fresh(now=1061.0)
+
+    def test_age_header_counts(self):
+        """Test that the Age header reduces remaining freshness."""
+        entry = self._entry({'cache-control': 'max-age=60', 'age': '50'})
+        assert not entry.is_fresh(now=1011.0)
+
+    def test_no_cache_requires_revalidation(self):
+        """Test that no-cache entries are never fresh."""
+        entry = self._entry({'cache-control': 'no-cache, max-age=600', 'etag': '"x"'})
+        assert not entry.is_fresh(now=1000.0)
+
+    def test_expires_header(self):
+        """Test freshness from Expires relative to Date."""
+        entry = self._entry(
+            {
+                'date': 'Thu, 01 Jan 1970 00:16:40 GMT',
+                'expires': 'Thu, 01 Jan 1970 00:17:40 GMT',
+            }
+        )
+        assert entry.freshness_lifetime() == 60.0
+
+    def test_heuristic_freshness_from_last_modified(self):
+        """Test heuristic freshness of 10% of the Last-Modified age."""
+        entry = self._entry(
+            {
+                'date': 'Thu, 01 Jan 1970 00:16:40 GMT',
+                'last-modified': 'Thu, 01 Jan 1970 00:00:00 GMT',
+            }
+        )
+        assert entry.freshness_lifetime() == 100.0
+
+    def test_conditional_headers(self):
+        """Test revalidation headers built from validators."""
+        entry = self._entry({'etag': '"v1"', 'last-modified': 'Wed, 01 Jan 2025 00:00:00 GMT'})
+        assert entry.conditional_headers() == {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT',
+        }
+
+
+class TestIsStorable:
+    """Tests for is_storable function."""
+
+    def test_validators_are_storable(self):
+        """Test that a 200 with an ETag is storable."""
+        assert is_storable(200, {'etag': '"x"'})
+
+    def test_no_store(self):
+        """Test that no-store responses are not stored."""
+        assert not is_storable(200, {'cache-control': 'no-store', 'etag': '"x"'})
+
+    def test_without_freshness_or_validators(self):
+        """Test that responses without cache metadata are not stored."""
+        assert not is_storable(200, {'content-type': 'text/html'})
+
+    def test_error_status(self):
+        """Test that error responses are not stored."""
+        assert not is_storable(404, {'etag': '"x"'})
+
+
+class TestHttpCache:
+    """Tests for HttpCache class."""
+
+    def test_store_and_load_roundtrip(self, tmp_path):
+        """Test that entries survive a new cache instance (process restart)."""
+        entry = HttpCacheEntry(
+            url='https://a/',
+            headers={'etag': '"v1"'},
+            body='héllo'.encode('utf-8'),
+            encoding='utf-8',
+            stored_at=1000.0,
+            conversion_key='k',
+            markdown='# hello',
+            title='hello',
+            anchors={'intro': 0},
+        )
+        HttpCache(directory=str(tmp_path)).store(entry)
+
+        loaded = HttpCache(directory=str(tmp_path)).load('https://a/')
+        assert loaded is not None
+        assert loaded.text == 'héllo'
+        assert loaded.markdown == '# hello'
+        assert loaded.anchors == {'intro': 0}
+        assert loaded.headers == {'etag': '"v1"'}
+
+    def test_concurrent_stores(self, tmp_path):
+        """Test that threads storing the same entry write separate temporary files."""
+        cache = HttpCache(directory=str(tmp_path))
+        entry = HttpCacheEntry(
+            url='https://a/', headers={}, body=b'x' * 100000, encoding='utf-8', stored_at=1000.0
+        )
+        with patch('os.replace', wraps=os.replace) as mock_replace:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda _: cache.store(entry), range(16)))
+
+        sources = [call.args[0] for call in mock_replace.call_args_list]
+        assert len(sources) == 32 and len(set(sources)) == 32
+        assert HttpCache(directory=str(tmp_path)).load('https://a/').body == entry.body
+        assert not [
+            name for _, _, names in os.walk(tmp_path) for name in names if name.endswith('.tmp')
+        ]
+
+    def test_disabled_cache(self, tmp_path):
+        """Test that a disabled cache neither stores nor loads."""
+        cache = HttpCache(directory=str(tmp_path), enabled=False)
+        cache.store(
+            HttpCacheEntry(url='https://a/', headers={}, body=b'x', encoding='utf-8', stored_at=0)
+        )
+        assert cache.load('https://a/') is None
+
+    def test_refresh_updates_headers(self, tmp_path):
+        """Test that a 304 refreshes stored validators and timestamp."""
+        cache = HttpCache(directory=str(tmp_path))
+        entry = HttpCacheEntry(
+            url='https://a/', headers={'etag': '"v1"'}, body=b'x', encoding='utf-8', stored_at=0
+        )
+        cache.store(entry)
+        cache.refresh(entry, {'etag': '"v2"', 'cache-control': 'max-age=60'})
+
+        loaded = cache.load('https://a/')
+        assert loaded.headers['etag'] == '"v2"'
+        assert loaded.is_fresh()
+
+    def test_prune(self, tmp_path):
+        """Test that pruning removes entries beyond the size budget."""
+        cache = HttpCache(directory=str(tmp_path), max_bytes=5)
+        for url in ('https://a/', 'https://b/'):
+            cache.store(
+                HttpCacheEntry(url=url, headers={}, body=b'xxxx', encoding='utf-8', stored_at=0)
+            )
+        cache.prune()
+        remaining = [cache.load('https://a/'), cache.load('https://b/')]
+        assert sum(entry is not None for entry in remaining) == 1
@@ -0,0 +1,252 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the sitemap catalog."""
+
+import gzip
+import pytest
+from aemlabs.aem_documentation_mcp_server import catalog_utils
+from aemlabs.aem_documentation_mcp_server.catalog_utils import (
+    Catalog,
+    SitemapEntry,
+    SitemapParser,
+    title_from_url,
+    url_key,
+    within_one_edit,
+)
+
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url>
+    <loc>https://sling.apache.org/documentation/bundles/models.html</loc>
+    <lastmod>2024-05-01</lastmod>
+  </url>
+  <url><loc> https://sling.apache.org/documentation/the-sling-engine/servlets.html </loc></url>
+  <url><lastmod>2024-05-01</lastmod></url>
+</urlset>
+"""
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://experienceleague.adobe.com/sitemap-1.xml.gz</loc></sitemap>
+  <sitemap><loc>https://experienceleague.adobe.com/sitemap-2.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+SOURCE = 'https://experienceleague.adobe.com/sitemap.xml'
+
+PAGES = [
+    'https://sling.apache.org/documentation/bundles/models.html',
+    'https://sling.apache.org/documentation/the-sling-engine/servlets.html',
+    'https://experienceleague.adobe.com/en/docs/experience-manager-65/content/implementing/developing/components/sling-models-injectors',
+    'https://experienceleague.adobe.com/en/docs/experience-manager-cloud-service/content/implementing/content-delivery/caching',
+    'https://experienceleague.adobe.com/en/docs/experience-manager-65/content/implementing/deploying/configuring/dispatcher-caching',
+]
+
+
+def parse(body: bytes, chunk_size: int = 7) -> SitemapParser:
+    """Feed a body to a new parser in small chunks, as a download would."""
+    parser = SitemapParser()
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start : start + chunk_size])
+    parser.close()
+    return parser
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """Catalog with the pages of PAGES."""
+    catalog = Catalog(path=str(tmp_path / 'catalog.db'), enabled=True)
+    catalog.replace_source(SOURCE, [SitemapEntry(url, '2024-05-01') for url in PAGES])
+    yield catalog
+    catalog.close_connection()
+
+
+class TestSitemapParser:
+    """Tests for SitemapParser class."""
+
+    def test_urlset(self):
+        """Test that page entries keep their lastmod and entries without a loc are skipped."""
+        parser = parse(URLSET)
+
+        assert parser.urls == [
+            SitemapEntry(PAGES[0], '2024-05-01'),
+            SitemapEntry(PAGES[1], None),
+        ]
+        assert parser.sitemaps == []
+
+    def test_gzipped_sitemap_index(self):
+        """Test that gzipped sitemap indexes are recognized and list their sitemaps."""
+        parser = parse(gzip.compress(SITEMAP_INDEX))
+
+        assert parser.sitemaps == [
+            'https://experienceleague.adobe.com/sitemap-1.xml.gz',
+            'https://experienceleague.adobe.com/sitemap-2.xml',
+        ]
+        assert parser.urls == []
+
+    @pytest.mark.parametrize('body', [b'<urlset><url>', b'<html><p>Not found</html>'])
+    def test_invalid_xml(self, body):
+        """Test that truncated or malformed sitemaps raise ValueError."""
+        with pytest.raises(ValueError):
+            parse(body)
+
+    @pytest.mark.parametrize('compress', [False, True])
+    def test_size_limit(self, compress):
+        """Test that sitemaps larger than the limit are rejected, also after decompression."""
+        body = URLSET.replace(b'</urlset>', b'<!--' + b' ' * 10000 + b'--></urlset>')
+        parser = SitemapParser(max_bytes=5000)
+
+        with pytest.raises(ValueError, match='exceeds'):
+            parser.feed(gzip.compress(body) if compress else body)
+
+
+class TestUrlHelpers:
+    """Tests for title_from_url, url_key and within_one_edit functions."""
+
+    @pytest.mark.parametrize(
+        'url, title',
+        [
+            (PAGES[0], 'Models'),
+            (PAGES[3], 'Caching'),
+            (
+                'https://adapt.to/2024/en/schedule/sling-models_injection.html',
+                'Sling Models Injection',
+            ),
+            ('https://developer.adobe.com/experience-manager/index.html', 'Experience Manager'),
+            ('https://adapt.to/', 'adapt.to'),
+        ],
+    )
+    def test_title_from_url(self, url, title):
+        """Test titles derived from the last meaningful path segment."""
+        assert title_from_url(url) == title
+
+    def test_url_key(self):
+        """Test that the scheme and www. are ignored for prefix matching."""
+        assert url_key('https://www.adobe.com/docs') == 'adobe.com/docs'
+        assert url_key('sling.apache.org/documentation') == 'sling.apache.org/documentation'
+
+    @pytest.mark.parametrize(
+        'a, b, expected',
+        [
+            ('injector', 'injector', True),
+            ('injector', 'injecter', True),
+            ('injector', 'injectors', True),
+            ('injector', 'ijnector', True),
+            ('injector', 'nijector', True),
+            ('injector', 'injection', False),
+            ('sling', 'slnig', True),
+            ('sling', 'snilg', False),
+        ],
+    )
+    def test_within_one_edit(self, a, b, expected):
+        """Test substitutions, insertions, deletions and adjacent swaps."""
+        assert within_one_edit(a, b) is expected
+        assert within_one_edit(b, a) is expected
+
+
+class TestCatalog:
+    """Tests for Catalog class."""
+
+    def test_lookup_by_words(self, catalog):
+        """Test that rare URL words rank the matching page first."""
+        [first, *_] = catalog.lookup('sling models injectors')
+
+        assert first.url == PAGES[2]
+        assert first.title == 'Sling Models Injectors'
+        assert first.lastmod == '2024-05-01'
+        assert first.score > 0
+
+    def test_prefix_and_fuzzy_matching(self, catalog):
+        """Test that query words match URL words by prefix and with one typo."""
+        assert catalog.lookup('inject', max_results=1)[0].url == PAGES[2]
+        assert catalog.lookup('dispacher', max_results=1)[0].url == PAGES[4]
+        assert catalog.lookup('xyzzy') == []
+
+    def test_partial_matches(self, catalog):
+        """Test that pages matching only some query words are found when none matches all."""
+        urls = [entry.url for entry in catalog.lookup('dispatcher servlets')]
+
+        assert set(urls) == {PAGES[1], PAGES[4]}
+
+    def test_url_prefix(self, catalog):
+        """Test restricting a query to a URL prefix and listing the pages under a prefix."""
+        prefix = 'https://experienceleague.adobe.com/en/docs/experience-manager-65'
+
+        assert [entry.url for entry in catalog.lookup('caching', url_prefix=prefix)] == [PAGES[4]]
+        listed = catalog.lookup(url_prefix='sling.apache.org/documentation')
+        assert [entry.url for entry in listed] == [PAGES[0], PAGES[1]]
+        assert listed[0].score is None
+
+    def test_replace_source(self, catalog):
+        """Test that a refresh replaces the source's entries and an empty crawl keeps them."""
+        assert catalog.replace_source(SOURCE, [SitemapEntry(PAGES[0], None)]) == 1
+        assert catalog.replace_source(SOURCE, []) == 0
+
+        assert len(catalog) == 1
+        assert catalog.lookup('servlets') == []
+
+    def test_refresh_keeps_read_titles(self, catalog):
+        """Test that a refresh updates lastmod but keeps titles read from the pages."""
+        catalog.set_title(PAGES[0], 'Sling Models')
+        catalog.replace_source(SOURCE, [SitemapEntry(url, '2025-01-01') for url in PAGES[:2]])
+
+        [entry] = catalog.lookup('models', max_results=1)
+        assert (entry.title, entry.lastmod) == ('Sling Models', '2025-01-01')
+        assert catalog.lookup('servlets', max_results=1)[0].title == 'Servlets'
+        assert len(catalog) == 2
+
+    def test_stale_sources(self, catalog, monkeypatch):
+        """Test that sources are stale when never read, when old, or soon after a failure."""
+        failed = 'https://adapt.to/sitemap.xml'
+        catalog.replace_source(failed, [])
+        sources = [SOURCE, failed, 'https://sling.apache.org/sitemap.xml']
+
+        assert catalog.stale_sources(sources) == ['https://sling.apache.org/sitemap.xml']
+        monkeypatch.setattr(catalog_utils, 'CATALOG_RETRY_AFTER', -1)
+        assert catalog.stale_sources(sources) == sources[1:]
+        assert catalog.stale_sources(sources, max_age=-1) == sources
+
+    def test_titles_and_persistence(self, catalog, tmp_path):
+        """Test that read titles replace derived ones and the catalog survives reopening."""
+        catalog.lookup('models')
+        catalog.set_title(PAGES[0], 'Sling Models')
+        assert catalog.lookup('models', max_results=1)[0].title == 'Sling Models'
+        catalog.close_connection()
+
+        reopened = Catalog(path=str(tmp_path / 'catalog.db'), enabled=True)
+        assert len(reopened) == len(PAGES)
+        assert reopened.lookup('models', max_results=1)[0].title == 'Sling Models'
+        reopened.close_connection()
+
+    def test_set_title_writes_only_listed_pages(self, catalog, tmp_path):
+        """Test that titles of pages missing from the catalog are never written."""
+        unused = Catalog(path=str(tmp_path / 'unused' / 'catalog.db'), enabled=True)
+        unused.set_title(PAGES[0], 'Sling Models')
+        assert not (tmp_path / 'unused').exists()
+
+        changes = catalog._connection.total_changes
+        catalog.set_title('https://sling.apache.org/unlisted.html', 'Unlisted')
+        catalog.set_title(PAGES[0], 'Models')
+        assert catalog._connection.total_changes == changes
+        catalog.set_title(PAGES[0], 'Sling Models')
+        assert catalog._connection.total_changes == changes + 1
+
+    def test_disabled(self, tmp_path):
+        """Test that a disabled catalog neither stores nor finds pages."""
+        catalog = Catalog(path=str(tmp_path / 'catalog.db'), enabled=False)
+
+        assert catalog.lookup('models') == []
+        assert len(catalog) == 0
+        assert not (tmp_path / 'catalog.db').exists()
@@ -0,0 +1,204 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for concurrency utilities."""
+
+import asyncio
+import pytest
+import threading
+import time
+from aemlabs.aem_documentation_mcp_server.concurrency_utils import (
+    ConversionExecutor,
+    SingleFlight,
+    TimeLimitedWorker,
+    resolve_executor_mode,
+)
+from aemlabs.aem_documentation_mcp_server.util import convert_page
+from unittest.mock import patch
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight class."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent callers for the same key run the work once."""
+        flight = SingleFlight()
+        executions = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal executions
+            executions += 1
+            await release.wait()
+            return 'result'
+
+        waiters = [asyncio.ensure_future(flight.do('key', work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ['result'] * 5
+        assert executions == 1
+        assert flight.get_stats() == {'calls': 1, 'coalesced': 4, 'in_flight': 0}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test that different keys are not coalesced."""
+        flight = SingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            flight.do('a', lambda: work('a')), flight.do('b', lambda: work('b'))
+        )
+        assert results == ['a', 'b']
+        assert flight.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_every_waiter(self):
+        """Test that an exception reaches all waiters."""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0)
+            raise ValueError('boom')
+
+        results = await asyncio.gather(
+            flight.do('key', work), flight.do('key', work), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelling_one_waiter_keeps_shared_task(self):
+        """Test that one cancelled waiter does not cancel the work for others."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return 'done'
+
+        first = asyncio.ensure_future(flight.do('key', work))
+        second = asyncio.ensure_future(flight.do('key', work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == 'done'
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_cancelling_all_waiters_cancels_shared_task(self):
+        """Test that the shared task is cancelled when every waiter has gone away."""
+        flight = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.ensure_future(flight.do('key', work))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert flight.in_flight() == 0
+
+
+class TestConversionExecutor:
+    """Tests for ConversionExecutor class."""
+
+    def test_auto_mode_follows_gil(self):
+        """Test that auto selects threads only on free-threaded builds."""
+        with patch('sys._is_gil_enabled', return_value=False, create=True):
+            assert resolve_executor_mode('auto') == 'thread'
+        with patch('sys._is_gil_enabled', return_value=True, create=True):
+            assert resolve_executor_mode('auto') == 'process'
+        assert resolve_executor_mode('inline') == 'inline'
+
+    @pytest.mark.asyncio
+    async def test_thread_mode_runs_off_loop(self):
+        """Test that calls run in a worker thread."""
+        executor = ConversionExecutor(mode='thread', workers=1)
+        name = await executor.run(lambda: threading.current_thread().name)
+        assert name.startswith('conversion')
+        assert executor.get_stats()['submitted'] == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_inline_mode(self):
+        """Test that inline mode calls the function directly."""
+        executor = ConversionExecutor(mode='inline')
+        assert await executor.run(max, 1, 2) == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_is_bounded(self):
+        """Test that callers beyond the queue size wait for a slot."""
+        executor = ConversionExecutor(mode='thread', workers=2, queue_size=1)
+        release = threading.Event()
+        first = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(executor.run(max, 1, 2))
+        await asyncio.sleep(0.01)
+
+        assert executor.get_stats()['submitted'] == 1
+        release.set()
+        assert await first is True
+        assert await second == 2
+        assert executor.get_stats()['waited'] == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process_mode_converts_page(self):
+        """Test that page conversion works in a worker process."""
+        executor = ConversionExecutor(mode='process', workers=1)
+        html = (
+            '<html><head><title>T</title></head><body><main>'
+            + '<p>Body text of the converted page.</p>' * 10
+            + '</main></body></html>'
+        )
+        converted = await executor.run(convert_page, html, 'text/html')
+        assert converted.title == 'T'
+        assert 'Body text' in converted.content
+        executor.shutdown()
+
+
+class TestTimeLimitedWorker:
+    """Tests for TimeLimitedWorker class."""
+
+    def test_stops_and_restarts_after_timeout(self):
+        """Test that a call past the time limit terminates the process and the next call works."""
+        worker = TimeLimitedWorker(timeout=60)
+        try:
+            assert worker.call(sum, [1, 2, 3]) == 6
+
+            worker.timeout = 0.5
+            started = time.monotonic()
+            with pytest.raises(TimeoutError, match='0.5 seconds'):
+                worker.call(time.sleep, 60)
+            assert time.monotonic() - started < 10
+
+            worker.timeout = 60
+            assert worker.call(sum, [4]) == 4
+            assert worker.get_stats() == {'timeout': 60, 'calls': 3, 'timeouts': 1}
+        finally:
+            worker.shutdown()
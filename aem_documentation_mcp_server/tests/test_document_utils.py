@@ -0,0 +1,354 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for parsed HTML documents."""
+
+import pytest
+from aemlabs.aem_documentation_mcp_server.document_utils import (
+    GENERIC_PROFILE,
+    MARKDOWN_OPTIONS,
+    NAV_SELECTORS,
+    PARSER_BACKENDS,
+    ProfileStats,
+    PruneRules,
+    parse_document,
+    profile_for_url,
+    prune_tree,
+    resolve_parser,
+)
+from aemlabs.aem_documentation_mcp_server.table_utils import TableConverter
+from aemlabs.aem_documentation_mcp_server.util import convert_page
+from pathlib import Path
+from unittest.mock import patch
+
+
+# Representative pages of every supported documentation domain
+FIXTURE_PAGES = sorted((Path(__file__).parent / 'fixtures' / 'pages').glob('*.html'))
+
+# Pages whose markdown legitimately differs between parser backends
+PARSER_DIFFERENCES = {
+    # Unclosed <li> tags: lxml ends each item at the next one, html.parser nests them
+    'helpx.adobe.com.html',
+}
+
+
+PAGE = """
+<html>
+<head>
+    <title>Sling Models</title>
+    <meta property="og:title" content="Sling Models | AEM">
+    <meta name="description" content="Map resources to Java objects.">
+    <meta property="article:modified_time" content="2025-01-10T08:00:00Z">
+    <link rel="canonical" href="https://sling.apache.org/documentation/sling-models.html">
+</head>
+<body>
+    <header><h1>Site header</h1></header>
+    <main>
+        <h1>Sling Models</h1>
+        <p>Sling Models map Sling resources to annotated Java classes.</p>
+        <nav>Previous | Next</nav>
+    </main>
+</body>
+</html>
+"""
+
+# A long page whose content is one wrapper holding many heading sections
+SECTIONED_PAGE = (
+    '<html><body><nav>Menu</nav><main><div class="article-content"><h1>Guide</h1>'
+    + ''.join(
+        f'<h2>Step {i}</h2><p>Configure <code>step{i}</code>.</p><ul><li>Check {i}</li></ul>'
+        for i in range(200)
+    )
+    + '<section><p>Related</p></section></div></main></body></html>'
+)
+
+# Page whose element ids link to headings in every supported way
+ANCHORED_PAGE = """<html><head><title>Anchors</title></head><body><main>
+<p>Intro</p>
+<h2 id="custom-id">Configure <code>OSGi</code></h2><p>a</p>
+<a name="legacy"></a><h2>Second</h2><p id="para">text <a id="inline">x</a></p>
+<section id="wrap"><p>lead</p><h3>Third</h3><p>b</p></section>
+<h2><a id="inner"></a>Fourth</h2><p>c</p>
+<table><tr><td><h4 id="cell">Cell</h4></td></tr></table>
+<div id="trailing"></div>
+</main></body></html>"""
+
+
+class TestParsedDocument:
+    """Tests for ParsedDocument class."""
+
+    def test_title_and_metadata(self):
+        """Test that title and head metadata are read from the same parse."""
+        document = parse_document(PAGE)
+
+        assert document.title == 'Sling Models'
+        assert document.metadata.og_title == 'Sling Models | AEM'
+        assert document.metadata.description == 'Map resources to Java objects.'
+        assert (
+            document.metadata.canonical_url
+            == 'https://sling.apache.org/documentation/sling-models.html'
+        )
+        assert document.metadata.last_modified == '2025-01-10T08:00:00Z'
+
+    def test_markdown_from_main_content(self):
+        """Test that the markdown comes from the pruned main content."""
+        document = parse_document(PAGE)
+
+        assert 'annotated Java classes' in document.markdown
+        assert 'Previous | Next' not in document.markdown
+        assert 'Site header' not in document.markdown
+
+    def test_missing_metadata(self):
+        """Test that absent metadata is reported as None."""
+        document = parse_document('<html><body><p>Text only</p></body></html>')
+
+        assert document.title is None
+        assert document.metadata.canonical_url is None
+        assert document.metadata.last_modified is None
+
+    def test_heading_ids(self):
+        """Test that element ids are resolved to the headings they link to."""
+        document = parse_document(ANCHORED_PAGE)
+
+        assert document.heading_ids == [
+            ('Configure OSGi', ['custom-id']),
+            ('Second', ['legacy', 'para', 'inline']),
+            ('Third', ['wrap']),
+            ('Fourth', ['inner']),
+            ('Cell', ['cell']),
+        ]
+
+    def test_convert_page_records_anchors(self):
+        """Test that converted pages carry the offsets of the headings ids link to."""
+        converted = convert_page(ANCHORED_PAGE, 'text/html')
+        content = converted.content
+
+        assert converted.anchors['custom-id'] == content.index('## Configure `OSGi`')
+        assert converted.anchors['legacy'] == content.index('## Second')
+        assert converted.anchors['wrap'] == content.index('### Third')
+        # The heading in the table cell is not a markdown heading
+        assert 'cell' not in converted.anchors
+
+    def test_convert_page_parses_once(self):
+        """Test that converting a page builds a single parse tree."""
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.document_utils.BeautifulSoup',
+            wraps=__import__('bs4').BeautifulSoup,
+        ) as mock_soup:
+            converted = convert_page(PAGE, 'text/html')
+
+        assert mock_soup.call_count == 1
+        assert converted.title == 'Sling Models'
+        assert converted.content.startswith('# Sling Models')
+
+    def test_sections_split_at_headings(self):
+        """Test that the content is split below its wrappers at each heading."""
+        document = parse_document(SECTIONED_PAGE)
+
+        assert len(document.sections) == 202
+        assert [node.name for node in document.sections[1]] == ['h2', 'p', 'ul']
+        assert document.sections[-1][0].name == 'section'
+
+    def test_markdown_prefix(self):
+        """Test that a prefix converts only what is needed and continues later."""
+        full = parse_document(SECTIONED_PAGE).markdown
+        document = parse_document(SECTIONED_PAGE)
+
+        first, complete = document.markdown_prefix(300)
+        assert not complete
+        assert 300 < len(first) < 400
+        assert full.startswith(first)
+
+        second, complete = document.markdown_prefix(3000)
+        assert not complete
+        assert len(second) > 3000
+        assert full.startswith(second)
+
+        assert document.markdown_prefix(len(full)) == (full, True)
+        assert document.markdown == full
+
+    def test_sections_converted_once(self):
+        """Test that sections converted by earlier calls are not converted again."""
+        document = parse_document(SECTIONED_PAGE)
+        nodes = [node for section in document.sections for node in section]
+        content = nodes[0].parent
+        with patch.object(
+            TableConverter,
+            'process_element',
+            autospec=True,
+            side_effect=TableConverter.process_element,
+        ) as process:
+            document.markdown_prefix(300)
+            early = [
+                call.args[1] for call in process.call_args_list if call.args[1].parent is content
+            ]
+            document.markdown_prefix(3000)
+            assert document.markdown_prefix(3000)[1] is False
+            document.markdown
+
+        converted = [
+            call.args[1] for call in process.call_args_list if call.args[1].parent is content
+        ]
+        assert len(early) < 30
+        assert converted == nodes
+
+    @pytest.mark.parametrize('page', FIXTURE_PAGES, ids=lambda page: page.name)
+    def test_same_markdown_as_serialized_content(self, page):
+        """Test that sectioned conversion equals converting the serialized main content."""
+        html = page.read_text(encoding='utf-8')
+        for parser in PARSER_BACKENDS:
+            document = parse_document(html, parser)
+            markdown = document.markdown
+            serialized = TableConverter(**MARKDOWN_OPTIONS).convert(str(document.main_content))
+
+            assert markdown == serialized.strip()
+
+
+class TestParserBackends:
+    """Tests for the pluggable HTML parser backends."""
+
+    def test_unknown_parser_falls_back(self):
+        """Test that an unknown backend name falls back to html.parser."""
+        assert resolve_parser('html5lib-typo') == 'html.parser'
+
+    def test_backends_available(self):
+        """Test that every declared backend is usable here."""
+        for name in PARSER_BACKENDS:
+            assert resolve_parser(name) == name
+
+    @pytest.mark.parametrize('page', FIXTURE_PAGES, ids=lambda page: page.name)
+    def test_backends_produce_same_markdown(self, page):
+        """Test that lxml and html.parser agree on every recorded domain page."""
+        html = page.read_text(encoding='utf-8')
+        documents = [parse_document(html, parser) for parser in PARSER_BACKENDS]
+
+        assert len({document.title for document in documents}) == 1
+        assert len({repr(document.metadata) for document in documents}) == 1
+        if page.name not in PARSER_DIFFERENCES:
+            assert len({document.markdown for document in documents}) == 1
+
+    def test_documented_difference_unclosed_list_items(self):
+        """Test the documented lxml handling of unclosed list items."""
+        html = (Path(__file__).parent / 'fixtures' / 'pages' / 'helpx.adobe.com.html').read_text()
+
+        assert '* Indexing may be slow\n* Preview mode' in parse_document(html, 'lxml').markdown
+        assert (
+            '* Indexing may be slow* Preview mode' in parse_document(html, 'html.parser').markdown
+        )
+
+
+class TestExtractionProfiles:
+    """Tests for host-keyed extraction profiles."""
+
+    @pytest.mark.parametrize(
+        'url,profile',
+        [
+            ('https://experienceleague.adobe.com/en/docs/x', 'experience-league'),
+            ('https://developer.adobe.com/experience-manager/', 'developer-adobe-gatsby'),
+            ('https://github.com/adobe/aem-core-wcm-components', 'github'),
+            ('https://adobe.github.io/aem-core-wcm-components/', 'github-pages'),
+            ('https://sling.apache.org/documentation.html', 'sling'),
+            ('https://adapt.to/2024/schedule', 'adaptto'),
+            ('https://helpx.adobe.com/experience-manager.html', 'generic'),
+            (None, 'generic'),
+        ],
+    )
+    def test_dispatch_by_host(self, url, profile):
+        """Test that each supported host gets its own profile."""
+        assert profile_for_url(url).name == profile
+
+    @pytest.mark.parametrize('page', FIXTURE_PAGES, ids=lambda page: page.name)
+    def test_profiles_match_generic_cascade(self, page):
+        """Test that each site's profile extracts the same content as the full cascade."""
+        html = page.read_text(encoding='utf-8')
+        host = page.name[: -len('.html')]
+
+        profiled = parse_document(html, url=f'https://{host}/page')
+        generic = parse_document(html)
+
+        assert profiled.markdown == generic.markdown
+        assert profiled.profile_matched
+
+    def test_fall_through_to_generic(self):
+        """Test that a redesigned page still converts when its profile misses."""
+        html = '<html><body><main><p>Redesigned GitHub page content</p></main></body></html>'
+        document = parse_document(html, url='https://github.com/adobe/redesign')
+
+        assert 'Redesigned GitHub page content' in document.markdown
+        assert document.profile.name == 'github'
+        assert document.profile_matched is False
+
+    def test_prune_handles_nested_matches(self):
+        """Test that nested removable elements are removed in a single pass."""
+        html = '<html><body><main><nav><script>x()</script><ul><li>Nav</li></ul></nav><p>Body paragraph text</p></main></body></html>'
+        document = parse_document(html)
+
+        assert document.markdown == 'Body paragraph text'
+        assert document.profile is GENERIC_PROFILE
+
+    def test_profile_stats(self):
+        """Test per-profile hit and fall-through counters."""
+        stats = ProfileStats()
+        stats.record('github', True)
+        stats.record('github', True)
+        stats.record('github', False)
+
+        github = stats.get_stats()['github']
+        assert github['pages'] == 3
+        assert github['fallthrough'] == 1
+        assert github['hit_rate'] == 2 / 3
+
+
+class TestPruneTree:
+    """Tests for the single-pass pruning walker."""
+
+    def test_rules_from_selectors(self):
+        """Test that simple selectors are split into tag, id and class sets."""
+        rules = PruneRules.from_selectors(['nav', '#navigation', '.toc'])
+
+        assert rules.tags == {'nav'}
+        assert rules.ids == {'navigation'}
+        assert rules.classes == {'toc'}
+
+    def test_complex_selector_rejected(self):
+        """Test that selectors which cannot be hashed are rejected."""
+        with pytest.raises(ValueError):
+            PruneRules.from_selectors(['div > .toc'])
+
+    def test_removes_matching_subtrees_once(self):
+        """Test that matched subtrees are dropped without visiting their descendants."""
+        soup = parse_document(
+            '<div id="root"><nav><ul><li>a</li><li>b</li></ul></nav>'
+            '<p class="intro lead">Intro</p><div class="toc extra">TOC</div>'
+            '<div id="navigation">Nav</div><p>Kept</p></div>'
+        ).soup
+        root = soup.find(id='root')
+
+        visited = prune_tree(root, PruneRules.from_selectors(['nav', '#navigation', '.toc']))
+
+        assert root.get_text() == 'IntroKept'
+        assert visited == 5
+
+    @pytest.mark.parametrize('page', FIXTURE_PAGES, ids=lambda page: page.name)
+    def test_same_result_as_selector_passes(self, page):
+        """Test that the walker removes exactly what per-selector passes removed."""
+        html = page.read_text(encoding='utf-8')
+        walked = parse_document(html).soup.body
+        selected = parse_document(html).soup.body
+
+        GENERIC_PROFILE.prune(walked)
+        for selector in NAV_SELECTORS:
+            for element in selected.select(selector):
+                element.decompose()
+
+        assert str(walked) == str(selected)
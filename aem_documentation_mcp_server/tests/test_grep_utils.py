@@ -0,0 +1,87 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for in-page search of converted documentation."""
+
+import pytest
+from aemlabs.aem_documentation_mcp_server.grep_utils import compile_query, grep_content
+from aemlabs.aem_documentation_mcp_server.outline_utils import build_outline
+
+
+CONTENT = (
+    '# Release Notes\n\n'
+    '## Sites\n\n'
+    '* Fixed page move. NPR-41001\n'
+    '* Fixed publishing\nof launches. NPR-41002\n\n'
+    '## Assets\n\n' + 'Filler text. ' * 40 + '\n\n* Fixed renditions. NPR-42003\n'
+)
+
+
+class TestCompileQuery:
+    """Tests for compile_query function."""
+
+    def test_plain_text_spans_whitespace(self):
+        """Test that plain-text words match across line breaks and regardless of case."""
+        pattern = compile_query('publishing OF launches')
+
+        assert pattern.search(CONTENT).group() == 'publishing\nof launches'
+
+    def test_plain_text_is_escaped(self):
+        """Test that regex metacharacters in plain text match literally."""
+        assert compile_query('a.b (c)').search('a.b (c)')
+        assert not compile_query('a.b').search('axb')
+
+    def test_regex_and_case(self):
+        """Test regular expressions and case-sensitive matching."""
+        assert compile_query(r'NPR-4\d{4}', regex=True).findall(CONTENT) == [
+            'NPR-41001',
+            'NPR-41002',
+            'NPR-42003',
+        ]
+        assert not compile_query('npr-41001', ignore_case=False).search(CONTENT)
+
+    @pytest.mark.parametrize('query', ['', '   ', '(unclosed', 'x' * 501])
+    def test_invalid_queries(self, query):
+        """Test empty, too long and invalid queries."""
+        with pytest.raises(ValueError):
+            compile_query(query, regex=True)
+
+
+class TestGrepContent:
+    """Tests for grep_content function."""
+
+    def test_passages_with_offsets_and_sections(self):
+        """Test that passages carry offsets into the content and their section."""
+        pattern = compile_query(r'NPR-4\d{4}', regex=True)
+
+        passages, total = grep_content(CONTENT, pattern, build_outline(CONTENT), context_chars=20)
+
+        assert total == 3
+        assert len(passages) == 2
+        first, second = passages
+        assert first.match_indexes == [CONTENT.index('NPR-41001'), CONTENT.index('NPR-41002')]
+        assert first.section == 'Sites'
+        assert CONTENT[first.start_index :].startswith(first.text)
+        assert second.section == 'Assets'
+        assert second.text.endswith('NPR-42003\n')
+
+    def test_max_passages_and_empty_matches(self):
+        """Test that the passage cap keeps counting matches and empty matches are skipped."""
+        pattern = compile_query(r'NPR-4\d{4}', regex=True)
+
+        passages, total = grep_content(CONTENT, pattern, [], context_chars=0, max_passages=1)
+        assert (len(passages), total) == (1, 3)
+        assert passages[0].text == 'NPR-41001'
+        assert passages[0].section is None
+
+        assert grep_content(CONTENT, compile_query('q*', regex=True), []) == ([], 0)
@@ -0,0 +1,214 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for HTTP client pooling."""
+
+import asyncio
+import httpx
+import pytest
+import socket
+import threading
+from aemlabs.aem_documentation_mcp_server.http_utils import (
+    HttpClientPool,
+    ResponseTooLargeError,
+    read_body,
+)
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+class TestHttpClientPool:
+    """Tests for HttpClientPool class."""
+
+    @pytest.mark.asyncio
+    async def test_same_host_reuses_client(self):
+        """Test that requests to the same host share one client."""
+        pool = HttpClientPool()
+        first = pool.client_for('https://experienceleague.adobe.com/en/docs/a')
+        second = pool.client_for('https://experienceleague.adobe.com/en/docs/b')
+        assert first is second
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_different_hosts_get_separate_clients(self):
+        """Test that each host gets its own client and pool."""
+        pool = HttpClientPool()
+        adobe = pool.client_for('https://experienceleague.adobe.com/en/docs')
+        sling = pool.client_for('https://sling.apache.org/documentation.html')
+        assert adobe is not sling
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_clients(self):
+        """Test that aclose closes every pooled client."""
+        pool = HttpClientPool()
+        client = pool.client_for('https://experienceleague.adobe.com/')
+        await pool.aclose()
+        assert client.is_closed
+        assert pool.client_for('https://experienceleague.adobe.com/') is not client
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stats(self):
+        """Test per-host request and client statistics."""
+        pool = HttpClientPool()
+        pool.client_for('https://experienceleague.adobe.com/a')
+        pool.client_for('https://experienceleague.adobe.com/b')
+        pool.client_for('https://github.com/adobe')
+
+        stats = pool.get_stats()
+        assert stats['hosts']['experienceleague.adobe.com']['requests'] == 2
+        assert stats['hosts']['experienceleague.adobe.com']['clients_created'] == 1
+        assert stats['hosts']['github.com']['requests'] == 1
+        assert stats['hosts']['github.com']['client_open'] is True
+        await pool.aclose()
+        assert pool.get_stats()['hosts']['github.com']['client_open'] is False
+
+    def test_loop_change_closes_sockets_of_closed_loop(self):
+        """Test that clients of a finished event loop have their sockets closed."""
+        pool = HttpClientPool()
+        client_socket, server_socket = socket.socketpair()
+
+        async def connect():
+            client = pool.client_for('https://experienceleague.adobe.com/en/docs/a')
+            connection = MagicMock()
+            connection._connection._network_stream.get_extra_info.return_value = client_socket
+            client._transport._pool._connections = [connection]
+            return client
+
+        first = asyncio.run(connect())
+        second = asyncio.run(connect())
+
+        assert first is not second
+        assert client_socket.fileno() == -1
+        assert server_socket.recv(1) == b''
+        server_socket.close()
+
+    def test_loop_change_tolerates_unknown_transport(self):
+        """Test that clients whose transport internals differ are dropped without errors."""
+        pool = HttpClientPool()
+
+        async def connect(transport):
+            client = pool.client_for('https://experienceleague.adobe.com/en/docs/a')
+            client._transport = transport
+            return client
+
+        asyncio.run(connect(httpx.MockTransport(lambda request: httpx.Response(200))))
+        asyncio.run(connect(MagicMock(_pool=MagicMock(connections=None))))
+        asyncio.run(connect(None))
+
+        assert len(pool._clients) == 1
+
+    def test_loop_change_closes_clients_on_running_loop(self):
+        """Test that clients of a loop still running in another thread are closed there."""
+        pool = HttpClientPool()
+        old_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=old_loop.run_forever)
+        thread.start()
+        try:
+            client = MagicMock(aclose=AsyncMock())
+            pool._loop, pool._clients['experienceleague.adobe.com'] = old_loop, client
+
+            async def switch():
+                pool.client_for('https://experienceleague.adobe.com/en/docs/a')
+                for _ in range(100):
+                    if client.aclose.await_count:
+                        break
+                    await asyncio.sleep(0.01)
+
+            asyncio.run(switch())
+            client.aclose.assert_awaited_once()
+        finally:
+            old_loop.call_soon_threadsafe(old_loop.stop)
+            thread.join()
+            old_loop.close()
+
+    def test_http2_falls_back_without_h2(self):
+        """Test that HTTP/2 is disabled when h2 is not installed."""
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.http_utils.is_http2_available',
+            return_value=False,
+        ):
+            pool = HttpClientPool(http2=True)
+        assert pool.http2 is False
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Async byte stream yielding fixed chunks and recording how many were read."""
+
+    def __init__(self, chunks):
+        """Initialize with the chunks to yield."""
+        self.chunks = chunks
+        self.read = 0
+
+    async def __aiter__(self):
+        """Yield the chunks one by one."""
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+class TestReadBody:
+    """Tests for read_body function."""
+
+    @pytest.mark.asyncio
+    async def test_reads_whole_body(self):
+        """Test reading a body within the limit."""
+        response = httpx.Response(200, stream=ChunkedStream([b'abc', b'def']))
+        body, complete = await read_body(response, max_bytes=100)
+        assert body == b'abcdef'
+        assert complete is True
+
+    @pytest.mark.asyncio
+    async def test_declared_length_rejected_before_download(self):
+        """Test that an oversized Content-Length is rejected without reading."""
+        stream = ChunkedStream([b'x' * 10])
+        response = httpx.Response(200, headers={'content-length': '5000'}, stream=stream)
+        with pytest.raises(ResponseTooLargeError):
+            await read_body(response, max_bytes=100)
+        assert stream.read == 0
+
+    @pytest.mark.asyncio
+    async def test_aborts_when_limit_exceeded(self):
+        """Test that streaming stops as soon as the limit is crossed."""
+        stream = ChunkedStream([b'x' * 60, b'x' * 60, b'x' * 60])
+        response = httpx.Response(200, stream=stream)
+        with pytest.raises(ResponseTooLargeError):
+            await read_body(response, max_bytes=100)
+        assert stream.read == 2
+
+    @pytest.mark.asyncio
+    async def test_early_stop_after_max_chars(self):
+        """Test that reading stops once enough characters are available."""
+        stream = ChunkedStream([b'a' * 10, b'b' * 10, b'c' * 10])
+        response = httpx.Response(200, stream=stream)
+        body, complete = await read_body(response, max_bytes=100, max_chars=15)
+        assert body == b'a' * 10 + b'b' * 10
+        assert complete is False
+        assert stream.read == 2
+
+    @pytest.mark.asyncio
+    async def test_on_chunk_stops_reading(self):
+        """Test that the chunk callback can end the download."""
+        stream = ChunkedStream([b'a' * 10, b'b' * 10, b'c' * 10])
+        response = httpx.Response(200, stream=stream)
+        seen = []
+
+        async def on_chunk(chunk):
+            seen.append(chunk)
+            return len(seen) == 2
+
+        body, complete = await read_body(response, max_bytes=100, on_chunk=on_chunk)
+        assert seen == [b'a' * 10, b'b' * 10]
+        assert body == b'a' * 10 + b'b' * 10
+        assert complete is False
+        assert stream.read == 2
@@ -0,0 +1,134 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the local full-text index."""
+
+import pytest
+from aemlabs.aem_documentation_mcp_server.index_utils import (
+    LocalIndex,
+    parse_query,
+    stem,
+    tokenize,
+)
+
+
+DISPATCHER = """# Dispatcher
+
+Dispatcher is the caching and load balancing tool of AEM.
+
+## Cache Invalidation
+
+Flush the dispatcher cache after publishing. Cached pages are invalidated
+by the flush agents.
+"""
+
+SLING = """# Sling Models
+
+Sling Models are annotation driven POJOs. The dispatcher is not involved.
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Index with two pages."""
+    index = LocalIndex(path=str(tmp_path / 'index.db'), enabled=True)
+    index.add('https://experienceleague.adobe.com/dispatcher', 'Dispatcher', DISPATCHER)
+    index.add('https://sling.apache.org/models', 'Sling Models', SLING)
+    yield index
+    index.close_connection()
+
+
+class TestTokenize:
+    """Tests for stem, tokenize and parse_query functions."""
+
+    def test_inflections_share_a_stem(self):
+        """Test that common inflections reduce to one term."""
+        assert {stem(word) for word in ('cache', 'caches', 'cached', 'caching')} == {'cach'}
+        assert stem('policies') == stem('policy')
+        assert stem('running') == 'run'
+        assert stem('osgi') == 'osgi'
+        assert stem('cq5') == 'cq5'
+
+    def test_positions_and_offsets(self):
+        """Test that stop words are skipped but keep their position."""
+        assert list(tokenize('Flush the sling:resourceType')) == [
+            (0, 0, 'flush'),
+            (2, 10, 'sling'),
+            (3, 16, 'resourcetyp'),
+        ]
+
+    def test_parse_query(self):
+        """Test terms and quoted phrases with their relative positions."""
+        terms, phrases = parse_query('"flush the cache" agents')
+
+        assert terms == ['flush', 'cach', 'agent']
+        assert phrases == [[(0, 'flush'), (2, 'cach')]]
+
+
+class TestLocalIndex:
+    """Tests for LocalIndex class."""
+
+    def test_bm25_ranking_and_passage(self, index):
+        """Test that the page with more matching terms ranks first with its best passage."""
+        first, second = index.search('dispatcher cache flushing', context_chars=20)
+
+        assert first.url == 'https://experienceleague.adobe.com/dispatcher'
+        assert first.score > second.score
+        assert first.section == 'Cache Invalidation'
+        assert DISPATCHER[first.start_index :].startswith('Flush the dispatcher cache')
+        assert first.snippet == DISPATCHER[first.start_index - 20 : first.start_index + 20]
+        assert second.title == 'Sling Models'
+
+    def test_phrases(self, index):
+        """Test that quoted phrases only match where their words appear in order."""
+        [hit] = index.search('"dispatcher is not involved"')
+        assert hit.url == 'https://sling.apache.org/models'
+        assert SLING[hit.start_index :].startswith('dispatcher is not')
+
+        assert index.search('"cache dispatcher"') == []
+        assert index.search('the and') == []
+
+    def test_reindex_only_changed_pages(self, index):
+        """Test that unchanged pages are skipped and changed pages replace their postings."""
+        url = 'https://sling.apache.org/models'
+
+        assert not index.add(url, 'Sling Models', SLING)
+        assert index.add(url, 'Sling Models', '# Sling Models\n\nAdapters.')
+
+        assert len(index) == 2
+        assert [hit.url for hit in index.search('annotation')] == []
+        assert [hit.url for hit in index.search('adapters')] == [url]
+
+    def test_eviction_and_persistence(self, tmp_path):
+        """Test that the oldest pages are dropped and the index survives reopening."""
+        path = str(tmp_path / 'index.db')
+        index = LocalIndex(path=path, enabled=True, max_documents=2)
+        for number in range(3):
+            index.add(f'https://example.com/{number}', None, f'page {number} content')
+        index.close_connection()
+
+        reopened = LocalIndex(path=path, enabled=True)
+        assert len(reopened) == 2
+        assert [hit.url for hit in reopened.search('content')] == [
+            'https://example.com/1',
+            'https://example.com/2',
+        ]
+        reopened.close_connection()
+
+    def test_disabled(self, tmp_path):
+        """Test that a disabled index neither stores nor finds pages."""
+        index = LocalIndex(path=str(tmp_path / 'index.db'), enabled=False)
+
+        assert not index.add('https://example.com/', None, 'content')
+        assert index.search('content') == []
+        assert not (tmp_path / 'index.db').exists()
@@ -14,8 +14,9 @@
 
 """Additional integration tests for coverage."""
 
+import httpx
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 from aemlabs.aem_documentation_mcp_server.server import (
     search_experience_league,
@@ -90,17 +91,10 @@ class TestSearchIntegration:
 
     @pytest.mark.asyncio
     async def test_search_with_all_parameters(self):
-        """Test search with all filter parameters."""
+        """Test that without a search token the tool answers without fetching the search page."""
         ctx = MockContext()
-        
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<html><body><div class="search-results">Results</div></body></html>'
-        mock_response.headers = {'content-type': 'text/html'}
-        
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
-            
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
             result = await search_experience_league(
                 ctx,
                 query='components',
@@ -108,10 +102,10 @@ class TestSearchIntegration:
                 products=['Experience Manager'],
                 roles=['Developer']
             )
-            
-            assert mock_get.called
-            called_url = mock_get.call_args[0][0]
-            assert 'components' in called_url.lower()
+
+            mock_send.assert_not_called()
+            assert 'search API is not configured' in result
+            assert 'experienceleague.adobe.com/en/search#q=components' in result
 
 
 class TestErrorHandling:
@@ -123,9 +117,9 @@ class TestErrorHandling:
         ctx = MockContext()
         url = 'https://experienceleague.adobe.com/test.html'
         
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
             import httpx
-            mock_get.side_effect = httpx.TimeoutException('Request timeout')
+            mock_send.side_effect = httpx.TimeoutException('Request timeout')
             
             result = await read_documentation_impl(ctx, url, 10000, 0, 'session-1')
             
@@ -137,9 +131,9 @@ class TestErrorHandling:
         ctx = MockContext()
         url = 'https://experienceleague.adobe.com/test.html'
         
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
             import httpx
-            mock_get.side_effect = httpx.ConnectError('Connection refused')
+            mock_send.side_effect = httpx.ConnectError('Connection refused')
             
             result = await read_documentation_impl(ctx, url, 10000, 0, 'session-1')
             
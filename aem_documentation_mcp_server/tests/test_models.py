@@ -17,6 +17,7 @@
 import pytest
 
 from aemlabs.aem_documentation_mcp_server.models import (
+    BatchReadResult,
     DocumentationResult,
     ServiceInfo,
 )
@@ -78,3 +79,19 @@ class TestServiceInfo:
             category='apis',
         )
         assert service is not None
+
+
+class TestBatchReadResult:
+    """Tests for BatchReadResult model."""
+
+    def test_success_result(self):
+        """Test a successful batch item."""
+        result = BatchReadResult(url='https://example.com', content='Text')
+        assert result.content == 'Text'
+        assert result.error is None
+
+    def test_error_result(self):
+        """Test a failed batch item."""
+        result = BatchReadResult(url='https://example.com', error='Failed')
+        assert result.content is None
+        assert result.error == 'Failed'
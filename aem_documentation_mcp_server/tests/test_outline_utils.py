@@ -0,0 +1,170 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for documentation page outlines."""
+
+from aemlabs.aem_documentation_mcp_server.cache_utils import CachedDocument
+from aemlabs.aem_documentation_mcp_server.outline_utils import (
+    anchor_offsets,
+    build_outline,
+    find_heading,
+    heading_anchor,
+)
+from unittest.mock import patch
+
+
+CONTENT = """# Sling Models
+
+Intro text.
+
+## Usage
+
+Annotate the class.
+
+```bash
+# not a heading
+mvn install
+```
+
+### Injection
+
+Use `@Inject`.
+
+## Usage
+
+Second usage section.
+"""
+
+
+class TestBuildOutline:
+    """Tests for build_outline function."""
+
+    def test_headings_with_offsets(self):
+        """Test levels, texts and that offsets point at the heading lines."""
+        outline = build_outline(CONTENT)
+
+        assert [(h.level, h.text) for h in outline] == [
+            (1, 'Sling Models'),
+            (2, 'Usage'),
+            (3, 'Injection'),
+            (2, 'Usage'),
+        ]
+        for heading in outline:
+            assert CONTENT[heading.start_index :].startswith('#' * heading.level + ' ')
+
+    def test_section_lengths_include_subsections(self):
+        """Test that a section ends at the next heading of the same or a higher level."""
+        title, usage, injection, second_usage = build_outline(CONTENT)
+
+        assert title.length == len(CONTENT)
+        assert usage.start_index + usage.length == second_usage.start_index
+        assert injection.start_index + injection.length == second_usage.start_index
+        assert CONTENT[second_usage.start_index :][: second_usage.length].endswith('section.\n')
+
+    def test_fenced_code_skipped(self):
+        """Test that comment lines inside fenced code blocks are not headings."""
+        content = '## A\n\n~~~~\n# comment\n~~~\n# still code\n~~~~\n\n## B\n'
+
+        assert [h.text for h in build_outline(content)] == ['A', 'B']
+
+    def test_no_headings(self):
+        """Test plain text without headings."""
+        assert build_outline('Just text\n#hashtag') == []
+
+
+class TestHeadingAnchor:
+    """Tests for heading_anchor function."""
+
+    def test_slugs(self):
+        """Test markdown removal, punctuation and duplicate suffixes."""
+        seen = {}
+
+        assert heading_anchor('Configure [OSGi](https://osgi.org) `@Component`s', seen) == (
+            'configure-osgi-components'
+        )
+        assert heading_anchor('What is new?', seen) == 'what-is-new'
+        assert heading_anchor('What is new?', seen) == 'what-is-new-1'
+
+
+class TestAnchorOffsets:
+    """Tests for anchor_offsets function."""
+
+    def test_headings_matched_in_order(self):
+        """Test that repeated and missing headings are matched in document order."""
+        heading_ids = [
+            ('Usage', ['first']),
+            ('Not rendered', ['skipped']),
+            ('Injection', ['inject']),
+            ('Usage', ['second']),
+        ]
+
+        anchors = anchor_offsets(CONTENT, heading_ids)
+
+        usages = [
+            heading.start_index for heading in build_outline(CONTENT) if heading.text == 'Usage'
+        ]
+        assert anchors == {
+            'first': usages[0],
+            'inject': CONTENT.index('### Injection'),
+            'second': usages[1],
+        }
+
+
+class TestFindHeading:
+    """Tests for find_heading function."""
+
+    def test_exact_and_normalized_matches(self):
+        """Test fragments matching anchors exactly, by letters and digits, and with prefixes."""
+        outline = build_outline(CONTENT)
+
+        assert find_heading(outline, 'usage') is outline[1]
+        assert find_heading(outline, 'usage-1') is outline[3]
+        assert find_heading(outline, 'Sling_Models') is outline[0]
+        assert find_heading(outline, 'user-content-injection') is outline[2]
+        assert find_heading(outline, 'sling%20models') is outline[0]
+
+    def test_element_id_differing_from_text(self):
+        """Test that a heading is found by an element id unrelated to its text."""
+        anchors = {'inject-annotations': CONTENT.index('### Injection')}
+        outline = build_outline(CONTENT, anchors)
+
+        assert outline[2].ids == ['inject-annotations']
+        assert find_heading(outline, 'inject-annotations') is outline[2]
+        assert find_heading(outline, 'injection') is outline[2]
+        assert find_heading(build_outline(CONTENT), 'inject-annotations') is None
+
+    def test_unknown_fragment(self):
+        """Test fragments that address no heading."""
+        outline = build_outline(CONTENT)
+
+        assert find_heading(outline, 'missing') is None
+        assert find_heading(outline, '') is None
+        assert find_heading(outline, '--') is None
+
+
+class TestCachedDocumentOutline:
+    """Tests for the outline cached with converted documents."""
+
+    def test_outline_computed_once(self):
+        """Test that the outline is built once per cached document."""
+        document = CachedDocument(url='https://example.com/', content=CONTENT)
+
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.cache_utils.build_outline',
+            wraps=build_outline,
+        ) as mock_build:
+            first = document.outline
+            second = document.outline
+
+        assert first is second
+        assert mock_build.call_count == 1
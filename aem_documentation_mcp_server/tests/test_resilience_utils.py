@@ -0,0 +1,389 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for rate limiting and retry utilities."""
+
+import asyncio
+import httpx
+import pytest
+from aemlabs.aem_documentation_mcp_server.resilience_utils import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HostPolicy,
+    HostResilience,
+    LatencyTracker,
+    TokenBucket,
+    backoff_delay,
+    parse_retry_after,
+)
+from unittest.mock import AsyncMock, patch
+
+
+def make_client(responses):
+    """Build a client whose transport returns the given responses (or raises exceptions)."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        outcome = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+FAST = HostPolicy(requests_per_second=1000.0, burst=1000, backoff_base=0.0, max_retries=3)
+
+
+BREAKER = HostPolicy(breaker_failure_rate=0.5, breaker_min_calls=4, breaker_open_seconds=30.0)
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker class."""
+
+    def test_opens_at_failure_rate(self):
+        """Test that the circuit opens once enough calls have failed."""
+        breaker = CircuitBreaker('a.com', BREAKER)
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow() is False
+        assert breaker.get_stats()['rejected'] == 1
+
+    def test_successes_keep_circuit_closed(self):
+        """Test that occasional failures below the threshold do not open the circuit."""
+        breaker = CircuitBreaker('a.com', BREAKER)
+        for _ in range(3):
+            breaker.record_success()
+            breaker.record_success()
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        """Test that only one probe passes after the open period."""
+        breaker = CircuitBreaker('a.com', BREAKER)
+        for _ in range(4):
+            breaker.record_failure()
+
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.resilience_utils.time.monotonic',
+            return_value=breaker.opened_at + 31.0,
+        ):
+            assert breaker.allow() is True
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert breaker.allow() is False
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow() is True
+        assert breaker.get_stats()['transitions'] == 3
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe re-opens the circuit for another period."""
+        breaker = CircuitBreaker('a.com', BREAKER)
+        for _ in range(4):
+            breaker.record_failure()
+
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.resilience_utils.time.monotonic',
+            return_value=breaker.opened_at + 31.0,
+        ):
+            assert breaker.allow() is True
+            breaker.record_failure()
+            assert breaker.state == CircuitBreaker.OPEN
+            assert breaker.allow() is False
+
+    def test_released_probe_can_be_retried(self):
+        """Test that an abandoned probe lets the next caller probe."""
+        breaker = CircuitBreaker('a.com', BREAKER)
+        for _ in range(4):
+            breaker.record_failure()
+
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.resilience_utils.time.monotonic',
+            return_value=breaker.opened_at + 31.0,
+        ):
+            assert breaker.allow() is True
+            breaker.release_probe()
+            assert breaker.allow() is True
+
+
+class TestLatencyTracker:
+    """Tests for LatencyTracker class."""
+
+    def test_percentiles(self):
+        """Test percentiles over the sample window."""
+        tracker = LatencyTracker(window=100)
+        assert tracker.percentile(0.5) is None
+        for i in range(1, 101):
+            tracker.record(i / 100)
+        assert tracker.percentile(0.5) == 0.51
+        assert tracker.percentile(0.95) == 0.96
+        assert tracker.percentile(1.0) == 1.0
+
+    def test_window_drops_old_samples(self):
+        """Test that only the most recent samples are kept."""
+        tracker = LatencyTracker(window=3)
+        for value in (10.0, 1.0, 1.0, 1.0):
+            tracker.record(value)
+        assert len(tracker) == 3
+        assert tracker.percentile(1.0) == 1.0
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket class."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_wait(self):
+        """Test that requests beyond the burst wait for new tokens."""
+        bucket = TokenBucket(rate=10.0, capacity=2)
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.resilience_utils.asyncio.sleep',
+            new_callable=AsyncMock,
+        ) as mock_sleep:
+            assert await bucket.acquire() == 0
+            assert await bucket.acquire() == 0
+            waited = await bucket.acquire()
+
+        assert waited > 0
+        mock_sleep.assert_called()
+
+    @pytest.mark.asyncio
+    async def test_drain(self):
+        """Test that draining forces the next request to wait."""
+        bucket = TokenBucket(rate=10.0, capacity=5)
+        bucket.drain()
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.resilience_utils.asyncio.sleep',
+            new_callable=AsyncMock,
+        ):
+            assert await bucket.acquire() > 0
+
+
+class TestParseRetryAfter:
+    """Tests for parse_retry_after function."""
+
+    def test_seconds(self):
+        """Test delta-seconds values."""
+        assert parse_retry_after('7') == 7.0
+
+    def test_http_date_in_the_past(self):
+        """Test HTTP dates, clamped at zero."""
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+    def test_invalid(self):
+        """Test missing and malformed values."""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('soon') is None
+
+
+class TestBackoffDelay:
+    """Tests for backoff_delay function."""
+
+    def test_bounded_by_cap(self):
+        """Test that jittered delays never exceed the exponential bound or the cap."""
+        policy = HostPolicy(backoff_base=0.5, backoff_max=2.0)
+        assert all(0 <= backoff_delay(0, policy) <= 0.5 for _ in range(50))
+        assert all(0 <= backoff_delay(10, policy) <= 2.0 for _ in range(50))
+
+
+class TestHostResilience:
+    """Tests for HostResilience class."""
+
+    def test_policy_lookup(self):
+        """Test exact, subdomain and default policy matching."""
+        github = HostPolicy(requests_per_second=1.0)
+        pages = HostPolicy(requests_per_second=3.0)
+        default = HostPolicy()
+        registry = HostResilience({'github.com': github, '.github.io': pages}, default)
+
+        assert registry.policy_for('github.com') is github
+        assert registry.policy_for('adobe.github.io') is pages
+        assert registry.policy_for('sling.apache.org') is default
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_status(self):
+        """Test that a 503 is retried and the later success returned."""
+        client, calls = make_client([httpx.Response(503), httpx.Response(200, text='ok')])
+        registry = HostResilience({}, FAST)
+
+        response = await registry.send(client, client.build_request('GET', 'https://a.com/'))
+
+        assert response.status_code == 200
+        assert len(calls) == 2
+        assert registry.get_stats()['a.com']['retries'] == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_honours_retry_after(self):
+        """Test that Retry-After sets the delay and 429 counts as throttling."""
+        client, _ = make_client(
+            [httpx.Response(429, headers={'retry-after': '3'}), httpx.Response(200)]
+        )
+        registry = HostResilience({}, FAST)
+
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.resilience_utils.asyncio.sleep',
+            new_callable=AsyncMock,
+        ) as mock_sleep:
+            response = await registry.send(client, client.build_request('GET', 'https://a.com/'))
+
+        assert response.status_code == 200
+        mock_sleep.assert_any_call(3.0)
+        assert registry.get_stats()['a.com']['throttled'] == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Test that the last error response is returned once retries are exhausted."""
+        client, calls = make_client([httpx.Response(502)])
+        registry = HostResilience({}, FAST)
+
+        response = await registry.send(client, client.build_request('GET', 'https://a.com/'))
+
+        assert response.status_code == 502
+        assert len(calls) == FAST.max_retries + 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_non_idempotent_not_retried(self):
+        """Test that POST requests are never retried."""
+        client, calls = make_client([httpx.Response(503)])
+        registry = HostResilience({}, FAST)
+
+        response = await registry.send(client, client.build_request('POST', 'https://a.com/'))
+
+        assert response.status_code == 503
+        assert len(calls) == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_transport_errors_retried_then_raised(self):
+        """Test that connection errors are retried and finally re-raised."""
+        client, calls = make_client([httpx.ConnectError('refused')])
+        registry = HostResilience({}, FAST)
+
+        with pytest.raises(httpx.ConnectError):
+            await registry.send(client, client.build_request('GET', 'https://a.com/'))
+        assert len(calls) == FAST.max_retries + 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_deadline(self):
+        """Test that a Retry-After longer than the deadline is not waited for."""
+        client, calls = make_client([httpx.Response(429, headers={'retry-after': '120'})])
+        registry = HostResilience({}, HostPolicy(deadline=10.0, backoff_base=0.0))
+
+        response = await registry.send(client, client.build_request('GET', 'https://a.com/'))
+
+        assert response.status_code == 429
+        assert len(calls) == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test that a failing host is not contacted once its circuit opens."""
+        client, calls = make_client([httpx.ConnectError('refused')])
+        policy = HostPolicy(
+            requests_per_second=1000.0,
+            burst=1000,
+            max_retries=0,
+            breaker_min_calls=2,
+            breaker_failure_rate=0.5,
+        )
+        registry = HostResilience({}, policy)
+
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await registry.send(client, client.build_request('GET', 'https://a.com/'))
+        with pytest.raises(CircuitOpenError):
+            await registry.send(client, client.build_request('GET', 'https://a.com/'))
+
+        assert len(calls) == 2
+        circuit = registry.get_stats()['a.com']['circuit']
+        assert circuit['state'] == 'open'
+        assert circuit['rejected'] == 1
+        await client.aclose()
+
+
+class TestHedging:
+    """Tests for hedged requests in HostResilience."""
+
+    @staticmethod
+    def make_registry(requests_sent):
+        """Build a hedging registry with a known 10 ms latency history."""
+        registry = HostResilience({}, FAST, hedging=True, hedge_budget=0.05)
+        for _ in range(20):
+            registry.latency_for('a.com').record(0.01)
+        for _ in range(requests_sent):
+            registry.count('a.com', 'requests')
+        return registry
+
+    @staticmethod
+    def make_stalling_client():
+        """Build a client whose first request stalls and later ones answer at once."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+                return httpx.Response(200, text='stalled')
+            return httpx.Response(200, text='hedge')
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+    @pytest.mark.asyncio
+    async def test_slow_request_is_hedged(self):
+        """Test that a stalled request is raced by a hedge which wins."""
+        registry = self.make_registry(requests_sent=100)
+        client, calls = self.make_stalling_client()
+
+        response = await registry.send(client, client.build_request('GET', 'https://a.com/'))
+        await response.aread()
+
+        assert response.text == 'hedge'
+        assert len(calls) == 2
+        stats = registry.get_stats()['a.com']
+        assert stats['hedged'] == 1
+        assert stats['hedge_wins'] == 1
+        assert stats['hedge_win_rate'] == 1.0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_hedges(self):
+        """Test that no hedge is sent once the budget is spent."""
+        registry = self.make_registry(requests_sent=10)
+        client, calls = self.make_stalling_client()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                registry.send(client, client.build_request('GET', 'https://a.com/')), 0.2
+            )
+
+        assert len(calls) == 1
+        assert 'hedged' not in registry.get_stats()['a.com']
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_hedging_disabled_by_default(self):
+        """Test that hedging is opt-in."""
+        registry = HostResilience({}, FAST)
+        for _ in range(20):
+            registry.latency_for('a.com').record(0.01)
+        assert registry.hedge_delay('a.com') is None
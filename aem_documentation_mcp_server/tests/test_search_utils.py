@@ -14,8 +14,23 @@
 """Tests for search utilities."""
 
 import pytest
+from aemlabs.aem_documentation_mcp_server.models import (
+    CatalogEntry,
+    CatalogLookupResult,
+    LocalSearchHit,
+    LocalSearchResult,
+    SearchResult,
+)
 from aemlabs.aem_documentation_mcp_server.search_utils import (
     build_experience_league_search_url,
+    build_search_request,
+    fuse_rankings,
+    parse_search_response,
+    render_fallback_results,
+    render_fused_results,
+    render_search_results,
+    result_key,
+    search_cache_key,
     EXPERIENCE_MANAGER_PRODUCTS,
     ALL_PRODUCTS,
     CONTENT_TYPES,
@@ -123,3 +138,215 @@ class TestPredefinedLists:
         assert 'Admin' in ROLES
         assert 'User' in ROLES
         assert len(ROLES) >= 6
+
+
+# Search API response with a complete, a sparse and an unusable result
+SEARCH_RESPONSE = {
+    'totalCount': 1234,
+    'results': [
+        {
+            'title': 'Sling Models  in AEM',
+            'clickUri': 'https://experienceleague.adobe.com/en/docs/sling-models',
+            'excerpt': 'Sling Models are\n annotation driven ' + 'POJOs. ' * 60,
+            'raw': {
+                'el_contenttype': ['Documentation'],
+                'el_product': ['Experience Manager', 'Experience Manager|6.5'],
+            },
+        },
+        {'uri': 'https://experienceleague.adobe.com/en/docs/models'},
+        {'title': 'No URL'},
+    ],
+}
+
+
+class TestSearchCacheKey:
+    """Tests for search_cache_key function."""
+
+    def test_normalization(self):
+        """Test that case, spacing and filter order do not change the key."""
+        key = search_cache_key(' Sling   Models', ['Tutorial', 'Documentation'], None, ['Dev'])
+        content_types = ['documentation', 'Tutorial', 'Tutorial']
+        assert key == search_cache_key('sling models', content_types, [], ['dev'])
+
+    def test_filters_are_distinguished(self):
+        """Test that the same values under different filters give different keys."""
+        roles_only = search_cache_key('q', None, None, ['Developer'])
+        assert search_cache_key('q', ['Developer']) != roles_only
+
+
+class TestBuildSearchRequest:
+    """Tests for build_search_request function."""
+
+    def test_filters_become_field_expressions(self):
+        """Test that each filter becomes an exact match on its index field."""
+        filters = (['Documentation', 'Tutorial'], ['Experience Manager|6.5'])
+        body = build_search_request('sling models', *filters, count=5)
+
+        assert body['q'] == 'sling models'
+        assert body['numberOfResults'] == 5
+        assert body['aq'] == (
+            '@el_contenttype==("Documentation","Tutorial") @el_product==("Experience Manager|6.5")'
+        )
+
+    def test_no_filters(self):
+        """Test a request without filters."""
+        assert 'aq' not in build_search_request('test', [], None, [])
+
+
+class TestParseSearchResponse:
+    """Tests for parse_search_response function."""
+
+    def test_results(self):
+        """Test fields, multi-valued fields, snippet trimming and skipped results."""
+        results, total = parse_search_response(SEARCH_RESPONSE)
+
+        assert total == 1234
+        first, second = results
+        assert first.title == 'Sling Models in AEM'
+        assert first.content_type == 'Documentation'
+        assert first.product == 'Experience Manager, Experience Manager|6.5'
+        assert first.snippet.startswith('Sling Models are annotation driven POJOs.')
+        assert len(first.snippet) == 300
+        assert second == SearchResult(
+            title='https://experienceleague.adobe.com/en/docs/models',
+            url='https://experienceleague.adobe.com/en/docs/models',
+        )
+
+    @pytest.mark.parametrize('data', [None, [], {'results': 'x'}, {'message': 'Unauthorized'}])
+    def test_unexpected_response(self, data):
+        """Test that responses without a result list are rejected."""
+        with pytest.raises(ValueError):
+            parse_search_response(data)
+
+
+class TestRenderSearchResults:
+    """Tests for render_search_results function."""
+
+    def test_compact_list(self):
+        """Test one numbered line per result with its snippet below."""
+        results, total = parse_search_response(SEARCH_RESPONSE)
+
+        markdown = render_search_results('sling models', results, total, 'https://search')
+
+        assert markdown.splitlines()[2] == '1234 results, showing 2. Search page: https://search'
+        assert (
+            '1. [Sling Models in AEM](https://experienceleague.adobe.com/en/docs/sling-models)'
+            ' - Documentation · Experience Manager, Experience Manager|6.5'
+        ) in markdown
+        assert '2. [https://experienceleague.adobe.com/en/docs/models]' in markdown
+
+    def test_no_results(self):
+        """Test the message for a search without results."""
+        assert 'No results.' in render_search_results('zzz', [], 0, 'https://search')
+
+
+class TestRenderFallbackResults:
+    """Tests for render_fallback_results function."""
+
+    def test_catalog_and_local_index_pages(self):
+        """Test the reason line followed by the catalog entries and local index hits."""
+        catalog_result = CatalogLookupResult(
+            query='dispatcher',
+            entries=[CatalogEntry(url='https://example.com/dispatcher', title='Dispatcher')],
+        )
+        local_result = LocalSearchResult(
+            query='dispatcher',
+            hits=[
+                LocalSearchHit(
+                    url='https://example.com/flush',
+                    title='Flushing',
+                    score=1.0,
+                    start_index=0,
+                    section='Invalidation',
+                    snippet='Flush the\ncache.',
+                )
+            ],
+        )
+
+        markdown = render_fallback_results(
+            'dispatcher', 'Not configured.', 'https://search', catalog_result, local_result
+        )
+
+        assert markdown.splitlines()[2] == (
+            'Not configured. Search page (open in a browser): https://search'
+        )
+        assert '## Sitemap catalog\n\n1. [Dispatcher](https://example.com/dispatcher)' in markdown
+        assert (
+            '## Local index\n\n1. [Flushing](https://example.com/flush) - Invalidation\n'
+            '   Flush the cache.'
+        ) in markdown
+
+    def test_errors_and_empty_lists(self):
+        """Test that lookup errors and empty lists are stated."""
+        markdown = render_fallback_results(
+            'zzz',
+            'Not configured.',
+            'https://search',
+            CatalogLookupResult(query='zzz', error='The sitemap catalog is disabled'),
+            LocalSearchResult(query='zzz'),
+        )
+
+        assert '## Sitemap catalog\n\nThe sitemap catalog is disabled' in markdown
+        assert '## Local index\n\nNo matching pages.' in markdown
+
+
+def results(*paths):
+    """Search results for Experience League paths, best first."""
+    return [
+        SearchResult(title=path, url=f'https://experienceleague.adobe.com/en/docs/{path}')
+        for path in paths
+    ]
+
+
+class TestResultKey:
+    """Tests for result_key function."""
+
+    def test_same_page_spellings(self):
+        """Test that fragments, trailing slashes, lang and host case do not matter."""
+        key = result_key('https://experienceleague.adobe.com/en/docs/page')
+
+        assert result_key('https://ExperienceLeague.adobe.com/en/docs/page/?lang=en#usage') == key
+        assert result_key('https://experienceleague.adobe.com/en/docs/page?v=2') != key
+
+
+class TestFuseRankings:
+    """Tests for fuse_rankings function."""
+
+    def test_pages_found_by_several_searches_rank_first(self):
+        """Test that summed reciprocal ranks beat a single top rank."""
+        fused = fuse_rankings([results('a', 'b', 'c'), results('d', 'c', 'b'), results('c')])
+
+        assert [(result.title, count) for result, count in fused] == [
+            ('c', 3),
+            ('b', 2),
+            ('a', 1),
+            ('d', 1),
+        ]
+
+    def test_duplicates_merged(self):
+        """Test that one page is counted once per list and keeps its best-ranked entry."""
+        first = results('x', 'page')
+        second = [
+            SearchResult(title='Page', url='https://experienceleague.adobe.com/en/docs/page/'),
+            *results('page'),
+        ]
+
+        fused = fuse_rankings([first, second])
+
+        assert [(result.title, count) for result, count in fused] == [('Page', 2), ('x', 1)]
+
+
+class TestRenderFusedResults:
+    """Tests for render_fused_results function."""
+
+    def test_results_and_failures(self):
+        """Test the merged list with per-result counts and the failed searches."""
+        fused = fuse_rankings([results('a'), results('a', 'b')])
+
+        markdown = render_fused_results(['q1', 'q2'], fused, 2, ["'q3': timed out"])
+
+        assert markdown.startswith('# Experience League search: q1 | q2\n')
+        assert '2 results merged from 2 searches.' in markdown
+        first = '1. [a](https://experienceleague.adobe.com/en/docs/a) - found by 2 of 2 searches'
+        assert first in markdown
+        assert markdown.endswith("Failed searches:\n- 'q3': timed out")
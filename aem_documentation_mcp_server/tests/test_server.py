@@ -16,11 +16,18 @@
 import httpx
 import pytest
 from aemlabs.aem_documentation_mcp_server.server import (
+    find_related_documentation,
     get_available_services,
+    get_documentation_outline,
+    grep_documentation,
+    lookup_documentation,
     main,
+    mcp,
     read_documentation,
+    search_experience_league_multi,
+    server_lifespan,
 )
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 
 class MockContext:
@@ -44,13 +51,14 @@ class TestReadDocumentation:
         url = 'https://experienceleague.adobe.com/en/docs/test'
         ctx = MockContext()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<html><body><main><h1>Test</h1></main></body></html>'
-        mock_response.headers = {'content-type': 'text/html'}
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text='<html><body><main><h1>Test</h1></main></body></html>',
+        )
 
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
 
             # Test via read_documentation_impl to avoid Field processing issues
             from aemlabs.aem_documentation_mcp_server.server_utils import read_documentation_impl
@@ -78,13 +86,14 @@ class TestReadDocumentation:
         ctx = MockContext()
 
         long_content = '<html><body><main>' + 'a' * 10000 + '</main></body></html>'
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = long_content
-        mock_response.headers = {'content-type': 'text/html'}
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text=long_content,
+        )
 
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
 
             # Test via read_documentation_impl to avoid Field processing issues
             from aemlabs.aem_documentation_mcp_server.server_utils import read_documentation_impl
@@ -99,13 +108,14 @@ class TestReadDocumentation:
         url = 'https://experienceleague.adobe.com/test'
         ctx = MockContext()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<html><body><main>' + 'abcd' * 1000 + '</main></body></html>'
-        mock_response.headers = {'content-type': 'text/html'}
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text='<html><body><main>' + 'abcd' * 1000 + '</main></body></html>',
+        )
 
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
 
             result = await read_documentation(ctx, url=url, max_length=100, start_index=50)
 
@@ -113,6 +123,111 @@ class TestReadDocumentation:
             assert 'start_index=150' in result or 'start_index' in result
 
 
+class TestGetDocumentationOutline:
+    """Tests for get_documentation_outline tool."""
+
+    @pytest.mark.asyncio
+    async def test_outline(self):
+        """Test the outline of a valid page."""
+        url = 'https://experienceleague.adobe.com/en/docs/test'
+        ctx = MockContext()
+
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text='<html><body><main><h1>Test</h1><h2>Setup</h2><p>Steps</p></main></body></html>',
+        )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
+
+            outline = await get_documentation_outline(ctx, url=url)
+
+        assert [heading.text for heading in outline.headings] == ['Test', 'Setup']
+        assert outline.headings[1].start_index == len('# Test\n\n')
+
+    @pytest.mark.asyncio
+    async def test_invalid_domain(self):
+        """Test that invalid domains are reported in the outline."""
+        outline = await get_documentation_outline(MockContext(), url='https://invalid.com/docs')
+
+        assert 'Invalid URL' in outline.error
+        assert outline.headings == []
+
+
+class TestGrepDocumentation:
+    """Tests for grep_documentation tool."""
+
+    @pytest.mark.asyncio
+    async def test_invalid_domain(self):
+        """Test that invalid domains are reported in the result."""
+        result = await grep_documentation(
+            MockContext(),
+            url='https://invalid.com/docs',
+            query='sling',
+            regex=False,
+            ignore_case=True,
+            context_chars=200,
+            max_passages=20,
+        )
+
+        assert 'Invalid URL' in result.error
+        assert result.passages == []
+
+
+class TestSearchExperienceLeagueMulti:
+    """Tests for search_experience_league_multi tool."""
+
+    @pytest.mark.asyncio
+    async def test_product_sets(self):
+        """Test one product set for all products, or one per product."""
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.server.search_experience_league_multi_impl',
+            new_callable=AsyncMock,
+        ) as mock_impl:
+            await search_experience_league_multi(MockContext(), queries=['sling'])
+            await search_experience_league_multi(
+                MockContext(), queries=['sling'], products=['A', 'B'], search_each_product=True
+            )
+
+        first, second = (call.kwargs['product_sets'] for call in mock_impl.call_args_list)
+        assert first == [None]
+        assert second == [['A'], ['B']]
+
+
+class TestFindRelatedDocumentation:
+    """Tests for find_related_documentation tool."""
+
+    @pytest.mark.asyncio
+    async def test_invalid_url(self):
+        """Test that unsupported URLs are rejected before reading them."""
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.server.find_related_documentation_impl',
+            new_callable=AsyncMock,
+        ) as mock_impl:
+            result = await find_related_documentation(MockContext(), url='https://example.com/')
+            await find_related_documentation(MockContext(), query='dispatcher')
+
+        assert 'Invalid URL' in result.error
+        args = mock_impl.call_args.args
+        assert args[1:5] == ('dispatcher', None, 10, None)
+
+
+class TestLookupDocumentation:
+    """Tests for lookup_documentation tool."""
+
+    @pytest.mark.asyncio
+    async def test_defaults(self):
+        """Test that omitted arguments reach the implementation as their defaults."""
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.server.lookup_documentation_impl',
+            new_callable=AsyncMock,
+        ) as mock_impl:
+            await lookup_documentation(MockContext(), query='sling models injectors')
+
+        assert mock_impl.call_args.args[1:] == ('sling models injectors', None, 10)
+
+
 class TestGetAvailableServices:
     """Tests for get_available_services tool."""
 
@@ -165,3 +280,18 @@ class TestMain:
             with patch('aemlabs.aem_documentation_mcp_server.server.logger.info'):
                 main()
                 mock_run.assert_called_once()
+
+
+class TestServerLifespan:
+    """Tests for the server lifespan."""
+
+    @pytest.mark.asyncio
+    async def test_lifespan_closes_http_pool(self):
+        """Test that the shared HTTP pool is closed on shutdown."""
+        with patch(
+            'aemlabs.aem_documentation_mcp_server.server.http_pool.aclose',
+            new_callable=AsyncMock,
+        ) as mock_aclose:
+            async with server_lifespan(mcp):
+                mock_aclose.assert_not_called()
+            mock_aclose.assert_called_once()
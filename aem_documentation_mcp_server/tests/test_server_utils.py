@@ -13,13 +13,39 @@
 # limitations under the License.
 """Tests for server utilities."""
 
+import asyncio
+import gzip
 import httpx
+import json
 import pytest
+import threading
+from aemlabs.aem_documentation_mcp_server import server_utils
+from aemlabs.aem_documentation_mcp_server.cache_utils import document_cache
+from aemlabs.aem_documentation_mcp_server.catalog_utils import catalog
+from aemlabs.aem_documentation_mcp_server.concurrency_utils import (
+    ConversionExecutor,
+    TimeLimitedWorker,
+)
+from aemlabs.aem_documentation_mcp_server.document_utils import parse_document
+from aemlabs.aem_documentation_mcp_server.grep_utils import compile_query
+from aemlabs.aem_documentation_mcp_server.index_utils import local_index
+from aemlabs.aem_documentation_mcp_server.models import CatalogEntry, CatalogLookupResult
+from aemlabs.aem_documentation_mcp_server.search_utils import SEARCH_NOT_CONFIGURED
 from aemlabs.aem_documentation_mcp_server.server_utils import (
+    find_related_documentation_impl,
+    get_documentation_outline_impl,
+    grep_documentation_impl,
+    lookup_documentation_impl,
+    read_documentation_batch_impl,
     read_documentation_impl,
+    search_experience_league_impl,
+    search_experience_league_multi_impl,
+    search_local_docs_impl,
     validate_adobe_url,
 )
-from unittest.mock import AsyncMock, MagicMock, patch
+from aemlabs.aem_documentation_mcp_server.vector_utils import vector_index
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
 
 
 class MockContext:
@@ -167,20 +193,21 @@ class TestReadDocumentationImpl:
         url = 'https://experienceleague.adobe.com/test.html'
         ctx = MockContext()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<html><body><main><h1>Test</h1><p>Content</p></main></body></html>'
-        mock_response.headers = {'content-type': 'text/html'}
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text='<html><body><main><h1>Test</h1><p>Content</p></main></body></html>',
+        )
 
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
 
             result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
 
             assert 'Adobe AEM Documentation from' in result
             assert 'Test' in result
             assert 'Content' in result
-            mock_get.assert_called_once()
+            mock_send.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_http_error(self):
@@ -188,8 +215,8 @@ class TestReadDocumentationImpl:
         url = 'https://experienceleague.adobe.com/test.html'
         ctx = MockContext()
 
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
-            mock_get.side_effect = httpx.HTTPError('Connection error')
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = httpx.HTTPError('Connection error')
 
             result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
 
@@ -202,11 +229,10 @@ class TestReadDocumentationImpl:
         url = 'https://experienceleague.adobe.com/test.html'
         ctx = MockContext()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 404
+        mock_response = httpx.Response(404)
 
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
 
             result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
 
@@ -219,21 +245,65 @@ class TestReadDocumentationImpl:
         url = 'https://experienceleague.adobe.com/test.html#section'
         ctx = MockContext()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = '<html><body><main>Content</main></body></html>'
-        mock_response.headers = {'content-type': 'text/html'}
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text='<html><body><main>Content</main></body></html>',
+        )
 
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
 
             await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
 
             # Verify that the hash was removed from the request
-            called_url = mock_get.call_args[0][0]
+            called_url = str(mock_send.call_args[0][0].url)
             assert '#section' not in called_url
             assert 'test.html' in called_url
 
+    @pytest.mark.asyncio
+    async def test_fragment_returns_addressed_section(self):
+        """Test that a deep link returns only its section, paginated on its own."""
+        url = 'https://experienceleague.adobe.com/docs/dispatcher.html'
+        ctx = MockContext()
+        steps = ''.join(f'<p>Step {i} of the configuration.</p>' for i in range(30))
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text=(
+                '<html><body><div class="article-content"><h1>Dispatcher</h1><p>Intro</p>'
+                f'<h2 id="configure">Configure the Dispatcher</h2>{steps}'
+                '<h3>Filters</h3><p>Filter rules.</p>'
+                '<h2>Troubleshooting</h2><p>Logs.</p></div></body></html>'
+            ),
+        )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
+
+            full = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+            first = await read_documentation_impl(
+                ctx, f'{url}#configure-the-dispatcher', 500, 0, 'test-session'
+            )
+            rest = await read_documentation_impl(
+                ctx, f'{url}#configure-the-dispatcher', 10000, 500, 'test-session'
+            )
+            by_id = await read_documentation_impl(ctx, f'{url}#configure', 500, 0, 'test-session')
+            missing = await read_documentation_impl(
+                ctx, f'{url}#unknown', 10000, 0, 'test-session'
+            )
+
+            section = first.split(':\n\n', 1)[1]
+            assert section.startswith('## Configure the Dispatcher\n\nStep 0')
+            assert 'Intro' not in section
+            assert 'start_index=500' in section
+            assert '### Filters' in rest
+            assert 'Troubleshooting' not in rest
+            assert 'Content truncated' not in rest
+            assert by_id.replace('#configure', '#configure-the-dispatcher') == first
+            assert missing.replace('#unknown', '') == full
+            mock_send.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_youtube_url_handling(self):
         """Test YouTube URL special handling."""
@@ -279,15 +349,1070 @@ class TestReadDocumentationImpl:
         ctx = MockContext()
 
         long_content = '<html><body><main>' + 'a' * 10000 + '</main></body></html>'
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = long_content
-        mock_response.headers = {'content-type': 'text/html'}
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text=long_content,
+        )
 
-        with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
-            mock_get.return_value = mock_response
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
 
             result = await read_documentation_impl(ctx, url, 100, 0, 'test-session')
 
             assert 'Content truncated' in result
             assert 'start_index=100' in result
+
+    @pytest.mark.asyncio
+    async def test_pagination_uses_document_cache(self):
+        """Test that reading later pages does not refetch the document."""
+        url = 'https://experienceleague.adobe.com/test.html'
+        ctx = MockContext()
+
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text='<html><body><main>' + 'a' * 1000 + '</main></body></html>',
+        )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
+
+            first = await read_documentation_impl(ctx, url, 100, 0, 'test-session')
+            second = await read_documentation_impl(ctx, url, 100, 100, 'test-session')
+
+            assert 'start_index=100' in first
+            assert 'start_index=200' in second
+            mock_send.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_revalidates_with_http_cache(self):
+        """Test that a stored page is revalidated and a 304 reuses the stored conversion."""
+        url = 'https://experienceleague.adobe.com/cached.html'
+        ctx = MockContext()
+
+        first_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html', 'etag': '"v1"'},
+            text='<html><body><main><h1>Cached</h1><p>Stored body</p></main></body></html>',
+        )
+        not_modified = httpx.Response(304, headers={'etag': '"v1"'})
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = [first_response, not_modified]
+
+            first = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+            document_cache.clear()
+            second = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+
+            assert 'Stored body' in first
+            assert second == first
+            assert mock_send.call_args[0][0].headers['If-None-Match'] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_fresh_http_cache_entry_skips_network(self):
+        """Test that a fresh stored page is served without any request."""
+        url = 'https://experienceleague.adobe.com/fresh.html'
+        ctx = MockContext()
+
+        response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html', 'cache-control': 'max-age=600'},
+            text='<html><body><main><p>Fresh body content</p></main></body></html>',
+        )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = response
+
+            await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+            document_cache.clear()
+            result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+
+            assert 'Fresh body content' in result
+            mock_send.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_one_fetch(self):
+        """Test that concurrent reads of the same page issue a single request."""
+        url = 'https://experienceleague.adobe.com/shared.html'
+        ctx = MockContext()
+
+        mock_response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text='<html><body><main><p>Shared content</p></main></body></html>',
+        )
+
+        async def slow_send(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_response
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = slow_send
+
+            results = await asyncio.gather(
+                *(read_documentation_impl(ctx, url, 10000, 0, 'test-session') for _ in range(3))
+            )
+
+            assert all('Shared content' in result for result in results)
+            mock_send.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_shared_fetch_error_reaches_every_caller(self):
+        """Test that each coalesced caller reports a shared fetch error to its own context."""
+        url = 'https://experienceleague.adobe.com/missing.html'
+        contexts = [MockContext() for _ in range(3)]
+        for ctx in contexts:
+            ctx.error = AsyncMock()
+
+        async def slow_send(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return httpx.Response(404)
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = slow_send
+
+            await asyncio.gather(
+                *(read_documentation_impl(ctx, url, 10000, 0, 'test-session') for ctx in contexts)
+            )
+
+            mock_send.assert_called_once()
+        for ctx in contexts:
+            ctx.error.assert_awaited_once()
+            assert 'status code 404' in ctx.error.await_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_binary_content_type_rejected(self):
+        """Test that binary responses are rejected from their headers."""
+        url = 'https://github.com/adobe/aem-project-archetype/archive/main'
+        ctx = MockContext()
+
+        mock_response = httpx.Response(
+            200, headers={'content-type': 'application/zip'}, content=b'PK\x03\x04'
+        )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
+
+            result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+
+            assert 'Failed to fetch' in result
+            assert 'application/zip' in result
+
+    @pytest.mark.asyncio
+    async def test_oversized_response_rejected(self):
+        """Test that responses above the size limit are aborted."""
+        url = 'https://github.com/adobe/huge'
+        ctx = MockContext()
+
+        mock_response = httpx.Response(
+            200, headers={'content-type': 'text/html'}, text='<html>' + 'x' * 100 + '</html>'
+        )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = mock_response
+            with patch('aemlabs.aem_documentation_mcp_server.http_utils.MAX_RESPONSE_BYTES', 50):
+                result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+
+            assert 'Failed to fetch' in result
+            assert 'byte limit' in result
+
+    @pytest.mark.asyncio
+    async def test_plain_text_read_stops_early(self):
+        """Test that plain-text pages are only downloaded as far as needed."""
+        url = 'https://github.com/adobe/notes.txt'
+        ctx = MockContext()
+
+        def respond(request, **kwargs):
+            return httpx.Response(
+                200,
+                headers={'content-type': 'text/plain'},
+                stream=httpx.ByteStream(b'0123456789' * 1000),
+            )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = respond
+
+            first = await read_documentation_impl(ctx, url, 100, 0, 'test-session')
+            assert 'Total length: more than' in first
+            assert mock_send.call_count == 1
+
+            await read_documentation_impl(ctx, url, 100, 50, 'test-session')
+            assert mock_send.call_count == 1
+
+            last = await read_documentation_impl(ctx, url, 100, 9950, 'test-session')
+            assert mock_send.call_count == 2
+            assert 'Content truncated' not in last
+
+    @pytest.mark.asyncio
+    async def test_streaming_conversion_stops_download_early(self):
+        """Test that the streaming converter stops reading once enough markdown exists."""
+        url = 'https://experienceleague.adobe.com/docs/long.html'
+        ctx = MockContext()
+        paragraphs = [f'<p>Paragraph {i} of a long guide.</p>'.encode() for i in range(2000)]
+        chunks = [
+            b'<html><body><div class="article-content">',
+            *paragraphs,
+            b'</div></body></html>',
+        ]
+        read = []
+
+        async def stream():
+            for chunk in chunks:
+                read.append(chunk)
+                yield chunk
+
+        def respond(request, **kwargs):
+            return httpx.Response(200, headers={'content-type': 'text/html'}, content=stream())
+
+        with (
+            patch.object(server_utils, 'resolve_converter', return_value='streaming'),
+            patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send,
+        ):
+            mock_send.side_effect = respond
+
+            first = await read_documentation_impl(ctx, url, 500, 0, 'test-session')
+            assert 'Paragraph 0 of a long guide.' in first
+            assert 'Total length: more than' in first
+            assert len(read) < len(chunks) // 10
+
+            read.clear()
+            later = await read_documentation_impl(ctx, url, 500, 5000, 'test-session')
+            assert mock_send.call_count == 2
+            assert 'Paragraph 170 of a long guide.' in later
+            assert len(read) < len(chunks) // 2
+
+    @pytest.mark.asyncio
+    async def test_lazy_conversion_converts_requested_window(self):
+        """Test that lazy conversion stops at the window and continues from the cached body."""
+        url = 'https://experienceleague.adobe.com/docs/sections.html'
+        ctx = MockContext()
+        sections = ''.join(
+            f'<h2>Section {i}</h2><p>Paragraph {i} of a long guide.</p>' for i in range(300)
+        )
+        response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html', 'cache-control': 'max-age=600'},
+            text=f'<html><body><div class="article-content">{sections}</div></body></html>',
+        )
+
+        with (
+            patch.object(server_utils, 'LAZY_CONVERSION', True),
+            patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send,
+        ):
+            mock_send.return_value = response
+
+            first = await read_documentation_impl(ctx, url, 500, 0, 'test-session')
+            assert 'Paragraph 0 of a long guide.' in first
+            assert 'Total length: more than' in first
+
+            later = await read_documentation_impl(ctx, url, 500, 5000, 'test-session')
+            assert 'Paragraph 109 of a long guide.' in later
+            assert 'Total length: more than' in later
+
+            last = await read_documentation_impl(ctx, url, 5000, 12000, 'test-session')
+            assert 'Paragraph 299 of a long guide.' in last
+            assert 'Content truncated' not in last
+
+            document_cache.clear()
+            stored = await read_documentation_impl(ctx, url, 500, 0, 'test-session')
+            assert 'Total length: more than' not in stored
+            mock_send.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_lazy_windows_share_one_parse_with_process_executor(self, monkeypatch):
+        """Test that later windows continue the parsed page instead of parsing it in a worker."""
+        executor = ConversionExecutor(mode='process', workers=2)
+        monkeypatch.setattr(server_utils, 'conversion_executor', executor)
+        url = 'https://experienceleague.adobe.com/docs/windows.html'
+        ctx = MockContext()
+        sections = ''.join(
+            f'<h2>Section {i}</h2><p>Paragraph {i} of a long guide.</p>' for i in range(300)
+        )
+        response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html', 'cache-control': 'max-age=600'},
+            text=f'<html><body><div class="article-content">{sections}</div></body></html>',
+        )
+
+        with (
+            patch.object(server_utils, 'LAZY_CONVERSION', True),
+            patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send,
+            patch(
+                'aemlabs.aem_documentation_mcp_server.util.parse_document', wraps=parse_document
+            ) as mock_parse,
+        ):
+            mock_send.return_value = response
+            first = await read_documentation_impl(ctx, url, 500, 0, 'test-session')
+            second = await read_documentation_impl(ctx, url, 500, 5000, 'test-session')
+
+        executor.shutdown()
+        assert 'Paragraph 0 of a long guide.' in first
+        assert 'Paragraph 109 of a long guide.' in second
+        assert mock_parse.call_count == 1
+        assert executor.get_stats()['submitted'] == 0
+
+    @pytest.mark.asyncio
+    async def test_transient_error_is_retried(self):
+        """Test that a transient 503 is retried instead of surfacing to the model."""
+        url = 'https://experienceleague.adobe.com/flaky.html'
+        ctx = MockContext()
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = [
+                httpx.Response(503),
+                httpx.Response(
+                    200,
+                    headers={'content-type': 'text/html'},
+                    text='<html><body><main><p>Recovered content</p></main></body></html>',
+                ),
+            ]
+
+            result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+
+            assert 'Recovered content' in result
+            assert mock_send.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test that reads fail immediately while the host's circuit is open."""
+        url = 'https://adapt.to/2024/down.html'
+        ctx = MockContext()
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = httpx.ConnectTimeout('timed out')
+
+            for _ in range(5):
+                result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+            calls = mock_send.call_count
+            result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+
+            assert 'Failed to fetch' in result
+            assert 'suspended' in result
+            assert mock_send.call_count == calls
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_serves_stale_copy(self):
+        """Test that an expired cached copy is served while the circuit is open."""
+        url = 'https://adapt.to/2024/schedule.html'
+        ctx = MockContext()
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = httpx.Response(
+                200,
+                headers={'content-type': 'text/html', 'cache-control': 'max-age=0'},
+                text='<html><body><main><p>Cached schedule</p></main></body></html>',
+            )
+            await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+
+        document_cache.clear()
+        breaker = server_utils.host_resilience.breaker_for('adapt.to')
+        for _ in range(breaker.policy.breaker_min_calls):
+            breaker.record_failure()
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            result = await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+
+            assert 'Cached schedule' in result
+            mock_send.assert_not_called()
+        assert len(document_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_extraction_profile_recorded(self):
+        """Test that the host's extraction profile outcome is counted."""
+        url = 'https://sling.apache.org/documentation/bundles/models.html'
+        ctx = MockContext()
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = httpx.Response(
+                200,
+                headers={'content-type': 'text/html'},
+                text='<html><body><div id="content"><p>Sling Models content</p></div></body></html>',
+            )
+            await read_documentation_impl(ctx, url, 10000, 0, 'test-session')
+
+        stats = server_utils.profile_stats.get_stats()
+        assert stats['sling']['hits'] == 1
+
+
+class TestReadDocumentationBatchImpl:
+    """Tests for read_documentation_batch_impl function."""
+
+    @pytest.mark.asyncio
+    async def test_results_and_errors_per_url(self):
+        """Test that each URL gets its own result or error, in order."""
+        ctx = MockContext()
+        urls = [
+            'https://sling.apache.org/documentation/bundles/models.html',
+            'https://example.com/not-supported',
+            'https://sling.apache.org/documentation/missing.html',
+        ]
+
+        def respond(request, **kwargs):
+            if 'missing' in str(request.url):
+                return httpx.Response(404)
+            return httpx.Response(
+                200,
+                headers={'content-type': 'text/html'},
+                text='<html><body><main><p>Sling Models page</p></main></body></html>',
+            )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = respond
+
+            results = await read_documentation_batch_impl(ctx, urls, 10000, 5, 30.0, 'test')
+
+        assert [result.url for result in results] == urls
+        assert 'Sling Models page' in results[0].content
+        assert results[0].error is None
+        assert 'Invalid URL' in results[1].error
+        assert 'status code 404' in results[2].error
+        assert results[2].content is None
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """Test that no more than max_concurrency pages are fetched at once."""
+        ctx = MockContext()
+        urls = [f'https://sling.apache.org/documentation/page{i}.html' for i in range(6)]
+        active = 0
+        peak = 0
+
+        async def slow_send(request, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(
+                200,
+                headers={'content-type': 'text/html'},
+                text='<html><body><main><p>Page content here</p></main></body></html>',
+            )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = slow_send
+
+            results = await read_documentation_batch_impl(ctx, urls, 10000, 2, 30.0, 'test')
+
+        assert all(result.content for result in results)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_per_item_timeout(self):
+        """Test that a slow page times out without failing the others."""
+        ctx = MockContext()
+        urls = [
+            'https://sling.apache.org/documentation/fast.html',
+            'https://sling.apache.org/documentation/slow.html',
+        ]
+
+        async def send(request, **kwargs):
+            if 'slow' in str(request.url):
+                await asyncio.sleep(1)
+            return httpx.Response(
+                200,
+                headers={'content-type': 'text/html'},
+                text='<html><body><main><p>Fast page content</p></main></body></html>',
+            )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = send
+
+            results = await read_documentation_batch_impl(ctx, urls, 10000, 5, 0.25, 'test')
+
+        assert 'Fast page content' in results[0].content
+        assert 'Timed out' in results[1].error
+
+
+class TestGetDocumentationOutlineImpl:
+    """Tests for get_documentation_outline_impl function."""
+
+    @pytest.mark.asyncio
+    async def test_offsets_jump_to_sections(self):
+        """Test that heading offsets are start indexes of read_documentation."""
+        url = 'https://experienceleague.adobe.com/docs/guide.html#install'
+        ctx = MockContext()
+        sections = ''.join(
+            f'<h2>Step {i}</h2><p>{"Details of the step. " * 20}</p>' for i in range(20)
+        )
+        response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text=(
+                '<html><head><title>Guide</title></head><body>'
+                f'<div class="article-content"><h1>Guide</h1>{sections}</div></body></html>'
+            ),
+        )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = response
+
+            outline = await get_documentation_outline_impl(ctx, url, 'test-session')
+            step = outline.headings[13]
+            result = await read_documentation_impl(
+                ctx, url, step.length, step.start_index, 'test-session'
+            )
+
+            assert outline.error is None
+            assert outline.title == 'Guide'
+            assert [h.level for h in outline.headings] == [1] + [2] * 20
+            assert (step.text, step.anchor) == ('Step 12', 'step-12')
+            assert result.split(':\n\n', 1)[1].startswith('## Step 12\n\nDetails')
+            assert 'Step 13' not in result.split('<e>')[0]
+            mock_send.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_errors(self):
+        """Test pages without an outline and failed fetches."""
+        ctx = MockContext()
+
+        video = await get_documentation_outline_impl(
+            ctx, 'https://www.youtube.com/watch?v=nJ8QTNQEkD8', 'test-session'
+        )
+        assert video.error and not video.headings
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = httpx.Response(404)
+            missing = await get_documentation_outline_impl(
+                ctx, 'https://experienceleague.adobe.com/missing.html', 'test-session'
+            )
+
+        assert 'status code 404' in missing.error
+
+
+class TestGrepDocumentationImpl:
+    """Tests for grep_documentation_impl function."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_greps_reuse_conversion(self):
+        """Test that passages point into read_documentation and the page is fetched once."""
+        url = 'https://experienceleague.adobe.com/docs/release-notes.html'
+        ctx = MockContext()
+        fixes = ''.join(f'<li>Fixed issue number {i}. NPR-{41000 + i}</li>' for i in range(500))
+        response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text=(
+                '<html><body><div class="article-content"><h1>Release Notes</h1>'
+                f'<h2>Sites</h2><ul>{fixes}</ul></div></body></html>'
+            ),
+        )
+
+        with (
+            patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send,
+            patch.object(server_utils, 'convert', wraps=server_utils.convert) as mock_convert,
+        ):
+            mock_send.return_value = response
+
+            found = await grep_documentation_impl(
+                ctx, url, 'npr-41420', False, True, 30, 20, 'test-session'
+            )
+            several = await grep_documentation_impl(
+                ctx, url, r'NPR-4104\d', True, True, 0, 3, 'test-session'
+            )
+            [passage] = found.passages
+            read = await read_documentation_impl(
+                ctx, url, 20, passage.match_indexes[0], 'test-session'
+            )
+
+            assert found.total_matches == 1
+            assert passage.section == 'Sites'
+            assert 'Fixed issue number 420.' in passage.text
+            assert read.split(':\n\n', 1)[1].startswith('NPR-41420')
+            assert several.total_matches == 10
+            assert [p.text for p in several.passages] == ['NPR-41040', 'NPR-41041', 'NPR-41042']
+            mock_send.assert_called_once()
+            assert mock_convert.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_runaway_regex_and_long_pages(self):
+        """Test that a backtracking regex is stopped and long pages are searched in part."""
+        ctx = MockContext()
+        url = 'https://experienceleague.adobe.com/docs/long.html'
+        worker = TimeLimitedWorker(timeout=60)
+        # Start the process and import the search code before the time limit applies
+        worker.call(compile_query, 'warm up')
+        worker.timeout = 1
+
+        with (
+            patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send,
+            patch.object(server_utils, 'regex_worker', worker),
+        ):
+            mock_send.return_value = httpx.Response(
+                200,
+                headers={'content-type': 'text/html'},
+                text=f'<html><body><main><p>{"a" * 40}! end</p></main></body></html>',
+            )
+            runaway = await grep_documentation_impl(
+                ctx, url, '(a+)+$', True, True, 20, 20, 'test-session'
+            )
+            with patch.object(server_utils, 'MAX_SCAN_CHARS', 10):
+                partial = await grep_documentation_impl(
+                    ctx, url, 'end', False, True, 20, 20, 'test-session'
+                )
+            whole = await grep_documentation_impl(ctx, url, 'end', False, True, 20, 20, 'test')
+        worker.shutdown()
+
+        assert 'did not finish within 1 seconds' in runaway.error
+        assert worker.get_stats()['timeouts'] == 1
+        assert (partial.total_matches, partial.truncated) == (0, True)
+        assert (whole.total_matches, whole.truncated) == (1, False)
+
+    @pytest.mark.asyncio
+    async def test_errors(self):
+        """Test invalid queries and failed fetches."""
+        ctx = MockContext()
+        url = 'https://experienceleague.adobe.com/missing.html'
+
+        invalid = await grep_documentation_impl(ctx, url, '(', True, True, 200, 20, 'test-session')
+        assert 'Invalid regular expression' in invalid.error
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = httpx.Response(404)
+            missing = await grep_documentation_impl(
+                ctx, url, 'dispatcher', False, True, 200, 20, 'test-session'
+            )
+
+        assert 'status code 404' in missing.error
+        assert missing.passages == []
+
+
+class StubSearchApi(ThreadingHTTPServer):
+    """Local stand-in for the search API, recording the requests it receives."""
+
+    def __init__(self):
+        """Listen on a free local port."""
+        super().__init__(('127.0.0.1', 0), StubSearchHandler)
+        self.requests = []
+        self.status = 200
+        # Payloads of specific queries, by query string
+        self.payloads = {}
+        self.payload = {
+            'totalCount': 1,
+            'results': [
+                {
+                    'title': 'Sling Models',
+                    'clickUri': 'https://experienceleague.adobe.com/en/docs/sling-models',
+                    'excerpt': 'Annotation driven POJOs.',
+                    'raw': {'el_contenttype': 'Documentation'},
+                }
+            ],
+        }
+
+    @property
+    def endpoint(self) -> str:
+        """URL of the search endpoint."""
+        return f'http://127.0.0.1:{self.server_address[1]}/rest/search/v2'
+
+
+class StubSearchHandler(BaseHTTPRequestHandler):
+    """Answer every POST with the stub's status and payload."""
+
+    def do_POST(self):
+        """Record the request and send the configured response."""
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length))
+        self.server.requests.append((self.path, dict(self.headers), request))
+        body = json.dumps(self.server.payloads.get(request['q'], self.server.payload)).encode()
+        self.send_response(self.server.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep test output quiet."""
+
+
+@pytest.fixture
+def search_api(monkeypatch):
+    """Run a stub search API and point the search backend at it."""
+    server = StubSearchApi()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(server_utils, 'SEARCH_ENDPOINT', server.endpoint)
+    monkeypatch.setattr(server_utils, 'SEARCH_ORGANIZATION_ID', 'adobev2prod')
+    monkeypatch.setattr(server_utils, 'SEARCH_TOKEN', 'test-token')
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestSearchExperienceLeagueImpl:
+    """Tests for search_experience_league_impl function."""
+
+    @pytest.mark.asyncio
+    async def test_results_cached_by_normalized_query(self, search_api):
+        """Test that equivalent searches, also concurrent ones, send one API request."""
+        ctx = MockContext()
+        search = ('Sling Models', ['Documentation'], ['Experience Manager'], None, 'test-session')
+
+        first, concurrent = await asyncio.gather(
+            search_experience_league_impl(ctx, *search),
+            search_experience_league_impl(ctx, *search),
+        )
+        again = await search_experience_league_impl(
+            ctx, 'sling  models', ['Documentation'], ['Experience Manager'], [], 'test-session'
+        )
+
+        assert first == concurrent
+        assert again.splitlines()[4:] == first.splitlines()[4:]
+        assert (
+            '1. [Sling Models](https://experienceleague.adobe.com/en/docs/sling-models)'
+            ' - Documentation'
+        ) in first
+        assert 'Annotation driven POJOs.' in first
+        [(path, headers, body)] = search_api.requests
+        assert path == '/rest/search/v2?organizationId=adobev2prod'
+        assert headers['Authorization'] == 'Bearer test-token'
+        assert body['q'] == 'Sling Models'
+        assert body['aq'] == (
+            '@el_contenttype==("Documentation") @el_product==("Experience Manager")'
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('status, payload', [(500, {}), (200, {'message': 'bad'})])
+    async def test_api_failure_uses_catalog_and_local_index(self, search_api, status, payload):
+        """Test that failed or unexpected API responses are answered from the local stores."""
+        search_api.status = status
+        search_api.payload = payload
+
+        result = await search_experience_league_impl(
+            MockContext(), 'dispatcher', None, None, None, 'test-session'
+        )
+
+        assert 'The Experience League search API is unavailable (' in result
+        assert 'https://experienceleague.adobe.com/en/search#q=dispatcher' in result
+        assert 'The sitemap catalog is disabled (MCP_CATALOG)' in result
+        assert 'The local index is disabled (MCP_LOCAL_INDEX)' in result
+        assert len(search_api.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_without_token_uses_catalog_and_local_index(self, search_api, monkeypatch):
+        """Test that without a token nothing is fetched and the local stores answer."""
+        monkeypatch.setattr(server_utils, 'SEARCH_TOKEN', '')
+        catalog_result = CatalogLookupResult(
+            query='dispatcher',
+            entries=[CatalogEntry(url='https://example.com/dispatcher', title='Dispatcher')],
+        )
+
+        with (
+            patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send,
+            patch.object(
+                server_utils, 'lookup_documentation_impl', new_callable=AsyncMock
+            ) as mock_lookup,
+        ):
+            mock_lookup.return_value = catalog_result
+            result = await search_experience_league_impl(
+                MockContext(), 'dispatcher', ['Tutorial'], None, None, 'test-session'
+            )
+            multi = await search_experience_league_multi_impl(
+                MockContext(), ['dispatcher', 'flush'], None, [None], None, 10, 'test-session'
+            )
+
+        assert result.splitlines()[2].startswith(SEARCH_NOT_CONFIGURED)
+        assert '1. [Dispatcher](https://example.com/dispatcher)' in result
+        assert 'The local index is disabled (MCP_LOCAL_INDEX)' in result
+        assert multi.splitlines()[2].startswith(SEARCH_NOT_CONFIGURED)
+        assert mock_lookup.call_args_list[0].args[1:3] == ('dispatcher', None)
+        mock_send.assert_not_called()
+        assert search_api.requests == []
+
+
+def search_payload(*paths):
+    """Search API response listing Experience League paths, best first."""
+    return {
+        'totalCount': len(paths),
+        'results': [
+            {'title': path, 'clickUri': f'https://experienceleague.adobe.com/en/docs/{path}'}
+            for path in paths
+        ],
+    }
+
+
+class TestSearchExperienceLeagueMultiImpl:
+    """Tests for search_experience_league_multi_impl function."""
+
+    @pytest.mark.asyncio
+    async def test_searches_merged(self, search_api):
+        """Test one search per query and product set, merged by reciprocal-rank fusion."""
+        search_api.payloads = {
+            'dispatcher flush': search_payload('flush', 'cache', 'agents'),
+            'invalidate dispatcher cache': search_payload('flush#api', 'cache?lang=en', 'other'),
+        }
+        search_api.payload = search_payload('other')
+
+        result = await search_experience_league_multi_impl(
+            MockContext(),
+            ['dispatcher flush', 'invalidate  dispatcher cache', 'dispatcher flush'],
+            ['Documentation'],
+            [None, ['Experience Manager|6.5']],
+            None,
+            10,
+            'test-session',
+        )
+
+        assert len(search_api.requests) == 4
+        assert sorted(body.get('aq', '') for _, _, body in search_api.requests)[-1] == (
+            '@el_contenttype==("Documentation") @el_product==("Experience Manager|6.5")'
+        )
+        lines = [line for line in result.splitlines() if '. [' in line]
+        assert [line.split(']')[0] for line in lines] == [
+            '1. [flush',
+            '2. [cache',
+            '3. [agents',
+            '4. [other',
+        ]
+        assert lines[0].endswith('found by 4 of 4 searches')
+        assert 'Failed searches' not in result
+
+    @pytest.mark.asyncio
+    async def test_failed_searches_listed(self, search_api):
+        """Test that failed searches are reported and the others still merged."""
+        search_api.payloads = {'broken': {'message': 'bad'}}
+        search_api.payload = search_payload('page')
+
+        result = await search_experience_league_multi_impl(
+            MockContext(), ['working', 'broken'], None, [None], None, 10, 'test-session'
+        )
+
+        assert '1. [page](https://experienceleague.adobe.com/en/docs/page)' in result
+        assert "- 'broken': Unexpected search response" in result
+
+    @pytest.mark.asyncio
+    async def test_all_failed_uses_catalog_and_local_index(self, search_api):
+        """Test that the first query is answered from the local stores when every search fails."""
+        search_api.payload = {'message': 'bad'}
+
+        result = await search_experience_league_multi_impl(
+            MockContext(), ['dispatcher', 'flush'], None, [None], None, 10, 'test-session'
+        )
+
+        assert result.startswith('# Experience League search: dispatcher')
+        assert "search API is unavailable ('dispatcher': Unexpected search response" in result
+        assert 'The sitemap catalog is disabled (MCP_CATALOG)' in result
+
+    @pytest.mark.asyncio
+    async def test_limits(self, search_api):
+        """Test the cap on merged results and on the number of searches."""
+        search_api.payload = search_payload('a', 'b', 'c')
+
+        result = await search_experience_league_multi_impl(
+            MockContext(), ['q'], None, [None], None, 2, 'test-session'
+        )
+        too_many = await search_experience_league_multi_impl(
+            MockContext(), ['q1', 'q2', 'q3'], None, [None] * 7, None, 10, 'test-session'
+        )
+
+        assert '2. [b]' in result and '3. [c]' not in result
+        assert 'make 21 searches, at most 20' in too_many
+        assert len(search_api.requests) == 1
+
+
+class TestSearchLocalDocsImpl:
+    """Tests for search_local_docs_impl function."""
+
+    @pytest.mark.asyncio
+    async def test_read_pages_are_searchable(self, monkeypatch):
+        """Test that a read page is indexed and its hit offsets work with read_documentation."""
+        monkeypatch.setattr(local_index, 'enabled', True)
+        url = 'https://experienceleague.adobe.com/docs/dispatcher.html'
+        ctx = MockContext()
+        response = httpx.Response(
+            200,
+            headers={'content-type': 'text/html'},
+            text=(
+                '<html><body><div class="article-content"><h1>Dispatcher</h1>'
+                + '<p>Load balancing.</p>' * 50
+                + '<h2>Invalidation</h2><p>Flush the dispatcher cache after publishing.</p>'
+                '</div></body></html>'
+            ),
+        )
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = response
+            await read_documentation_impl(ctx, url, 100, 0, 'test-session')
+
+            result = await search_local_docs_impl(ctx, 'flushing the cache', 10, 0)
+            [hit] = result.hits
+            read = await read_documentation_impl(ctx, url, 20, hit.start_index, 'test-session')
+
+        assert result.indexed_documents == 1
+        assert (hit.url, hit.title, hit.section) == (url, 'Dispatcher', 'Invalidation')
+        assert read.split(':\n\n', 1)[1].startswith('Flush the dispatcher')
+        mock_send.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_errors(self, monkeypatch):
+        """Test a disabled index and queries without search terms."""
+        disabled = await search_local_docs_impl(MockContext(), 'dispatcher', 10, 150)
+        monkeypatch.setattr(local_index, 'enabled', True)
+        stop_words = await search_local_docs_impl(MockContext(), 'the of "and"', 10, 150)
+
+        assert 'disabled' in disabled.error
+        assert 'at least one search term' in stop_words.error
+
+
+RELATED_PAGES = {
+    'https://experienceleague.adobe.com/docs/experience-manager-cloud-service/caching.html': (
+        '<h1>Caching in AEM as a Cloud Service</h1><h2>Dispatcher</h2>'
+        '<p>Flush agents invalidate the dispatcher cache when content is activated.</p>'
+    ),
+    'https://experienceleague.adobe.com/docs/experience-manager-65/dispatcher.html': (
+        '<h1>Dispatcher caching in AEM 6.5</h1><h2>Cache invalidation</h2>'
+        '<p>Configure flush agents to invalidate the dispatcher cache on activation.</p>'
+    ),
+    'https://experienceleague.adobe.com/docs/experience-manager-65/sling-models.html': (
+        '<h1>Sling Models in AEM 6.5</h1><p>Sling Models are annotation driven objects.</p>'
+    ),
+}
+
+
+def related_page_response(request, **kwargs):
+    """Serve the page of RELATED_PAGES a request addresses."""
+    body = RELATED_PAGES[str(request.url.copy_with(query=None))]
+    return httpx.Response(
+        200,
+        headers={'content-type': 'text/html'},
+        text=f'<html><body><div class="article-content">{body}</div></body></html>',
+    )
+
+
+class TestFindRelatedDocumentationImpl:
+    """Tests for find_related_documentation_impl function."""
+
+    @pytest.mark.asyncio
+    async def test_counterpart_of_a_page(self, monkeypatch):
+        """Test that the page compared is read, indexed and left out of its related pages."""
+        pytest.importorskip('numpy')
+        monkeypatch.setattr(vector_index, 'enabled', True)
+        cloud_url, six_five_url, sling_url = RELATED_PAGES
+        ctx = MockContext()
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = related_page_response
+            for url in (six_five_url, sling_url):
+                await read_documentation_impl(ctx, url, 1000, 0, 'test-session')
+
+            result = await find_related_documentation_impl(
+                ctx, None, cloud_url, 10, 'experience-manager-65', 'test-session'
+            )
+            by_query = await find_related_documentation_impl(
+                ctx, 'sling model annotations', None, 1, None, 'test-session'
+            )
+
+        assert result.error is None
+        assert result.indexed_documents == 3
+        assert [page.url for page in result.related] == [six_five_url, sling_url]
+        assert result.related[0].section == 'Cache invalidation'
+        assert [page.url for page in by_query.related] == [sling_url]
+        assert mock_send.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_errors(self, monkeypatch):
+        """Test a missing NumPy, a disabled index and a request without query or url."""
+        with monkeypatch.context() as patched:
+            patched.setattr(server_utils, 'is_numpy_available', lambda: False)
+            no_numpy = await find_related_documentation_impl(
+                MockContext(), 'dispatcher', None, 10, None, 'test-session'
+            )
+        assert 'requires NumPy' in no_numpy.error
+
+        pytest.importorskip('numpy')
+        disabled = await find_related_documentation_impl(
+            MockContext(), 'dispatcher', None, 10, None, 'test-session'
+        )
+        monkeypatch.setattr(vector_index, 'enabled', True)
+        empty = await find_related_documentation_impl(
+            MockContext(), '  ', None, 10, None, 'test-session'
+        )
+
+        assert 'disabled' in disabled.error
+        assert empty.error == 'Provide a query or a url'
+
+
+SITEMAPS = {
+    'https://experienceleague.adobe.com/sitemap.xml': (
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        '<sitemap><loc>https://experienceleague.adobe.com/sitemap-65.xml.gz</loc></sitemap>'
+        '<sitemap><loc>https://experienceleague.adobe.com/sitemap-missing.xml</loc></sitemap>'
+        '<sitemap><loc>https://example.com/sitemap.xml</loc></sitemap>'
+        '</sitemapindex>'
+    ),
+    'https://experienceleague.adobe.com/sitemap-65.xml.gz': (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        '<url><loc>https://experienceleague.adobe.com/docs/experience-manager-65/'
+        'sling-models-injectors.html</loc><lastmod>2024-05-01</lastmod></url>'
+        '<url><loc>https://experienceleague.adobe.com/docs/experience-manager-65/'
+        'dispatcher-caching.html</loc></url>'
+        '<url><loc>https://example.com/unsupported.html</loc></url>'
+        '</urlset>'
+    ),
+}
+
+
+def sitemap_response(request, **kwargs):
+    """Serve SITEMAPS, gzipping .gz files, and 404 for anything else."""
+    body = SITEMAPS.get(str(request.url))
+    if body is None:
+        return httpx.Response(404, request=request)
+    content = gzip.compress(body.encode()) if request.url.path.endswith('.gz') else body.encode()
+    return httpx.Response(200, content=content, request=request)
+
+
+class TestLookupDocumentationImpl:
+    """Tests for lookup_documentation_impl function."""
+
+    @pytest.mark.asyncio
+    async def test_first_lookup_reads_sitemaps(self, monkeypatch):
+        """Test that sitemap indexes are crawled into the catalog once, skipping failures."""
+        monkeypatch.setattr(catalog, 'enabled', True)
+        monkeypatch.setattr(
+            server_utils, 'CATALOG_SITEMAPS', ['https://experienceleague.adobe.com/sitemap.xml']
+        )
+        ctx = MockContext()
+
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = sitemap_response
+            result = await lookup_documentation_impl(
+                ctx, 'sling model injector', None, 5, 'test-session'
+            )
+            prefix = 'experienceleague.adobe.com/docs/experience-manager-65/d'
+            listed = await lookup_documentation_impl(ctx, None, prefix, 5, 'test-session')
+
+        assert result.error is None
+        assert result.catalog_size == 2
+        [first, *_] = result.entries
+        assert first.url.endswith('/sling-models-injectors.html')
+        assert (first.title, first.lastmod) == ('Sling Models Injectors', '2024-05-01')
+        assert [entry.url for entry in listed.entries] == [
+            'https://experienceleague.adobe.com/docs/experience-manager-65/dispatcher-caching.html'
+        ]
+        fetched = [str(call.args[0].url) for call in mock_send.call_args_list]
+        assert fetched == [
+            'https://experienceleague.adobe.com/sitemap.xml',
+            'https://experienceleague.adobe.com/sitemap-65.xml.gz',
+            'https://experienceleague.adobe.com/sitemap-missing.xml',
+        ]
+
+    @pytest.mark.asyncio
+    async def test_errors(self, monkeypatch):
+        """Test a disabled catalog, a lookup without terms and unreadable sitemaps."""
+        disabled = await lookup_documentation_impl(
+            MockContext(), 'models', None, 10, 'test-session'
+        )
+        monkeypatch.setattr(catalog, 'enabled', True)
+        monkeypatch.setattr(
+            server_utils, 'CATALOG_SITEMAPS', ['https://experienceleague.adobe.com/none.xml']
+        )
+        no_terms = await lookup_documentation_impl(MockContext(), 'the', None, 10, 'test-session')
+        with patch('httpx.AsyncClient.send', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = sitemap_response
+            unreadable = await lookup_documentation_impl(
+                MockContext(), 'models', None, 10, 'test-session'
+            )
+
+        assert 'disabled' in disabled.error
+        assert 'at least one search term' in no_terms.error
+        assert unreadable.error.startswith('No documentation sitemap could be read')
+        assert '404' in unreadable.error
@@ -0,0 +1,274 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the streaming HTML to markdown converter."""
+
+import pytest
+from aemlabs.aem_documentation_mcp_server.document_utils import (
+    EXTRACTION_PROFILES,
+    GENERIC_PROFILE,
+    parse_document,
+)
+from aemlabs.aem_documentation_mcp_server.streaming_utils import (
+    ElementMatcher,
+    StreamingConverter,
+    candidate_index,
+    convert_html_streaming,
+    resolve_converter,
+)
+from aemlabs.aem_documentation_mcp_server.util import convert_page
+from pathlib import Path
+
+
+FIXTURE_PAGES = sorted((Path(__file__).parent / 'fixtures' / 'pages').glob('*.html'))
+
+# Pages whose markdown differs between parser backends, where streaming
+# follows the default lxml backend
+PARSER_DIFFERENCES = {'helpx.adobe.com.html'}
+
+# Markup exercising whitespace, inline, list, table and code conversion
+MIXED_CONTENT = """
+<html><head><title>Mixed</title></head>
+<body>
+<nav><a href="/">Home</a></nav>
+<div class="content">
+  <h2>Setup <code>mvn</code></h2>
+  <p>Run <strong> the build </strong> and <a href="https://example.com/">https://example.com/</a>.<br>
+  Then <em>deploy</em> with <a href="/deploy" title="Deploy">the guide</a>.</p>
+  <!-- editorial note -->
+  <div><div class="toc">Contents</div> <span>inline</span> text </div>
+  <ul><li>One<ul><li>Nested</li></ul></li><li>Two</li></ul>
+  <ol start="3"><li>Three</li><li>Four</li></ol>
+  <p>After the list</p>
+  <table><thead><tr><th>Name</th><th colspan="2">Value</th></tr></thead>
+  <tbody><tr><td>a</td><td><code>x|y</code></td><td>z</td></tr></tbody></table>
+  <pre><code>line 1
+    line 2</code></pre>
+  <blockquote><p>Quoted</p><p>text</p></blockquote>
+  <dl><dt>Term</dt><dd>Definition</dd></dl>
+  <img src="/diagram.png" alt="Diagram"><hr>
+</div>
+</body></html>
+"""
+
+
+class TestStreamingConverter:
+    """Tests for StreamingConverter."""
+
+    @pytest.mark.parametrize('page', FIXTURE_PAGES, ids=lambda page: page.name)
+    @pytest.mark.parametrize('with_url', [True, False], ids=['profile', 'generic'])
+    def test_same_output_as_markdownify(self, page, with_url):
+        """Test that streaming matches the markdownify converter on every recorded domain page."""
+        html = page.read_text(encoding='utf-8')
+        url = f'https://{page.name[: -len(".html")]}/page' if with_url else None
+
+        stream = convert_html_streaming(html, url)
+
+        for parser in ('html.parser', 'lxml'):
+            if parser == 'html.parser' and page.name in PARSER_DIFFERENCES:
+                continue
+            document = parse_document(html, parser, url)
+            assert stream.markdown == document.markdown
+            assert stream.title == document.title
+            assert stream.profile_matched == document.profile_matched
+
+    @pytest.mark.parametrize('page', FIXTURE_PAGES, ids=lambda page: page.name)
+    def test_same_anchors_as_markdownify(self, page):
+        """Test that streaming links the same element ids to the same headings."""
+        html = page.read_text(encoding='utf-8')
+        url = f'https://{page.name[: -len(".html")]}/page'
+
+        stream = convert_page(html, 'text/html', url, converter='streaming')
+        tree = convert_page(html, 'text/html', url, converter='markdownify')
+
+        assert stream.anchors == tree.anchors
+
+    def test_anchors_of_wrappers_and_targets(self):
+        """Test ids of headings, anchor targets, wrapping sections and paragraphs."""
+        html = (
+            '<main><p>Intro</p><h2 id="custom-id">Configure</h2><p>a</p>'
+            '<a name="legacy"></a><h2>Second</h2><p id="para">text</p>'
+            '<section id="wrap"><p>lead</p><h3>Third</h3></section></main>'
+        )
+
+        stream = convert_html_streaming(html)
+
+        assert stream.heading_ids == parse_document(html).heading_ids
+        assert stream.heading_ids == [
+            ('Configure', ['custom-id']),
+            ('Second', ['legacy', 'para']),
+            ('Third', ['wrap']),
+        ]
+
+    def test_mixed_content(self):
+        """Test whitespace, inline, list, table and code conversion against markdownify."""
+        stream = convert_html_streaming(MIXED_CONTENT)
+
+        assert stream.markdown == parse_document(MIXED_CONTENT, 'html.parser').markdown
+        assert '| Name | Value | |' in stream.markdown
+        assert 'Contents' not in stream.markdown
+        assert stream.title == 'Mixed'
+        assert stream.complete
+
+    @pytest.mark.parametrize(
+        'fragment',
+        [
+            '<ol><li>Open the console<li>Click Create<li>Save</ol>',
+            '<ul><li>One<ul><li>Nested<li>Nested 2</ul><li>Two</ul>',
+            '<ul><li><p>one</p><li><p>two</p></ul>',
+            '<ul><li><p>one<li>two</ul>',
+            '<dl><dt>Term<dd>Definition<dt>Other<dd>More</dl>',
+            '<p>First<p>Second <b>bold<p>Third',
+            '<table><tr><th>Name<th>Value<tr><td>a<td><b>b<tr><td>c<td>d</table>',
+            '<table><thead><tr><th>A<th>B<tbody><tr><td>1<td>2<tfoot><tr><td>3<td>4</table>',
+            '<select><option>A<option>B</select>',
+        ],
+    )
+    def test_implied_end_tags(self, fragment):
+        """Test that left-out end tags are implied like the default lxml backend does."""
+        html = f'<html><body><div class="content">{fragment}<p>After</p></div></body></html>'
+
+        assert convert_html_streaming(html).markdown == parse_document(html).markdown
+
+    def test_higher_priority_container_later_in_page(self):
+        """Test that a later container matched by an earlier selector wins."""
+        html = (
+            '<html><body><main><p>Main text only</p></main>'
+            '<div class="article-content"><p>Article text</p></div></body></html>'
+        )
+        url = 'https://experienceleague.adobe.com/docs/page.html'
+
+        stream = convert_html_streaming(html, url)
+
+        assert stream.markdown == 'Article text'
+        assert stream.profile_matched
+
+    def test_body_and_bare_fragments(self):
+        """Test the body fallback and pages without any container."""
+        assert convert_html_streaming(
+            '<body><p>Body text</p><footer>x</footer></body>'
+        ).markdown == ('Body text')
+        assert convert_html_streaming('<p>Fragment text</p>').markdown == 'Fragment text'
+
+    def test_pruned_region_not_converted(self):
+        """Test that removed elements never reach the converter."""
+        html = '<main><aside>' + '<p>sidebar</p>' * 1000 + '</aside><p>Kept</p></main>'
+        stream = StreamingConverter()
+
+        stream.feed(html)
+        stream.close()
+
+        assert stream.markdown == 'Kept'
+
+    def test_stops_after_max_chars(self):
+        """Test that conversion stops once enough markdown was produced."""
+        paragraphs = ''.join(f'<p>Paragraph number {i} of the guide.</p>' for i in range(500))
+        html = f'<html><body><div class="article-content">{paragraphs}</div></body></html>'
+        url = 'https://experienceleague.adobe.com/docs/page.html'
+        full = convert_html_streaming(html, url).markdown
+
+        stream = StreamingConverter(url, max_chars=200)
+        fed = 0
+        for start in range(0, len(html), 512):
+            stream.feed(html[start : start + 512])
+            fed += 1
+            if stream.done:
+                break
+        stream.close()
+
+        assert fed < len(html) // 512
+        assert not stream.complete
+        assert 200 < len(stream.markdown) < 300
+        assert full.startswith(stream.markdown)
+
+    def test_keeps_reading_while_better_container_possible(self):
+        """Test that a fallback container does not stop the parse early."""
+        html = (
+            '<html><body><main>' + '<p>Fallback paragraph.</p>' * 50 + '</main>'
+            '<div class="article-content"><p>Preferred</p></div></body></html>'
+        )
+        stream = convert_html_streaming(
+            html, 'https://experienceleague.adobe.com/docs/page.html', max_chars=100
+        )
+
+        assert stream.markdown == 'Preferred'
+        assert stream.complete
+
+    def test_byte_chunks_split_inside_characters(self):
+        """Test that multi-byte characters split across chunks are decoded."""
+        body = '<main><p>Übersicht – Komponenten</p></main>'.encode('utf-8')
+        stream = StreamingConverter()
+
+        for index in range(len(body)):
+            stream.feed(body[index : index + 1])
+        stream.close()
+
+        assert stream.markdown == 'Übersicht – Komponenten'
+
+    def test_title_fallbacks(self):
+        """Test the <title>, first h1 and og:title fallbacks."""
+        og = '<meta property="og:title" content=" OG ">'
+        assert convert_html_streaming(f'<head><title> T </title>{og}</head>').title == 'T'
+        assert convert_html_streaming(f'<head>{og}</head><h1>Heading <b>one</b></h1>').title == (
+            'Heading one'
+        )
+        assert convert_html_streaming(f'<head>{og}</head>').title == 'OG'
+        assert convert_html_streaming('<p>none</p>').title is None
+
+
+class TestElementMatcher:
+    """Tests for ElementMatcher."""
+
+    @pytest.mark.parametrize(
+        'profile', [GENERIC_PROFILE, *EXTRACTION_PROFILES], ids=lambda p: p.name
+    )
+    def test_every_profile_selector_supported(self, profile):
+        """Test that all content selectors compile for streaming."""
+        index = candidate_index(profile)
+        assert index.profile_priorities == len(profile.content)
+
+    def test_compound_selectors(self):
+        """Test tag, class and attribute parts."""
+        matcher = ElementMatcher.parse("div.a.b[role='main']")
+        attrs = {'class': 'a b c', 'role': 'main'}
+
+        assert matcher.matches('div', attrs, frozenset(['a', 'b', 'c']))
+        assert not matcher.matches('span', attrs, frozenset(['a', 'b', 'c']))
+        assert not matcher.matches('div', {'role': 'main'}, frozenset(['a']))
+
+    def test_rejects_combinators(self):
+        """Test that descendant selectors are rejected."""
+        with pytest.raises(ValueError):
+            ElementMatcher.parse('main article')
+
+
+class TestConverterSelection:
+    """Tests for choosing the markdown converter."""
+
+    def test_unknown_converter_falls_back(self):
+        """Test that an unknown converter name falls back to markdownify."""
+        assert resolve_converter('sax') == 'markdownify'
+        assert resolve_converter('streaming') == 'streaming'
+
+    def test_convert_page_with_streaming(self):
+        """Test that convert_page produces the same page with either converter."""
+        html = (Path(__file__).parent / 'fixtures' / 'pages' / 'github.com.html').read_text()
+        url = 'https://github.com/adobe/aem-project-archetype'
+
+        streamed = convert_page(html, 'text/html', url, converter='streaming')
+        parsed = convert_page(html, 'text/html', url, converter='markdownify')
+
+        assert streamed.content == parsed.content
+        assert streamed.title == parsed.title
+        assert (streamed.profile, streamed.profile_matched) == ('github', True)
+        assert streamed.complete
@@ -0,0 +1,137 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the single-pass table renderer."""
+
+import markdownify
+import pytest
+from aemlabs.aem_documentation_mcp_server.document_utils import MARKDOWN_OPTIONS, parse_document
+from aemlabs.aem_documentation_mcp_server.streaming_utils import convert_html_streaming
+from aemlabs.aem_documentation_mcp_server.table_utils import RowSpans, TableConverter, cell_span
+from aemlabs.aem_documentation_mcp_server.util import extract_content_from_html
+from pathlib import Path
+from unittest.mock import patch
+
+
+RELEASE_NOTES = (
+    Path(__file__).parent / 'fixtures' / 'tables' / 'experienceleague-release-notes.html'
+)
+RELEASE_NOTES_URL = 'https://experienceleague.adobe.com/docs/experience-manager-65/release-notes/release-notes.html'
+
+# Tables without rowspans, rendered exactly like markdownify
+REGULAR_TABLES = {
+    'header and body': (
+        '<table><thead><tr><th>Name</th><th colspan="2">Value</th></tr></thead>\n'
+        '<tbody><tr><td>a</td><td><code>x|y</code></td><td>z <em> e </em></td></tr>\n'
+        '<tr><td><a href="/u">link</a></td><td>line<br>break</td><td></td></tr></tbody></table>'
+    ),
+    'bare rows': '<table><tr><td>1</td><td>one</td></tr><tr><td>2</td><td>two</td></tr></table>',
+    'header cells in body': (
+        '<table><caption>Caption <b>bold</b></caption><colgroup><col></colgroup>'
+        '<tbody><tr><th>A</th><th>B</th></tr><tr><td><p>para</p></td><td><pre>a\n  b</pre></td></tr>'
+        '</tbody><tfoot><tr><td>f</td><td>g</td></tr></tfoot></table>'
+    ),
+    'empty rows and cells': '<table><tr></tr><tr><td> </td><td><!-- c --></td></tr></table>',
+    'nested table': (
+        '<table><tr><td>outer</td><td><table><tr><td>inner</td></tr></table></td></tr></table>'
+    ),
+    'text between rows': '<table>loose text<tr><td>a</td></tr></table>',
+}
+
+
+def convert(html: str, **options) -> str:
+    """Convert HTML with the table renderer and the shared markdown options."""
+    return TableConverter(**MARKDOWN_OPTIONS, **options).convert(html)
+
+
+class TestTableConverter:
+    """Tests for TableConverter."""
+
+    @pytest.mark.parametrize('html', REGULAR_TABLES.values(), ids=REGULAR_TABLES.keys())
+    def test_same_output_as_markdownify(self, html):
+        """Test that tables without rowspans convert exactly like markdownify."""
+        page = f'<div><p>Before</p>{html}<p>After</p></div>'
+        assert convert(page) == markdownify.markdownify(page, **MARKDOWN_OPTIONS)
+
+    def test_regular_table_skips_generic_rows(self):
+        """Test that regular tables never reach markdownify's row conversion."""
+        html = RELEASE_NOTES.read_text(encoding='utf-8')
+        with patch.object(markdownify.MarkdownConverter, 'convert_tr', side_effect=AssertionError):
+            assert '| Area | Issue | Description | Fixed in |' in convert(html)
+
+    def test_rowspan_keeps_columns_aligned(self):
+        """Test that cells covered by a rowspan become empty cells."""
+        html = (
+            '<table><tr><th>Area</th><th>Issue</th><th>Fixed</th></tr>'
+            '<tr><td rowspan="2">Sites</td><td>A-1</td><td rowspan="3">6.5</td></tr>'
+            '<tr><td>A-2</td></tr><tr><td>Assets</td><td>B-1</td></tr></table>'
+        )
+        assert convert(html) == (
+            '| Area | Issue | Fixed |\n'
+            '| --- | --- | --- |\n'
+            '| Sites | A-1 | 6.5 |\n'
+            '| | A-2 | |\n'
+            '| Assets | B-1 | |'
+        )
+
+    def test_row_cap(self):
+        """Test that rows past the cap are replaced by a count."""
+        rows = ''.join(f'<tr><td>{i}</td></tr>' for i in range(10))
+        html = f'<table><thead><tr><th>N</th></tr></thead><tbody>{rows}</tbody></table><p>Next</p>'
+        assert convert(html, table_max_rows=3) == (
+            '| N |\n| --- |\n| 0 |\n| 1 |\n| 2 |\n\n*7 more rows*\n\nNext'
+        )
+        assert '*' not in convert(html)
+
+    def test_release_notes_fixture(self):
+        """Test the recorded release notes table through extract_content_from_html."""
+        content = extract_content_from_html(RELEASE_NOTES.read_text(encoding='utf-8'))
+        rows = [line for line in content.splitlines() if line.startswith('|')]
+
+        assert len(rows) == 105
+        assert all(row.count(' |') == 4 for row in rows)
+        assert (
+            '| | `CQ-23210` | Sites fails with a `RepositoryException` when publishing' in content
+        )
+
+    @pytest.mark.parametrize('max_rows', [0, 20])
+    def test_streaming_converter_matches(self, max_rows):
+        """Test that the streaming converter renders tables the same way."""
+        html = RELEASE_NOTES.read_text(encoding='utf-8')
+        with patch.object(TableConverter.Options, 'table_max_rows', max_rows):
+            document = parse_document(html, 'html.parser', RELEASE_NOTES_URL)
+            stream = convert_html_streaming(html, RELEASE_NOTES_URL)
+
+            assert stream.markdown == document.markdown
+        assert ('more rows*' in stream.markdown) == bool(max_rows)
+
+
+class TestRowSpans:
+    """Tests for RowSpans."""
+
+    def test_spans_fill_following_rows(self):
+        """Test that spanned columns are filled until the span ends."""
+        spans = RowSpans()
+
+        assert spans.place([(' a |', 1, 3), (' b | |', 2, 2)]) == (' a | b | |', 3)
+        assert spans.place([(' c |', 1, 1)]) == (' | | | c |', 4)
+        assert spans.place([(' d |', 1, 1), (' e |', 1, 1)]) == (' | d | e |', 3)
+        assert spans.place([(' f |', 1, 1)]) == (' f |', 1)
+
+    def test_cell_span(self):
+        """Test span parsing and clamping."""
+        assert cell_span('3') == 3
+        assert cell_span('0') == 1
+        assert cell_span('5000') == 1000
+        assert cell_span('x') == 1
+        assert cell_span(None) == 1
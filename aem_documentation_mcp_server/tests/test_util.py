@@ -15,9 +15,12 @@
 
 import pytest
 from aemlabs.aem_documentation_mcp_server.util import (
+    LazyDocumentCache,
+    canonicalize_url,
     extract_content_from_html,
     extract_page_title,
     format_documentation_result,
+    is_binary_content_type,
     is_html_content,
 )
 
@@ -99,6 +102,24 @@ class TestIsHtmlContent:
         assert is_html_content('test', '')
 
 
+class TestIsBinaryContentType:
+    """Tests for is_binary_content_type function."""
+
+    def test_images_and_archives(self):
+        """Test that images, archives and PDFs are binary."""
+        assert is_binary_content_type('image/png')
+        assert is_binary_content_type('application/zip')
+        assert is_binary_content_type('application/pdf')
+        assert is_binary_content_type('application/octet-stream; charset=binary')
+
+    def test_text_types(self):
+        """Test that HTML, text and JSON are not binary."""
+        assert not is_binary_content_type('text/html; charset=utf-8')
+        assert not is_binary_content_type('text/plain')
+        assert not is_binary_content_type('application/json')
+        assert not is_binary_content_type('')
+
+
 class TestFormatDocumentationResult:
     """Tests for format_documentation_result function."""
 
@@ -131,6 +152,14 @@ class TestFormatDocumentationResult:
         assert 'start_index=100' in result
         assert is_truncated is True
 
+    def test_incomplete_content(self):
+        """Test that a partially read document does not claim a total length."""
+        result, is_truncated = format_documentation_result(
+            'https://example.com', 'a' * 200, 0, 100, complete=False
+        )
+        assert 'Total length: more than 200' in result
+        assert is_truncated is True
+
     def test_start_index_beyond_content(self):
         """Test start_index beyond content length."""
         content = 'Short'
@@ -172,3 +201,48 @@ class TestExtractPageTitle:
     def test_error_handling(self):
         """Test error handling for invalid HTML."""
         assert extract_page_title(None) is None
+
+
+class TestCanonicalizeUrl:
+    """Tests for canonicalize_url function."""
+
+    def test_lowercases_scheme_and_host(self):
+        """Test that scheme and host are lowercased but the path is kept."""
+        url = 'HTTPS://ExperienceLeague.Adobe.com/en/Docs'
+        assert canonicalize_url(url) == 'https://experienceleague.adobe.com/en/Docs'
+
+    def test_drops_default_port(self):
+        """Test that default ports are removed."""
+        assert canonicalize_url('https://adapt.to:443/2025') == 'https://adapt.to/2025'
+
+    def test_empty_path(self):
+        """Test that an empty path becomes '/'."""
+        assert canonicalize_url('https://github.com') == 'https://github.com/'
+
+    def test_keeps_query_and_fragment(self):
+        """Test that query and fragment are preserved."""
+        url = 'https://experienceleague.adobe.com/en/search#q=sling'
+        assert canonicalize_url(url) == url
+
+
+class TestLazyDocumentCache:
+    """Tests for LazyDocumentCache class."""
+
+    def test_keyed_by_canonical_url_and_body(self):
+        """Test that the same body under an equivalent URL is reused and a new body re-parsed."""
+        memo = LazyDocumentCache(max_entries=2)
+        page = '<html><body><main><h2>A</h2><p>One</p></main></body></html>'
+        url = 'https://experienceleague.adobe.com/docs/page.html'
+
+        document = memo.get(page, url)
+        assert memo.get(page, 'HTTPS://experienceleague.adobe.com/docs/page.html') is document
+        assert memo.get(page.replace('One', 'Two'), url) is not document
+        assert (memo.hits, memo.misses) == (1, 2)
+
+    def test_least_recently_used_evicted(self):
+        """Test that the memo keeps at most max_entries documents."""
+        memo = LazyDocumentCache(max_entries=1)
+        first = memo.get('<p>First page</p>', None)
+        memo.get('<p>Second page</p>', None)
+
+        assert memo.get('<p>First page</p>', None) is not first
@@ -0,0 +1,171 @@
+# Copyright 2024-2025 Salomão Santos (salomaosantos777@gmail.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the related-page vector index."""
+
+import pytest
+from aemlabs.aem_documentation_mcp_server import vector_utils
+from aemlabs.aem_documentation_mcp_server.vector_utils import (
+    VectorIndex,
+    chunk_document,
+    term_buckets,
+)
+
+
+CLOUD_CACHING = """# Caching in AEM as a Cloud Service
+
+## Dispatcher cache
+
+The dispatcher caches pages at the publish tier. Flush agents invalidate
+the dispatcher cache when content is activated.
+
+## CDN
+
+The CDN caches responses according to Cache-Control headers.
+"""
+
+SIX_FIVE_CACHING = """# Configuring Dispatcher caching in AEM 6.5
+
+## Cache invalidation
+
+Configure flush agents on the author instance to invalidate the dispatcher
+cache when pages are activated.
+"""
+
+SIX_FIVE_SLING = """# Sling Models in AEM 6.5
+
+Sling Models are annotation driven Java objects adapted from resources.
+"""
+
+CLOUD_URL = 'https://experienceleague.adobe.com/docs/experience-manager-cloud-service/caching'
+SIX_FIVE_URL = 'https://experienceleague.adobe.com/docs/experience-manager-65/dispatcher'
+SLING_URL = 'https://experienceleague.adobe.com/docs/experience-manager-65/sling-models'
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Index with three pages."""
+    pytest.importorskip('numpy')
+    index = VectorIndex(directory=str(tmp_path / 'vectors'), enabled=True)
+    index.add(CLOUD_URL, 'Caching in AEM as a Cloud Service', CLOUD_CACHING)
+    index.add(SIX_FIVE_URL, 'Dispatcher caching in AEM 6.5', SIX_FIVE_CACHING)
+    index.add(SLING_URL, 'Sling Models in AEM 6.5', SIX_FIVE_SLING)
+    return index
+
+
+class TestChunkDocument:
+    """Tests for chunk_document and term_buckets functions."""
+
+    def test_chunks_follow_headings(self):
+        """Test that every section becomes a chunk carrying its heading."""
+        chunks = chunk_document(CLOUD_CACHING)
+
+        assert [section for _, _, section in chunks] == [
+            'Caching in AEM as a Cloud Service',
+            'Dispatcher cache',
+            'CDN',
+        ]
+        assert chunks[-1][1] == len(CLOUD_CACHING)
+        assert CLOUD_CACHING[chunks[1][0] :].startswith('## Dispatcher cache')
+
+    def test_long_sections_split_at_paragraphs(self, monkeypatch):
+        """Test that sections longer than the chunk size are split between paragraphs."""
+        monkeypatch.setattr(vector_utils, 'CHUNK_MAX_CHARS', 100)
+        content = '# Long\n\n' + '\n\n'.join(['word ' * 12] * 5)
+
+        chunks = chunk_document(content)
+
+        assert len(chunks) > 1
+        assert all(end - start <= 100 for start, end, _ in chunks)
+        assert all(content[start : start + 2] == '\n\n' for start, _, _ in chunks[1:])
+        assert {section for _, _, section in chunks} == {'Long'}
+
+    def test_term_buckets_are_sublinear(self):
+        """Test that repeated terms weigh less than proportionally and inflections share buckets."""
+        buckets = term_buckets('cache caches cached flush', dimensions=1 << 20)
+
+        assert sorted(buckets.values()) == pytest.approx([1.0, 2.0986], abs=1e-4)
+
+
+class TestVectorIndex:
+    """Tests for VectorIndex class."""
+
+    def test_related_pages_across_versions(self, index):
+        """Test that the AEM 6.5 counterpart of a Cloud Service page ranks first."""
+        related = index.related(
+            index.page_vector(CLOUD_URL),
+            exclude_url=CLOUD_URL,
+            url_contains='experience-manager-65',
+        )
+
+        assert [page.url for page in related] == [SIX_FIVE_URL, SLING_URL]
+        assert related[0].section == 'Cache invalidation'
+        assert SIX_FIVE_CACHING[related[0].start_index :].startswith('## Cache invalidation')
+        assert 0 < related[1].score < related[0].score <= 1
+
+    def test_query_text(self, index):
+        """Test that a free-text query finds the matching page and nothing unrelated."""
+        [first, *_] = index.related(index.query_vector('sling model annotations'))
+
+        assert first.url == SLING_URL
+        assert index.related(index.query_vector('unrelated xyzzy')) == []
+
+    def test_reindex_and_persistence(self, index, tmp_path):
+        """Test that changed pages replace their chunks and the index survives reopening."""
+        assert not index.add(SLING_URL, 'Sling Models in AEM 6.5', SIX_FIVE_SLING)
+        assert index.add(SLING_URL, 'Sling Models in AEM 6.5', '# Sling Models\n\nAdapters.')
+
+        reopened = VectorIndex(directory=str(tmp_path / 'vectors'), enabled=True)
+        assert len(reopened) == 3
+        [first, *_] = reopened.related(reopened.query_vector('adapters'))
+        assert (first.url, first.section) == (SLING_URL, 'Sling Models')
+        assert SLING_URL not in {
+            page.url for page in reopened.related(reopened.query_vector('annotation'))
+        }
+
+    def test_eviction_and_compaction(self, tmp_path, monkeypatch):
+        """Test that the oldest pages are dropped and dead rows are compacted away."""
+        pytest.importorskip('numpy')
+        directory = tmp_path / 'vectors'
+        index = VectorIndex(directory=str(directory), enabled=True, dimensions=64, max_chunks=2)
+        for number in range(3):
+            index.add(f'https://example.com/{number}', None, f'page {number} content')
+
+        reopened = VectorIndex(directory=str(directory), enabled=True, dimensions=64, max_chunks=2)
+        assert len(reopened) == 2
+        assert (directory / 'vectors.f32').stat().st_size == 3 * 64 * 4
+
+        monkeypatch.setattr(vector_utils, 'COMPACT_MIN_DEAD_CHUNKS', 1)
+        reopened.add('https://example.com/3', None, 'page 3 content')
+
+        assert len(reopened) == 2
+        assert (directory / 'vectors.f32').stat().st_size == 2 * 64 * 4
+        related = reopened.related(reopened.query_vector('content'))
+        assert {page.url for page in related} == {'https://example.com/2', 'https://example.com/3'}
+        assert len(VectorIndex(directory=str(directory), enabled=True, dimensions=64)) == 2
+
+    def test_mismatched_dimensions_start_over(self, index, tmp_path):
+        """Test that an index written with other dimensions is replaced instead of misread."""
+        other = VectorIndex(directory=str(tmp_path / 'vectors'), enabled=True, dimensions=64)
+
+        assert len(other) == 0
+        assert other.add(SLING_URL, None, SIX_FIVE_SLING)
+        assert len(other) == 1
+
+    def test_disabled(self, tmp_path):
+        """Test that a disabled index neither stores nor finds pages."""
+        index = VectorIndex(directory=str(tmp_path / 'vectors'), enabled=False)
+
+        assert not index.add('https://example.com/', None, 'content')
+        assert len(index) == 0
+        assert not (tmp_path / 'vectors').exists()